@@ -0,0 +1,19 @@
+"""
+async_views.py — Base class for async class-based views
+Django 5.0's method_decorator(…, name="dispatch") wraps dispatch as a sync
+function, which breaks decorators like xframe_options_exempt on views with
+async handlers. Making dispatch itself a coroutine lets them pick their
+async variant.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+from django.http import HttpResponseBase
+from django.views import View
+
+
+class AsyncView(View):
+
+    async def dispatch(self, request: Any, *args: Any, **kwargs: Any) -> HttpResponseBase:
+        return await super().dispatch(request, *args, **kwargs)
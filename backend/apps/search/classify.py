@@ -0,0 +1,118 @@
+"""
+classify.py — Local query-type classifier
+Guesses what kind of target a query is (email, phone, domain/URL,
+username handle, personal name) with a confidence, so `categories=auto`
+only fans out to the group categories that make sense for it.
+Pure regex — no network, microseconds per call.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+
+
+EMAIL_RE    = re.compile(r"^[a-z0-9._%+\-]+@[a-z0-9.\-]+\.[a-z]{2,24}$", re.I)
+URL_RE      = re.compile(r"^(?:https?://|www\.)\S+$", re.I)
+DOMAIN_RE   = re.compile(r"^(?:[a-z0-9](?:[a-z0-9\-]{0,61}[a-z0-9])?\.)+([a-z]{2,24})(?::\d+)?(?:/\S*)?$", re.I)
+IPV4_RE     = re.compile(r"^(?:(?:25[0-5]|2[0-4]\d|1?\d?\d)\.){3}(?:25[0-5]|2[0-4]\d|1?\d?\d)$")
+E164_RE     = re.compile(r"^\+[1-9]\d{6,14}$")
+PHONE_RE    = re.compile(r"^\+?[\d\s().\-/]{7,24}$")
+HANDLE_RE   = re.compile(r"^@?[a-z0-9_.\-]{2,40}$", re.I)
+NAME_TOK_RE = re.compile(r"^[^\W\d_](?:[^\W\d_]|['’\-.])*$")
+
+# TLDs common enough that `word.tld` is almost certainly a domain, not a handle
+COMMON_TLDS: frozenset[str] = frozenset({
+    "com", "net", "org", "io", "co", "ai", "app", "dev", "info", "biz", "me",
+    "us", "uk", "de", "fr", "nl", "es", "it", "ru", "ch", "se", "no", "fi",
+    "dk", "pl", "be", "at", "ca", "au", "br", "in", "jp", "cn", "edu", "gov",
+    "xyz", "online", "site", "tech", "store", "cloud", "gg", "tv", "fm", "ly",
+})
+
+AUTO_THRESHOLD = 0.5    # categories below this are not searched in auto mode
+CATEGORIES     = ("person", "username", "email", "phone", "domain")
+
+
+@dataclass(frozen=True)
+class Guess:
+    category:   str
+    confidence: float
+
+
+def _phone(q: str) -> float:
+    digits  = re.sub(r"\D", "", q)
+    compact = re.sub(r"[\s().\-/]", "", q)
+    if E164_RE.match(compact):
+        return 0.97
+    if not PHONE_RE.match(q) or not 7 <= len(digits) <= 15:
+        return 0.0
+    # National formats: separators, a trunk 0 or an area code in parentheses
+    if "(" in q or re.search(r"\d[\s.\-/]\d", q) or digits.startswith("0"):
+        return 0.85
+    return 0.75
+
+
+def _name(tokens: list[str]) -> float:
+    if not 2 <= len(tokens) <= 4 or not all(NAME_TOK_RE.match(t) for t in tokens):
+        return 0.0
+    return 0.9 if all(t[0].isupper() for t in tokens) else 0.7
+
+
+def classify(q: str) -> list[Guess]:
+    """All plausible categories for q, most confident first."""
+    q      = q.strip()
+    tokens = q.split()
+    scores: dict[str, float] = {}
+
+    def hit(category: str, confidence: float) -> None:
+        scores[category] = max(scores.get(category, 0.0), confidence)
+
+    if not q:
+        return []
+
+    if len(tokens) == 1:
+        if EMAIL_RE.match(q):
+            hit("email", 0.99)
+        elif URL_RE.match(q):
+            hit("domain", 0.97)
+        elif IPV4_RE.match(q):
+            hit("domain", 0.9)  # hosts are searched by the domain groups
+        elif q.startswith("@") and HANDLE_RE.match(q):
+            hit("username", 0.95)
+        else:
+            m = DOMAIN_RE.match(q)
+            if m and not q.replace(".", "").isdigit():
+                if m.group(1).lower() in COMMON_TLDS:
+                    hit("domain", 0.93)
+                else:
+                    # john.doe — a dotted handle as often as a domain
+                    hit("domain", 0.6)
+                    hit("username", 0.55)
+
+    phone = 0.0 if scores else _phone(q)
+    if phone:
+        hit("phone", phone)
+        if re.fullmatch(r"\d+", q):
+            hit("username", 0.3)  # bare digits are occasionally handles
+
+    if len(tokens) == 1 and not scores and HANDLE_RE.match(q):
+        if re.search(r"[\d_.]", q):
+            hit("username", 0.85)
+        else:
+            # A single plain word — a handle, or a mononym
+            hit("username", 0.75)
+            hit("person", 0.5 if q[0].isupper() else 0.35)
+
+    name = _name(tokens)
+    if name:
+        hit("person", name)
+
+    return sorted((Guess(c, round(s, 2)) for c, s in scores.items()), key=lambda g: -g.confidence)
+
+
+def categories_for(q: str, threshold: float = AUTO_THRESHOLD) -> list[str]:
+    """
+    Categories worth searching for q. Ambiguous inputs keep every category
+    above the threshold; unrecognised ones fall back to all categories.
+    """
+    cats = [g.category for g in classify(q) if g.confidence >= threshold]
+    return cats or list(CATEGORIES)
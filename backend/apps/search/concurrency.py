@@ -0,0 +1,48 @@
+"""
+concurrency.py — The search path on many threads at once
+Group, engine and enrichment work runs on the shared pools, and on a
+free-threaded (no-GIL) CPython those threads really do run in parallel —
+parsing included, so the parse process pool is not needed there.
+
+What is shared across threads, and why it is safe without the GIL:
+
+    read-only after import   HACKING_GROUPS / GROUP_BY_ID (a mappingproxy), engine
+                             tables, header dicts, user-agent tuples, compiled regexes
+    behind a lock            memo flights, prefetch jobs, admission, group priority,
+                             engine stats, rate-limit buckets, query plans, metrics,
+                             traces, the job queue's waiters, lazily built transports
+    per thread               Django's cache handles (the locmem store has its own
+                             lock), DB connections, and rng() below
+    per request / per call   parsers, soups, dedup state, result lists
+
+New module-level state should fall in one of those rows.
+"""
+from __future__ import annotations
+
+import random
+import sys
+import threading
+
+
+_local = threading.local()
+
+
+def gil_enabled() -> bool:
+    """False on a free-threaded build running without the GIL (it can be
+    switched back on at startup, e.g. by an extension that needs it)."""
+    check = getattr(sys, "_is_gil_enabled", None)
+    return True if check is None else bool(check())
+
+
+def free_threaded_build() -> bool:
+    import sysconfig
+    return bool(sysconfig.get_config_var("Py_GIL_DISABLED"))
+
+
+def rng() -> random.Random:
+    """This thread's Random — the module-level one is a single object every
+    thread would contend on without the GIL."""
+    r = getattr(_local, "rng", None)
+    if r is None:
+        r = _local.rng = random.Random()
+    return r
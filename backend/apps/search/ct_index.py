@@ -0,0 +1,194 @@
+"""
+ct_index.py — Certificate-transparency subdomain index
+Streams crt.sh JSON for a domain, dedupes names on the fly with bounded
+memory and keeps a persistent per-domain index (CertDomain / CertName).
+Repeat lookups read the index and only refresh it once it goes stale.
+"""
+from __future__ import annotations
+
+import json
+import re
+import threading
+from datetime import timedelta
+from typing import Any, Generator, Iterable, Iterator
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.search import outbound
+from apps.search.models import CertDomain, CertName
+
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+CRTSH_URL     = "https://crt.sh/"
+FETCH_TIMEOUT = 15
+REFRESH_AFTER = timedelta(hours=6)
+MAX_NAMES     = 5000            # unique names kept per refresh
+MAX_CERTS     = 50_000          # certificate rows scanned per refresh
+MAX_BUFFER    = 1024 * 1024     # a single JSON object larger than this aborts the stream
+LOCK_STRIPES  = 64              # domains hash onto this many refresh locks
+
+DOMAIN_RE = re.compile(r"^[a-z0-9.\-]+\.[a-z]{2,}$")
+
+# A fixed set, not one lock per domain ever looked up — two domains sharing
+# a stripe only means one refresh waits for the other
+_domain_locks: tuple[threading.Lock, ...] = tuple(threading.Lock() for _ in range(LOCK_STRIPES))
+
+
+def _lock_for(domain: str) -> threading.Lock:
+    return _domain_locks[hash(domain) % LOCK_STRIPES]
+
+
+def normalise_domain(q: str) -> str:
+    q = q.strip().lower()
+    q = re.sub(r"^https?://", "", q)
+    q = re.sub(r"^www\.", "", q)
+    return q.split("/")[0].split("?")[0].split(":")[0]
+
+
+# ---------------------------------------------------------------------------
+# Streaming JSON
+# ---------------------------------------------------------------------------
+
+def iter_json_array(chunks: Iterable[str]) -> Generator[Any, None, bool]:
+    """
+    Yield the elements of a top-level JSON array as text chunks arrive.
+    Only the unparsed tail of the stream is buffered, never the whole array.
+    Returns True once the closing bracket has been read — False when the
+    stream ended early or an element outgrew MAX_BUFFER.
+    """
+    decoder = json.JSONDecoder()
+    buf     = ""
+    opened  = False
+    for chunk in chunks:
+        buf += chunk
+        pos  = 0
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos >= len(buf):
+                break
+            if not opened:
+                if buf[pos] != "[":
+                    return False
+                opened = True
+                pos   += 1
+                continue
+            if buf[pos] == "]":
+                break
+            try:
+                obj, pos_end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                break  # element continues in the next chunk
+            if pos_end == len(buf) and type(obj) in (int, float):
+                break  # so may the digits of a number
+            yield obj
+            pos = pos_end
+        buf = buf[pos:]
+        if len(buf) > MAX_BUFFER:
+            return False
+    return buf.lstrip().startswith("]")
+
+
+def _iter_names(entries: Iterable[dict[str, Any]], domain: str, after_id: int) -> Iterator[tuple[str, str, str, int]]:
+    """(name, issuer, logged, cert_id) for every new in-scope name, deduped, bounded."""
+    seen: set[str] = set()
+    for scanned, cert in enumerate(entries):
+        if scanned >= MAX_CERTS or len(seen) >= MAX_NAMES:
+            break
+        if not isinstance(cert, dict):
+            continue
+        cert_id = int(cert.get("id") or 0)
+        if cert_id and cert_id <= after_id:
+            continue
+        issuer = (cert.get("issuer_name") or "")[:255]
+        logged = (cert.get("entry_timestamp") or "")[:10]
+        for line in (cert.get("name_value") or "").splitlines():
+            name = line.strip().lower()
+            if name.startswith("*."):
+                name = name[2:]
+            if not name or name in seen or len(name) > 253:
+                continue
+            if name != domain and not name.endswith("." + domain):
+                continue
+            seen.add(name)
+            yield name, issuer, logged, cert_id
+
+
+# ---------------------------------------------------------------------------
+# Index
+# ---------------------------------------------------------------------------
+
+def _refresh(entry: CertDomain) -> None:
+    """
+    Add the names of certificates logged since the last refresh. crt.sh does
+    not order rows by id, so the high-water mark only moves once the whole
+    answer was read — after a cut-off (MAX_CERTS / MAX_NAMES, a cut stream)
+    certificates below it may not have been seen yet.
+    """
+    domain   = entry.domain
+    after_id = entry.max_cert_id
+    rows: list[tuple[str, str, str, int]] = []
+    top_id   = after_id
+    complete = False
+
+    def _tracked(entries: Generator[Any, None, bool]) -> Iterator[Any]:
+        nonlocal top_id, complete
+        while True:
+            try:
+                cert = next(entries)
+            except StopIteration as end:
+                complete = bool(end.value)
+                return
+            if isinstance(cert, dict):
+                top_id = max(top_id, int(cert.get("id") or 0))
+            yield cert
+
+    with outbound.stream(
+        "GET", CRTSH_URL,
+        params={"q": f"%.{domain}", "output": "json"},
+        headers={"User-Agent": "Mozilla/5.0", "Accept": "application/json"},
+        timeout=FETCH_TIMEOUT,
+    ) as r:
+        if r.status_code != 200:
+            return
+        rows = list(_iter_names(_tracked(iter_json_array(r.iter_text())), domain, after_id))
+
+    with transaction.atomic():
+        known = set(CertName.objects.filter(domain=entry).values_list("name", flat=True))
+        CertName.objects.bulk_create([
+            CertName(domain=entry, name=n, issuer=i, logged_at=l, cert_id=c)
+            for n, i, l, c in rows if n not in known
+        ], ignore_conflicts=True)
+        if complete:
+            entry.max_cert_id = top_id
+        entry.refreshed_at = timezone.now()
+        entry.save(update_fields=["max_cert_id", "refreshed_at"])
+
+
+def lookup(q: str, limit: int = 100) -> list[CertName]:
+    """
+    Return indexed names for `q`, newest certificates first.
+    Refreshes from crt.sh when the index is missing or older than REFRESH_AFTER;
+    concurrent callers for the same domain share a single refresh.
+    """
+    domain = normalise_domain(q)
+    if not DOMAIN_RE.match(domain):
+        return []
+    with _lock_for(domain):
+        entry, _ = CertDomain.objects.get_or_create(domain=domain)
+        stale = entry.refreshed_at is None or timezone.now() - entry.refreshed_at > REFRESH_AFTER
+        if stale:
+            try:
+                _refresh(entry)
+            except Exception:
+                pass  # serve whatever the index already holds
+    return list(CertName.objects.filter(domain=entry)[:limit])
+
+
+def subdomain_count(q: str) -> int:
+    domain = normalise_domain(q)
+    return CertName.objects.filter(domain__domain=domain).exclude(name=domain).count()
@@ -0,0 +1,130 @@
+"""
+deadline.py — Request latency budget
+A search's absolute deadline lives in a context variable so every layer
+below the view (group threads, engine rounds, enrichment scripts, each
+outbound HTTP call) can read what is left without threading it through
+every signature. Worker threads do not inherit context on their own —
+submit work with submit() / within() so the deadline follows it. Work
+can also be cancelled outright (cancel_on), which reads as a spent budget.
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, TypeVar
+
+import httpx
+
+from apps.search import profiling
+
+
+T = TypeVar("T")
+
+DEFAULT_BUDGET_MS = 120_000
+MIN_BUDGET_MS     = 250
+MAX_BUDGET_MS     = 120_000
+
+_ends_at: contextvars.ContextVar[float | None] = contextvars.ContextVar("firecat_deadline", default=None)
+_cancel:  contextvars.ContextVar[threading.Event | None] = contextvars.ContextVar("firecat_cancel", default=None)
+
+
+def parse_budget(raw: str) -> float:
+    """`budget_ms` query value → seconds, clamped. ValueError when not a number."""
+    if not raw:
+        return DEFAULT_BUDGET_MS / 1000
+    ms = float(raw)
+    if ms != ms:
+        raise ValueError("budget_ms is NaN")
+    return min(MAX_BUDGET_MS, max(MIN_BUDGET_MS, ms)) / 1000
+
+
+def remaining() -> float | None:
+    """Seconds left in the current budget — None when no budget is set,
+    0 once the surrounding work has been cancelled."""
+    cancel = _cancel.get()
+    if cancel is not None and cancel.is_set():
+        return 0.0
+    ends_at = _ends_at.get()
+    return None if ends_at is None else ends_at - time.monotonic()
+
+
+def expired() -> bool:
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def clamp(timeout: float | None) -> float | None:
+    """A per-call timeout that never outlives the budget."""
+    left = remaining()
+    if left is None:
+        return timeout
+    left = max(0.0, left)
+    return left if timeout is None else min(timeout, left)
+
+
+def within(ends_at: float | None, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run fn with the deadline set to `ends_at` (monotonic), keeping any tighter one."""
+    current = _ends_at.get()
+    if current is not None and (ends_at is None or current < ends_at):
+        ends_at = current
+    token = _ends_at.set(ends_at)
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        _ends_at.reset(token)
+
+
+@contextmanager
+def cancel_on(event: threading.Event) -> Iterator[None]:
+    """Setting `event` spends the budget of everything run inside at once."""
+    token = _cancel.set(event)
+    try:
+        yield
+    finally:
+        _cancel.reset(token)
+
+
+def submit(
+    executor: concurrent.futures.Executor,
+    fn: Callable[..., T],
+    *args: Any,
+    **kwargs: Any,
+) -> concurrent.futures.Future[T]:
+    """executor.submit that carries the caller's context — the deadline, the
+    group priority, the trace and any profile — into the worker thread."""
+    return executor.submit(contextvars.copy_context().run, profiling.bind(fn), *args, **kwargs)
+
+
+class DeadlineTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """Caps every request's timeouts at the remaining budget; fails fast once spent."""
+
+    def __init__(self, inner: Any) -> None:
+        self.inner = inner
+
+    def _cap(self, request: httpx.Request) -> None:
+        left = remaining()
+        if left is not None:
+            if left <= 0:
+                raise httpx.TimeoutException("latency budget exhausted", request=request)
+            timeouts = dict(request.extensions.get("timeout") or {})
+            request.extensions["timeout"] = {
+                k: left if timeouts.get(k) is None else min(timeouts[k], left)
+                for k in ("connect", "read", "write", "pool")
+            }
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        self._cap(request)
+        return self.inner.handle_request(request)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self._cap(request)
+        return await self.inner.handle_async_request(request)
+
+    def close(self) -> None:
+        self.inner.close()
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import json
+import os
+import tracemalloc
+
+from django.http import FileResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+
+from apps.search import jsonenc, profiling
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class MemoryView(View):
+    """
+    GET  /api/debug/memory/[?top=25&key=app|lineno] — the largest live allocations made by apps/search code
+    POST /api/debug/memory/ {"action": "start"|"stop", "frames": 25}
+    tracemalloc slows every allocation while it runs — start it, reproduce, read, stop.
+    Staff or SEARCH_DEBUG_ENDPOINTS only.
+    """
+
+    def get(self, request):  # type: ignore[override]
+        if not profiling.allowed(request):
+            return jsonenc.response({"error": "Not found"}, status=404)
+        if not tracemalloc.is_tracing():
+            return jsonenc.response({"error": "tracemalloc is off — POST {\"action\": \"start\"} first"}, status=409)
+        try:
+            top = max(1, min(200, int(request.GET.get("top", 25))))
+        except ValueError:
+            return jsonenc.response({"error": "top must be a number"}, status=400)
+        key = request.GET.get("key", "app")
+        if key not in ("app", "lineno"):
+            return jsonenc.response({"error": "key must be app or lineno"}, status=400)
+        return jsonenc.response(profiling.memory_top(top, key))
+
+    def post(self, request):  # type: ignore[override]
+        if not profiling.allowed(request):
+            return jsonenc.response({"error": "Not found"}, status=404)
+        try:
+            body = json.loads(request.body or b"{}")
+            action, frames = body.get("action"), int(body.get("frames", 25))
+        except (ValueError, AttributeError, TypeError):
+            return jsonenc.response({"error": "Invalid JSON"}, status=400)
+        if action == "start":
+            profiling.memory_start(max(1, min(100, frames)))
+        elif action == "stop":
+            profiling.memory_stop()
+        else:
+            return jsonenc.response({"error": "action must be start or stop"}, status=400)
+        return jsonenc.response({"tracing": tracemalloc.is_tracing()})
+
+
+class ProfilesView(View):
+    """
+    GET /api/debug/profiles/[?name=<file>] — saved request profiles, newest
+    first, or one folded-stacks file. Staff or SEARCH_DEBUG_ENDPOINTS only.
+    """
+
+    def get(self, request):  # type: ignore[override]
+        if not profiling.allowed(request):
+            return jsonenc.response({"error": "Not found"}, status=404)
+        name = os.path.basename(request.GET.get("name", "").strip())
+        if name:
+            path = os.path.join(profiling.PROFILE_DIR, name)
+            if not name.endswith(".folded") or not os.path.isfile(path):
+                return jsonenc.response({"error": "Unknown profile"}, status=404)
+            return FileResponse(open(path, "rb"), content_type="text/plain; charset=utf-8")
+        try:
+            names = sorted((n for n in os.listdir(profiling.PROFILE_DIR) if n.endswith(".folded")), reverse=True)
+        except FileNotFoundError:
+            names = []
+        return jsonenc.response({"dir": profiling.PROFILE_DIR, "profiles": names})
@@ -0,0 +1,171 @@
+"""
+hedging.py — Hedged engine requests
+Tracks per-engine latency and answer quality, and runs an engine round so
+that an engine still silent at its own p90 latency (or one that answered
+with too little) is backed up by the fastest healthy spare engine. The
+first adequate answer closes each slot; stragglers are abandoned. Hedges
+go through outbound like any other call, so they count against the
+per-host rate limits. A round that runs out of time with slots still open
+is marked cut short, so a memoised round is not cached as complete.
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import threading
+import time
+from collections import deque
+from typing import Any, Callable
+
+from apps.search import deadline, memo, metrics, scheduler
+from apps.search.records import Result
+
+
+Fetch = Callable[[str], list[Result]]
+
+ADEQUATE      = 3       # results that make an answer good enough to stop waiting
+WINDOW        = 200     # samples kept per engine
+MIN_SAMPLES   = 10      # below this the default hedge delay is used
+HEDGE_DEFAULT = 4.0     # seconds before hedging an engine with no history
+HEDGE_FLOOR   = 0.5
+HEALTH_WINDOW = 20
+HEALTH_MIN    = 0.3     # share of adequate answers for a spare to be picked
+
+
+class EngineStats:
+
+    def __init__(self) -> None:
+        self._lock    = threading.Lock()
+        self._latency: dict[str, deque[float]] = {}
+        self._quality: dict[str, deque[bool]]  = {}
+
+    def record(self, engine: str, seconds: float, adequate: bool) -> None:
+        with self._lock:
+            self._latency.setdefault(engine, deque(maxlen=WINDOW)).append(seconds)
+            self._quality.setdefault(engine, deque(maxlen=HEALTH_WINDOW)).append(adequate)
+
+    def quantile(self, engine: str, q: float) -> float | None:
+        with self._lock:
+            samples = sorted(self._latency.get(engine, ()))
+        if len(samples) < MIN_SAMPLES:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+    def hedge_after(self, engine: str) -> float:
+        p90 = self.quantile(engine, 0.9)
+        return HEDGE_DEFAULT if p90 is None else max(HEDGE_FLOOR, p90)
+
+    def healthy(self, engine: str) -> bool:
+        with self._lock:
+            recent = list(self._quality.get(engine, ()))
+        return len(recent) < 5 or sum(recent) / len(recent) >= HEALTH_MIN
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            engines = list(self._latency)
+        return {e: {"p50": self.quantile(e, 0.5), "p90": self.quantile(e, 0.9), "healthy": self.healthy(e)} for e in engines}
+
+
+stats = EngineStats()
+
+
+def _timed(engine: str, fetch: Fetch, query: str) -> list[Result]:
+    t0 = time.monotonic()
+    with metrics.source("engine", engine) as call:
+        try:
+            items = fetch(query) or []
+        except Exception:
+            stats.record(engine, time.monotonic() - t0, False)
+            raise
+        call["results"] = len(items)
+    stats.record(engine, time.monotonic() - t0, len(items) >= ADEQUATE)
+    return items
+
+
+class _Slot:
+    def __init__(self, engine: str, future: concurrent.futures.Future[list[Result]], hedge_at: float) -> None:
+        self.engines  = [engine]
+        self.futures  = [future]
+        self.hedge_at = hedge_at
+        self.hedged   = False     # one hedge attempt per slot
+        self.closed   = False
+
+
+def _result(f: concurrent.futures.Future[list[Result]]) -> list[Result]:
+    try:
+        return f.result() or []
+    except Exception:
+        return []
+
+
+def hedged_round(
+    query: str,
+    primaries: list[tuple[str, Fetch]],
+    spares: list[tuple[str, Fetch]],
+    timeout: float | None,
+) -> tuple[list[Result], set[str]]:
+    """
+    Run the primary engines for `query`, hedging slow or thin ones with
+    spares. Returns (raw results in slot order, names of engines used).
+    """
+    ex      = scheduler.engines_pool
+    start   = time.monotonic()
+    give_up = start + (timeout if timeout is not None else 3600)
+    pool    = list(spares)
+    used    = {name for name, _ in primaries}
+    slots   = [
+        _Slot(name, deadline.submit(ex, _timed, name, fetch, query), start + stats.hedge_after(name))
+        for name, fetch in primaries
+    ]
+
+    def hedge(slot: _Slot) -> None:
+        slot.hedged   = True
+        slot.hedge_at = float("inf")
+        ranked = sorted(
+            (s for s in pool if stats.healthy(s[0])),
+            key=lambda s: stats.quantile(s[0], 0.5) or HEDGE_DEFAULT,
+        )
+        if ranked:
+            name, fetch = ranked[0]
+            pool.remove(ranked[0])
+            used.add(name)
+            slot.engines.append(name)
+            slot.futures.append(deadline.submit(ex, _timed, name, fetch, query))
+
+    try:
+        while True:
+            now = time.monotonic()
+            for slot in slots:
+                if slot.closed:
+                    continue
+                finished = [f for f in slot.futures if f.done()]
+                if any(len(_result(f)) >= ADEQUATE for f in finished):
+                    slot.closed = True
+                elif len(finished) == len(slot.futures):
+                    # Everything in the slot answered, none well enough — hedge at once if we still can
+                    if slot.hedged or not pool:
+                        slot.closed = True
+                    else:
+                        hedge(slot)
+                elif now >= slot.hedge_at and pool and not slot.hedged:
+                    hedge(slot)
+            open_slots = [s for s in slots if not s.closed]
+            if not open_slots or now >= give_up:
+                break
+            pending    = [f for s in open_slots for f in s.futures if not f.done()]
+            next_hedge = min((s.hedge_at for s in open_slots), default=give_up) if pool else give_up
+            concurrent.futures.wait(
+                pending,
+                timeout=max(0.0, min(give_up, next_hedge) - now),
+                return_when=concurrent.futures.FIRST_COMPLETED,
+            )
+    finally:
+        scheduler.cancel_pending(f for slot in slots for f in slot.futures)
+    if any(not s.closed for s in slots):
+        memo.cut_short()
+
+    raw: list[Result] = []
+    for slot in slots:
+        for f in slot.futures:
+            if f.done():
+                raw.extend(_result(f))
+    return raw, used
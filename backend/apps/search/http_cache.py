@@ -0,0 +1,178 @@
+"""
+http_cache.py — Conditional-request cache transport for JSON APIs
+Stores API responses with their validators, revalidates them with
+If-None-Match / If-Modified-Since and serves 304s from the local store.
+X-RateLimit-* headers are tracked per host so calls are deferred (or served
+stale) before the upstream limit is exhausted.
+"""
+from __future__ import annotations
+
+import hashlib
+import re
+import time
+from typing import Any
+
+import httpx
+from django.core.cache import cache
+
+from apps.search import deadline, metrics, outbound
+
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+STORE_TTL      = 24 * 3600   # how long a validated body is kept for revalidation
+RATE_RESERVE   = 2           # stop spending when this many calls are left in the window
+MAX_DEFER      = 5.0         # longest we will sleep waiting for a window reset, budget permitting
+MAX_AGE_RE     = re.compile(r"max-age=(\d+)")
+
+
+# ---------------------------------------------------------------------------
+# Store
+# ---------------------------------------------------------------------------
+
+def _entry_key(request: httpx.Request) -> str:
+    raw = f"{request.method} {request.url} {request.headers.get('accept', '')}"
+    return "httpc1_" + hashlib.md5(raw.encode()).hexdigest()
+
+
+def _limit_key(host: str) -> str:
+    return "httprl1_" + host
+
+
+def _response(entry: dict[str, Any], request: httpx.Request, state: str) -> httpx.Response:
+    metrics.CACHE.inc(layer="http", outcome=state)
+    headers = list(entry["headers"]) + [("x-firecat-cache", state)]
+    return httpx.Response(entry["status"], headers=headers, content=entry["body"], request=request)
+
+
+def _fresh_for(headers: httpx.Headers) -> int:
+    cc = headers.get("cache-control", "")
+    if "no-store" in cc or "no-cache" in cc:
+        return 0
+    m = MAX_AGE_RE.search(cc)
+    return int(m.group(1)) if m else 0
+
+
+# ---------------------------------------------------------------------------
+# Rate limits
+# ---------------------------------------------------------------------------
+
+def _reset_at(value: str, now: float) -> float | None:
+    try:
+        n = float(value)
+    except (TypeError, ValueError):
+        return None
+    # GitHub sends an epoch timestamp, Reddit sends seconds-until-reset
+    return n if n > 1e9 else now + n
+
+
+def _record_limits(host: str, r: httpx.Response) -> None:
+    now       = time.time()
+    remaining = r.headers.get("x-ratelimit-remaining")
+    reset     = _reset_at(r.headers.get("x-ratelimit-reset", ""), now)
+    if r.status_code in (403, 429) and r.headers.get("retry-after"):
+        reset     = _reset_at(r.headers["retry-after"], now)
+        remaining = "0"
+    if remaining is None or reset is None:
+        return
+    try:
+        left = int(float(remaining))
+    except ValueError:
+        return
+    cache.set(_limit_key(host), (left, reset), timeout=max(1, int(reset - now) + 1))
+
+
+def _deferral(host: str) -> float:
+    """Seconds to wait before spending another call on `host` (0 = go ahead)."""
+    state = cache.get(_limit_key(host))
+    if not state:
+        return 0.0
+    left, reset = state
+    if left > RATE_RESERVE:
+        return 0.0
+    return max(0.0, reset - time.time())
+
+
+# ---------------------------------------------------------------------------
+# Transport
+# ---------------------------------------------------------------------------
+
+class ConditionalCacheTransport(httpx.BaseTransport):
+    """
+    Wraps another transport. GET responses carrying an ETag or Last-Modified
+    are stored raw (still content-encoded) so they can be replayed verbatim.
+    """
+
+    def __init__(self, inner: httpx.BaseTransport | None = None) -> None:
+        self._inner = inner
+
+    @property
+    def inner(self) -> httpx.BaseTransport:
+        # Resolved per call so outbound.configure() (record/replay) applies here too
+        return self._inner or outbound.transport()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method != "GET":
+            return self.inner.handle_request(request)
+
+        key   = _entry_key(request)
+        entry = cache.get(key)
+        host  = request.url.host
+
+        if entry and entry["fresh_until"] > time.time():
+            return _response(entry, request, "fresh")
+
+        wait = _deferral(host)
+        if wait:
+            if entry:
+                return _response(entry, request, "stale")
+            # Sleeping blocks a pool thread — only when the reset comes before the search's deadline
+            if wait > MAX_DEFER or (deadline.clamp(wait) or 0.0) < wait:
+                metrics.CACHE.inc(layer="http", outcome="deferred")
+                return httpx.Response(
+                    429, headers={"retry-after": str(int(wait) + 1), "x-firecat-cache": "deferred"},
+                    request=request,
+                )
+            time.sleep(wait)
+
+        if entry:
+            if entry.get("etag"):
+                request.headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                request.headers["If-Modified-Since"] = entry["last_modified"]
+
+        r = self.inner.handle_request(request)
+        try:
+            body = b"".join(r.stream)  # type: ignore[arg-type]  # raw, still content-encoded
+        finally:
+            r.close()
+        _record_limits(host, r)
+
+        if r.status_code == 304 and entry:
+            entry["fresh_until"] = time.time() + _fresh_for(r.headers)
+            cache.set(key, entry, timeout=STORE_TTL)
+            return _response(entry, request, "revalidated")
+
+        etag, modified = r.headers.get("etag"), r.headers.get("last-modified")
+        if r.status_code == 200 and (etag or modified):
+            cache.set(key, {
+                "status":        r.status_code,
+                "headers":       r.headers.multi_items(),
+                "body":          body,
+                "etag":          etag,
+                "last_modified": modified,
+                "fresh_until":   time.time() + _fresh_for(r.headers),
+            }, timeout=STORE_TTL)
+
+        metrics.CACHE.inc(layer="http", outcome="miss")
+        return httpx.Response(r.status_code, headers=r.headers, content=body, request=request)
+
+    def close(self) -> None:
+        if self._inner:
+            self._inner.close()
+
+
+# Shared client for the open JSON APIs (GitHub, Reddit, urlscan, Wayback) — shared by every user, so no cookie jar
+api_client = httpx.Client(transport=ConditionalCacheTransport(), cookies=outbound.no_cookies())
@@ -2,23 +2,24 @@ from __future__ import annotations
 
 import re
 import ssl
-import random
 from urllib.parse import urlparse, urljoin
 from typing import Any
 
-import httpx
+from asgiref.sync import sync_to_async
 from bs4 import BeautifulSoup, Comment
 from django.http import JsonResponse
-from django.views import View
 from django.views.decorators.clickjacking import xframe_options_exempt
 from django.utils.decorators import method_decorator
 
+from apps.search import concurrency, jsonenc, outbound, parsing
+from apps.search.async_views import AsyncView
 
-USER_AGENTS = [
+
+USER_AGENTS = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:125.0) Gecko/20100101 Firefox/125.0",
-]
+)
 
 # Regex patterns
 EMAIL_RE    = re.compile(r'[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}')
@@ -50,7 +51,7 @@ JUNK_EMAILS = frozenset({
 
 
 def _ua():
-    return random.choice(USER_AGENTS)
+    return concurrency.rng().choice(USER_AGENTS)
 
 
 def _clean_email(email: str) -> bool:
@@ -69,25 +70,25 @@ def _clean_phone(phone: str) -> bool:
     return 7 <= len(digits) <= 15
 
 
-def _fetch_page(url: str) -> tuple[str | None, str | None]:
-    """Fetch a URL and return (html_content, final_url). Returns (None, None) on failure."""
+async def _fetch_page(url: str) -> tuple[bytes | None, str | None, str | None]:
+    """Fetch a URL and return (raw body, encoding, final_url). Returns (None, None, None) on failure."""
     headers = {
         "User-Agent":      _ua(),
         "Accept":          "text/html,application/xhtml+xml,*/*;q=0.8",
         "Accept-Language": "en-US,en;q=0.9",
     }
     attempts = [
-        lambda: httpx.get(url, headers=headers, timeout=15, follow_redirects=True, verify=False),
-        lambda: httpx.get(url.replace("https://", "http://"), headers=headers, timeout=15, follow_redirects=True, verify=False),
+        lambda: outbound.aget(url, headers=headers, timeout=15, follow_redirects=True, verify=False),
+        lambda: outbound.aget(url.replace("https://", "http://"), headers=headers, timeout=15, follow_redirects=True, verify=False),
     ]
     for attempt in attempts:
         try:
-            r = attempt()
+            r = await attempt()
             if r.status_code < 400:
-                return r.text, str(r.url)
+                return r.content, r.encoding, str(r.url)
         except Exception:
             continue
-    return None, None
+    return None, None, None
 
 
 def _extract_all(html: str, base_url: str) -> dict[str, Any]:
@@ -219,7 +220,7 @@ def _extract_all(html: str, base_url: str) -> dict[str, Any]:
 
 
 @method_decorator(xframe_options_exempt, name="dispatch")
-class InspectView(View):
+class InspectView(AsyncView):
     """
     GET /api/search/inspect/?url=<url>
     Fetches a URL and extracts all OSINT-relevant data:
@@ -227,7 +228,7 @@ class InspectView(View):
     external links, tech stack, exposed keys, crypto addresses.
     """
 
-    def get(self, request):  # type: ignore[override]
+    async def get(self, request):  # type: ignore[override]
         url = request.GET.get("url", "").strip()
         if not url:
             return JsonResponse({"error": "No URL provided"}, status=400)
@@ -235,11 +236,14 @@ class InspectView(View):
         if not url.startswith(("http://", "https://")):
             url = "https://" + url
 
-        html, final_url = _fetch_page(url)
-        if not html:
+        raw, encoding, final_url = await _fetch_page(url)
+        if not raw:
             return JsonResponse({"error": "Could not fetch page"}, status=502)
 
-        data = _extract_all(html, final_url or url)
+        # Extraction is CPU-bound — keep it off the event loop
+        data = await sync_to_async(parsing.run, thread_sensitive=False)(
+            _extract_all, raw, final_url or url, encoding=encoding,
+        )
         data["url"]       = final_url or url
         data["source_url"] = url
 
@@ -254,4 +258,4 @@ class InspectView(View):
             "crypto":       len(data["crypto"]),
         }
 
-        return JsonResponse(data)
\ No newline at end of file
+        return jsonenc.response(data)
\ No newline at end of file
@@ -0,0 +1,331 @@
+"""
+jobqueue.py — Group tasks on a shared queue, executed by worker processes
+Scraping and parsing are CPU-bound under the GIL, so one web process tops
+out at about a core. With SEARCH_QUEUE_URL set, the web process only
+enqueues group tasks; `manage.py search_worker` processes — on this node or
+any other — run them and store each reply in the same backend under its job
+id, where whoever waits on that job picks it up. Replies nobody collects
+(the waiter gave up or went away) expire after REPLY_TTL.
+
+    SEARCH_QUEUE_URL=redis://host:6379/1        Redis lists — priority bands for jobs, one expiring list per reply
+    SEARCH_QUEUE_URL=sqlite:////var/tmp/q.db    single node, any number of worker processes
+    SEARCH_QUEUE_URL=local://                   in-process stand-in (worker threads)
+
+Unset, groups run in the web process as before. Workers share engine
+rounds and "load more" continuations through the cache, so give them the
+same CACHE_URL as the web nodes.
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import itertools
+import json
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Protocol
+
+from django.conf import settings
+
+from apps.search import jsonenc, priority, records, tracing
+
+
+QUEUE_URL     = getattr(settings, "SEARCH_QUEUE_URL", "")
+LOCAL_WORKERS = 16
+POLL          = 0.05    # seconds between polls on backends without blocking reads
+REPLY_TTL     = 300     # seconds an uncollected reply is kept
+PREFIX        = "firecat:search"
+BANDS         = (("high", 75), ("normal", 45), ("low", 0))   # Redis lists, served in this order
+
+Job   = dict[str, Any]
+Reply = dict[str, Any]
+
+
+class Backend(Protocol):
+    def push(self, job: Job) -> None: ...
+    def pop(self, timeout: float) -> Job | None: ...
+    def depth(self) -> int: ...
+    def reply(self, job_id: str, reply: Reply) -> None: ...
+    def result(self, job_id: str, timeout: float) -> Reply | None: ...
+
+
+# ---------------------------------------------------------------------------
+# Backends
+# ---------------------------------------------------------------------------
+
+class LocalBackend:
+    """Everything in this process — for development and single-process deployments."""
+
+    def __init__(self) -> None:
+        self._jobs     = queue.PriorityQueue()  # type: queue.PriorityQueue[tuple[int, int, Job]]
+        self._seq      = itertools.count()
+        self._replies: dict[str, tuple[float, Reply]] = {}
+        self._lock     = threading.Lock()
+        self._replied  = threading.Condition(self._lock)
+        self._started  = False
+
+    def push(self, job: Job) -> None:
+        with self._lock:
+            if not self._started:
+                self._started = True
+                threading.Thread(target=serve, args=(self, LOCAL_WORKERS), daemon=True, name="search-local-worker").start()
+            seq = next(self._seq)   # itertools.count is not atomic on free-threaded builds
+        self._jobs.put((-job["priority"], seq, job))
+
+    def pop(self, timeout: float) -> Job | None:
+        try:
+            return self._jobs.get(timeout=timeout)[2]
+        except queue.Empty:
+            return None
+
+    def depth(self) -> int:
+        return self._jobs.qsize()
+
+    def reply(self, job_id: str, reply: Reply) -> None:
+        now = time.monotonic()
+        with self._replied:
+            for stale in [k for k, (at, _) in self._replies.items() if now - at > REPLY_TTL]:
+                del self._replies[stale]
+            self._replies[job_id] = (now, reply)
+            self._replied.notify_all()
+
+    def result(self, job_id: str, timeout: float) -> Reply | None:
+        with self._replied:
+            self._replied.wait_for(lambda: job_id in self._replies, timeout)
+            hit = self._replies.pop(job_id, None)
+        return None if hit is None else hit[1]
+
+
+class SQLiteBackend:
+    """A jobs and a results table in one SQLite file — many processes, one node."""
+
+    def __init__(self, path: str) -> None:
+        self.path   = path
+        self._local = threading.local()
+        with self._db() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("CREATE TABLE IF NOT EXISTS jobs (id INTEGER PRIMARY KEY, priority INTEGER, payload TEXT)")
+            db.execute("CREATE INDEX IF NOT EXISTS jobs_order ON jobs (priority DESC, id)")
+            db.execute("CREATE TABLE IF NOT EXISTS results (job TEXT PRIMARY KEY, created REAL, payload TEXT)")
+            db.execute("CREATE INDEX IF NOT EXISTS results_created ON results (created)")
+
+    def _db(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = self._local.db = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+        return db
+
+    def push(self, job: Job) -> None:
+        self._db().execute("INSERT INTO jobs (priority, payload) VALUES (?, ?)", (job["priority"], json.dumps(job)))
+
+    def _take(self, select: str, delete: str, *args: Any) -> list[tuple[int, str]]:
+        db = self._db()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            rows = db.execute(select, args).fetchall()
+            if rows:
+                db.execute(delete.format(",".join("?" * len(rows))), [r[0] for r in rows])
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+        return rows
+
+    def pop(self, timeout: float) -> Job | None:
+        give_up = time.monotonic() + timeout
+        while True:
+            rows = self._take(
+                "SELECT id, payload FROM jobs ORDER BY priority DESC, id LIMIT 1",
+                "DELETE FROM jobs WHERE id IN ({})",
+            )
+            if rows:
+                return json.loads(rows[0][1])
+            if time.monotonic() >= give_up:
+                return None
+            time.sleep(POLL)
+
+    def depth(self) -> int:
+        return int(self._db().execute("SELECT COUNT(*) FROM jobs").fetchone()[0])
+
+    def reply(self, job_id: str, reply: Reply) -> None:
+        db  = self._db()
+        now = time.time()
+        db.execute("INSERT OR REPLACE INTO results (job, created, payload) VALUES (?, ?, ?)", (job_id, now, jsonenc.dumps(reply)))
+        db.execute("DELETE FROM results WHERE created < ?", (now - REPLY_TTL,))
+
+    def result(self, job_id: str, timeout: float) -> Reply | None:
+        db      = self._db()
+        give_up = time.monotonic() + timeout
+        while True:
+            # One waiter per job id — a plain read, no write lock until there is something to take
+            row = db.execute("SELECT payload FROM results WHERE job = ?", (job_id,)).fetchone()
+            if row is not None:
+                db.execute("DELETE FROM results WHERE job = ?", (job_id,))
+                return json.loads(row[0])
+            if time.monotonic() >= give_up:
+                return None
+            time.sleep(POLL)
+
+
+class RedisBackend:
+    """Priority-banded Redis lists for jobs, one expiring list per reply — any number of nodes."""
+
+    def __init__(self, url: str) -> None:
+        import redis  # optional dependency — only needed for this backend
+
+        self._redis = redis.Redis.from_url(url)
+
+    @staticmethod
+    def _band(prio: int) -> str:
+        return next(f"{PREFIX}:jobs:{name}" for name, floor in BANDS if prio >= floor)
+
+    def push(self, job: Job) -> None:
+        self._redis.lpush(self._band(job["priority"]), json.dumps(job))
+
+    def pop(self, timeout: float) -> Job | None:
+        hit = self._redis.brpop([f"{PREFIX}:jobs:{name}" for name, _ in BANDS], timeout=max(1, int(timeout)))
+        return None if hit is None else json.loads(hit[1])
+
+    def depth(self) -> int:
+        return sum(int(self._redis.llen(f"{PREFIX}:jobs:{name}")) for name, _ in BANDS)
+
+    def reply(self, job_id: str, reply: Reply) -> None:
+        key = f"{PREFIX}:reply:{job_id}"
+        self._redis.pipeline().lpush(key, jsonenc.dumps(reply)).expire(key, REPLY_TTL).execute()
+
+    def result(self, job_id: str, timeout: float) -> Reply | None:
+        # Fractional BRPOP timeouts need Redis 6 — rounding up would overrun the group deadline
+        hit = self._redis.brpop([f"{PREFIX}:reply:{job_id}"], timeout=max(0.01, timeout))
+        return None if hit is None else json.loads(hit[1])
+
+
+def _connect(url: str) -> Backend:
+    scheme, _, rest = url.partition("://")
+    if scheme == "local":
+        return LocalBackend()
+    if scheme == "sqlite":
+        return SQLiteBackend(rest)
+    if scheme in ("redis", "rediss", "unix"):
+        return RedisBackend(url)
+    raise ValueError(f"Unsupported SEARCH_QUEUE_URL scheme: {scheme!r}")
+
+
+_backend: Backend | None = None
+_backend_lock = threading.Lock()
+
+
+def backend(url: str = "") -> Backend:
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = _connect(url or QUEUE_URL)
+        return _backend
+
+
+def enabled() -> bool:
+    return bool(QUEUE_URL)
+
+
+# ---------------------------------------------------------------------------
+# Web side — enqueue and wait for the reply
+# ---------------------------------------------------------------------------
+
+def depth() -> int:
+    """Group tasks waiting on the shared queue, from every web process — 0 when unknown."""
+    if not enabled():
+        return 0
+    try:
+        return backend().depth()
+    except Exception:
+        return 0
+
+
+def run_group(
+    group: dict[str, Any],
+    q: str,
+    plan: Any,
+    ends_at: float,
+) -> tuple[str, list[records.Result], str | None]:
+    """
+    Drop-in for views._run_group that runs the group on a worker. The query
+    plan stays behind — it is per process; workers share engine rounds
+    through the memo cache instead. A reply that misses the deadline
+    comes back empty.
+    """
+    left = max(0.0, ends_at - time.monotonic())
+    prio = priority.of(group)
+    job  = {
+        "id":       uuid.uuid4().hex,
+        "group":    group["id"],
+        "q":        q,
+        "deadline": time.time() + left,      # wall clock — workers run on other nodes
+        "priority": prio,
+        "trace":    tracing.current() is not None,   # the worker records spans and sends them back
+    }
+    # In flight here while it waits, so shedding sees it like a local group
+    with priority.running(prio), tracing.span("job", group=group["id"]):
+        b = backend()
+        b.push(job)
+        reply = b.result(job["id"], left)
+        if reply is None:
+            return group["id"], [], None
+        tracing.graft(reply.get("trace"))
+    return group["id"], records.coerce(reply.get("items") or []), reply.get("cursor")
+
+
+# ---------------------------------------------------------------------------
+# Worker side
+# ---------------------------------------------------------------------------
+
+def execute(job: Job) -> Reply:
+    """Run one group task to its deadline and build the reply."""
+    from apps.search.views import GROUP_BY_ID, _run_group
+
+    reply: Reply = {"id": job["id"], "group": job["group"], "items": [], "cursor": None}
+    left  = job["deadline"] - time.time()
+    group = GROUP_BY_ID.get(job["group"])
+    if group is None or left <= 0:
+        return reply   # unknown group or already too late — answer fast so nobody waits
+    if not job.get("trace"):
+        _, reply["items"], reply["cursor"] = _run_group(group, job["q"], None, time.monotonic() + left)
+        return reply
+    trace = tracing.Trace("worker")
+    with tracing.active(trace.root):
+        _, reply["items"], reply["cursor"] = _run_group(group, job["q"], None, time.monotonic() + left)
+    trace.finish(store=False)
+    reply["trace"] = trace.root.as_dict(trace.root.start)
+    return reply
+
+
+def serve(b: Backend, threads: int, stop: threading.Event | None = None) -> None:
+    """Pull jobs off the queue and run up to `threads` of them at once until stopped."""
+    stop  = stop or threading.Event()
+    slots = threading.BoundedSemaphore(threads)
+    pool  = concurrent.futures.ThreadPoolExecutor(threads, thread_name_prefix="search-worker")
+
+    def run(job: Job) -> None:
+        try:
+            try:
+                reply = execute(job)
+            except Exception as exc:
+                reply = {"id": job["id"], "group": job["group"], "items": [], "cursor": None, "error": str(exc)}
+            b.reply(job["id"], reply)
+        finally:
+            slots.release()
+
+    try:
+        while not stop.is_set():
+            slots.acquire()
+            try:
+                job = b.pop(timeout=1.0)
+            except Exception:
+                job = None
+                time.sleep(1.0)
+            if job is None:
+                slots.release()
+                continue
+            pool.submit(run, job)
+    finally:
+        pool.shutdown(wait=True)
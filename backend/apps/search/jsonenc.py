@@ -0,0 +1,95 @@
+"""
+jsonenc.py — One JSON encoder for search responses, SSE events and the API
+Serialising big result payloads (a full search is dozens of groups of
+results) shows up in request profiles, so everything large goes through
+dumps()/dumpb() here: orjson when it is installed, the standard library
+otherwise. SEARCH_JSON_BACKEND forces one ("orjson" / "stdlib").
+
+Both backends write the same bytes: compact separators, UTF-8 rather than
+\\u escapes, keys in insertion order, datetimes in ISO 8601 with "Z" for
+UTC. Types neither knows go to `default` (see _default); search results
+(records.Result) become their dict form there. Known gaps, none of which
+search payloads contain: non-finite floats (stdlib NaN, orjson null),
+floats printed with an exponent, and integers past 64 bits.
+"""
+from __future__ import annotations
+
+import dataclasses
+import datetime
+import decimal
+import json
+import uuid
+from typing import Any, Callable
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.functional import Promise
+
+from apps.search.records import Result
+
+try:
+    import orjson  # optional dependency — the stdlib encoder is used without it
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+
+def _default(o: Any) -> Any:
+    if isinstance(o, Result):
+        return o.as_dict()
+    if isinstance(o, datetime.datetime):
+        r = o.isoformat()
+        return r[:-6] + "Z" if r.endswith("+00:00") else r
+    if isinstance(o, (datetime.date, datetime.time)):
+        return o.isoformat()
+    if isinstance(o, (decimal.Decimal, uuid.UUID, Promise)):
+        return str(o)
+    if isinstance(o, (set, frozenset)):
+        return list(o)
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        return dataclasses.asdict(o)
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+def _stdlib(obj: Any, default: Callable[[Any], Any] = _default) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=default).encode()
+
+
+if orjson is not None:
+    _OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+    def _orjson(obj: Any, default: Callable[[Any], Any] = _default) -> bytes:
+        return orjson.dumps(obj, default=default, option=_OPTIONS)
+
+
+def backends() -> dict[str, Callable[..., bytes]]:
+    """Every encoder usable here, by name."""
+    out: dict[str, Callable[..., bytes]] = {"stdlib": _stdlib}
+    if orjson is not None:
+        out["orjson"] = _orjson
+    return out
+
+
+def _pick() -> tuple[str, Callable[..., bytes]]:
+    available = backends()
+    wanted    = getattr(settings, "SEARCH_JSON_BACKEND", "auto") or "auto"
+    if wanted == "auto":
+        wanted = "orjson" if "orjson" in available else "stdlib"
+    if wanted not in available:
+        raise ValueError(f"SEARCH_JSON_BACKEND={wanted!r} is not available here (have: {', '.join(available)})")
+    return wanted, available[wanted]
+
+
+BACKEND, _encode = _pick()
+
+
+def dumpb(obj: Any, default: Callable[[Any], Any] = _default) -> bytes:
+    return _encode(obj, default)
+
+
+def dumps(obj: Any, default: Callable[[Any], Any] = _default) -> str:
+    return _encode(obj, default).decode()
+
+
+def response(data: Any, status: int = 200, **kwargs: Any) -> HttpResponse:
+    """JsonResponse, through the fast encoder (and not \\u-escaping non-ASCII)."""
+    return HttpResponse(dumpb(data), content_type="application/json", status=status, **kwargs)
@@ -0,0 +1,64 @@
+"""Shared helpers for the benchmark and load-test commands."""
+from __future__ import annotations
+
+import os
+import resource
+import threading
+from typing import Any
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100
+    lo, hi = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def open_fds() -> int:
+    try:
+        return len(os.listdir("/proc/self/fd"))
+    except OSError:
+        try:
+            return len(os.listdir("/dev/fd"))
+        except OSError:
+            return 0
+
+
+def rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):
+        # ru_maxrss is KiB on Linux, bytes on macOS — peak only, but better than nothing
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2**20 if peak > 2**24 else peak / 1024
+
+
+class ResourceSampler:
+    """Polls thread count, open FDs and RSS in the background and keeps the peaks."""
+
+    def __init__(self, interval: float = 0.01, fds: bool = False) -> None:
+        self.interval   = interval
+        self.track_fds  = fds
+        self.peak       = threading.active_count()
+        self.peak_fds   = open_fds() if fds else 0
+        self.peak_rss   = rss_mb() if fds else 0.0
+        self._stop      = threading.Event()
+        self._thread    = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, threading.active_count())
+            if self.track_fds:
+                self.peak_fds = max(self.peak_fds, open_fds())
+                self.peak_rss = max(self.peak_rss, rss_mb())
+
+    def __enter__(self) -> "ResourceSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._stop.set()
+        self._thread.join()
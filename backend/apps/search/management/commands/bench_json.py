@@ -0,0 +1,110 @@
+"""
+bench_json — JSON encoding of search payloads, per backend.
+
+Builds the payloads the hot paths encode — a full JSON search response,
+one SSE group event, 500 history rows through the DRF renderer — and
+times every backend in apps/search/jsonenc.py against the json.dumps calls
+they replaced. That the backends write the same bytes is checked in
+apps/search/tests/test_jsonenc.py.
+
+    python manage.py bench_json
+    python manage.py bench_json --items 25 --repeat 200
+"""
+from __future__ import annotations
+
+import datetime
+import json
+import time
+from typing import Any, Callable
+
+from django.core.management.base import BaseCommand
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.renderers import JSONRenderer
+
+from apps.search import jsonenc
+from apps.search.records import Result
+from apps.search.stub_upstream import _results
+from apps.search.views import HACKING_GROUPS
+from firecat_project.renderers import FastJSONRenderer
+
+SOURCES = ("google_electron", "bing", "ddg", "brave", "mojeek", "startpage", "yahoo")
+
+
+def _search_body(items: int) -> dict[str, Any]:
+    groups = []
+    for n, g in enumerate(HACKING_GROUPS):
+        rows = (_results(f"{g['label']} jürgen müller", 1) * (items // 10 + 1))[:items]
+        groups.append({
+            "id": g["id"], "label": g["label"], "cursor": None,
+            "items": [
+                Result(f"{t} — “{n}”", link, link.split("/")[2], s, SOURCES[i % len(SOURCES)])
+                for i, (t, link, s) in enumerate(rows)
+            ],
+        })
+    return {"groups": groups, "cached": False, "partial": False}
+
+
+def _plain(payload: Any) -> Any:
+    """The payload with results as dicts — what the old encoders were given."""
+    if isinstance(payload, Result):
+        return payload.as_dict()
+    if isinstance(payload, dict):
+        return {k: _plain(v) for k, v in payload.items()}
+    if isinstance(payload, list):
+        return [_plain(v) for v in payload]
+    return payload
+
+
+def _history(rows: int) -> list[dict[str, Any]]:
+    at = datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc)
+    return [
+        {"id": i, "title": f"Résumé {i} line", "url": f"https://example.com/{i}", "visited_at": at + datetime.timedelta(seconds=i)}
+        for i in range(rows)
+    ]
+
+
+def _time(fn: Callable[[], Any], repeat: int) -> float:
+    """Best-of-three mean per call, microseconds."""
+    best = float("inf")
+    for _ in range(3):
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        best = min(best, (time.perf_counter() - t0) / repeat)
+    return best * 1e6
+
+
+class Command(BaseCommand):
+    help = "Time the JSON backends on search payloads."
+
+    def add_arguments(self, parser):  # type: ignore[no-untyped-def]
+        parser.add_argument("--items", type=int, default=25, help="results per group")
+        parser.add_argument("--history", type=int, default=500, help="history rows for the renderer")
+        parser.add_argument("--repeat", type=int, default=50)
+
+    def handle(self, *args, **opts):  # type: ignore[no-untyped-def]
+        body     = _search_body(opts["items"])
+        event    = {"type": "group", "group": body["groups"][0]}
+        history  = _history(opts["history"])
+        repeat   = max(1, opts["repeat"])
+        backends = jsonenc.backends()
+
+        plain_body, plain_event = _plain(body), _plain(event)
+        size = len(json.dumps(plain_body, cls=DjangoJSONEncoder))
+        rows = [
+            ("search JSON", "JsonResponse encoder", lambda: json.dumps(plain_body, cls=DjangoJSONEncoder),
+             {b: (lambda enc=enc: enc(body)) for b, enc in backends.items()}),
+            ("SSE group event", "json.dumps", lambda: json.dumps(plain_event, ensure_ascii=False),
+             {b: (lambda enc=enc: enc(event)) for b, enc in backends.items()}),
+            (f"history x{len(history)}", "DRF JSONRenderer", lambda: JSONRenderer().render(history),
+             {"renderer": lambda: FastJSONRenderer().render(history)}),
+        ]
+        self.stdout.write(f"backends: {', '.join(backends)} (active: {jsonenc.BACKEND})")
+        self.stdout.write(f"search body: {len(body['groups'])} groups x {opts['items']} items, {size / 1024:.0f} KiB")
+        self.stdout.write(f"{'payload':<16} {'encoder':<22} {'us/call':>9} {'speedup':>8}")
+        for label, old_name, old, new in rows:
+            base = _time(old, repeat)
+            self.stdout.write(f"{label:<16} {old_name:<22} {base:>9.0f} {'1.00x':>8}")
+            for name, fn in new.items():
+                us = _time(fn, repeat)
+                self.stdout.write(f"{'':<16} {name:<22} {us:>9.0f} {base / us:>7.2f}x")
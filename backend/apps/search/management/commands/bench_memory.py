@@ -0,0 +1,103 @@
+"""
+bench_memory — memory held per search: result dicts against records.Result.
+
+Parses synthetic SERPs (the stub upstream's, through the real parsers) for
+every group's operator queries on three engines, keeps what a search keeps
+— each group's raw results, its deduplicated list and the "load more"
+backlog — and measures it with tracemalloc, once as the dicts results used
+to be and once as Results. Then the same for the cache: the pickled size
+of every group entry, as the cache backends store them.
+
+    python manage.py bench_memory
+    python manage.py bench_memory --queries 2 --q "john smith"
+"""
+from __future__ import annotations
+
+import gc
+import itertools
+import pickle
+import tracemalloc
+from typing import Any, Callable
+
+from django.core.management.base import BaseCommand
+
+from apps.search import views
+from apps.search.records import Result
+from apps.search.stub_upstream import _results, _serp
+
+ENGINES = (("bing", views._serp_bing), ("ddg", views._serp_ddg), ("brave", views._serp_brave))
+
+
+def _dicts(rows: list[views.Row], source: str) -> list[dict[str, Any]]:
+    """Results the way views._items built them before records.py."""
+    return [
+        {"title": title, "link": link, "displayLink": display, "snippet": snippet, "source": source}
+        for title, link, display, snippet in rows
+    ]
+
+
+def _records(rows: list[views.Row], source: str) -> list[Result]:
+    return [Result(title, link, display, snippet, source) for title, link, display, snippet in rows]
+
+
+def _link(item: Any) -> str:
+    return item["link"] if isinstance(item, dict) else item.link
+
+
+def _search(q: str, queries: int, build: Callable[[list[views.Row], str], list[Any]]) -> dict[str, dict[str, Any]]:
+    """Per group: raw results, the kept ones and the backlog, as a search holds them."""
+    held: dict[str, dict[str, Any]] = {}
+    for g in views.HACKING_GROUPS:
+        raw: list[Any] = []
+        for query in views._build_queries(g, q)[:queries]:
+            for engine, parse in ENGINES:
+                raw.extend(build(parse(_serp(engine, _results(query, 1))), engine))
+        seen: set[str] = set()
+        kept = [i for i in raw if not (_link(i) in seen or seen.add(_link(i)))][:views.MAX_PER_GROUP]   # type: ignore[func-returns-value]
+        links = {_link(i) for i in kept}
+        held[g["id"]] = {
+            "raw":     raw,
+            "items":   kept,
+            "backlog": list(itertools.islice((i for i in raw if _link(i) not in links), views.MORE_BACKLOG)),
+        }
+    return held
+
+
+def _measure(q: str, queries: int, build: Callable[[list[views.Row], str], list[Any]]) -> tuple[int, int, int, int]:
+    """(bytes held, results held, group cache bytes, backlog cache bytes)."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    held   = _search(q, queries, build)
+    gc.collect()
+    size   = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    count   = sum(len(h["raw"]) for h in held.values())
+    cached  = sum(len(pickle.dumps(h["items"], pickle.HIGHEST_PROTOCOL)) for h in held.values())
+    backlog = sum(len(pickle.dumps(h["backlog"], pickle.HIGHEST_PROTOCOL)) for h in held.values())
+    return size, count, cached, backlog
+
+
+class Command(BaseCommand):
+    help = "Memory per in-flight search and per cache entry: result dicts vs slotted Result records."
+
+    def add_arguments(self, parser):  # type: ignore[no-untyped-def]
+        parser.add_argument("--q", default="john smith")
+        parser.add_argument("--queries", type=int, default=3, help="operator queries per group")
+
+    def handle(self, *args, **opts):  # type: ignore[no-untyped-def]
+        q, queries = opts["q"], max(1, opts["queries"])
+        rows = [("dicts", _measure(q, queries, _dicts)), ("Result", _measure(q, queries, _records))]
+        groups = len(views.HACKING_GROUPS)
+        self.stdout.write(f"{groups} groups, {queries} queries x {len(ENGINES)} engines each, q={q!r}")
+        self.stdout.write(f"{'results as':<10} {'held KiB':>9} {'B/result':>9} {'cache KiB':>10} {'B/entry':>8} {'backlog KiB':>12}")
+        for name, (size, count, cached, backlog) in rows:
+            self.stdout.write(
+                f"{name:<10} {size / 1024:>9.0f} {size / max(1, count):>9.0f} "
+                f"{cached / 1024:>10.0f} {cached / groups:>8.0f} {backlog / 1024:>12.0f}"
+            )
+        (old, _, old_c, old_b), (new, _, new_c, new_b) = rows[0][1], rows[1][1]
+        self.stdout.write(
+            f"Result saves {100 * (1 - new / old):.0f}% held, "
+            f"{100 * (1 - new_c / old_c):.0f}% per group cache entry, {100 * (1 - new_b / old_b):.0f}% per backlog"
+        )
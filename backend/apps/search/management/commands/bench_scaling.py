@@ -0,0 +1,143 @@
+"""
+bench_scaling — thread scaling of replayed searches, standard vs free-threaded.
+
+Runs the recorded searches with 1, 2, 4 … N concurrent clients and reports
+throughput, speedup over one client and how many cores were busy. Upstream
+latency and host rate limits are off by default, so what is left is
+parsing, dedup and the search path's own bookkeeping (plus Bing's pause
+between result pages): on a standard build "cores" stays at or below 1
+however many clients run; on a free-threaded build it should follow them.
+
+    # record once (see bench_search), then
+    python manage.py bench_scaling --cassettes /tmp/firecat-cassettes
+    # the same run on other interpreters, one table each
+    python manage.py bench_scaling --cassettes /tmp/firecat-cassettes --interpreter python3.13t
+    # no cassettes: synthetic SERPs from the stub upstream
+    python manage.py bench_scaling --mode stub
+
+Groups run without the query planner, so concurrent clients replaying the
+same query do not share engine rounds through the memo cache.
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.search import concurrency, deadline, outbound, scheduler
+from apps.search.ratelimit import DEFAULT_LIMITS
+from apps.search.stub_upstream import DEFAULT_LATENCY
+from apps.search.views import HACKING_GROUPS, _search_group
+
+from .bench_search import DEFAULT_QUERIES
+
+
+def _levels(spec: str) -> list[int]:
+    if spec:
+        return sorted({max(1, int(n)) for n in spec.split(",") if n.strip()})
+    top, n, out = os.cpu_count() or 1, 1, []
+    while n < top:
+        out.append(n)
+        n *= 2
+    return out + [top]
+
+
+def _search(q: str, groups: list[dict[str, Any]]) -> int:
+    """One search's groups on the shared pool, as SearchProxyView runs them — groups with results."""
+    futures = [deadline.submit(scheduler.groups_pool, _search_group, g, q) for g in groups]
+    found   = 0
+    for f in concurrent.futures.as_completed(futures):
+        try:
+            found += bool(f.result()[1])
+        except Exception:
+            pass
+    return found
+
+
+def _level(clients: int, searches: list[tuple[str, list[dict[str, Any]]]], rounds: int) -> dict[str, float]:
+    cache.clear()
+    work = searches * rounds
+
+    def client(i: int) -> int:
+        return sum(_search(q, groups) for q, groups in work[i::clients])
+
+    start, cpu = time.perf_counter(), time.process_time()
+    with concurrent.futures.ThreadPoolExecutor(clients, thread_name_prefix="bench-client") as ex:
+        found = sum(ex.map(client, range(clients)))
+    wall = time.perf_counter() - start
+    cpu  = time.process_time() - cpu
+    return {"clients": clients, "searches": len(work), "wall": wall, "per_s": len(work) / wall, "cores": cpu / wall, "groups": found}
+
+
+def _table(write: Any, result: dict[str, Any]) -> None:
+    write(f"python {result['python']}  free-threaded build={result['free_threaded']}  GIL enabled={result['gil']}")
+    write(f"{'clients':>7} {'searches':>8} {'wall s':>8} {'search/s':>9} {'speedup':>8} {'cores':>6}")
+    base = result["levels"][0]["per_s"] if result["levels"] else 1.0
+    for row in result["levels"]:
+        write(
+            f"{row['clients']:>7} {row['searches']:>8} {row['wall']:>8.2f} "
+            f"{row['per_s']:>9.2f} {row['per_s'] / base:>7.2f}x {row['cores']:>6.2f}"
+        )
+
+
+class Command(BaseCommand):
+    help = "Thread scaling of replayed searches (throughput and busy cores per client count)."
+
+    def add_arguments(self, parser):  # type: ignore[no-untyped-def]
+        parser.add_argument("--mode", choices=["replay", "stub"], default="replay")
+        parser.add_argument("--cassettes", default=outbound.CASSETTES)
+        parser.add_argument("--latency", default="", help="JSON or path: {host: [latency_ms, jitter_ms]} (default: none)")
+        parser.add_argument("--clients", default="", help="comma-separated client counts (default 1, 2, 4 … cores)")
+        parser.add_argument("--rounds", type=int, default=2, help="times each category's search runs per level")
+        parser.add_argument("--categories", default=",".join(DEFAULT_QUERIES))
+        parser.add_argument("--interpreter", action="append", default=[], help="also run under this python (repeatable)")
+        parser.add_argument("--json", action="store_true", help="print one JSON result instead of a table")
+
+    def handle(self, *args, **opts):  # type: ignore[no-untyped-def]
+        latency = opts["latency"]
+        if not latency and opts["mode"] == "stub":
+            latency = json.dumps({host: [0, 0] for host in DEFAULT_LATENCY})   # the stub's own per-host defaults too
+        # Host rate limits would measure the token buckets, not the cores
+        os.environ.setdefault("FIRECAT_RATE_LIMITS", json.dumps({host: [1e6, 1e6] for host in DEFAULT_LIMITS}))
+        outbound.configure(opts["mode"], opts["cassettes"], latency)
+        searches = [
+            (DEFAULT_QUERIES[cat], [g for g in HACKING_GROUPS if g["category"] == cat])
+            for cat in (c.strip() for c in opts["categories"].split(","))
+            if cat in DEFAULT_QUERIES
+        ]
+        if not searches:
+            raise CommandError("No known categories in --categories")
+
+        result = {
+            "python":        sys.version.split()[0],
+            "free_threaded": concurrency.free_threaded_build(),
+            "gil":           concurrency.gil_enabled(),
+            "levels":        [_level(n, searches, max(1, opts["rounds"])) for n in _levels(opts["clients"])],
+        }
+        if opts["json"]:
+            self.stdout.write(json.dumps(result))
+            return
+        _table(self.stdout.write, result)
+
+        passthrough = [
+            "--mode", opts["mode"], "--cassettes", opts["cassettes"], "--latency", opts["latency"],
+            "--clients", opts["clients"], "--rounds", str(opts["rounds"]), "--categories", opts["categories"],
+        ]
+        for python in opts["interpreter"]:
+            self.stdout.write("")
+            run = subprocess.run(
+                [python, "manage.py", "bench_scaling", "--json", *passthrough],
+                cwd=settings.BASE_DIR, capture_output=True, text=True,
+            )
+            if run.returncode != 0:
+                self.stderr.write(f"{python}: exited {run.returncode}\n{run.stderr.strip()}")
+                continue
+            _table(self.stdout.write, json.loads(run.stdout.strip().splitlines()[-1]))
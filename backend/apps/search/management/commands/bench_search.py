@@ -0,0 +1,107 @@
+"""
+bench_search — drive full searches through the real search path.
+
+Each run is one SSE search as SearchProxyView serves it: admission, group
+priority and shedding, the shared group pool, hedged engine rounds and the
+group cache writes. Time to first group is when its first group event
+comes off the stream.
+
+    # capture live traffic once
+    python manage.py bench_search --mode record --cassettes /tmp/firecat-cassettes
+    # replay it deterministically, with simulated engine latency
+    python manage.py bench_search --mode replay --cassettes /tmp/firecat-cassettes \
+        --latency '{"default": [250, 100], "www.bing.com": [900, 400]}' --runs 5
+"""
+from __future__ import annotations
+
+import json
+import time
+from typing import Any
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+
+from apps.search import deadline, outbound
+from apps.search.views import HACKING_GROUPS, SearchProxyView
+
+from ._sampling import ResourceSampler, percentile
+
+
+DEFAULT_QUERIES = {
+    "person":   "Ada Lovelace",
+    "username": "torvalds",
+    "email":    "info@example.com",
+    "phone":    "+14155552671",
+    "domain":   "example.com",
+}
+
+
+def run_search(q: str, groups: list[dict[str, Any]], budget: float = deadline.DEFAULT_BUDGET_MS / 1000) -> dict[str, float]:
+    """One search through SearchProxyView's event stream — returns its timings."""
+    start      = time.perf_counter()
+    cpu_start  = time.process_time()
+    first      = None
+    found      = 0
+    with ResourceSampler() as sampler:
+        response = SearchProxyView()._stream(q, groups, time.monotonic() + budget, session="bench")
+        if response.streaming:   # else a 429: the admission queue was full
+            try:
+                for chunk in response.streaming_content:
+                    for line in bytes(chunk).decode().splitlines():
+                        if not line.startswith("data: "):
+                            continue
+                        event = json.loads(line[6:])
+                        if event.get("type") == "group":
+                            found += 1
+                            if first is None:
+                                first = time.perf_counter() - start
+            finally:
+                response.close()
+    return {
+        "latency": time.perf_counter() - start,
+        "ttfg":    first if first is not None else float("nan"),
+        "threads": sampler.peak,
+        "cpu":     time.process_time() - cpu_start,
+        "groups":  found,
+    }
+
+
+class Command(BaseCommand):
+    help = "Benchmark full searches per category (p50/p95 latency, time-to-first-group, threads, CPU)."
+
+    def add_arguments(self, parser):  # type: ignore[no-untyped-def]
+        parser.add_argument("--mode", choices=["live", "record", "replay"], default="replay")
+        parser.add_argument("--cassettes", default=outbound.CASSETTES)
+        parser.add_argument("--latency", default="", help="JSON or path: {host: [latency_ms, jitter_ms]}")
+        parser.add_argument("--runs", type=int, default=3)
+        parser.add_argument("--budget-ms", type=float, default=deadline.DEFAULT_BUDGET_MS, help="budget of each search")
+        parser.add_argument("--categories", default=",".join(DEFAULT_QUERIES))
+        parser.add_argument("--query", action="append", default=[], help="category=query override")
+
+    def handle(self, *args, **opts):  # type: ignore[no-untyped-def]
+        outbound.configure(opts["mode"], opts["cassettes"], opts["latency"])
+        queries = dict(DEFAULT_QUERIES)
+        for override in opts["query"]:
+            cat, _, q = override.partition("=")
+            queries[cat.strip()] = q.strip()
+
+        runs = 1 if opts["mode"] == "record" else opts["runs"]
+        self.stdout.write(f"mode={opts['mode']} cassettes={opts['cassettes']} runs={runs}")
+        self.stdout.write(f"{'category':<10} {'groups':>6} {'p50 s':>8} {'p95 s':>8} {'ttfg p50':>9} {'threads':>8} {'cpu s':>7}")
+
+        for cat in [c.strip() for c in opts["categories"].split(",") if c.strip()]:
+            groups = [g for g in HACKING_GROUPS if g["category"] == cat]
+            if not groups or cat not in queries:
+                continue
+            samples = []
+            for _ in range(runs):
+                cache.clear()  # every run is a cold search
+                samples.append(run_search(queries[cat], groups, deadline.parse_budget(str(opts["budget_ms"]))))
+            lat  = [s["latency"] for s in samples]
+            ttfg = [s["ttfg"] for s in samples if s["ttfg"] == s["ttfg"]]
+            self.stdout.write(
+                f"{cat:<10} {int(samples[-1]['groups']):>3}/{len(groups):<2} "
+                f"{percentile(lat, 50):>8.2f} {percentile(lat, 95):>8.2f} "
+                f"{percentile(ttfg, 50):>9.2f} {max(s['threads'] for s in samples):>8.0f} "
+                f"{sum(s['cpu'] for s in samples) / len(samples):>7.2f}"
+            )
@@ -0,0 +1,89 @@
+"""
+bench_sse — bytes on the wire against latency per event for SSE compression.
+
+Encodes the events of a full search stream (every group, --items results
+each) the way compression.py sends them — one compressor per stream,
+flushed after each event — at several levels, next to sending them plain,
+compressing each event on its own (no shared window) and gzipping the
+whole body at once (what a buffering middleware would reach, too late to
+stream). Per event: the time spent compressing, and that plus the time its
+bytes take on a --link-kbps link, the delay a slow client actually sees.
+
+    python manage.py bench_sse
+    python manage.py bench_sse --items 25 --link-kbps 512
+"""
+from __future__ import annotations
+
+import statistics
+import time
+import zlib
+from typing import Any, Callable
+
+from django.core.management.base import BaseCommand
+
+from apps.search import compression
+from apps.search.views import _sse
+
+from .bench_json import _search_body
+
+
+def _stream(events: list[bytes], make: Callable[[], Any] | None) -> tuple[int, list[float], list[int]]:
+    """Total bytes, per-event compress seconds and per-event sizes for one stream."""
+    coder = make() if make is not None else None
+    times, sizes = [], []
+    for e in events:
+        t0  = time.perf_counter()
+        out = coder.chunk(e) if coder is not None else e
+        times.append(time.perf_counter() - t0)
+        sizes.append(len(out))
+    tail = len(coder.finish()) if coder is not None else 0
+    return sum(sizes) + tail, times, sizes
+
+
+def _isolated(events: list[bytes], encoding: str, level: int) -> tuple[int, list[float], list[int]]:
+    """Each event through a fresh compressor — what sharing the window saves."""
+    times, sizes = [], []
+    for e in events:
+        t0  = time.perf_counter()
+        c   = compression.compressor(encoding, level)
+        out = c.chunk(e) + c.finish()
+        times.append(time.perf_counter() - t0)
+        sizes.append(len(out))
+    return sum(sizes), times, sizes
+
+
+class Command(BaseCommand):
+    help = "Compare SSE compression settings: bytes on the wire vs per-event latency."
+
+    def add_arguments(self, parser):  # type: ignore[no-untyped-def]
+        parser.add_argument("--items", type=int, default=25, help="results per group")
+        parser.add_argument("--link-kbps", type=float, default=1000.0, help="client link speed for the latency column")
+
+    def handle(self, *args, **opts):  # type: ignore[no-untyped-def]
+        body   = _search_body(opts["items"])
+        events = [_sse({"type": "group", "group": g}).encode() for g in body["groups"]]
+        events.append(_sse({"type": "done", "cached": False, "total": len(body["groups"]) * opts["items"]}).encode())
+        plain  = sum(map(len, events))
+        bps    = opts["link_kbps"] * 1000 / 8
+
+        runs: list[tuple[str, tuple[int, list[float], list[int]]]] = [("identity", _stream(events, None))]
+        levels = {"deflate": (1, 6, 9), "gzip": (1, 6, 9)}
+        if compression.brotli is not None:
+            levels["br"] = (1, 5, 9, 11)
+        for enc, lv in levels.items():
+            for level in lv:
+                runs.append((f"{enc}-{level} shared", _stream(events, lambda e=enc, n=level: compression.compressor(e, n))))
+        runs.append(("gzip-6 per event", _isolated(events, "gzip", 6)))
+
+        self.stdout.write(f"{len(events)} events, {plain / 1024:.0f} KiB plain; link {opts['link_kbps']:.0f} kbit/s")
+        self.stdout.write(f"{'mode':<20} {'KiB':>7} {'ratio':>6} {'cpu us/ev':>10} {'p95 us':>8} {'ev ms @link':>12}")
+        for name, (total, times, sizes) in runs:
+            cpu = [t * 1e6 for t in times]
+            lat = statistics.mean(t + s / bps for t, s in zip(times, sizes)) * 1000
+            p95 = sorted(cpu)[int(len(cpu) * 0.95) - 1]
+            self.stdout.write(
+                f"{name:<20} {total / 1024:>7.1f} {plain / total:>5.1f}x {statistics.mean(cpu):>10.0f} {p95:>8.0f} {lat:>12.1f}"
+            )
+        whole = len(zlib.compress(b"".join(events), 6))
+        self.stdout.write(f"{'gzip-6 whole body':<20} {whole / 1024:>7.1f} {plain / whole:>5.1f}x {'(buffered — no streaming)':>33}")
+        self.stdout.write(f"offered here: {', '.join(compression.OFFERED) or 'nothing'}")
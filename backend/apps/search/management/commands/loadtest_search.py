@@ -0,0 +1,183 @@
+"""
+loadtest_search — N concurrent SSE clients against /api/search/.
+
+Runs the real Django app in-process on a threaded WSGI server with all
+outbound traffic answered by the stub upstream, then reports sustained
+searches per minute, event latency distributions and peak threads, FDs
+and memory of the process.
+
+    python manage.py loadtest_search --clients 20 --duration 60 \
+        --mix person=3,username=1,email=1,domain=1 --cache-hit-ratio 0.3
+"""
+from __future__ import annotations
+
+import itertools
+import json
+import random
+import threading
+import time
+from collections import defaultdict
+from typing import Any
+
+import httpx
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler, get_internal_wsgi_application
+
+from apps.search import outbound
+
+from ._sampling import ResourceSampler, percentile
+
+
+BASE_QUERIES = {
+    "person":   "Ada Lovelace",
+    "username": "adalovelace",
+    "email":    "ada@example.com",
+    "phone":    "+1415555",
+    "domain":   "example.com",
+}
+
+
+class _QuietHandler(WSGIRequestHandler):
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        pass
+
+
+def _parse_mix(spec: str) -> dict[str, float]:
+    mix: dict[str, float] = {}
+    for part in spec.split(","):
+        cat, _, weight = part.partition("=")
+        cat = cat.strip()
+        if cat:
+            if cat not in BASE_QUERIES:
+                raise CommandError(f"Unknown category in --mix: {cat}")
+            mix[cat] = float(weight or 1)
+    return mix
+
+
+class _QueryPool:
+    """Hands out fresh queries, or already-completed ones at the cache-hit ratio."""
+
+    def __init__(self, hit_ratio: float, seed: int) -> None:
+        self.hit_ratio = hit_ratio
+        self.rng       = random.Random(seed)
+        self.counter   = itertools.count(1)
+        self.warm: dict[str, list[str]] = defaultdict(list)
+        self.lock      = threading.Lock()
+
+    def pick(self, cat: str) -> tuple[str, bool]:
+        with self.lock:
+            if self.warm[cat] and self.rng.random() < self.hit_ratio:
+                return self.rng.choice(self.warm[cat]), True
+            n = next(self.counter)
+        base = BASE_QUERIES[cat]
+        if cat == "phone":
+            return f"{base}{n:04d}", False
+        if cat == "email":
+            user, domain = base.split("@")
+            return f"{user}{n}@{domain}", False
+        if cat == "domain":
+            return f"site{n}.{base}", False
+        return f"{base}{n}" if cat == "username" else f"{base} {n}", False
+
+    def done(self, cat: str, q: str) -> None:
+        with self.lock:
+            if q not in self.warm[cat]:
+                self.warm[cat].append(q)
+
+
+class Command(BaseCommand):
+    help = "Load-test the SSE search endpoint with concurrent clients against a stub upstream."
+
+    def add_arguments(self, parser):  # type: ignore[no-untyped-def]
+        parser.add_argument("--clients", type=int, default=10)
+        parser.add_argument("--duration", type=float, default=60.0, help="seconds")
+        parser.add_argument("--mix", default="person=1,username=1,email=1,phone=1,domain=1")
+        parser.add_argument("--cache-hit-ratio", type=float, default=0.0)
+        parser.add_argument("--latency", default="", help="stub latency JSON or path: {host: [ms, jitter_ms]}")
+        parser.add_argument("--url", default="", help="target an already running server (it must run with FIRECAT_HTTP_MODE=stub)")
+        parser.add_argument("--seed", type=int, default=1)
+
+    def handle(self, *args, **opts):  # type: ignore[no-untyped-def]
+        mix   = _parse_mix(opts["mix"])
+        pool  = _QueryPool(opts["cache_hit_ratio"], opts["seed"])
+        httpd = None
+        base  = opts["url"].rstrip("/")
+        if not base:
+            outbound.configure("stub", latency=opts["latency"])
+            cache.clear()
+            httpd = ThreadedWSGIServer(("127.0.0.1", 0), _QuietHandler, allow_reuse_address=True)
+            httpd.daemon_threads = True
+            httpd.set_app(get_internal_wsgi_application())
+            threading.Thread(target=httpd.serve_forever, daemon=True).start()
+            base = f"http://127.0.0.1:{httpd.server_address[1]}"
+
+        events:   dict[str, list[float]] = defaultdict(list)
+        searches: list[tuple[str, bool, float]] = []
+        errors    = [0]
+        lock      = threading.Lock()
+        end       = time.perf_counter() + opts["duration"]
+        cats, weights = list(mix), list(mix.values())
+
+        def client(seed: int) -> None:
+            rng = random.Random(seed)
+            with httpx.Client(timeout=None) as c:
+                while time.perf_counter() < end:
+                    cat = rng.choices(cats, weights)[0]
+                    q, warm = pool.pick(cat)
+                    t0, first, ok = time.perf_counter(), None, False
+                    try:
+                        with c.stream("GET", f"{base}/api/search/", params={"q": q, "categories": cat},
+                                      headers={"Accept": "text/event-stream"}) as r:
+                            for line in r.iter_lines():
+                                if not line.startswith("data: "):
+                                    continue
+                                kind = json.loads(line[6:]).get("type", "")
+                                at   = time.perf_counter() - t0
+                                with lock:
+                                    events[kind].append(at)
+                                    if first is None:
+                                        first = at
+                                        events["first"].append(at)
+                                ok = ok or kind == "done"
+                    except Exception:
+                        pass
+                    with lock:
+                        if ok:
+                            searches.append((cat, warm, time.perf_counter() - t0))
+                        else:
+                            errors[0] += 1
+                    if ok:
+                        pool.done(cat, q)
+
+        self.stdout.write(f"{opts['clients']} clients × {opts['duration']:.0f}s against {base} — mix {mix}, hit ratio {opts['cache_hit_ratio']}")
+        threads_before = threading.active_count()
+        started = time.perf_counter()
+        with ResourceSampler(interval=0.05, fds=True) as sampler:
+            workers = [threading.Thread(target=client, args=(opts["seed"] + i,), daemon=True) for i in range(opts["clients"])]
+            for w in workers:
+                w.start()
+            for w in workers:
+                w.join()
+        elapsed = time.perf_counter() - started
+        if httpd:
+            httpd.shutdown()
+
+        self.stdout.write(f"searches completed : {len(searches)}  (errors/incomplete: {errors[0]})")
+        self.stdout.write(f"sustained          : {len(searches) / elapsed * 60:.1f} searches/min")
+        for label, values in (
+            ("search (cold)", [s for _, warm, s in searches if not warm]),
+            ("search (warm)", [s for _, warm, s in searches if warm]),
+            ("first event",   events["first"]),
+            ("group events",  events["group"]),
+            ("done event",    events["done"]),
+        ):
+            if values:
+                self.stdout.write(
+                    f"{label:<18} : n={len(values):<5} p50={percentile(values, 50):.2f}s "
+                    f"p95={percentile(values, 95):.2f}s p99={percentile(values, 99):.2f}s max={max(values):.2f}s"
+                )
+        # Client threads live in this process too — report the server-side share separately
+        self.stdout.write(f"peak threads       : {sampler.peak} (≈{sampler.peak - threads_before - opts['clients']} server-side)")
+        self.stdout.write(f"peak open FDs      : {sampler.peak_fds}")
+        self.stdout.write(f"peak RSS           : {sampler.peak_rss:.1f} MB")
@@ -0,0 +1,42 @@
+"""
+search_worker — Run search group tasks from the job queue.
+
+Pulls group tasks enqueued by the web processes (SEARCH_QUEUE_URL) and
+stores each result under its job id for whoever waits on it. Parsing is
+GIL-bound, so run one worker per core — on any node that can reach the
+queue and the shared cache:
+
+    SEARCH_QUEUE_URL=redis://queue:6379/1 CACHE_URL=redis://queue:6379/0 \\
+        python manage.py search_worker --threads 16
+"""
+from __future__ import annotations
+
+import signal
+import threading
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.search import jobqueue
+
+
+class Command(BaseCommand):
+    help = "Execute search group tasks from SEARCH_QUEUE_URL until interrupted."
+
+    def add_arguments(self, parser):  # type: ignore[no-untyped-def]
+        parser.add_argument("--threads", type=int, default=16, help="group tasks run at once (mostly waiting on engines)")
+        parser.add_argument("--queue", default="", help="queue URL, overriding SEARCH_QUEUE_URL")
+
+    def handle(self, *args, **opts):  # type: ignore[no-untyped-def]
+        url = opts["queue"] or jobqueue.QUEUE_URL
+        if not url:
+            raise CommandError("No job queue configured — set SEARCH_QUEUE_URL or pass --queue")
+        if url.startswith("local://"):
+            raise CommandError("local:// queues live inside the web process — use redis:// or sqlite:// for workers")
+
+        stop = threading.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, lambda *_: stop.set())
+
+        self.stdout.write(f"search_worker: {opts['threads']} threads on {url}")
+        jobqueue.serve(jobqueue.backend(url), opts["threads"], stop)
+        self.stdout.write("search_worker: stopped")
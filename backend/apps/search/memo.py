@@ -0,0 +1,82 @@
+"""
+memo.py — Cached, single-flight computations shared across requests
+Engine rounds and enrichment results are keyed by what they depend on, so
+a speculative prefetch, the real search and every group in it share one
+computation: the first caller computes, concurrent callers wait for it,
+later ones read the cache. Results cut short by a deadline or cancellation
+are handed to whoever was waiting but never cached; a computation that
+stopped at its own time limit with work outstanding (cut_short) is cached
+for PARTIAL_TTL only, so the next search soon asks again.
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import contextvars
+import hashlib
+import threading
+import time
+from typing import Any, Callable
+
+from django.core.cache import cache
+
+from apps.search import deadline, metrics, tracing
+
+
+PARTIAL_TTL = 60
+
+_lock     = threading.Lock()
+_inflight: dict[str, concurrent.futures.Future[tuple[Any, bool]]] = {}
+_cut:      contextvars.ContextVar[list[bool] | None] = contextvars.ContextVar("firecat_memo_cut", default=None)
+
+
+def key(namespace: str, *parts: str) -> str:
+    return f"{namespace}_" + hashlib.md5("|".join(parts).encode()).hexdigest()
+
+
+def cut_short() -> None:
+    """Mark the computation running in this context as incomplete."""
+    flag = _cut.get()
+    if flag is not None:
+        flag.append(True)
+
+
+def shared(cache_key: str, compute: Callable[[], Any], ttl: int) -> Any:
+    hit = cache.get(cache_key)
+    if hit is not None:
+        metrics.CACHE.inc(layer="memo", outcome="hit")
+        tracing.record("memo", time.monotonic(), outcome="hit")
+        return hit
+
+    with _lock:
+        flight = _inflight.get(cache_key)
+        owner  = flight is None
+        if owner:
+            flight = _inflight[cache_key] = concurrent.futures.Future()
+    metrics.CACHE.inc(layer="memo", outcome="miss" if owner else "wait")
+
+    if owner:
+        value, complete = None, False
+        cut: list[bool] = []
+        token = _cut.set(cut)
+        try:
+            with tracing.span("memo", outcome="miss"):
+                value = compute()
+            complete = not deadline.expired()
+            if complete:
+                cache.set(cache_key, value, timeout=min(ttl, PARTIAL_TTL) if cut else ttl)
+        finally:
+            _cut.reset(token)
+            with _lock:
+                _inflight.pop(cache_key, None)
+            flight.set_result((value, complete))  # type: ignore[union-attr]
+        return value
+
+    try:
+        with tracing.span("memo", outcome="wait"):
+            value, complete = flight.result(timeout=deadline.clamp(None))  # type: ignore[union-attr]
+    except concurrent.futures.TimeoutError:
+        return None
+    if not complete and not deadline.expired():
+        # The owner was cancelled or ran out of budget before we did — go again
+        return shared(cache_key, compute, ttl)
+    return value
@@ -0,0 +1,425 @@
+"""
+metrics.py — Counters and latency histograms for the search path
+Engines, open APIs, enrichers, the Electron worker, the cache layers,
+upstream hosts, groups and the page proxy record here; /api/metrics serves
+it all in Prometheus text format.
+
+With several processes (ASGI workers, search_worker), set
+SEARCH_METRICS_DIR to a directory they share: each process flushes its
+values to <dir>/<pid>.json every few seconds and a scrape of any one of
+them sums counters and histograms over every file. A scrape that finds
+the file of an exited process takes it over: the counters and histograms
+move into the scraping process's own file and the dead one is deleted, so
+totals never go backwards and the directory holds about one file per live
+process. Gauges of exited processes are dropped.
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Iterator
+
+import httpx
+from django.conf import settings
+
+from apps.search import tracing
+
+
+METRICS_DIR     = getattr(settings, "SEARCH_METRICS_DIR", "")
+FLUSH_EVERY     = 5.0
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Upstream hosts get their own label; anything else (enrichers fetching the
+# target itself) is "other" so the label set stays bounded
+KNOWN_HOSTS = {
+    "www.bing.com", "html.duckduckgo.com", "www.startpage.com", "search.brave.com",
+    "www.mojeek.com", "search.yahoo.com", "api.github.com", "www.reddit.com",
+    "crt.sh", "web.archive.org", "api.hackertarget.com", "urlscan.io", "127.0.0.1",
+}
+
+
+# ---------------------------------------------------------------------------
+# Metric families
+# ---------------------------------------------------------------------------
+
+class _Family:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...]) -> None:  # noqa: A002
+        self.name   = name
+        self.help   = help
+        self.labels = labels
+        self.values: dict[tuple[str, ...], Any] = {}
+        self._lock  = threading.Lock()
+
+    def _key(self, labels: dict[str, Any]) -> tuple[str, ...]:
+        return tuple(str(labels.get(n, "")) for n in self.labels)
+
+    def samples(self) -> list[list[Any]]:
+        with self._lock:
+            return [[list(k), v if not isinstance(v, list) else list(v)] for k, v in self.values.items()]
+
+
+class Counter(_Family):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + amount
+        _touch()
+
+
+class Histogram(_Family):
+    """values: label key → [count per bucket (cumulative at render time)..., sum, count]"""
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...], buckets: tuple[float, ...] = LATENCY_BUCKETS) -> None:  # noqa: A002
+        super().__init__(name, help, labels)
+        self.buckets = buckets
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            row = self.values.get(key)
+            if row is None:
+                row = self.values[key] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    row[i] += 1
+                    break
+            row[-2] += value
+            row[-1] += 1
+        _touch()
+
+
+class Gauge(_Family):
+    """Read at collection time from `read()` — per process, summed over live ones."""
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...], read: Callable[[], dict[tuple[str, ...], float]]) -> None:  # noqa: A002
+        super().__init__(name, help, labels)
+        self.read = read
+
+    def samples(self) -> list[list[Any]]:
+        try:
+            return [[list(k), v] for k, v in self.read().items()]
+        except Exception:
+            return []
+
+
+_registry: dict[str, _Family] = {}
+
+
+def counter(name: str, help: str, labels: tuple[str, ...] = ()) -> Counter:  # noqa: A002
+    return _registry.setdefault(name, Counter(name, help, labels))  # type: ignore[return-value]
+
+
+def histogram(name: str, help: str, labels: tuple[str, ...] = ()) -> Histogram:  # noqa: A002
+    return _registry.setdefault(name, Histogram(name, help, labels))  # type: ignore[return-value]
+
+
+def gauge(name: str, help: str, labels: tuple[str, ...], read: Callable[[], dict[tuple[str, ...], float]]) -> Gauge:  # noqa: A002
+    return _registry.setdefault(name, Gauge(name, help, labels, read))  # type: ignore[return-value]
+
+
+# ---------------------------------------------------------------------------
+# The search-path metrics
+# ---------------------------------------------------------------------------
+
+SOURCE_REQUESTS  = counter("firecat_source_requests_total", "Calls to result sources by outcome (ok, empty, error, busy).", ("kind", "source", "outcome"))
+SOURCE_LATENCY   = histogram("firecat_source_latency_seconds", "Result source call latency.", ("kind", "source"))
+SOURCE_RESULTS   = counter("firecat_source_results_total", "Raw results returned by each source.", ("kind", "source"))
+UPSTREAM         = counter("firecat_upstream_responses_total", "Outbound HTTP responses by host and status (403/429 are blocks).", ("host", "status"))
+UPSTREAM_LATENCY = histogram("firecat_upstream_latency_seconds", "Outbound HTTP latency by host.", ("host",))
+CACHE            = counter("firecat_cache_lookups_total", "Cache lookups by layer and outcome.", ("layer", "outcome"))
+GROUP_RUNS       = counter("firecat_group_runs_total", "Group runs by outcome (ok, empty, late).", ("group", "category", "outcome"))
+GROUP_LATENCY    = histogram("firecat_group_latency_seconds", "Group run latency.", ("group", "category"))
+GROUP_RESULTS    = counter("firecat_group_results_total", "Results returned by each group.", ("group", "category"))
+SEARCHES         = counter("firecat_searches_total", "Search requests by mode and outcome.", ("mode", "outcome"))
+PROXY_REQUESTS   = counter("firecat_proxy_requests_total", "Page proxy requests by outcome.", ("outcome",))
+PROXY_LATENCY    = histogram("firecat_proxy_latency_seconds", "Page proxy latency.", ())
+THREADS          = gauge("firecat_threads", "Live threads per process, summed over processes.", (), lambda: {(): threading.active_count()})
+
+
+@contextmanager
+def source(kind: str, name: str) -> Iterator[dict[str, Any]]:
+    """
+    Time one call to a result source. Set `results` on the yielded dict
+    to the number of items it produced; an exception counts as an error.
+    The call is also a span of the current search trace.
+    """
+    call: dict[str, Any] = {"results": 0}
+    t0 = time.monotonic()
+    try:
+        with tracing.span(kind, source=name) as span:
+            try:
+                yield call
+            finally:
+                span.update(call)
+    except BaseException:
+        call["outcome"] = "error"
+        raise
+    finally:
+        n = call["results"]
+        SOURCE_LATENCY.observe(time.monotonic() - t0, kind=kind, source=name)
+        SOURCE_REQUESTS.inc(kind=kind, source=name, outcome=call.get("outcome") or ("ok" if n else "empty"))
+        if n:
+            SOURCE_RESULTS.inc(n, kind=kind, source=name)
+
+
+def sourced(kind: str, name: str) -> Callable[[Callable[..., list[Any]]], Callable[..., list[Any]]]:
+    """Decorator form of source() for functions returning a result list."""
+    def decorate(fn: Callable[..., list[Any]]) -> Callable[..., list[Any]]:
+        @wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> list[Any]:
+            with source(kind, name) as call:
+                items = fn(*args, **kwargs)
+                call["results"] = len(items or [])
+                return items
+        return wrapper
+    return decorate
+
+
+class MetricsTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """Counts every outbound response by host and status, and times it."""
+
+    def __init__(self, inner: Any) -> None:
+        self.inner = inner
+
+    @contextmanager
+    def _timed(self, request: httpx.Request) -> Iterator[Callable[[httpx.Response], None]]:
+        """Yields the function to call with the response once there is one."""
+        host   = request.url.host if request.url.host in KNOWN_HOSTS else "other"
+        t0     = time.monotonic()
+        status = "error"
+        with tracing.span("http", host=request.url.host) as span:
+            def seen(r: httpx.Response) -> None:
+                nonlocal status
+                code   = r.status_code
+                status = str(code) if code in (403, 429) else f"{code // 100}xx"
+                span["status"] = code
+            try:
+                yield seen
+            except httpx.TimeoutException:
+                status = "timeout"
+                raise
+            finally:
+                UPSTREAM_LATENCY.observe(time.monotonic() - t0, host=host)
+                UPSTREAM.inc(host=host, status=status)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        with self._timed(request) as seen:
+            r = self.inner.handle_request(request)
+            seen(r)
+            return r
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        with self._timed(request) as seen:
+            r = await self.inner.handle_async_request(request)
+            seen(r)
+            return r
+
+    def close(self) -> None:
+        self.inner.close()
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+
+
+# ---------------------------------------------------------------------------
+# Multi-process aggregation
+# ---------------------------------------------------------------------------
+
+_flusher: threading.Thread | None = None
+_flusher_lock = threading.Lock()
+
+
+def _touch() -> None:
+    """Start the background flush once this process records anything."""
+    global _flusher
+    if not METRICS_DIR or _flusher is not None:
+        return
+    with _flusher_lock:
+        if _flusher is None:
+            _flusher = threading.Thread(target=_flush_forever, daemon=True, name="metrics-flush")
+            _flusher.start()
+
+
+# Counters and histograms taken over from exited processes, flushed with our own
+_adopted:   dict[str, dict[str, Any]] = {}
+_adopt_lock = threading.Lock()
+_flushed    = False
+
+
+def _merge(out: dict[tuple[str, ...], Any], samples: list[list[Any]]) -> None:
+    for labels, value in samples:
+        key = tuple(labels)
+        if isinstance(value, list):
+            prev     = out.get(key) or [0] * len(value)
+            out[key] = [a + b for a, b in zip(prev, value)]
+        else:
+            out[key] = out.get(key, 0) + value
+
+
+def _adopt(snap: dict[str, Any]) -> None:
+    with _adopt_lock:
+        for fams in (snap.get("families", {}), snap.get("adopted", {})):
+            for name, fam in fams.items():
+                if fam["kind"] != "gauge":
+                    out = _adopted.setdefault(name, {**fam, "samples": {}})
+                    _merge(out["samples"], fam["samples"])
+
+
+def _snapshot() -> dict[str, Any]:
+    with _adopt_lock:
+        adopted = {
+            name: {**fam, "samples": [[list(k), v] for k, v in fam["samples"].items()]}
+            for name, fam in _adopted.items()
+        }
+    return {
+        "pid":      os.getpid(),
+        "families": {
+            f.name: {"kind": f.kind, "help": f.help, "labels": list(f.labels),
+                     "buckets": list(getattr(f, "buckets", ())), "samples": f.samples()}
+            for f in _registry.values()
+        },
+        "adopted":  adopted,
+    }
+
+
+def flush() -> None:
+    global _flushed
+    if not METRICS_DIR:
+        return
+    os.makedirs(METRICS_DIR, exist_ok=True)
+    path = os.path.join(METRICS_DIR, f"{os.getpid()}.json")
+    if not _flushed:
+        _flushed = True
+        # A file under our pid is from an exited process the pid was reused from
+        prior = _load(path)
+        if prior:
+            _adopt(prior)
+    tmp  = f"{path}.tmp"
+    with open(tmp, "w") as fh:
+        json.dump(_snapshot(), fh)
+    os.replace(tmp, path)
+
+
+def _flush_forever() -> None:
+    while True:
+        time.sleep(FLUSH_EVERY)
+        try:
+            flush()
+        except OSError:
+            pass
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _load(path: str) -> dict[str, Any] | None:
+    try:
+        with open(path) as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+
+def _retire(path: str) -> bool:
+    """
+    Take over an exited process's file: claim it by renaming (only one
+    scraper wins), carry its totals in our own file, flush, then delete it.
+    False when another process claimed it first.
+    """
+    claimed = f"{path}.{os.getpid()}.retiring"
+    try:
+        os.rename(path, claimed)
+    except OSError:
+        return False
+    snap = _load(claimed)
+    if snap:
+        _adopt(snap)
+    try:
+        flush()
+    finally:
+        os.unlink(claimed)
+    return True
+
+
+def _snapshots() -> list[dict[str, Any]]:
+    if not METRICS_DIR or not os.path.isdir(METRICS_DIR):
+        return [_snapshot()]
+    own   = f"{os.getpid()}.json"
+    snaps = []
+    for name in os.listdir(METRICS_DIR):
+        if not name.endswith(".json") or name == own:
+            continue
+        path = os.path.join(METRICS_DIR, name)
+        snap = _load(path)
+        if snap is None:
+            continue
+        if not _alive(snap["pid"]) and _retire(path):
+            continue   # now part of our own snapshot
+        snaps.append(snap)
+    return [_snapshot()] + snaps   # taken after the takeovers, so it carries them
+
+
+def collect() -> dict[str, dict[str, Any]]:
+    """Every family summed over this process and the others that flushed to METRICS_DIR."""
+    merged: dict[str, dict[str, Any]] = {}
+    for snap in _snapshots():
+        live = snap["pid"] == os.getpid() or _alive(snap["pid"])
+        for name, fam in snap["families"].items():
+            if fam["kind"] == "gauge" and not live:
+                continue
+            _merge(merged.setdefault(name, {**fam, "samples": {}})["samples"], fam["samples"])
+        for name, fam in snap.get("adopted", {}).items():
+            _merge(merged.setdefault(name, {**fam, "samples": {}})["samples"], fam["samples"])
+    return merged
+
+
+def _fmt_labels(names: list[str], values: tuple[str, ...], extra: str = "") -> str:
+    def esc(v: str) -> str:
+        return v.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+    parts = [f'{n}="{esc(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _num(v: float) -> str:
+    return repr(float(v)) if isinstance(v, float) and not v.is_integer() else str(int(v))
+
+
+def render() -> str:
+    """Prometheus text exposition format, version 0.0.4."""
+    lines: list[str] = []
+    for name, fam in sorted(collect().items()):
+        lines.append(f"# HELP {name} {fam['help']}")
+        lines.append(f"# TYPE {name} {fam['kind']}")
+        for key, value in sorted(fam["samples"].items()):
+            if fam["kind"] != "histogram":
+                lines.append(f"{name}{_fmt_labels(fam['labels'], key)} {_num(value)}")
+                continue
+            running = 0
+            for bound, n in zip(fam["buckets"], value):
+                running += n
+                le = _fmt_labels(fam["labels"], key, 'le="%s"' % bound)
+                lines.append(f"{name}_bucket{le} {running}")
+            le = _fmt_labels(fam["labels"], key, 'le="+Inf"')
+            lines.append(f"{name}_bucket{le} {int(value[-1])}")
+            lines.append(f"{name}_sum{_fmt_labels(fam['labels'], key)} {_num(value[-2])}")
+            lines.append(f"{name}_count{_fmt_labels(fam['labels'], key)} {int(value[-1])}")
+    return "\n".join(lines) + "\n"
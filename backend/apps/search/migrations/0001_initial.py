@@ -0,0 +1,39 @@
+# Generated by Django 5.0.4 on 2026-10-19 11:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CertDomain',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('domain', models.CharField(max_length=253, unique=True)),
+                ('refreshed_at', models.DateTimeField(blank=True, null=True)),
+                ('max_cert_id', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='CertName',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=253)),
+                ('issuer', models.CharField(blank=True, max_length=255)),
+                ('logged_at', models.CharField(blank=True, max_length=10)),
+                ('cert_id', models.BigIntegerField(default=0)),
+                ('domain', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='names', to='search.certdomain')),
+            ],
+            options={
+                'ordering': ['-cert_id'],
+                'unique_together': {('domain', 'name')},
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+from __future__ import annotations
+from django.db import models
+
+
+class CertDomain(models.Model):
+    """Per-domain certificate-transparency index header — one row per looked-up domain."""
+    domain:       models.CharField[str, str] = models.CharField(max_length=253, unique=True)
+    refreshed_at: models.DateTimeField       = models.DateTimeField(null=True, blank=True)
+    max_cert_id:  models.BigIntegerField     = models.BigIntegerField(default=0)
+
+    def __str__(self) -> str:
+        return f'{self.domain} ({self.refreshed_at:%Y-%m-%d %H:%M})' if self.refreshed_at else self.domain
+
+
+class CertName(models.Model):
+    domain:    models.ForeignKey             = models.ForeignKey(CertDomain, on_delete=models.CASCADE, related_name='names')
+    name:      models.CharField[str, str]    = models.CharField(max_length=253)
+    issuer:    models.CharField[str, str]    = models.CharField(max_length=255, blank=True)
+    logged_at: models.CharField[str, str]    = models.CharField(max_length=10, blank=True)
+    cert_id:   models.BigIntegerField        = models.BigIntegerField(default=0)
+
+    class Meta:
+        ordering        = ['-cert_id']
+        unique_together = [('domain', 'name')]
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class GroupClick(models.Model):
+    """Result clicks per search group — feeds the learned part of group priority."""
+    group_id:   models.CharField[str, str] = models.CharField(max_length=64, unique=True)
+    clicks:     models.PositiveIntegerField = models.PositiveIntegerField(default=0)
+    updated_at: models.DateTimeField       = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f'{self.group_id}: {self.clicks}'
@@ -4,17 +4,16 @@ Fetches real data: breach status, social accounts, domain MX, reputation.
 All results have osint=True to bypass the relevance filter.
 """
 import re, socket, hashlib
-import httpx
-from typing import Any
+
+from apps.search import outbound
+from apps.search.records import Result
 
 TIMEOUT = 7
 H = {"User-Agent": "Mozilla/5.0", "Accept": "application/json"}
 
 
 def _r(title, link, snippet, source):
-    return {"title": title, "link": link, "snippet": snippet,
-            "source": source, "osint": True,
-            "displayLink": re.sub(r"https?://", "", link).split("/")[0]}
+    return Result(title, link, re.sub(r"https?://", "", link).split("/")[0], snippet, source, osint=True)
 
 def _domain(email):
     p = email.split("@")
@@ -24,7 +23,7 @@ def _domain(email):
 def _emailrep(email):
     results = []
     try:
-        r = httpx.get(f"https://emailrep.io/{email}", timeout=TIMEOUT,
+        r = outbound.get(f"https://emailrep.io/{email}", timeout=TIMEOUT,
                       headers={**H, "Key": "emailrep-free"})
         d = r.json()
         rep      = d.get("reputation", "unknown")
@@ -60,7 +59,7 @@ def _mx_records(email):
     if not domain:
         return results
     try:
-        r = httpx.get(f"https://api.hackertarget.com/dnslookup/?q={domain}", timeout=TIMEOUT)
+        r = outbound.get(f"https://api.hackertarget.com/dnslookup/?q={domain}", timeout=TIMEOUT)
         if r.status_code == 200 and "error" not in r.text.lower():
             lines = r.text.strip().splitlines()
             mx = [l for l in lines if " MX " in l]
@@ -73,7 +72,7 @@ def _mx_records(email):
                     f"https://mxtoolbox.com/SuperTool.aspx?action=mx:{domain}",
                     snippet, "dns"))
         ip = socket.gethostbyname(domain)
-        ri = httpx.get(f"https://ipinfo.io/{ip}/json", timeout=TIMEOUT)
+        ri = outbound.get(f"https://ipinfo.io/{ip}/json", timeout=TIMEOUT)
         d  = ri.json()
         results.append(_r(f"Mail Server IP — {ip} ({d.get('org','?')})",
             f"https://ipinfo.io/{ip}",
@@ -87,7 +86,7 @@ def _mx_records(email):
 def _paste_search(email):
     results = []
     try:
-        r = httpx.get(f"https://psbdmp.ws/api/v3/search/{email}", timeout=TIMEOUT, headers=H)
+        r = outbound.get(f"https://psbdmp.ws/api/v3/search/{email}", timeout=TIMEOUT, headers=H)
         dumps = r.json().get("data", [])
         for d in dumps[:5]:
             results.append(_r(f"Pastebin Dump — {d.get('id','')}",
@@ -109,7 +108,7 @@ def _hunter(email):
     if not domain:
         return []
     try:
-        r = httpx.get(f"https://api.hunter.io/v2/email-verifier?email={email}&api_key=free",
+        r = outbound.get(f"https://api.hunter.io/v2/email-verifier?email={email}&api_key=free",
                       timeout=TIMEOUT, headers=H)
         d = r.json().get("data", {})
         return [_r(f"Hunter.io Verify — {email} [{d.get('status','?')}]",
@@ -145,7 +144,7 @@ def _breach_links(email):
     ]
 
 
-def enrich_email(q: str) -> list[dict[str, Any]]:
+def enrich_email(q: str) -> list[Result]:
     email = q.strip().lower()
     out   = []
     out.extend(_emailrep(email))
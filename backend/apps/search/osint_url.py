@@ -3,17 +3,17 @@ osint_url.py — Active domain/URL intelligence
 Fetches real data: IP, DNS, subdomains, headers, tech, history.
 """
 import re, socket
-import httpx
-from typing import Any
+
+from apps.search import ct_index, outbound
+from apps.search.http_cache import api_client
+from apps.search.records import Result
 
 TIMEOUT = 7
 H = {"User-Agent": "Mozilla/5.0", "Accept": "application/json, text/html"}
 
 
 def _r(title, link, snippet, source):
-    return {"title": title, "link": link, "snippet": snippet,
-            "source": source, "osint": True,
-            "displayLink": re.sub(r"https?://", "", link).split("/")[0]}
+    return Result(title, link, re.sub(r"https?://", "", link).split("/")[0], snippet, source, osint=True)
 
 def _clean(q):
     q = q.strip().lower()
@@ -26,7 +26,7 @@ def _resolve_ip(domain):
     results = []
     try:
         ip = socket.gethostbyname(domain)
-        ri = httpx.get(f"https://ipinfo.io/{ip}/json", timeout=TIMEOUT)
+        ri = outbound.get(f"https://ipinfo.io/{ip}/json", timeout=TIMEOUT)
         d  = ri.json()
         results.append(_r(
             f"IP Address — {domain} → {ip}",
@@ -45,7 +45,7 @@ def _resolve_ip(domain):
 def _dns(domain):
     results = []
     try:
-        r = httpx.get(f"https://api.hackertarget.com/dnslookup/?q={domain}", timeout=TIMEOUT)
+        r = outbound.get(f"https://api.hackertarget.com/dnslookup/?q={domain}", timeout=TIMEOUT)
         if r.status_code == 200 and "error" not in r.text.lower():
             lines = r.text.strip().splitlines()
             by_type = {}
@@ -69,18 +69,10 @@ def _dns(domain):
 def _subdomains(domain):
     results = []
     try:
-        r = httpx.get(f"https://crt.sh/?q=%.{domain}&output=json", timeout=TIMEOUT, headers=H)
-        data = r.json()
-        seen, subs = set(), []
-        for entry in data[:100]:
-            for name in entry.get("name_value", "").split("\n"):
-                name = name.strip().lower()
-                if name and name not in seen and domain in name and not name.startswith("*"):
-                    seen.add(name)
-                    subs.append(name)
+        subs = [c.name for c in ct_index.lookup(domain, limit=100) if c.name != domain]
         if subs:
             results.append(_r(
-                f"Subdomains — {domain} ({len(subs)} found via crt.sh)",
+                f"Subdomains — {domain} ({ct_index.subdomain_count(domain)} found via crt.sh)",
                 f"https://crt.sh/?q=%.{domain}",
                 " · ".join(subs[:25]),
                 "crt.sh"
@@ -93,7 +85,7 @@ def _subdomains(domain):
 def _http_headers(domain):
     results = []
     try:
-        r = httpx.head(f"https://{domain}", timeout=TIMEOUT, follow_redirects=True, headers=H)
+        r = outbound.head(f"https://{domain}", timeout=TIMEOUT, follow_redirects=True, headers=H)
         interesting = {
             "server", "x-powered-by", "x-generator", "cf-ray", "via",
             "x-drupal-cache", "content-security-policy", "strict-transport-security",
@@ -115,7 +107,7 @@ def _http_headers(domain):
 def _urlscan(domain):
     results = []
     try:
-        r = httpx.get(f"https://urlscan.io/api/v1/search/?q=domain:{domain}&size=5",
+        r = api_client.get(f"https://urlscan.io/api/v1/search/?q=domain:{domain}&size=5",
                       timeout=TIMEOUT, headers=H)
         for hit in r.json().get("results", [])[:3]:
             page = hit.get("page", {})
@@ -136,7 +128,7 @@ def _urlscan(domain):
 def _wayback(domain):
     results = []
     try:
-        r = httpx.get(f"https://archive.org/wayback/available?url={domain}", timeout=TIMEOUT)
+        r = api_client.get(f"https://archive.org/wayback/available?url={domain}", timeout=TIMEOUT)
         snap = r.json().get("archived_snapshots", {}).get("closest", {})
         if snap.get("available"):
             ts = snap.get("timestamp", "")
@@ -171,7 +163,7 @@ def _shodan(domain):
     )]
 
 
-def enrich_url(q: str) -> list[dict[str, Any]]:
+def enrich_url(q: str) -> list[Result]:
     domain  = _clean(q)
     out     = []
     out.extend(_resolve_ip(domain))
@@ -1,10 +1,14 @@
 """
 osint_username.py — Active username intelligence
 Fetches real GitHub data, checks platform availability, breach exposure.
+Results are yielded as they arrive — platform hits as each site confirms.
 """
 import re
-import httpx
-from typing import Any
+from typing import Iterator
+
+from apps.search.http_cache import api_client
+from apps.search.records import Result
+from apps.search.username_checker import check_username
 
 TIMEOUT = 6
 H = {"User-Agent": "Mozilla/5.0", "Accept": "application/json"}
@@ -12,9 +16,7 @@ GH = {**H, "Accept": "application/vnd.github.v3+json"}
 
 
 def _r(title, link, snippet, source):
-    return {"title": title, "link": link, "snippet": snippet,
-            "source": source, "osint": True,
-            "displayLink": re.sub(r"https?://", "", link).split("/")[0]}
+    return Result(title, link, re.sub(r"https?://", "", link).split("/")[0], snippet, source, osint=True)
 
 def _clean(q):
     return re.sub(r'^@', '', q.strip())
@@ -23,7 +25,7 @@ def _clean(q):
 def _github(username):
     results = []
     try:
-        r = httpx.get(f"https://api.github.com/users/{username}", timeout=TIMEOUT, headers=GH)
+        r = api_client.get(f"https://api.github.com/users/{username}", timeout=TIMEOUT, headers=GH)
         if r.status_code == 200:
             d = r.json()
             results.append(_r(
@@ -41,7 +43,7 @@ def _github(username):
                 "github"
             ))
             # Repos
-            r2 = httpx.get(f"https://api.github.com/users/{username}/repos?sort=updated&per_page=6",
+            r2 = api_client.get(f"https://api.github.com/users/{username}/repos?sort=updated&per_page=6",
                            timeout=TIMEOUT, headers=GH)
             if r2.status_code == 200:
                 for repo in r2.json()[:6]:
@@ -63,7 +65,7 @@ def _github(username):
 def _reddit(username):
     results = []
     try:
-        r = httpx.get(f"https://www.reddit.com/user/{username}/about.json",
+        r = api_client.get(f"https://www.reddit.com/user/{username}/about.json",
                       timeout=TIMEOUT, headers={**H, "Accept": "application/json"})
         if r.status_code == 200:
             d = r.json().get("data", {})
@@ -83,39 +85,11 @@ def _reddit(username):
 
 
 def _check_platforms(username):
-    """Quick HTTP HEAD check on key platforms — 200/301 = exists."""
-    platforms = [
-        ("Twitter/X",   f"https://twitter.com/{username}"),
-        ("Instagram",   f"https://www.instagram.com/{username}/"),
-        ("TikTok",      f"https://www.tiktok.com/@{username}"),
-        ("YouTube",     f"https://www.youtube.com/@{username}"),
-        ("Twitch",      f"https://www.twitch.tv/{username}"),
-        ("Medium",      f"https://medium.com/@{username}"),
-        ("Dev.to",      f"https://dev.to/{username}"),
-        ("GitLab",      f"https://gitlab.com/{username}"),
-        ("Codepen",     f"https://codepen.io/{username}"),
-        ("Behance",     f"https://www.behance.net/{username}"),
-        ("Dribbble",    f"https://dribbble.com/{username}"),
-        ("SoundCloud",  f"https://soundcloud.com/{username}"),
-        ("Patreon",     f"https://www.patreon.com/{username}"),
-        ("Steam",       f"https://steamcommunity.com/id/{username}"),
-    ]
-    results = []
-    for name, url in platforms:
-        try:
-            r = httpx.head(url, timeout=3, follow_redirects=True,
-                           headers={"User-Agent": "Mozilla/5.0"})
-            exists = r.status_code in (200, 301, 302)
-            if exists:
-                results.append(_r(
-                    f"{name} — @{username} [FOUND]",
-                    url,
-                    f"Profile @{username} exists on {name}. Status: {r.status_code}.",
-                    name.lower().replace("/", "_")
-                ))
-        except Exception:
-            pass
-    return results
+    """Concurrent presence check across every site in the definitions file."""
+    try:
+        yield from check_username(username)
+    except Exception:
+        return
 
 
 def _breach_exposure(username):
@@ -135,11 +109,9 @@ def _breach_exposure(username):
     ]
 
 
-def enrich_username(q: str) -> list[dict[str, Any]]:
+def enrich_username(q: str) -> Iterator[Result]:
     username = _clean(q)
-    out = []
-    out.extend(_github(username))
-    out.extend(_reddit(username))
-    out.extend(_check_platforms(username))
-    out.extend(_breach_exposure(username))
-    return out
\ No newline at end of file
+    yield from _github(username)
+    yield from _reddit(username)
+    yield from _check_platforms(username)
+    yield from _breach_exposure(username)
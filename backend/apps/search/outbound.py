@@ -0,0 +1,230 @@
+"""
+outbound.py — Single exit point for outbound HTTP
+Every engine, API, enrichment and Electron worker call goes through the
+pooled clients here, so the transport stack (live, record, replay or the
+load-test stub) can be switched in one place. Call signatures mirror
+httpx.get/post/head/stream. Async callers get the same wrapper stack
+(deadline, rate limit, metrics) through async_client().
+"""
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import contextvars
+import http.cookiejar
+import os
+import ssl
+import threading
+import weakref
+from contextlib import contextmanager
+from typing import Any, Coroutine, Iterator, TypeVar
+
+import httpx
+
+from apps.search.deadline import DeadlineTransport
+from apps.search.metrics import MetricsTransport
+from apps.search.ratelimit import RateLimitTransport
+from apps.search.replay import RECORD, REPLAY, RecordReplayTransport, load_latency
+from apps.search.stub_upstream import StubUpstreamTransport
+
+
+T = TypeVar("T")
+
+# True, False or a long-lived SSLContext (WebProxyView's legacy TLS) — each gets its own pooled client
+Verify = bool | ssl.SSLContext
+
+LIVE, STUB = "live", "stub"
+
+MODE      = os.environ.get("FIRECAT_HTTP_MODE", LIVE)
+CASSETTES = os.environ.get("FIRECAT_CASSETTES", os.path.join(os.path.dirname(__file__), "cassettes"))
+LATENCY   = os.environ.get("FIRECAT_REPLAY_LATENCY", "")
+
+POOL_LIMITS = httpx.Limits(max_connections=200, max_keepalive_connections=40)
+
+_lock:        threading.Lock                        = threading.Lock()
+_transports:  dict[Verify, httpx.BaseTransport]     = {}
+_clients:     dict[Verify, httpx.Client]            = {}
+_replay:      RecordReplayTransport | None          = None
+_stub:        StubUpstreamTransport | None          = None
+_loop:        asyncio.AbstractEventLoop | None      = None
+
+# Async clients and their pools belong to one event loop: one per loop and `verify`
+_async_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[Verify, httpx.AsyncClient]] = weakref.WeakKeyDictionary()
+
+
+def configure(mode: str = LIVE, cassettes: str = "", latency: str = "") -> None:
+    """Switch the transport stack at runtime (benchmarks, load tests)."""
+    global MODE, CASSETTES, LATENCY, _replay, _stub
+    with _lock:
+        MODE      = mode
+        CASSETTES = cassettes or CASSETTES
+        LATENCY   = latency
+        _replay   = None
+        _stub     = None
+        for c in _clients.values():
+            c.close()
+        _clients.clear()
+        _transports.clear()
+        _async_clients.clear()
+
+
+# Built lazily — callers hold _lock so concurrent first calls share one instance
+
+def _replay_transport() -> RecordReplayTransport:
+    global _replay
+    if _replay is None:
+        _replay = RecordReplayTransport(MODE, CASSETTES, latency=load_latency(LATENCY))
+    return _replay
+
+
+def _stub_transport() -> StubUpstreamTransport:
+    global _stub
+    if _stub is None:
+        _stub = StubUpstreamTransport(load_latency(LATENCY))
+    return _stub
+
+
+def transport(verify: Verify = True) -> httpx.BaseTransport:
+    """The base transport for the current mode — wrap it to add behaviour.
+    Engine hosts are rate limited by group priority, timeouts are always
+    capped at the caller's remaining latency budget, and every response is
+    counted by host and status."""
+    with _lock:
+        if verify not in _transports:
+            base: httpx.BaseTransport
+            if MODE == REPLAY:
+                base = _replay_transport()
+            elif MODE == STUB:
+                base = _stub_transport()
+            else:
+                inner = httpx.HTTPTransport(verify=verify, limits=POOL_LIMITS)
+                base  = RecordReplayTransport(RECORD, CASSETTES, inner=inner) if MODE == RECORD else inner
+            _transports[verify] = RateLimitTransport(MetricsTransport(DeadlineTransport(base)))
+        return _transports[verify]
+
+
+def async_transport(verify: Verify = True) -> httpx.AsyncBaseTransport:
+    """The async counterpart of transport(): the same wrappers (and the same
+    rate-limit buckets) over an async base. Pools are bound to the event loop
+    that first uses them — get one through async_client()."""
+    with _lock:
+        base: httpx.AsyncBaseTransport
+        if MODE == REPLAY:
+            base = _replay_transport()
+        elif MODE == STUB:
+            base = _stub_transport()
+        else:
+            inner = httpx.AsyncHTTPTransport(verify=verify, limits=POOL_LIMITS)
+            base  = RecordReplayTransport(RECORD, CASSETTES, async_inner=inner) if MODE == RECORD else inner
+    return RateLimitTransport(MetricsTransport(DeadlineTransport(base)))
+
+
+def simulated_host_available(host: str) -> bool | None:
+    """Whether a local service (the Electron worker) is reachable in replay/stub
+    mode — None when traffic is live and the caller should probe for real."""
+    if MODE == REPLAY:
+        with _lock:
+            replay = _replay_transport()
+        return replay.has_host(host)
+    if MODE == STUB:
+        return True
+    return None
+
+
+def no_cookies() -> http.cookiejar.CookieJar:
+    """A jar that keeps nothing. The shared clients serve every user and every
+    upstream — a Set-Cookie from one must never ride along on another's
+    requests. Callers that need cookies pass them per request."""
+    return http.cookiejar.CookieJar(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+
+
+def client(verify: Verify = True) -> httpx.Client:
+    with _lock:
+        c = _clients.get(verify)
+    if c is None:
+        c = httpx.Client(transport=transport(verify), cookies=no_cookies())
+        with _lock:
+            c = _clients.setdefault(verify, c)
+    return c
+
+
+def _prepare(kwargs: dict[str, Any]) -> dict[str, Any]:
+    # Per-request cookies are deprecated on shared clients — send them as a header
+    cookies = kwargs.pop("cookies", None)
+    if cookies:
+        headers = dict(kwargs.get("headers") or {})
+        headers["Cookie"] = "; ".join(f"{k}={v}" for k, v in cookies.items())
+        kwargs["headers"] = headers
+    return kwargs
+
+
+def request(method: str, url: str, *, verify: Verify = True, **kwargs: Any) -> httpx.Response:
+    return client(verify).request(method, url, **_prepare(kwargs))
+
+
+def get(url: str, **kwargs: Any) -> httpx.Response:
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs: Any) -> httpx.Response:
+    return request("POST", url, **kwargs)
+
+
+def head(url: str, **kwargs: Any) -> httpx.Response:
+    return request("HEAD", url, **kwargs)
+
+
+@contextmanager
+def stream(method: str, url: str, *, verify: Verify = True, **kwargs: Any) -> Iterator[httpx.Response]:
+    with client(verify).stream(method, url, **_prepare(kwargs)) as r:
+        yield r
+
+
+# ---------------------------------------------------------------------------
+# Async — for views served over ASGI and async probes started from threads
+# ---------------------------------------------------------------------------
+
+def async_client(verify: Verify = True) -> httpx.AsyncClient:
+    """The shared async client of the running event loop."""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        c = _async_clients.get(loop, {}).get(verify)
+    if c is None:
+        c = httpx.AsyncClient(transport=async_transport(verify), cookies=no_cookies())
+        with _lock:
+            c = _async_clients.setdefault(loop, {}).setdefault(verify, c)
+    return c
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    with _lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, daemon=True, name="outbound-async").start()
+        return _loop
+
+
+def submit_async(coro: Coroutine[Any, Any, T]) -> concurrent.futures.Future[T]:
+    """
+    Run a coroutine from sync code on one long-lived event loop, so its
+    requests share that loop's client. It runs in the caller's context —
+    deadline, group priority and trace apply as they would on the thread.
+    Cancelling the returned future cancels the coroutine.
+    """
+    ctx = contextvars.copy_context()
+
+    async def run() -> T:
+        for var, value in ctx.items():
+            var.set(value)
+        return await coro
+
+    return asyncio.run_coroutine_threadsafe(run(), _background_loop())
+
+
+async def arequest(method: str, url: str, *, verify: Verify = True, **kwargs: Any) -> httpx.Response:
+    return await async_client(verify).request(method, url, **_prepare(kwargs))
+
+
+async def aget(url: str, **kwargs: Any) -> httpx.Response:
+    return await arequest("GET", url, **kwargs)
@@ -0,0 +1,89 @@
+"""
+parsing.py — Optional process pool for HTML parsing
+Network waits release the GIL; BeautifulSoup does not, so with many groups
+in flight one process is pinned at a core while parsing. With
+SEARCH_PARSE_PROCESSES set, SERP and inspector parsing runs on a pool of
+worker processes instead: callers hand over the raw response bytes and
+get plain rows back (tuples, not dicts — cheaper to pickle). Unset, or if
+the pool breaks, parsing runs inline exactly as before.
+
+    SEARCH_PARSE_PROCESSES=auto   one process per core (none on a free-threaded build)
+    SEARCH_PARSE_PROCESSES=4      fixed size
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import multiprocessing
+import os
+import threading
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, TypeVar
+
+from django.conf import settings
+
+from apps.search import concurrency, deadline, profiling
+
+
+T = TypeVar("T")
+
+
+def _size(raw: Any) -> int:
+    if str(raw).strip().lower() == "auto":
+        # Without the GIL the group threads already parse on every core
+        return (os.cpu_count() or 1) if concurrency.gil_enabled() else 0
+    try:
+        return max(0, int(raw or 0))
+    except ValueError:
+        return 0
+
+
+PROCESSES = _size(getattr(settings, "SEARCH_PARSE_PROCESSES", 0))
+
+_pool: concurrent.futures.ProcessPoolExecutor | None = None
+_lock = threading.Lock()
+
+
+def _init() -> None:
+    # Parsers live in Django modules — make them importable in the child
+    import django
+    django.setup()
+
+
+def _call(fn: Callable[..., T], html: str | bytes, encoding: str | None, args: tuple[Any, ...]) -> T:
+    if isinstance(html, bytes) and encoding is not None:
+        html = html.decode(encoding or "utf-8", errors="replace")
+    return fn(html, *args)
+
+
+def pool() -> concurrent.futures.ProcessPoolExecutor | None:
+    global _pool
+    if not PROCESSES:
+        return None
+    with _lock:
+        if _pool is None:
+            # forkserver: never fork the threaded web process itself
+            ctx   = multiprocessing.get_context("forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn")
+            _pool = concurrent.futures.ProcessPoolExecutor(PROCESSES, mp_context=ctx, initializer=_init)
+        return _pool
+
+
+def run(fn: Callable[..., T], html: str | bytes, *args: Any, encoding: str | None = None) -> T:
+    """
+    fn(html, *args) — on the parse pool when there is one, else inline.
+    `fn` must be a module-level function returning plain, picklable data;
+    `html` may be the raw response bytes, decoded with `encoding` wherever
+    the parse runs — or passed on as bytes without one, for parsers that
+    find the document's encoding themselves.
+    """
+    global _pool
+    ex = pool()
+    if ex is not None:
+        try:
+            return ex.submit(_call, fn, html, encoding, args).result(timeout=deadline.clamp(None))
+        except BrokenProcessPool:
+            with _lock:
+                _pool = None   # a crashed child — start a fresh pool on the next call
+        except concurrent.futures.TimeoutError:
+            raise TimeoutError("latency budget exhausted while parsing") from None
+    with profiling.attached():   # e.g. sync_to_async threads of the proxy and inspector
+        return _call(fn, html, encoding, args)
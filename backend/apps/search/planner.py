@@ -0,0 +1,156 @@
+"""
+planner.py — Global query planner for a multi-group search
+Expands every selected group's operator queries, canonicalises and dedupes
+them across groups, and merges `<base> site:a OR site:b` queries that share
+a base into fewer OR-queries. Each planned query runs once; results are
+routed back to every group query whose site constraints they satisfy.
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Callable
+from urllib.parse import urlparse
+
+from apps.search import deadline
+from apps.search.records import Result
+
+
+TOKEN_RE       = re.compile(r'"[^"]*"|\S+')
+SITE_MERGE_MAX = 6      # sites per merged OR-query — keeps queries inside engine word limits
+
+
+def _tokens(query: str) -> list[str]:
+    return TOKEN_RE.findall(query)
+
+
+def canonicalise(query: str) -> str:
+    """Whitespace-normalised query with OR-ed site lists in sorted order."""
+    parsed = split_sites(query)
+    if parsed:
+        base, sites = parsed
+        return join_sites(base, sorted(set(sites)))
+    return " ".join(_tokens(query))
+
+
+def split_sites(query: str) -> tuple[str, list[str]] | None:
+    """
+    `<base> site:a OR site:b` (sites may lead or trail) → (base, [a, b]).
+    None when the query has anything else mixed in — boolean ORs in the base,
+    exclusions, or site terms that are not one contiguous OR-chain.
+    """
+    toks  = _tokens(query)
+    idx   = [i for i, t in enumerate(toks) if t.startswith("site:")]
+    if not idx:
+        return None
+    chain = toks[idx[0]: idx[-1] + 1]
+    if chain[0::2] != [toks[i] for i in idx] or any(t != "OR" for t in chain[1::2]):
+        return None
+    base = toks[: idx[0]] + toks[idx[-1] + 1:]
+    if not base or "OR" in base or any(t.startswith(("-site:", "site:")) for t in base):
+        return None
+    return " ".join(base), [toks[i][5:] for i in idx]
+
+
+def join_sites(base: str, sites: list[str]) -> str:
+    return base + " " + " OR ".join(f"site:{s}" for s in sites)
+
+
+def site_matches(link: str, site: str) -> bool:
+    host, _, path = site.partition("/")
+    host = host.lstrip("*.").lower()
+    try:
+        u = urlparse(link)
+    except ValueError:
+        return False
+    netloc = u.netloc.lower().split(":")[0]
+    if netloc.startswith("www."):
+        netloc = netloc[4:]
+    if netloc != host and not netloc.endswith("." + host):
+        return False
+    path = path.replace('"', "").strip("/")
+    return not path or u.path.lstrip("/").lower().startswith(path.lower())
+
+
+@dataclass
+class _Route:
+    planned: list[str]                     # upstream queries that serve this group query
+    sites:   list[str] = field(default_factory=list)  # empty = no site constraint
+
+
+class QueryPlan:
+    """
+    Built once per search from every selected group. Group threads call
+    fetch(query) in place of running the engines themselves; the first caller
+    of a planned query runs it, concurrent callers wait for the same result.
+    """
+
+    def __init__(self, group_queries: dict[str, list[str]], runner: Callable[[str], list[Result]]) -> None:
+        self.runner   = runner
+        self.routes:  dict[str, _Route] = {}
+        self.planned: list[str]         = []
+        self._futures: dict[str, concurrent.futures.Future[list[Result]]] = {}
+        self._lock    = threading.Lock()
+        self.requested = sum(len(qs) for qs in group_queries.values())
+        self._build([q for qs in group_queries.values() for q in qs])
+
+    def _build(self, queries: list[str]) -> None:
+        by_base: dict[str, list[str]] = {}
+        plain:   list[str]            = []
+        for query in queries:
+            canon = canonicalise(query)
+            if canon in self.routes or canon in plain:
+                continue
+            parsed = split_sites(canon)
+            if parsed:
+                base, sites = parsed
+                self.routes[canon] = _Route(planned=[], sites=sites)
+                merged = by_base.setdefault(base, [])
+                merged.extend(s for s in sites if s not in merged)
+            else:
+                plain.append(canon)
+                self.routes[canon] = _Route(planned=[canon])
+
+        self.planned.extend(plain)
+        for base, sites in by_base.items():
+            chunks = [sites[i: i + SITE_MERGE_MAX] for i in range(0, len(sites), SITE_MERGE_MAX)]
+            texts  = [join_sites(base, chunk) for chunk in chunks]
+            self.planned.extend(texts)
+            for canon, route in self.routes.items():
+                parsed = split_sites(canon)
+                if not parsed or parsed[0] != base:
+                    continue
+                route.planned = [t for t, chunk in zip(texts, chunks) if set(chunk) & set(route.sites)]
+
+    def _run(self, text: str) -> list[Result]:
+        with self._lock:
+            fut = self._futures.get(text)
+            owner = fut is None
+            if owner:
+                fut = self._futures[text] = concurrent.futures.Future()
+        if owner:
+            try:
+                fut.set_result(self.runner(text))  # type: ignore[union-attr]
+            except Exception:
+                fut.set_result([])  # type: ignore[union-attr]
+        try:
+            return fut.result(timeout=deadline.clamp(None))  # type: ignore[union-attr]
+        except concurrent.futures.TimeoutError:
+            return []  # another group owns it and the budget ran out first
+
+    def fetch(self, query: str) -> list[Result]:
+        canon = canonicalise(query)
+        route = self.routes.get(canon) or _Route(planned=[canon])
+        items: list[Result] = []
+        for text in route.planned:
+            for item in self._run(text):
+                if not route.sites or any(site_matches(item.link, s) for s in route.sites):
+                    items.append(item)
+        return items
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            executed = len(self._futures)
+        return {"requested": self.requested, "planned": len(self.planned), "executed": executed}
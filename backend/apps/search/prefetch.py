@@ -0,0 +1,103 @@
+"""
+prefetch.py — Speculative search-as-you-type warmup
+While the user is still typing, the search box reports the partial query.
+We classify it and warm the cheap, high-yield parts of the real search —
+the bare "q" engine round and the enrichment script for the likely
+category — into the shared memo cache (apps/search/memo.py). One job per
+session: a new query cancels the previous one, and every job runs on a
+short budget at low priority so typing never crowds out real searches.
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from apps.search import classify, deadline, priority, scheduler
+
+
+MIN_LENGTH        = 3
+BUDGET            = 15.0   # seconds — an abandoned prefetch dies on its own
+PRIORITY          = 10     # below every group; waits behind real searches for engine tokens
+MAX_JOBS          = 8      # speculative jobs across all sessions
+ENRICH_CONFIDENCE = 0.8    # only warm enrichment when the category is clear
+
+
+@dataclass
+class _Job:
+    q:      str
+    cancel: threading.Event = field(default_factory=threading.Event)
+    done:   threading.Event = field(default_factory=threading.Event)
+
+
+_lock = threading.Lock()
+_jobs: dict[str, _Job] = {}
+_slots = threading.BoundedSemaphore(MAX_JOBS)
+
+
+def _warm(job: _Job) -> None:
+    from apps.search.views import _cached_round, _enrich
+
+    q       = job.q
+    q_words = [w.lower() for w in q.split() if len(w) >= 2]
+    guesses = classify.classify(q)
+    # Every group's first query is the exact phrase — the planner canonicalises it to this
+    futures = [deadline.submit(scheduler.groups_pool, _cached_round, f'"{q}"', q_words)]
+    if guesses and guesses[0].confidence >= ENRICH_CONFIDENCE:
+        futures.append(deadline.submit(scheduler.groups_pool, _enrich, guesses[0].category, q))
+    pending = set(futures)
+    try:
+        while pending and not deadline.expired():
+            _, pending = concurrent.futures.wait(pending, timeout=0.25)
+    finally:
+        # In-flight calls finish on their own; anything new fails fast once cancelled
+        scheduler.cancel_pending(futures)
+
+
+def _run(session: str, job: _Job) -> None:
+    try:
+        with deadline.cancel_on(job.cancel), priority.running(PRIORITY):
+            deadline.within(time.monotonic() + BUDGET, _warm, job)
+    except Exception:
+        pass
+    finally:
+        job.done.set()
+        _slots.release()
+        with _lock:
+            if _jobs.get(session) is job:
+                del _jobs[session]
+
+
+def start(session: str, q: str) -> bool:
+    """
+    Start warming `q` for a session, cancelling its previous job. Returns
+    False when nothing was started (too short, unchanged or no free slot).
+    """
+    q = q.strip()
+    with _lock:
+        current = _jobs.get(session)
+        if current is not None and current.q == q and not current.done.is_set():
+            return False
+        if current is not None:
+            current.cancel.set()
+    if len(q) < MIN_LENGTH or not _slots.acquire(blocking=False):
+        return False
+    job = _Job(q)
+    with _lock:
+        _jobs[session] = job
+    threading.Thread(target=_run, args=(session, job), daemon=True).start()
+    return True
+
+
+def cancel(session: str) -> None:
+    with _lock:
+        job = _jobs.get(session)
+    if job is not None:
+        job.cancel.set()
+
+
+def active() -> dict[str, Any]:
+    with _lock:
+        return {"jobs": len(_jobs), "queries": sorted(j.q for j in _jobs.values())}
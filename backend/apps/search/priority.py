@@ -0,0 +1,164 @@
+"""
+priority.py — Group priorities for scheduling
+Each group gets a priority (higher runs first): a base value, an optional
+override from settings.SEARCH_GROUP_PRIORITIES, and a bonus learned from
+result clicks. The running group's priority lives in a context variable so
+the outbound rate limiter can give high-value groups first claim on tokens;
+under load, low-priority groups are shed instead of queued.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import F
+
+
+DEFAULT_PRIORITY = 50
+LEARN_WEIGHT     = 25       # most-clicked group in a category gets this bonus
+LEARN_REFRESH    = 60       # seconds between click-table reads
+SHED_LOAD        = int(getattr(settings, "SEARCH_SHED_LOAD", 96))   # groups in flight, all searches
+SHED_BELOW       = int(getattr(settings, "SEARCH_SHED_BELOW", 45))  # only groups under this are shed
+
+# The groups analysts open first — broad exact matches and the main profiles
+BASE_PRIORITY: dict[str, int] = {
+    "person_web":       90, "person_linkedin":  80, "person_social":    75,
+    "person_twitter":   65, "person_facebook":  65, "person_instagram": 65,
+    "person_github":    60, "person_news":      60,
+    "username_exact":   90, "username_social":  80, "username_dev":     65,
+    "email_exact":      90, "email_breach":     80, "email_social":     65,
+    "phone_exact":      90, "phone_reverse":    80,
+    "domain_whois":     90, "domain_subdomains": 75, "domain_certs":    70,
+    "domain_exposed":   65, "domain_emails":    65,
+    "person_paste":     30, "username_paste":   30, "email_paste":      35,
+    "phone_paste":      30, "person_records":   35, "phone_records":    35,
+}
+
+_current: contextvars.ContextVar[int] = contextvars.ContextVar("firecat_priority", default=DEFAULT_PRIORITY)
+
+_lock              = threading.Lock()
+_active            = 0
+_learned:  dict[str, float] = {}
+_learned_at        = 0.0
+_refreshing        = False
+
+
+# ---------------------------------------------------------------------------
+# Learned bonus — click-through per group
+# ---------------------------------------------------------------------------
+
+def _reload() -> None:
+    """Read the click table and recompute the bonus. The refresh clock only
+    moves after a successful read, so a failed one is retried next call."""
+    global _learned, _learned_at, _refreshing
+    from apps.search.models import GroupClick
+    from apps.search.views import GROUP_BY_ID
+    try:
+        clicks = dict(GroupClick.objects.values_list("group_id", "clicks"))
+    except Exception:
+        with _lock:
+            _refreshing = False
+        return
+    top: dict[str, int] = {}
+    for gid, n in clicks.items():
+        cat = GROUP_BY_ID.get(gid, {}).get("category", "")
+        top[cat] = max(top.get(cat, 0), n)
+    learned = {}
+    for gid, n in clicks.items():
+        peak = top.get(GROUP_BY_ID.get(gid, {}).get("category", ""), 0)
+        if peak:
+            # log scale so one heavy session can't swamp the configured order
+            learned[gid] = LEARN_WEIGHT * math.log1p(n) / math.log1p(peak)
+    with _lock:
+        _learned, _learned_at, _refreshing = learned, time.monotonic(), False
+
+
+def _reload_in_thread() -> None:
+    try:
+        _reload()
+    finally:
+        connections.close_all()   # this thread's own connection
+
+
+def _refresh_learned() -> dict[str, float]:
+    global _refreshing
+    with _lock:
+        if _refreshing or time.monotonic() - _learned_at < LEARN_REFRESH:
+            return _learned
+        _refreshing = True
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        _reload()
+    else:
+        # On the event loop (ASGI views) the ORM refuses to run — read on a
+        # thread and keep ordering by the current bonus meanwhile
+        threading.Thread(target=_reload_in_thread, daemon=True, name="priority-refresh").start()
+    return _learned
+
+
+def record_click(gid: str) -> None:
+    from apps.search.models import GroupClick
+    updated = GroupClick.objects.filter(group_id=gid).update(clicks=F("clicks") + 1)
+    if not updated:
+        GroupClick.objects.get_or_create(group_id=gid, defaults={"clicks": 1})
+
+
+# ---------------------------------------------------------------------------
+# Priorities
+# ---------------------------------------------------------------------------
+
+def of(group: dict[str, Any]) -> int:
+    gid      = group["id"]
+    override = getattr(settings, "SEARCH_GROUP_PRIORITIES", {}) or {}
+    base     = override.get(gid, group.get("priority", BASE_PRIORITY.get(gid, DEFAULT_PRIORITY)))
+    return int(base + _refresh_learned().get(gid, 0.0))
+
+
+def order(groups: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Highest priority first; ties keep HACKING_GROUPS order."""
+    return sorted(groups, key=lambda g: -of(g))
+
+
+def current() -> int:
+    return _current.get()
+
+
+def shed(groups: list[dict[str, Any]]) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """
+    Split priority-ordered groups into (run, shed). Groups below SHED_BELOW
+    are dropped, lowest first, while the process already has too many in
+    flight — counting group tasks still waiting on the shared job queue,
+    which is where the load builds up when workers run the groups.
+    """
+    from apps.search import jobqueue
+    with _lock:
+        room = SHED_LOAD - _active
+    room -= jobqueue.depth()
+    run  = list(groups)
+    gone: list[dict[str, Any]] = []
+    while len(run) > max(room, 0) and run and of(run[-1]) < SHED_BELOW:
+        gone.append(run.pop())
+    return run, gone
+
+
+@contextmanager
+def running(priority: int) -> Iterator[None]:
+    """Mark a group as in flight and expose its priority to the outbound layer."""
+    global _active
+    token = _current.set(priority)
+    with _lock:
+        _active += 1
+    try:
+        yield
+    finally:
+        with _lock:
+            _active -= 1
+        _current.reset(token)
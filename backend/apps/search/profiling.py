@@ -0,0 +1,307 @@
+"""
+profiling.py — Opt-in CPU and memory profiling of live requests
+Upstream responses decide where the time goes, so slow searches are
+profiled where they happen. A request sent with `X-Firecat-Profile: 1` (or
+?profile=1) by a staff user, or by anyone with SEARCH_DEBUG_ENDPOINTS on,
+runs under a sampling profiler: every thread doing work for it — the
+request thread, group and engine tasks submitted through deadline.submit,
+parsing.run callers — is sampled until the response (or its stream) ends, and the
+stacks are saved in folded form to SEARCH_PROFILE_DIR, ready for
+flamegraph.pl or speedscope. The file name comes back in the
+X-Firecat-Profile response header.
+
+Off, nothing samples: the middleware reads one header and the hooks read
+one context variable. Memory is tracemalloc, started and read through
+/api/debug/memory/ (see debug_views.py). Parsing on SEARCH_PARSE_PROCESSES
+worker processes is not sampled — profile the parsers with it at 0.
+"""
+from __future__ import annotations
+
+import collections
+import contextvars
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Iterator, TypeVar
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.utils.decorators import sync_and_async_middleware
+
+
+T = TypeVar("T")
+
+PROFILE_DIR = getattr(settings, "SEARCH_PROFILE_DIR", "") or os.path.join(tempfile.gettempdir(), "firecat-profiles")
+INTERVAL    = 0.005      # seconds between samples
+HEADER      = "HTTP_X_FIRECAT_PROFILE"
+APP_DIR     = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(os.path.dirname(APP_DIR))
+
+# Leaf frames that mean "blocked, not computing" — left out of the profile
+# unless ?profile=wall, so the flamegraph shows CPU, not network waits
+IDLE = (
+    ("threading.py", "wait"), ("threading.py", "_wait_for_tstate_lock"), ("queue.py", "get"),
+    ("selectors.py", "select"), ("socket.py", "readinto"), ("ssl.py", "read"), ("ssl.py", "recv_into"),
+    ("httpcore/_backends/sync.py", "read"), ("concurrent/futures/_base.py", "wait"),
+)
+
+_active: contextvars.ContextVar[Profile | None] = contextvars.ContextVar("firecat_profile", default=None)
+
+
+def _where(filename: str) -> str:
+    """Short, stable file names: package-relative, backend-relative, or the stdlib module file."""
+    _, sep, tail = filename.rpartition("site-packages" + os.sep)
+    if sep:
+        return tail
+    if filename.startswith(BACKEND_DIR):
+        return os.path.relpath(filename, BACKEND_DIR)
+    return os.path.basename(filename)
+
+
+class Profile:
+    """Samples the threads registered with it until stopped."""
+
+    def __init__(self, label: str, wall: bool = False) -> None:
+        self.name    = f"{time.strftime('%Y%m%d-%H%M%S')}-{label}-{uuid.uuid4().hex[:6]}.folded"
+        self.wall    = wall
+        self.counts: collections.Counter[str] = collections.Counter()
+        self.samples = 0
+        self.idle    = 0
+        self._threads: dict[int, int] = {}
+        self._names:   dict[int, str] = {}
+        self._lock    = threading.Lock()
+        self._stop    = threading.Event()
+        self._sampler = threading.Thread(target=self._run, daemon=True, name="profile-sampler")
+
+    # -- threads ------------------------------------------------------------
+
+    def enter(self) -> None:
+        ident = threading.get_ident()
+        with self._lock:
+            self._threads[ident] = self._threads.get(ident, 0) + 1
+            self._names.setdefault(ident, threading.current_thread().name)
+
+    def leave(self) -> None:
+        ident = threading.get_ident()
+        with self._lock:
+            left = self._threads.get(ident, 1) - 1
+            if left:
+                self._threads[ident] = left
+            else:
+                self._threads.pop(ident, None)
+
+    # -- sampling -----------------------------------------------------------
+
+    def _idle(self, frame: Any) -> bool:
+        code = frame.f_code
+        return any(code.co_name == name and code.co_filename.endswith(tail) for tail, name in IDLE)
+
+    def _run(self) -> None:
+        while not self._stop.wait(INTERVAL):
+            with self._lock:
+                threads = [(ident, self._names.get(ident, "?")) for ident in self._threads]
+            frames = sys._current_frames()
+            for ident, tname in threads:
+                frame = frames.get(ident)
+                if frame is None:
+                    continue
+                self.samples += 1
+                if not self.wall and self._idle(frame):
+                    self.idle += 1
+                    continue
+                stack: list[str] = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({_where(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(tname.rstrip("0123456789_-") or tname)   # pool threads merge into one root
+                self.counts[";".join(reversed(stack))] += 1
+
+    def start(self) -> Profile:
+        self._sampler.start()
+        return self
+
+    def stop(self) -> str:
+        """Stop sampling and write the folded stacks; returns the file path."""
+        path = os.path.join(PROFILE_DIR, self.name)
+        if self._stop.is_set():
+            return path
+        self._stop.set()
+        self._sampler.join()
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        with open(path, "w") as fh:
+            for stack, n in self.counts.most_common():
+                fh.write(f"{stack} {n}\n")
+        return path
+
+
+# ---------------------------------------------------------------------------
+# Hooks — one context lookup when no profile is running
+# ---------------------------------------------------------------------------
+
+def bind(fn: Callable[..., T]) -> Callable[..., T]:
+    """`fn`, registering the thread that runs it with the caller's profile."""
+    prof = _active.get()
+    if prof is None:
+        return fn
+
+    @wraps(fn)
+    def run(*args: Any, **kwargs: Any) -> T:
+        prof.enter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            prof.leave()
+    return run
+
+
+@contextmanager
+def attached() -> Iterator[None]:
+    """Register this thread with the current profile for the block."""
+    prof = _active.get()
+    if prof is None:
+        yield
+        return
+    prof.enter()
+    try:
+        yield
+    finally:
+        prof.leave()
+
+
+# ---------------------------------------------------------------------------
+# Middleware
+# ---------------------------------------------------------------------------
+
+def _wanted(request: Any) -> str | None:
+    """'cpu' or 'wall' when the request asks to be profiled, else None."""
+    raw = request.META.get(HEADER) or request.GET.get("profile")
+    if not raw or raw in ("0", "false"):
+        return None
+    return "wall" if raw == "wall" else "cpu"
+
+
+def allowed(request: Any, user: Any = None) -> bool:
+    """Profiling, memory snapshots and search traces — a staff user, or
+    anyone when SEARCH_DEBUG_ENDPOINTS is on. DEBUG alone is not enough."""
+    if getattr(settings, "SEARCH_DEBUG_ENDPOINTS", False):
+        return True
+    user = user if user is not None else getattr(request, "user", None)
+    return bool(user is not None and user.is_active and user.is_staff)
+
+
+def _label(request: Any) -> str:
+    return "-".join(p for p in request.path.split("/") if p and p != "api")[:40] or "root"
+
+
+def _finish(prof: Profile, token: contextvars.Token[Profile | None], response: Any) -> Any:
+    _active.reset(token)
+    response["X-Firecat-Profile"] = prof.name
+    if isinstance(response, StreamingHttpResponse):
+        # Sample until the stream is drained or dropped, not just until the headers go out
+        from apps.search import scheduler
+        response.streaming_content = scheduler.closing(response.streaming_content, prof.stop)
+    else:
+        prof.stop()
+    return response
+
+
+@sync_and_async_middleware
+def profile_middleware(get_response: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    if iscoroutinefunction(get_response):
+        async def middleware(request: Any) -> Any:
+            mode = _wanted(request)
+            if mode is None:
+                return await get_response(request)
+            user = await request.auser() if hasattr(request, "auser") else await sync_to_async(lambda: request.user)()
+            if not allowed(request, user):
+                return await get_response(request)
+            # Under ASGI the request "thread" is the shared event loop — only
+            # the threads doing work for this request are sampled
+            prof  = Profile(_label(request), wall=mode == "wall").start()
+            token = _active.set(prof)
+            try:
+                response = await get_response(request)
+            except BaseException:
+                _active.reset(token)
+                prof.stop()
+                raise
+            return _finish(prof, token, response)
+    else:
+        def middleware(request: Any) -> Any:
+            mode = _wanted(request)
+            if mode is None or not allowed(request):
+                return get_response(request)
+            prof  = Profile(_label(request), wall=mode == "wall").start()
+            token = _active.set(prof)
+            prof.enter()
+            try:
+                response = get_response(request)
+            except BaseException:
+                _active.reset(token)
+                prof.stop()
+                raise
+            finally:
+                prof.leave()
+            return _finish(prof, token, response)
+    return middleware
+
+
+# ---------------------------------------------------------------------------
+# Memory
+# ---------------------------------------------------------------------------
+
+def memory_start(frames: int = 25) -> None:
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+
+
+def memory_stop() -> None:
+    tracemalloc.stop()
+
+
+def memory_top(limit: int = 25, key: str = "app") -> dict[str, Any]:
+    """
+    The largest live allocations made on behalf of apps/search code.
+    key="app" groups them by the innermost apps/search line on the stack
+    (which of our lines caused them, wherever the bytes were allocated);
+    key="lineno" by the allocating line itself.
+    """
+    snapshot = tracemalloc.take_snapshot().filter_traces([
+        tracemalloc.Filter(True, os.path.join(APP_DIR, "*"), all_frames=True),
+        tracemalloc.Filter(False, tracemalloc.__file__),   # this snapshot's own bookkeeping
+    ])
+    total = sum(t.size for t in snapshot.traces)
+    if key == "lineno":
+        rows = [
+            {"where": f"{_where(s.traceback[0].filename)}:{s.traceback[0].lineno}", "kb": round(s.size / 1024, 1), "blocks": s.count}
+            for s in snapshot.statistics("lineno")[:limit]
+        ]
+    else:
+        sizes: dict[str, list[int]] = {}
+        for trace in snapshot.traces:
+            app = next((f for f in reversed(trace.traceback) if f.filename.startswith(APP_DIR)), None)
+            if app is None:
+                continue
+            row = sizes.setdefault(f"{_where(app.filename)}:{app.lineno}", [0, 0])
+            row[0] += trace.size
+            row[1] += 1
+        rows = [
+            {"where": where, "kb": round(size / 1024, 1), "blocks": n}
+            for where, (size, n) in sorted(sizes.items(), key=lambda kv: -kv[1][0])[:limit]
+        ]
+    current, peak = tracemalloc.get_traced_memory()
+    return {
+        "key":       key,
+        "app_kb":    round(total / 1024, 1),
+        "traced_kb": round(current / 1024, 1),
+        "peak_kb":   round(peak / 1024, 1),
+        "top":       rows,
+    }
@@ -1,18 +1,20 @@
-import httpx
-import random
 import ssl
+import time
+from asgiref.sync import sync_to_async
 from bs4 import BeautifulSoup
 from django.http import HttpResponse, HttpResponseBadRequest
-from django.views import View
 from django.views.decorators.clickjacking import xframe_options_exempt
 from django.utils.decorators import method_decorator
 
-USER_AGENTS = [
+from apps.search import concurrency, metrics, outbound, parsing
+from apps.search.async_views import AsyncView
+
+USER_AGENTS = (
     'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36',
     'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36',
     'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36',
     'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:123.0) Gecko/20100101 Firefox/123.0',
-]
+)
 
 STRIP_HEADERS = {
     'x-frame-options',
@@ -30,6 +32,8 @@ STRIP_HEADERS = {
     'te',
     'trailers',
     'upgrade',
+    # A proxied page's cookies would land on our origin (and could replace the session cookie)
+    'set-cookie',
 }
 
 def make_ssl_context():
@@ -43,36 +47,59 @@ def make_ssl_context():
         pass
     return ctx
 
+# One context for the whole process, so the legacy-TLS attempt reuses a pooled client
+LEGACY_TLS = make_ssl_context()
+
+def add_base_tag(content, url, charset=None):
+    """Pin relative links to the proxied page. CPU-bound — runs through parsing.run, off the event loop.
+    `content` is the raw body: without a charset from the Content-Type header, BeautifulSoup
+    finds the page's own <meta charset> instead of trusting a guess."""
+    try:
+        soup = BeautifulSoup(content, 'html.parser', from_encoding=charset)
+        if not soup.find('base'):
+            base = soup.new_tag('base', href=url)
+            if soup.head:
+                soup.head.insert(0, base)
+            elif soup.html:
+                head = soup.new_tag('head')
+                head.append(base)
+                soup.html.insert(0, head)
+        return str(soup).encode('utf-8')
+    except Exception:
+        return content
+
 @method_decorator(xframe_options_exempt, name='dispatch')
-class WebProxyView(View):
+class WebProxyView(AsyncView):
+    """Async — the fallback attempts wait on the event loop, not on a server thread."""
 
-    def get(self, request):
+    async def get(self, request):
         url = request.GET.get('url', '').strip()
         if not url:
             return HttpResponseBadRequest('No URL provided')
 
         headers = {
-            'User-Agent':      random.choice(USER_AGENTS),
+            'User-Agent':      concurrency.rng().choice(USER_AGENTS),
             'Accept':          'text/html,application/xhtml+xml,*/*;q=0.9',
             'Accept-Language': 'en-US,en;q=0.9',
             'Accept-Encoding': 'gzip, deflate',
         }
 
         attempts = [
-            lambda: httpx.get(url, headers=headers, timeout=15, follow_redirects=True, verify=False),
-            lambda: httpx.get(url, headers=headers, timeout=15, follow_redirects=True,
-                              transport=httpx.HTTPSTransport(ssl_context=make_ssl_context())),
-            lambda: httpx.get(
+            lambda: outbound.aget(url, headers=headers, timeout=15, follow_redirects=True, verify=False),
+            lambda: outbound.aget(url, headers=headers, timeout=15, follow_redirects=True,
+                                  verify=LEGACY_TLS),
+            lambda: outbound.aget(
                 url.replace('https://', 'http://'),
                 headers=headers, timeout=15, follow_redirects=True, verify=False
             ),
         ]
 
+        t0       = time.monotonic()
         r        = None
         last_err = None
         for attempt in attempts:
             try:
-                r = attempt()
+                r = await attempt()
                 if r.status_code < 500:
                     break
                 r = None
@@ -81,29 +108,22 @@ class WebProxyView(View):
                 r = None
                 continue
 
+        metrics.PROXY_LATENCY.observe(time.monotonic() - t0)
         if r is None:
+            metrics.PROXY_REQUESTS.inc(outcome="failed")
             return HttpResponse(
                 f'<html><body style="font-family:sans-serif;padding:40px;color:#666">'
                 f'<h3>Could not load page</h3><p>{str(last_err)}</p></body></html>',
                 content_type='text/html', status=502,
             )
 
+        metrics.PROXY_REQUESTS.inc(outcome=f'{r.status_code // 100}xx')
         content_type = r.headers.get('content-type', 'text/html')
 
         if 'text/html' in content_type:
-            try:
-                soup = BeautifulSoup(r.content, 'html.parser')
-                if not soup.find('base'):
-                    base = soup.new_tag('base', href=str(r.url))
-                    if soup.head:
-                        soup.head.insert(0, base)
-                    elif soup.html:
-                        head = soup.new_tag('head')
-                        head.append(base)
-                        soup.html.insert(0, head)
-                content = str(soup).encode('utf-8')
-            except Exception:
-                content = r.content
+            content      = await sync_to_async(parsing.run, thread_sensitive=False)(
+                add_base_tag, r.content, str(r.url), r.charset_encoding,
+            )
             content_type = 'text/html; charset=utf-8'
         else:
             content = r.content
@@ -117,4 +137,4 @@ class WebProxyView(View):
                 except Exception:
                     pass
 
-        return response
\ No newline at end of file
+        return response
@@ -0,0 +1,129 @@
+"""
+ratelimit.py — Priority-aware per-host token buckets
+Search engines throttle and ban bursty clients. Each engine host gets a
+token bucket; when requests have to wait for tokens, the waiter with the
+highest group priority is served first, so high-value groups are not stuck
+behind a queue of low-value ones. Waits never outlive the latency budget.
+The buckets are per process: sync and async clients draw from the same ones.
+"""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import json
+import os
+import threading
+import time
+from typing import Any
+
+import httpx
+
+from apps.search import deadline, priority
+
+
+# host → (tokens per second, burst)
+DEFAULT_LIMITS: dict[str, tuple[float, float]] = {
+    "www.bing.com":        (20.0, 40.0),
+    "html.duckduckgo.com": (8.0,  16.0),
+    "www.startpage.com":   (8.0,  16.0),
+    "search.brave.com":    (8.0,  16.0),
+    "www.mojeek.com":      (8.0,  16.0),
+    "search.yahoo.com":    (10.0, 20.0),
+}
+MAX_WAIT = 10.0     # seconds a request may queue for a token
+
+
+def _load_limits() -> dict[str, tuple[float, float]]:
+    limits = dict(DEFAULT_LIMITS)
+    try:
+        extra = json.loads(os.environ.get("FIRECAT_RATE_LIMITS", "") or "{}")
+        limits.update({h: (float(r), float(b)) for h, (r, b) in extra.items()})
+    except (ValueError, TypeError):
+        pass
+    return limits
+
+
+class TokenBucket:
+
+    def __init__(self, rate: float, burst: float) -> None:
+        self.rate    = rate
+        self.burst   = burst
+        self.tokens  = burst
+        self.updated = time.monotonic()
+        self.waiters: list[tuple[int, int]] = []     # (-priority, seq) min-heap
+        self._seq    = itertools.count()
+        self._cond   = threading.Condition()
+
+    def _refill(self) -> None:
+        now          = time.monotonic()
+        self.tokens  = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, prio: int, timeout: float) -> bool:
+        """Take one token, or give up after `timeout` seconds."""
+        give_up = time.monotonic() + timeout
+        with self._cond:
+            entry = (-prio, next(self._seq))
+            heapq.heappush(self.waiters, entry)
+            try:
+                while True:
+                    self._refill()
+                    if self.waiters[0] == entry and self.tokens >= 1:
+                        self.tokens -= 1
+                        return True
+                    left = give_up - time.monotonic()
+                    if left <= 0:
+                        return False
+                    need = (1 - self.tokens) / self.rate if self.tokens < 1 else 0.01
+                    self._cond.wait(min(left, max(need, 0.005)))
+            finally:
+                self.waiters.remove(entry)
+                heapq.heapify(self.waiters)
+                self._cond.notify_all()
+
+
+_buckets:      dict[str, TokenBucket] | None = None
+_buckets_lock: threading.Lock               = threading.Lock()
+
+
+def shared_buckets() -> dict[str, TokenBucket]:
+    global _buckets
+    with _buckets_lock:
+        if _buckets is None:
+            _buckets = {h: TokenBucket(r, b) for h, (r, b) in _load_limits().items()}
+        return _buckets
+
+
+class RateLimitTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """Waits for a host token (by group priority) before passing the request on."""
+
+    def __init__(self, inner: Any, limits: dict[str, tuple[float, float]] | None = None) -> None:
+        self.inner   = inner
+        self.buckets = {h: TokenBucket(r, b) for h, (r, b) in limits.items()} if limits is not None else shared_buckets()
+
+    def _refused(self, request: httpx.Request) -> httpx.TimeoutException:
+        return httpx.TimeoutException(f"rate limit queue for {request.url.host}", request=request)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        bucket = self.buckets.get(request.url.host)
+        if bucket is not None:
+            wait = deadline.clamp(MAX_WAIT) or 0.0
+            if not bucket.acquire(priority.current(), wait):
+                raise self._refused(request)
+        return self.inner.handle_request(request)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        bucket = self.buckets.get(request.url.host)
+        if bucket is not None and not bucket.acquire(priority.current(), 0):
+            # Queue for the token on a thread (it carries the context), not on the loop
+            wait = deadline.clamp(MAX_WAIT) or 0.0
+            if not await asyncio.to_thread(bucket.acquire, priority.current(), wait):
+                raise self._refused(request)
+        return await self.inner.handle_async_request(request)
+
+    def close(self) -> None:
+        self.inner.close()
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
@@ -0,0 +1,56 @@
+"""
+records.py — Search results as compact records
+One search holds thousands of results at once: raw engine rows per group,
+the deduplicated lists, the "load more" backlog and the cached copies. As
+dicts every one carried a hash table for five keys and its own copies of
+the source name and domain. A Result keeps its fields in slots and shares
+one string per source and per domain (sys.intern), in memory and in the
+pickles the cache stores, where a shared string is written once per entry.
+
+Results become dicts only on the way out: jsonenc encodes them, jobqueue
+sends them to and from worker processes as JSON.
+"""
+from __future__ import annotations
+
+import sys
+from typing import Any
+
+
+def _intern(s: Any) -> str:
+    # sys.intern takes exact str only — parsers may hand over str subclasses
+    return sys.intern(str(s)) if s else ""
+
+
+class Result:
+    __slots__ = ("title", "link", "display_link", "snippet", "source", "osint")
+
+    def __init__(self, title: str, link: str, display_link: str, snippet: str, source: str, osint: bool = False) -> None:
+        self.title        = title or ""
+        self.link         = link or ""
+        self.display_link = _intern(display_link)
+        self.snippet      = snippet or ""
+        self.source       = _intern(source)
+        self.osint        = osint
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Unpickling goes back through __init__, so cached results are interned again
+        return Result, (self.title, self.link, self.display_link, self.snippet, self.source, self.osint)
+
+    def __repr__(self) -> str:
+        return f"Result({self.source}: {self.link})"
+
+    def as_dict(self) -> dict[str, Any]:
+        """The wire form — the keys the frontend reads."""
+        d = {"title": self.title, "link": self.link, "displayLink": self.display_link, "snippet": self.snippet, "source": self.source}
+        if self.osint:
+            d["osint"] = True
+        return d
+
+    @classmethod
+    def from_dict(cls, d: dict[str, Any]) -> Result:
+        return cls(d.get("title", ""), d.get("link", ""), d.get("displayLink", ""), d.get("snippet", ""), d.get("source", ""), bool(d.get("osint")))
+
+
+def coerce(items: list[Any]) -> list[Result]:
+    """Results from wherever they came — records already, or their dict form off the wire."""
+    return [i if isinstance(i, Result) else Result.from_dict(i) for i in items]
@@ -0,0 +1,157 @@
+"""
+replay.py — Record/replay transport for outbound httpx traffic
+In record mode every response is written to a cassette on disk; in replay
+mode requests are answered from the cassettes only, never the network,
+with optional per-host latency and jitter so benchmarks stay realistic.
+"""
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+
+RECORD, REPLAY = "record", "replay"
+
+
+def _request_key(request: httpx.Request) -> str:
+    url  = request.url.copy_with(params=sorted(request.url.params.multi_items()))
+    body = request.content if request.method in ("POST", "PUT", "PATCH") else b""
+    return hashlib.sha1(f"{request.method} {url}".encode() + b"\n" + body).hexdigest()
+
+
+def _host_dir(request: httpx.Request) -> str:
+    port = f"_{request.url.port}" if request.url.port else ""
+    return f"{request.url.host}{port}"
+
+
+def load_latency(spec: str) -> dict[str, tuple[float, float]]:
+    """
+    Parse a latency profile — inline JSON or a path to a JSON file:
+    {"default": [latency_ms, jitter_ms], "www.bing.com": [900, 400], ...}
+    """
+    if not spec:
+        return {}
+    raw = Path(spec).read_text() if os.path.exists(spec) else spec
+    return {h: (float(v[0]), float(v[1]) if len(v) > 1 else 0.0) for h, v in json.loads(raw).items()}
+
+
+def cap_delay(request: httpx.Request, seconds: float) -> tuple[float, bool]:
+    """Simulated latency cut at the request's read timeout — (sleep for, timed out)."""
+    limit = (request.extensions.get("timeout") or {}).get("read")
+    if limit is not None and seconds > limit:
+        return limit, True
+    return seconds, False
+
+
+class RecordReplayTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """
+    Cassettes live at <root>/<host[_port]>/<sha1 of method, url, body>.json and
+    hold the raw (still content-encoded) body, so replays are byte-identical.
+    """
+
+    def __init__(
+        self,
+        mode: str,
+        root: str | Path,
+        inner: httpx.BaseTransport | None = None,
+        async_inner: httpx.AsyncBaseTransport | None = None,
+        latency: dict[str, tuple[float, float]] | None = None,
+    ) -> None:
+        self.mode        = mode
+        self.root        = Path(root)
+        self.inner       = inner or httpx.HTTPTransport()
+        self.async_inner = async_inner or httpx.AsyncHTTPTransport()
+        self.latency     = latency or {}
+        self._lock       = threading.Lock()
+        self._rng        = random.Random(0)
+
+    # ── cassettes ──────────────────────────────────────────────────────────
+
+    def _path(self, request: httpx.Request) -> Path:
+        return self.root / _host_dir(request) / f"{_request_key(request)}.json"
+
+    def _load(self, request: httpx.Request) -> httpx.Response:
+        path = self._path(request)
+        try:
+            data = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return httpx.Response(599, headers={"x-firecat-replay": "miss"}, request=request)
+        return httpx.Response(
+            data["status"], headers=data["headers"],
+            content=base64.b64decode(data["body"]), request=request,
+        )
+
+    def _save(self, request: httpx.Request, status: int, headers: list[tuple[str, str]], body: bytes) -> None:
+        path = self._path(request)
+        data = {
+            "request": {"method": request.method, "url": str(request.url)},
+            "status":  status,
+            "headers": headers,
+            "body":    base64.b64encode(body).decode("ascii"),
+        }
+        with self._lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(data))
+            tmp.replace(path)
+
+    def has_host(self, host: str) -> bool:
+        return (self.root / host).is_dir()
+
+    def _delay(self, request: httpx.Request) -> float:
+        base, jitter = self.latency.get(request.url.host, self.latency.get("default", (0.0, 0.0)))
+        with self._lock:
+            ms = base + self._rng.uniform(-jitter, jitter)
+        return max(0.0, ms) / 1000
+
+    # ── sync ───────────────────────────────────────────────────────────────
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if self.mode == REPLAY:
+            request.read()
+            delay, timed_out = cap_delay(request, self._delay(request))
+            time.sleep(delay)
+            if timed_out:
+                raise httpx.ReadTimeout("simulated latency exceeded the read timeout", request=request)
+            return self._load(request)
+        r = self.inner.handle_request(request)
+        try:
+            body = b"".join(r.stream)  # type: ignore[arg-type]
+        finally:
+            r.close()
+        self._save(request, r.status_code, r.headers.multi_items(), body)
+        return httpx.Response(r.status_code, headers=r.headers, content=body, request=request)
+
+    # ── async ──────────────────────────────────────────────────────────────
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self.mode == REPLAY:
+            await request.aread()
+            delay, timed_out = cap_delay(request, self._delay(request))
+            await asyncio.sleep(delay)
+            if timed_out:
+                raise httpx.ReadTimeout("simulated latency exceeded the read timeout", request=request)
+            return self._load(request)
+        r = await self.async_inner.handle_async_request(request)
+        try:
+            body = b"".join([chunk async for chunk in r.stream])  # type: ignore[union-attr]
+        finally:
+            await r.aclose()
+        self._save(request, r.status_code, r.headers.multi_items(), body)
+        return httpx.Response(r.status_code, headers=r.headers, content=body, request=request)
+
+    def close(self) -> None:
+        self.inner.close()
+
+    async def aclose(self) -> None:
+        await self.async_inner.aclose()
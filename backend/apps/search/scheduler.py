@@ -0,0 +1,205 @@
+"""
+scheduler.py — Shared, bounded execution for search
+Long-lived worker pools replace the per-request executors: one for group
+tasks and one for engine/API fetches, so thread and FD use stays flat no
+matter how many searches arrive. In front of them, admission control runs
+at most SEARCH_SLOTS searches at once; the rest wait in a bounded queue
+served round-robin per session (one heavy user can't starve the others).
+When the queue is full, callers get a Retry-After estimate instead of a
+slower search for everyone.
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, AsyncIterator, Callable, Iterator
+
+from django.conf import settings
+
+from apps.search import metrics
+
+
+SEARCH_SLOTS        = int(getattr(settings, "SEARCH_SLOTS", 8))
+QUEUE_LIMIT         = int(getattr(settings, "SEARCH_QUEUE_LIMIT", 32))
+SESSION_QUEUE_LIMIT = 4
+GROUP_WORKERS       = 64
+ENGINE_WORKERS      = 96
+DEFAULT_DURATION    = 20.0      # seconds per search until we have measurements
+
+groups_pool  = concurrent.futures.ThreadPoolExecutor(GROUP_WORKERS,  thread_name_prefix="search-group")
+engines_pool = concurrent.futures.ThreadPoolExecutor(ENGINE_WORKERS, thread_name_prefix="search-engine")
+
+
+class Ticket:
+    """One search's place in line — granted when it may run."""
+
+    def __init__(self, session: str) -> None:
+        self.session  = session
+        self.granted  = threading.Event()
+        self.started  = 0.0
+        self.released = False
+
+
+class Admission:
+
+    def __init__(self, slots: int, queue_limit: int, session_limit: int) -> None:
+        self.slots         = slots
+        self.queue_limit   = queue_limit
+        self.session_limit = session_limit
+        self.running       = 0
+        self.waiting: OrderedDict[str, deque[Ticket]] = OrderedDict()
+        self.duration      = DEFAULT_DURATION     # EWMA of search run time
+        self._lock         = threading.Lock()
+
+    def _queued(self) -> int:
+        return sum(len(q) for q in self.waiting.values())
+
+    def _grant(self, ticket: Ticket) -> None:
+        self.running  += 1
+        ticket.started = time.monotonic()
+        ticket.granted.set()
+
+    def _dispatch(self) -> None:
+        # Round-robin: serve the first waiting session, then move it to the back
+        while self.running < self.slots and self.waiting:
+            session, line = next(iter(self.waiting.items()))
+            ticket = line.popleft()
+            del self.waiting[session]
+            if line:
+                self.waiting[session] = line
+            self._grant(ticket)
+
+    def admit(self, session: str) -> Ticket | None:
+        """A ticket (granted now or queued), or None when the queue is full."""
+        ticket = Ticket(session)
+        with self._lock:
+            if self.running < self.slots and not self.waiting:
+                self._grant(ticket)
+                return ticket
+            if self._queued() >= self.queue_limit or len(self.waiting.get(session, ())) >= self.session_limit:
+                return None
+            self.waiting.setdefault(session, deque()).append(ticket)
+        return ticket
+
+    def position(self, ticket: Ticket) -> int:
+        """0 when running, otherwise how many searches go before it (1-based)."""
+        if ticket.granted.is_set():
+            return 0
+        with self._lock:
+            lines = [list(q) for q in self.waiting.values()]
+        n = 0
+        for depth in range(max((len(l) for l in lines), default=0)):
+            for line in lines:
+                if depth < len(line):
+                    n += 1
+                    if line[depth] is ticket:
+                        return n
+        return n
+
+    def release(self, ticket: Ticket) -> None:
+        with self._lock:
+            if ticket.released:
+                return
+            ticket.released = True
+            if ticket.granted.is_set():
+                self.running -= 1
+                self.duration = 0.8 * self.duration + 0.2 * (time.monotonic() - ticket.started)
+            else:
+                line = self.waiting.get(ticket.session)
+                if line and ticket in line:
+                    line.remove(ticket)
+                    if not line:
+                        del self.waiting[ticket.session]
+            self._dispatch()
+
+    def retry_after(self) -> int:
+        with self._lock:
+            ahead = self._queued() + 1
+        return max(1, math.ceil(self.duration * ahead / self.slots))
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {"running": self.running, "queued": self._queued(), "slots": self.slots}
+
+
+admission = Admission(SEARCH_SLOTS, QUEUE_LIMIT, SESSION_QUEUE_LIMIT)
+
+metrics.gauge(
+    "firecat_searches_active", "Admitted searches by state.", ("state",),
+    lambda: {(k,): v for k, v in admission.stats().items() if k != "slots"},
+)
+metrics.gauge(
+    "firecat_pool_backlog", "Tasks waiting for a thread on the shared search pools.", ("pool",),
+    lambda: {("groups",): groups_pool._work_queue.qsize(), ("engines",): engines_pool._work_queue.qsize()},
+)
+
+
+class Closing:
+    """
+    Iterator wrapper whose close() always runs `on_close` — Django closes
+    streaming content when the response ends, even if it was never iterated
+    (a bare generator's finally would not run then).
+    """
+
+    def __init__(self, it: Iterator[Any], on_close: Callable[[], None]) -> None:
+        self._it       = it
+        self._on_close = on_close
+
+    def __iter__(self) -> Closing:
+        return self
+
+    def __next__(self) -> Any:
+        return next(self._it)
+
+    def close(self) -> None:
+        try:
+            close = getattr(self._it, "close", None)
+            if close:
+                close()
+        finally:
+            self._on_close()
+
+
+class AsyncClosing:
+    """Closing for async iterators (ASGI streams) — Django still calls the sync close()."""
+
+    def __init__(self, it: AsyncIterator[Any], on_close: Callable[[], None]) -> None:
+        self._it       = it
+        self._on_close = on_close
+
+    def __aiter__(self) -> AsyncClosing:
+        return self
+
+    async def __anext__(self) -> Any:
+        try:
+            return await self._it.__anext__()
+        except BaseException:
+            # Finished, failed or cancelled (client gone) — give the slot back now
+            self._on_close()
+            raise
+
+    async def aclose(self) -> None:
+        try:
+            aclose = getattr(self._it, "aclose", None)
+            if aclose:
+                await aclose()
+        finally:
+            self._on_close()
+
+    def close(self) -> None:
+        self._on_close()
+
+
+def closing(it: Iterator[Any] | AsyncIterator[Any], on_close: Callable[[], None]) -> Closing | AsyncClosing:
+    if hasattr(it, "__anext__"):
+        return AsyncClosing(it, on_close)  # type: ignore[arg-type]
+    return Closing(it, on_close)  # type: ignore[arg-type]
+
+
+def cancel_pending(futures: Any) -> None:
+    """Drop queued work on the shared pools; running tasks end on their deadline."""
+    for f in futures:
+        f.cancel()
@@ -0,0 +1,147 @@
+"""
+stub_upstream.py — Synthetic upstream for load tests
+Answers every outbound request locally: SERP HTML shaped for each engine
+parser (with results that pass the relevance filter), empty JSON for the
+open APIs and a Google-style page for the Electron worker. Latency and
+jitter are simulated per host so the backend sees realistic waits.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from html import escape
+
+import httpx
+
+from apps.search.replay import cap_delay
+
+
+PHRASE_RE = re.compile(r'"([^"]+)"')
+SITE_RE   = re.compile(r"site:([\w.\-]+)")
+
+DEFAULT_LATENCY: dict[str, tuple[float, float]] = {
+    "default":                (120.0, 60.0),
+    "www.bing.com":           (450.0, 200.0),
+    "html.duckduckgo.com":    (350.0, 150.0),
+    "www.startpage.com":      (700.0, 400.0),
+    "search.brave.com":       (400.0, 200.0),
+    "www.mojeek.com":         (300.0, 150.0),
+    "search.yahoo.com":       (400.0, 200.0),
+    "127.0.0.1":              (1500.0, 700.0),
+}
+
+RESULTS_PER_PAGE = 10
+
+
+def _results(query: str, page: int) -> list[tuple[str, str, str]]:
+    """Deterministic (title, link, snippet) rows for a query and page."""
+    m      = PHRASE_RE.search(query)
+    phrase = m.group(1) if m else query.split(" site:")[0].strip() or "result"
+    sites  = SITE_RE.findall(query)
+    seed   = int(hashlib.md5(f"{query}|{page}".encode()).hexdigest()[:8], 16)
+    rows   = []
+    for i in range(RESULTS_PER_PAGE):
+        n      = seed + i
+        domain = sites[n % len(sites)].split("/")[0] if sites else f"site{n % 97}.example{n % 13}.com"
+        link   = f"https://{domain}/{phrase.replace(' ', '-').lower()}/{n % 100000}"
+        rows.append((
+            f"{phrase} — profile {n % 1000}",
+            link,
+            f"Synthetic result {i + 1} on page {page} mentioning {phrase}.",
+        ))
+    return rows
+
+
+def _serp(engine: str, rows: list[tuple[str, str, str]]) -> str:
+    blocks = []
+    for title, link, snippet in rows:
+        t, l, s = escape(title), escape(link), escape(snippet)
+        if engine == "bing":
+            blocks.append(f'<li class="b_algo"><h2><a href="{l}">{t}</a></h2><div class="b_caption"><p>{s}</p></div></li>')
+        elif engine == "ddg":
+            blocks.append(f'<div class="result"><h2 class="result__title"><a class="result__a" href="{l}">{t}</a></h2><a class="result__snippet">{s}</a></div>')
+        elif engine == "startpage":
+            blocks.append(f'<div class="w-gl__result"><h3><a href="{l}">{t}</a></h3><p class="w-gl__description">{s}</p></div>')
+        elif engine == "brave":
+            blocks.append(f'<div class="snippet"><a href="{l}"><span class="snippet-title">{t}</span></a><p class="snippet-description">{s}</p></div>')
+        elif engine == "mojeek":
+            blocks.append(f'<li><a class="title" href="{l}">{t}</a><p class="s">{s}</p></li>')
+        elif engine == "yahoo":
+            blocks.append(f'<div class="algo"><h3><a href="{l}">{t}</a></h3><p>{s}</p></div>')
+        else:
+            blocks.append(f'<div class="g"><a href="{l}"><h3>{t}</h3></a><div class="VwiC3b">{s}</div></div>')
+    body = "".join(blocks)
+    if engine == "mojeek":
+        body = f'<ul class="results-standard">{body}</ul>'
+    return f"<html><body>{body}</body></html>"
+
+
+ENGINE_HOSTS = {
+    "www.bing.com":        ("bing",      "q"),
+    "html.duckduckgo.com": ("ddg",       "q"),
+    "www.startpage.com":   ("startpage", "q"),
+    "search.brave.com":    ("brave",     "q"),
+    "www.mojeek.com":      ("mojeek",    "q"),
+    "search.yahoo.com":    ("yahoo",     "p"),
+}
+
+
+def respond(request: httpx.Request) -> httpx.Response:
+    host = request.url.host
+    if host in ENGINE_HOSTS:
+        engine, param = ENGINE_HOSTS[host]
+        query = request.url.params.get(param, "")
+        page  = (int(request.url.params.get("first", "1") or 1) - 1) // 10 + 1
+        rows  = _results(query, page) if page <= 2 else []
+        return httpx.Response(200, html=_serp(engine, rows), request=request)
+    if host == "127.0.0.1" and request.url.path == "/search/batch":
+        pages = [
+            {"engine": r.get("engine", "google"), "query": r.get("query", ""), "queue": 0,
+             "html": _serp("bing" if r.get("engine") == "bing" else "google", _results(r.get("query", ""), 1))}
+            for r in json.loads(request.content or b"{}").get("requests", [])
+        ]
+        ndjson = "".join(json.dumps(p) + "\n" for p in pages)
+        return httpx.Response(200, text=ndjson, headers={"Content-Type": "application/x-ndjson"}, request=request)
+    if host == "127.0.0.1" and request.url.path.startswith("/search"):
+        payload = json.loads(request.content or b"{}")
+        engine  = payload.get("engine", "google")
+        html    = _serp("bing" if engine == "bing" else "google", _results(payload.get("query", ""), 1))
+        return httpx.Response(200, json={"html": html, "engine": engine}, request=request)
+    if "json" in request.headers.get("accept", "") or host.startswith("api.") or host == "crt.sh":
+        return httpx.Response(200, json=[] if host == "crt.sh" else {}, request=request)
+    return httpx.Response(404, text="", request=request)
+
+
+class StubUpstreamTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+
+    def __init__(self, latency: dict[str, tuple[float, float]] | None = None, seed: int = 0) -> None:
+        self.latency = {**DEFAULT_LATENCY, **(latency or {})}
+        self._rng    = random.Random(seed)
+        self._lock   = threading.Lock()
+
+    def _delay(self, request: httpx.Request) -> float:
+        base, jitter = self.latency.get(request.url.host, self.latency["default"])
+        with self._lock:
+            ms = base + self._rng.uniform(-jitter, jitter)
+        return max(0.0, ms) / 1000
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request.read()
+        delay, timed_out = cap_delay(request, self._delay(request))
+        time.sleep(delay)
+        if timed_out:
+            raise httpx.ReadTimeout("simulated latency exceeded the read timeout", request=request)
+        return respond(request)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        delay, timed_out = cap_delay(request, self._delay(request))
+        await asyncio.sleep(delay)
+        if timed_out:
+            raise httpx.ReadTimeout("simulated latency exceeded the read timeout", request=request)
+        return respond(request)
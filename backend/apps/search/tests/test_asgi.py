@@ -0,0 +1,118 @@
+import asyncio
+import threading
+from unittest import mock
+
+import httpx
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+
+from apps.search import outbound, parsing, priority, proxy_views, views
+from apps.search.models import GroupClick
+from apps.search.tests.utils import StubUpstreamMixin
+
+PAGE = '<html><head><meta charset="iso-8859-1"></head><body><a href="/x">café</a></body></html>'.encode("latin-1")
+
+
+class LearnedRefreshTests(TransactionTestCase):
+    """The click table is read off the event loop, and the refresh clock only moves on success."""
+
+    def setUp(self):
+        priority._learned, priority._learned_at, priority._refreshing = {}, 0.0, False
+        self.addCleanup(setattr, priority, "_learned_at", 0.0)
+        self.addCleanup(setattr, priority, "_learned", {})
+
+    def test_refresh_from_the_event_loop_runs_on_a_thread(self):
+        GroupClick.objects.create(group_id="person_paste", clicks=10)
+        before = set(threading.enumerate())
+
+        async def order():
+            return priority.of(views.GROUP_BY_ID["person_paste"])
+
+        self.assertEqual(asyncio.run(order()), 30)   # current bonus while the read runs
+        for t in set(threading.enumerate()) - before:
+            t.join(5)
+        self.assertEqual(priority.of(views.GROUP_BY_ID["person_paste"]), 30 + priority.LEARN_WEIGHT)
+        self.assertGreater(priority._learned_at, 0)
+
+    def test_failed_read_is_retried(self):
+        with mock.patch.object(GroupClick.objects, "values_list", side_effect=RuntimeError("db down")):
+            self.assertEqual(priority._refresh_learned(), {})
+        self.assertEqual(priority._learned_at, 0.0)
+        self.assertFalse(priority._refreshing)
+        GroupClick.objects.create(group_id="person_news", clicks=1)
+        self.assertIn("person_news", priority._refresh_learned())
+
+
+class BaseTagTests(SimpleTestCase):
+
+    def test_meta_charset_is_honoured(self):
+        out = parsing.run(proxy_views.add_base_tag, PAGE, "https://example.com/a/").decode()
+        self.assertIn("café", out)
+        self.assertIn('<base href="https://example.com/a/"/>', out)
+
+    def test_header_charset_wins(self):
+        page = "<html><head></head><body>naïve</body></html>".encode("cp1252")
+        out  = proxy_views.add_base_tag(page, "https://example.com/", "cp1252").decode()
+        self.assertIn("naïve", out)
+
+
+class ProxyViewTests(TestCase):
+
+    def setUp(self):
+        self.calls: list[object] = []
+
+    async def _aget(self, url, **kwargs):
+        self.calls.append(kwargs["verify"])
+        if len(self.calls) == 1:
+            raise httpx.ConnectError("handshake failed")
+        return httpx.Response(200, content=PAGE, headers={"content-type": "text/html"}, request=httpx.Request("GET", url))
+
+    def test_legacy_tls_fallback_and_charset(self):
+        with mock.patch.object(outbound, "aget", self._aget):
+            r = self.client.get("/api/proxy/", {"url": "https://example.com/"})
+        self.assertEqual(r.status_code, 200)
+        self.assertIn("café", r.content.decode())
+        self.assertEqual(self.calls, [False, proxy_views.LEGACY_TLS])
+
+
+class ProxyCookieTests(SimpleTestCase):
+    """Pages fetched for one user must not hand their cookies to the next user's fetches."""
+
+    def setUp(self):
+        self.sent: list[str | None] = []
+        outbound.configure(outbound.MODE)
+        self.addCleanup(outbound.configure, outbound.MODE)
+        patcher = mock.patch.object(outbound, "async_transport", lambda verify=True: httpx.MockTransport(self._page))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _page(self, request: httpx.Request) -> httpx.Response:
+        self.sent.append(request.headers.get("cookie"))
+        return httpx.Response(
+            200, content=PAGE, headers={"content-type": "text/html", "set-cookie": "sessionid=VICTIM; Path=/"},
+        )
+
+    async def test_cookies_set_by_a_page_are_not_sent_on_later_fetches(self):
+        first  = await self.async_client.get("/api/proxy/", {"url": "https://victim.example/"})
+        second = await self.async_client.get("/api/proxy/", {"url": "https://victim.example/next"})
+        probe  = await self.async_client.get("/api/search/inspect/", {"url": "https://victim.example/"})
+        self.assertEqual([first.status_code, second.status_code, probe.status_code], [200, 200, 200])
+        self.assertEqual(self.sent, [None, None, None])
+        self.assertFalse(first.has_header("Set-Cookie"))   # nor are they passed on to our origin
+
+
+class SharedAsyncClientTests(StubUpstreamMixin, SimpleTestCase):
+
+    def test_one_client_per_loop_and_verify(self):
+        async def clients():
+            await outbound.aget("https://api.github.com/users/ada")
+            first = outbound.async_client(proxy_views.LEGACY_TLS)
+            await outbound.aget("https://api.github.com/users/ada", verify=proxy_views.LEGACY_TLS)
+            return first, outbound.async_client(proxy_views.LEGACY_TLS), outbound.async_client(True)
+
+        first, again, default = asyncio.run(clients())
+        self.assertIs(first, again)
+        self.assertIsNot(first, default)
+
+    def test_sync_client_is_shared_for_a_context(self):
+        self.assertIs(outbound.client(proxy_views.LEGACY_TLS), outbound.client(proxy_views.LEGACY_TLS))
+        self.assertEqual(outbound.get("https://api.github.com/users/ada", verify=proxy_views.LEGACY_TLS).status_code, 200)
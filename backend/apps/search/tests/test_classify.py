@@ -0,0 +1,54 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+
+from apps.search import classify, views
+from apps.search.records import Result
+
+
+class ClassifyTests(SimpleTestCase):
+    CASES = {
+        "ada@example.com":           ["email"],
+        "https://example.com/about": ["domain"],
+        "example.com":               ["domain"],
+        "10.0.0.1":                  ["domain"],
+        "@ada_l":                    ["username"],
+        "ada_lovelace99":            ["username"],
+        "+14155552671":              ["phone"],
+        "(415) 555-2671":            ["phone"],
+        "Ada Lovelace":              ["person"],
+        "john.doe":                  ["domain", "username"],
+    }
+
+    def test_categories(self):
+        for q, cats in self.CASES.items():
+            with self.subTest(q=q):
+                self.assertEqual(classify.categories_for(q), cats)
+
+    def test_guesses_are_ordered_by_confidence(self):
+        guesses = classify.classify("Lovelace")
+        self.assertEqual([g.category for g in guesses], ["username", "person"])
+        self.assertGreater(guesses[0].confidence, guesses[1].confidence)
+
+    def test_unrecognised_queries_fall_back_to_everything(self):
+        self.assertEqual(classify.classify(""), [])
+        self.assertEqual(classify.categories_for("what is this?!"), list(classify.CATEGORIES))
+
+
+class AutoCategoriesTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_auto_runs_only_the_classified_categories(self):
+        ran: list[str] = []
+
+        def search_group(group, q, plan=None, state=None):
+            ran.append(group["category"])
+            return group["id"], [Result("t", f"https://example.com/{group['id']}", "example.com", "", "bing")]
+
+        with mock.patch.object(views, "_search_group", search_group):
+            r = self.client.get("/api/search/", {"q": "ada@example.com", "categories": "auto"})
+        self.assertEqual(set(ran), {"email"})
+        self.assertEqual(r.json()["classified"], [{"category": "email", "confidence": 0.99}])
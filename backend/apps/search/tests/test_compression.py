@@ -0,0 +1,147 @@
+import asyncio
+import unittest
+import zlib
+
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase
+
+from apps.search import compression
+
+
+EVENTS = [
+    f'data: {{"type":"group","group":{{"id":"g{i}","items":[{{"link":"https://example.com/{i}","source":"bing"}}]}}}}\n\n'.encode()
+    for i in range(6)
+]
+
+
+def _decoder(encoding):
+    if encoding == "br":
+        return compression.brotli.Decompressor()
+    return zlib.decompressobj(31 if encoding == "gzip" else 15)
+
+
+def _decode(decoder, chunk):
+    return decoder.process(chunk) if hasattr(decoder, "process") else decoder.decompress(chunk)
+
+
+class Closing:
+    """An event iterator that records whether it was closed."""
+
+    def __init__(self, events):
+        self._it    = iter(events)
+        self.closed = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._it)
+
+    def close(self):
+        self.closed = True
+
+
+class NegotiateTests(SimpleTestCase):
+
+    OFFERED = ("br", "gzip", "deflate")
+
+    def test_server_order_breaks_ties(self):
+        self.assertEqual(compression.negotiate("gzip, deflate, br", self.OFFERED), "br")
+        self.assertEqual(compression.negotiate("deflate, gzip", self.OFFERED), "gzip")
+
+    def test_client_q_values_win(self):
+        self.assertEqual(compression.negotiate("br;q=0.5, gzip;q=0.9", self.OFFERED), "gzip")
+        self.assertEqual(compression.negotiate("br;q=0, gzip;q=0", self.OFFERED), None)
+        self.assertEqual(compression.negotiate("GZIP; Q=0.4", self.OFFERED), "gzip")
+
+    def test_wildcard_and_identity(self):
+        self.assertEqual(compression.negotiate("*", self.OFFERED), "br")
+        self.assertEqual(compression.negotiate("*;q=0.1, br;q=0", self.OFFERED), "gzip")
+        self.assertIsNone(compression.negotiate("", self.OFFERED))
+        self.assertIsNone(compression.negotiate("identity", self.OFFERED))
+        self.assertIsNone(compression.negotiate("gzip;q=lots", self.OFFERED))
+
+    def test_only_offered_encodings(self):
+        self.assertIsNone(compression.negotiate("br", ("gzip",)))
+        self.assertIsNone(compression.negotiate("gzip", ()))
+
+
+class PerEventFlushTests(SimpleTestCase):
+
+    def encodings(self):
+        return ("gzip", "deflate") + (("br",) if compression.brotli is not None else ())
+
+    def test_each_event_decodes_as_it_arrives(self):
+        for encoding in self.encodings():
+            with self.subTest(encoding=encoding):
+                stream  = compression._Compressed(iter(EVENTS), compression.compressor(encoding))
+                decoder = _decoder(encoding)
+                for event in EVENTS:
+                    self.assertEqual(_decode(decoder, next(stream)), event)
+                _decode(decoder, next(stream))   # the trailer
+                self.assertEqual(list(stream), [])
+                if hasattr(decoder, "eof"):
+                    self.assertTrue(decoder.eof)
+
+    def test_later_events_compress_against_earlier_ones(self):
+        coder = compression.compressor("gzip")
+        sizes = [len(coder.chunk(e)) for e in EVENTS]
+        self.assertLess(max(sizes[1:]), sizes[0])
+
+    def test_close_reaches_the_event_iterator(self):
+        events = Closing(EVENTS)
+        stream = compression._Compressed(events, compression.compressor("gzip"))
+        next(stream)
+        stream.close()
+        self.assertTrue(events.closed)
+
+    def test_async_streams(self):
+        async def events():
+            for e in EVENTS:
+                yield e
+
+        async def run():
+            decoder = _decoder("deflate")
+            stream  = compression._AsyncCompressed(events(), compression.compressor("deflate"))
+            out     = []
+            async for chunk in stream:
+                out.append(_decode(decoder, chunk))
+            return out
+
+        self.assertEqual(asyncio.run(run())[:len(EVENTS)], EVENTS)
+
+    @unittest.skipIf(compression.brotli is None, "brotli is not installed")
+    def test_brotli_quality(self):
+        self.assertIsInstance(compression.compressor("br", 1), compression._Brotli)
+
+
+class CompressEventsTests(SimpleTestCase):
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def stream(self):
+        return StreamingHttpResponse(iter(EVENTS), content_type="text/event-stream")
+
+    def test_accepted_encoding(self):
+        request  = self.factory.get("/api/search/", HTTP_ACCEPT_ENCODING="gzip")
+        response = compression.compress_events(request, self.stream())
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(zlib.decompress(b"".join(response.streaming_content), 31), b"".join(EVENTS))
+
+    def test_identity(self):
+        request  = self.factory.get("/api/search/")
+        response = compression.compress_events(request, self.stream())
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(b"".join(response.streaming_content), b"".join(EVENTS))
+
+    def test_left_alone(self):
+        request = self.factory.get("/api/search/", HTTP_ACCEPT_ENCODING="gzip")
+        plain   = HttpResponse(b"{}")
+        self.assertIs(compression.compress_events(request, plain), plain)
+        self.assertFalse(plain.has_header("Content-Encoding"))
+        encoded = self.stream()
+        encoded["Content-Encoding"] = "br"
+        self.assertEqual(compression.compress_events(request, encoded)["Content-Encoding"], "br")
@@ -0,0 +1,85 @@
+import concurrent.futures
+import sys
+import threading
+import types
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from apps.search import concurrency, jobqueue, outbound, views
+from apps.search.management.commands import bench_scaling
+
+from .utils import StubUpstreamMixin
+
+
+class InterpreterTests(SimpleTestCase):
+
+    def test_gil_enabled(self):
+        with mock.patch.object(sys, "_is_gil_enabled", create=True, return_value=False):
+            self.assertFalse(concurrency.gil_enabled())
+        with mock.patch.object(sys, "_is_gil_enabled", create=True, return_value=True):
+            self.assertTrue(concurrency.gil_enabled())
+
+    def test_older_interpreters_always_have_the_gil(self):
+        with mock.patch.object(concurrency, "sys", types.SimpleNamespace()):
+            self.assertTrue(concurrency.gil_enabled())
+
+
+class RngTests(SimpleTestCase):
+
+    def test_one_random_per_thread(self):
+        mine = concurrency.rng()
+        self.assertIs(concurrency.rng(), mine)
+        with concurrent.futures.ThreadPoolExecutor(4) as ex:
+            theirs = list(ex.map(lambda _: id(concurrency.rng()), range(4)))
+        self.assertNotIn(id(mine), theirs)
+
+    def test_user_agents_come_from_the_thread_rng(self):
+        with mock.patch.object(concurrency, "rng") as rng:
+            rng.return_value.choice.return_value = "UA"
+            self.assertEqual(views._ua(), "UA")
+        rng.return_value.choice.assert_called_once_with(views.USER_AGENTS)
+
+
+class SharedStateTests(SimpleTestCase):
+
+    def test_group_tables_are_read_only(self):
+        with self.assertRaises(TypeError):
+            views.GROUP_BY_ID["x"] = {}   # type: ignore[index]
+        self.assertIsInstance(views.USER_AGENTS, tuple)
+
+    def test_local_backend_orders_concurrent_pushes(self):
+        b = jobqueue.LocalBackend()
+        b._started = True   # no worker thread — the jobs stay queued
+        with concurrent.futures.ThreadPoolExecutor(8) as ex:
+            list(ex.map(lambda i: b.push({"id": str(i), "priority": 50}), range(200)))
+        self.assertEqual(b.depth(), 200)
+        seqs = []
+        while not b._jobs.empty():
+            seqs.append(b._jobs.get_nowait()[1])
+        self.assertEqual(sorted(seqs), list(range(200)))
+
+
+class TransportTests(StubUpstreamMixin, SimpleTestCase):
+
+    def test_concurrent_first_calls_share_one_stub(self):
+        start = threading.Barrier(8)
+
+        def first(_: int) -> int:
+            start.wait()
+            return id(outbound.client())
+
+        with concurrent.futures.ThreadPoolExecutor(8) as ex:
+            clients = set(ex.map(first, range(8)))
+        self.assertEqual(len(clients), 1)
+        self.assertIsNotNone(outbound._stub)
+        self.assertIs(outbound.transport(), outbound.transport())
+
+
+class BenchScalingTests(SimpleTestCase):
+
+    def test_levels(self):
+        self.assertEqual(bench_scaling._levels("4,1,2,2"), [1, 2, 4])
+        self.assertEqual(bench_scaling._levels("0"), [1])
+        with mock.patch.object(bench_scaling.os, "cpu_count", return_value=6):
+            self.assertEqual(bench_scaling._levels(""), [1, 2, 4, 6])
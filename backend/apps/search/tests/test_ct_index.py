@@ -0,0 +1,109 @@
+import json
+from contextlib import contextmanager
+from unittest import mock
+
+import httpx
+from django.test import SimpleTestCase, TestCase
+
+from apps.search import ct_index
+from apps.search.models import CertDomain, CertName
+
+
+def _drain(gen):
+    """(elements, return value) of an iter_json_array generator."""
+    items = []
+    while True:
+        try:
+            items.append(next(gen))
+        except StopIteration as end:
+            return items, end.value
+
+
+class IterJsonArrayTests(SimpleTestCase):
+    ROWS = [{"id": 1, "name_value": "a.example.com"}, {"id": 2, "name_value": "b,]\n[c"}, [3, {"x": "]"}]]
+
+    def test_every_chunk_boundary(self):
+        text = json.dumps(self.ROWS, indent=1)
+        for cut in range(len(text) + 1):
+            with self.subTest(cut=cut):
+                self.assertEqual(_drain(ct_index.iter_json_array([text[:cut], text[cut:]])), (self.ROWS, True))
+
+    def test_one_character_chunks(self):
+        text = json.dumps(self.ROWS)
+        self.assertEqual(_drain(ct_index.iter_json_array(text)), (self.ROWS, True))
+
+    def test_number_split_across_chunks(self):
+        self.assertEqual(_drain(ct_index.iter_json_array(["[1", "23, 4", "5]"])), ([123, 45], True))
+
+    def test_empty_array(self):
+        self.assertEqual(_drain(ct_index.iter_json_array(["[", " ]"])), ([], True))
+
+    def test_truncated_stream_is_not_complete(self):
+        text = json.dumps(self.ROWS)
+        items, complete = _drain(ct_index.iter_json_array([text[:-10]]))
+        self.assertEqual(items, self.ROWS[:2])
+        self.assertFalse(complete)
+
+    def test_oversized_element_aborts(self):
+        with mock.patch.object(ct_index, "MAX_BUFFER", 16):
+            items, complete = _drain(ct_index.iter_json_array(['[{"id": 1}, {"name_value": "', "x" * 64]))
+        self.assertEqual(items, [{"id": 1}])
+        self.assertFalse(complete)
+
+
+def _crtsh(rows):
+    @contextmanager
+    def stream(method, url, **kwargs):
+        yield httpx.Response(200, json=rows)
+    return mock.patch.object(ct_index.outbound, "stream", stream)
+
+
+class RefreshTests(TestCase):
+    # crt.sh rows are not ordered by id
+    ROWS = [
+        {"id": 50, "name_value": "a.example.com", "issuer_name": "CA", "entry_timestamp": "2026-01-02T00:00:00"},
+        {"id": 70, "name_value": "b.example.com\n*.c.example.com"},
+        {"id": 40, "name_value": "d.example.com\nother.org"},
+    ]
+
+    def setUp(self):
+        self.entry = CertDomain.objects.create(domain="example.com")
+
+    def _names(self):
+        return set(CertName.objects.filter(domain=self.entry).values_list("name", flat=True))
+
+    def test_complete_read_advances_the_high_water_mark(self):
+        with _crtsh(self.ROWS):
+            ct_index._refresh(self.entry)
+        self.entry.refresh_from_db()
+        self.assertEqual(self.entry.max_cert_id, 70)
+        self.assertEqual(self._names(), {"a.example.com", "b.example.com", "c.example.com", "d.example.com"})
+
+    def test_cut_off_keeps_the_high_water_mark(self):
+        with _crtsh(self.ROWS), mock.patch.object(ct_index, "MAX_CERTS", 2):
+            ct_index._refresh(self.entry)
+        self.entry.refresh_from_db()
+        self.assertEqual(self.entry.max_cert_id, 0)
+        self.assertIsNotNone(self.entry.refreshed_at)
+        # The lower id behind the cut-off is picked up by the next refresh
+        with _crtsh(self.ROWS):
+            ct_index._refresh(self.entry)
+        self.entry.refresh_from_db()
+        self.assertEqual(self.entry.max_cert_id, 70)
+        self.assertIn("d.example.com", self._names())
+
+    def test_incremental_refresh_skips_known_ids(self):
+        self.entry.max_cert_id = 60
+        self.entry.save()
+        with _crtsh(self.ROWS):
+            ct_index._refresh(self.entry)
+        self.assertEqual(self._names(), {"b.example.com", "c.example.com"})
+
+
+class DomainLockTests(SimpleTestCase):
+
+    def test_locks_are_striped(self):
+        locks = {id(ct_index._lock_for(f"host{i}.example.com")) for i in range(5000)}
+        self.assertLessEqual(len(locks), ct_index.LOCK_STRIPES)
+        self.assertEqual(len(ct_index._domain_locks), ct_index.LOCK_STRIPES)
+        self.assertIs(ct_index._lock_for("example.com"), ct_index._lock_for("example.com"))
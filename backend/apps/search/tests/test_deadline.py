@@ -0,0 +1,93 @@
+import asyncio
+import concurrent.futures
+import threading
+import time
+
+import httpx
+from django.test import SimpleTestCase, TestCase
+
+from apps.search import deadline
+
+from .utils import StubUpstreamMixin
+
+
+class BudgetTests(SimpleTestCase):
+
+    def test_parse_budget(self):
+        self.assertEqual(deadline.parse_budget(""), deadline.DEFAULT_BUDGET_MS / 1000)
+        self.assertEqual(deadline.parse_budget("1500"), 1.5)
+        self.assertEqual(deadline.parse_budget("1"), deadline.MIN_BUDGET_MS / 1000)
+        self.assertEqual(deadline.parse_budget("1e9"), deadline.MAX_BUDGET_MS / 1000)
+        for bad in ("soon", "nan"):
+            with self.subTest(bad=bad), self.assertRaises(ValueError):
+                deadline.parse_budget(bad)
+
+    def test_clamp_without_and_within_a_budget(self):
+        self.assertIsNone(deadline.remaining())
+        self.assertEqual(deadline.clamp(6), 6)
+        left = deadline.within(time.monotonic() + 2, deadline.clamp, 6)
+        self.assertTrue(1.5 < left <= 2)
+        self.assertEqual(deadline.within(time.monotonic() + 2, deadline.clamp, 0.5), 0.5)
+
+    def test_within_keeps_the_tighter_deadline(self):
+        outer = time.monotonic() + 1
+        left  = deadline.within(outer, deadline.within, outer + 60, deadline.remaining)
+        self.assertLessEqual(left, 1)
+
+    def test_cancel_spends_the_budget(self):
+        stop = threading.Event()
+        with deadline.cancel_on(stop):
+            self.assertFalse(deadline.expired())
+            stop.set()
+            self.assertEqual(deadline.remaining(), 0.0)
+            self.assertTrue(deadline.expired())
+
+    def test_submit_carries_the_deadline_to_the_pool(self):
+        with concurrent.futures.ThreadPoolExecutor(1) as pool:
+            left = deadline.within(time.monotonic() + 5, lambda: deadline.submit(pool, deadline.remaining).result())
+        self.assertTrue(4 < left <= 5)
+
+
+class DeadlineTransportTests(SimpleTestCase):
+
+    def setUp(self):
+        self.timeouts: list[dict] = []
+
+    def _upstream(self, request: httpx.Request) -> httpx.Response:
+        self.timeouts.append(request.extensions["timeout"])
+        return httpx.Response(200)
+
+    def test_caps_request_timeouts(self):
+        with httpx.Client(transport=deadline.DeadlineTransport(httpx.MockTransport(self._upstream))) as c:
+            deadline.within(time.monotonic() + 1, c.get, "https://example.com/", timeout=15)
+        self.assertTrue(all(0 < v <= 1 for v in self.timeouts[0].values()))
+
+    def test_spent_budget_fails_fast(self):
+        with httpx.Client(transport=deadline.DeadlineTransport(httpx.MockTransport(self._upstream))) as c:
+            with self.assertRaises(httpx.TimeoutException):
+                deadline.within(time.monotonic() - 1, c.get, "https://example.com/")
+        self.assertEqual(self.timeouts, [])
+
+    def test_async_requests_are_capped_too(self):
+        async def fetch() -> None:
+            async with httpx.AsyncClient(transport=deadline.DeadlineTransport(httpx.MockTransport(self._upstream))) as c:
+                await c.get("https://example.com/", timeout=15)
+
+        deadline.within(time.monotonic() + 1, asyncio.run, fetch())
+        self.assertTrue(all(0 < v <= 1 for v in self.timeouts[0].values()))
+
+
+class BudgetParameterTests(StubUpstreamMixin, TestCase):
+    # Every engine answers in 5 s — far past the budget
+    latency = {h: (5000.0, 0.0) for h in ("default", "www.bing.com", "html.duckduckgo.com", "www.startpage.com",
+                                          "search.brave.com", "www.mojeek.com", "search.yahoo.com", "127.0.0.1")}
+
+    def test_budget_must_be_a_number(self):
+        r = self.client.get("/api/search/", {"q": "ada", "budget_ms": "soon"})
+        self.assertEqual(r.status_code, 400)
+
+    def test_search_answers_within_its_budget(self):
+        t0 = time.monotonic()
+        r  = self.client.get("/api/search/", {"q": "ada lovelace", "groups": "person_web,person_news", "budget_ms": "1000"})
+        self.assertLess(time.monotonic() - t0, 2.0)
+        self.assertIn(r.status_code, (200, 503))
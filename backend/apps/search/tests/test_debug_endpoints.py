@@ -0,0 +1,70 @@
+import shutil
+import tempfile
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+
+from apps.search import profiling
+
+
+ENDPOINTS = ("/api/search/traces/", "/api/debug/memory/", "/api/debug/profiles/")
+
+
+class DebugEndpointAccessTests(TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir, ignore_errors=True)
+        patcher = mock.patch.object(profiling, "PROFILE_DIR", self.dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def assertOpen(self, path):
+        # Memory answers 409 until tracemalloc is started — past the gate either way
+        self.assertIn(self.client.get(path).status_code, (200, 409), path)
+
+    @override_settings(DEBUG=True, SEARCH_DEBUG_ENDPOINTS=False)
+    def test_debug_alone_keeps_them_closed(self):
+        for path in ENDPOINTS:
+            self.assertEqual(self.client.get(path).status_code, 404, path)
+        self.assertEqual(self.client.post("/api/debug/memory/", {"action": "start"}, content_type="application/json").status_code, 404)
+
+    @override_settings(DEBUG=False, SEARCH_DEBUG_ENDPOINTS=True)
+    def test_opt_in_setting_opens_them(self):
+        for path in ENDPOINTS:
+            self.assertOpen(path)
+
+    @override_settings(DEBUG=False, SEARCH_DEBUG_ENDPOINTS=False)
+    def test_staff_users_get_in(self):
+        self.client.force_login(User.objects.create_user("ops", password="x", is_staff=True))
+        for path in ENDPOINTS:
+            self.assertOpen(path)
+
+    @override_settings(DEBUG=False, SEARCH_DEBUG_ENDPOINTS=False)
+    def test_other_users_do_not(self):
+        self.client.force_login(User.objects.create_user("someone", password="x"))
+        for path in ENDPOINTS:
+            self.assertEqual(self.client.get(path).status_code, 404, path)
+
+
+class ProfileMiddlewareAccessTests(TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir, ignore_errors=True)
+        patcher = mock.patch.object(profiling, "PROFILE_DIR", self.dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @override_settings(DEBUG=True, SEARCH_DEBUG_ENDPOINTS=False)
+    def test_anonymous_profile_request_is_ignored(self):
+        r = self.client.get("/api/search/traces/?profile=1")
+        self.assertNotIn("X-Firecat-Profile", r)
+
+    @override_settings(DEBUG=False, SEARCH_DEBUG_ENDPOINTS=False)
+    def test_staff_profile_request_is_sampled(self):
+        self.client.force_login(User.objects.create_user("ops", password="x", is_staff=True))
+        r = self.client.get("/api/search/traces/", HTTP_X_FIRECAT_PROFILE="1")
+        self.assertEqual(r.status_code, 200)
+        self.assertTrue(r["X-Firecat-Profile"].endswith(".folded"))
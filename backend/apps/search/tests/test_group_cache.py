@@ -0,0 +1,87 @@
+import threading
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from apps.search import concurrency, ratelimit, views
+from apps.search.records import Result
+
+from .utils import StubUpstreamMixin
+
+
+class GroupCacheTests(TestCase):
+    """Results are cached per (group, query): a later selection only runs the groups not seen yet."""
+
+    def setUp(self):
+        cache.clear()
+        self.ran: list[str] = []
+        self.lock = threading.Lock()
+        patcher = mock.patch.object(views, "_search_group", self._search_group)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(cache.clear)
+
+    def _search_group(self, group, q, plan=None, state=None):
+        with self.lock:
+            self.ran.append(group["id"])
+        if state is not None:
+            state["qi"], state["raw"] = len(views._build_queries(group, q)), []
+        return group["id"], [Result(f"{group['id']} hit", f"https://example.com/{group['id']}", "example.com", "", "bing")]
+
+    def _search(self, groups: str, q: str = "ada lovelace"):
+        return self.client.get("/api/search/", {"q": q, "groups": groups})
+
+    def test_only_unseen_groups_run(self):
+        first = self._search("person_web,person_social")
+        self.assertEqual(first.status_code, 200)
+        self.assertFalse(first.json()["cached"])
+        self.assertEqual(sorted(self.ran), ["person_social", "person_web"])
+
+        self.ran.clear()
+        second = self._search("person_web,person_news")
+        self.assertEqual(self.ran, ["person_news"])
+        self.assertEqual([g["id"] for g in second.json()["groups"]], ["person_web", "person_news"])
+
+        self.ran.clear()
+        third = self._search("person_news,person_social")
+        self.assertEqual(self.ran, [])
+        self.assertTrue(third.json()["cached"])
+
+    def test_cache_key_ignores_word_order_and_case(self):
+        self._search("person_web", q="Ada Lovelace")
+        self.ran.clear()
+        self._search("person_web", q="lovelace ada")
+        self.assertEqual(self.ran, [])
+
+    def test_groups_selector_validation(self):
+        self.assertEqual(self._search("nope,nada").status_code, 400)
+        # Unknown ids are dropped, duplicates run once
+        r = self._search("person_web,nope,person_web")
+        self.assertEqual([g["id"] for g in r.json()["groups"]], ["person_web"])
+        self.assertEqual(self.ran, ["person_web"])
+
+    def test_categories_select_their_groups(self):
+        self.client.get("/api/search/", {"q": "ada@example.com", "categories": "email"})
+        self.assertEqual(sorted(self.ran), sorted(g["id"] for g in views.HACKING_GROUPS if g["category"] == "email"))
+
+
+class CacheSizeTests(StubUpstreamMixin, TestCase):
+
+    def setUp(self):
+        # No host rate limits or pauses between Bing pages — this is about cache entries, not pacing
+        for patcher in (
+            mock.patch.object(ratelimit, "_buckets", {}),
+            mock.patch.object(concurrency, "rng", return_value=mock.Mock(uniform=lambda a, b: 0.0, choice=lambda s: s[0])),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        super().setUp()
+
+    def test_full_searches_do_not_evict_each_other(self):
+        groups = ",".join(g["id"] for g in views.HACKING_GROUPS)
+        for q in ("ada lovelace", "torvalds", "example.com"):
+            self.assertEqual(self.client.get("/api/search/", {"q": q, "groups": groups}).status_code, 200)
+        # The first search's groups are still cached after two more full searches
+        repeat = self.client.get("/api/search/", {"q": "ada lovelace", "groups": groups})
+        self.assertTrue(repeat.json()["cached"])
@@ -0,0 +1,93 @@
+import threading
+import time
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from apps.search import hedging
+from apps.search.records import Result
+
+
+def _answer(engine: str, n: int = hedging.ADEQUATE, delay: float = 0.0, release: threading.Event | None = None):
+    def fetch(query: str) -> list[Result]:
+        if release is not None:
+            release.wait(5)
+        elif delay:
+            time.sleep(delay)
+        return [Result(query, f"https://{engine}.example/{i}", "", "", engine) for i in range(n)]
+    return fetch
+
+
+class EngineStatsTests(SimpleTestCase):
+
+    def test_default_delay_until_enough_samples(self):
+        stats = hedging.EngineStats()
+        for _ in range(hedging.MIN_SAMPLES - 1):
+            stats.record("bing", 0.1, True)
+        self.assertEqual(stats.hedge_after("bing"), hedging.HEDGE_DEFAULT)
+        stats.record("bing", 2.0, True)
+        self.assertEqual(stats.hedge_after("bing"), 2.0)
+
+    def test_hedge_delay_has_a_floor(self):
+        stats = hedging.EngineStats()
+        for _ in range(hedging.MIN_SAMPLES):
+            stats.record("bing", 0.01, True)
+        self.assertEqual(stats.hedge_after("bing"), hedging.HEDGE_FLOOR)
+
+    def test_health(self):
+        stats = hedging.EngineStats()
+        for _ in range(4):
+            stats.record("yahoo", 0.1, False)
+        self.assertTrue(stats.healthy("yahoo"))   # too few answers to judge
+        stats.record("yahoo", 0.1, False)
+        self.assertFalse(stats.healthy("yahoo"))
+
+
+class HedgedRoundTests(SimpleTestCase):
+
+    def setUp(self):
+        patcher = mock.patch.object(hedging, "stats", hedging.EngineStats())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+
+    def test_no_hedge_when_primaries_answer(self):
+        raw, used = hedging.hedged_round("q", [("bing", _answer("bing")), ("ddg", _answer("ddg"))], [("brave", _answer("brave"))], 5)
+        self.assertEqual(used, {"bing", "ddg"})
+        self.assertEqual({r.source for r in raw}, {"bing", "ddg"})
+
+    def test_thin_answer_is_hedged_at_once(self):
+        t0 = time.monotonic()
+        raw, used = hedging.hedged_round("q", [("bing", _answer("bing", n=1))], [("brave", _answer("brave"))], 5)
+        self.assertLess(time.monotonic() - t0, 1)
+        self.assertEqual(used, {"bing", "brave"})
+        self.assertEqual([r.source for r in raw], ["bing"] + ["brave"] * hedging.ADEQUATE)
+
+    def test_silent_engine_is_hedged_after_its_delay(self):
+        with mock.patch.object(hedging, "HEDGE_DEFAULT", 0.1):
+            t0 = time.monotonic()
+            raw, used = hedging.hedged_round("q", [("bing", _answer("bing", release=self.release))], [("brave", _answer("brave"))], 5)
+        self.assertLess(time.monotonic() - t0, 2)
+        self.assertEqual(used, {"bing", "brave"})
+        self.assertEqual({r.source for r in raw}, {"brave"})   # the straggler is abandoned
+
+    def test_fastest_healthy_spare_is_picked(self):
+        for _ in range(hedging.MIN_SAMPLES):
+            hedging.stats.record("mojeek", 0.2, True)
+            hedging.stats.record("brave", 0.8, True)
+            hedging.stats.record("yahoo", 0.1, False)
+        spares = [("brave", _answer("brave")), ("mojeek", _answer("mojeek")), ("yahoo", _answer("yahoo"))]
+        _, used = hedging.hedged_round("q", [("bing", _answer("bing", n=0))], spares, 5)
+        self.assertEqual(used, {"bing", "mojeek"})
+
+    def test_one_hedge_per_slot(self):
+        spares = [("brave", _answer("brave", n=0)), ("mojeek", _answer("mojeek", n=0))]
+        _, used = hedging.hedged_round("q", [("bing", _answer("bing", n=0))], spares, 5)
+        self.assertEqual(len(used), 2)
+
+    def test_round_ends_at_the_timeout(self):
+        t0 = time.monotonic()
+        raw, _ = hedging.hedged_round("q", [("bing", _answer("bing", release=self.release))], [], 0.2)
+        self.assertLess(time.monotonic() - t0, 1)
+        self.assertEqual(raw, [])
@@ -0,0 +1,91 @@
+import time
+from unittest import mock
+
+import httpx
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from apps.search import deadline, http_cache
+from apps.search.http_cache import ConditionalCacheTransport
+
+
+class ConditionalCacheTests(SimpleTestCase):
+    URL = "https://api.github.com/users/janedoe"
+
+    def setUp(self):
+        cache.clear()
+        self.seen: list[httpx.Request] = []
+        self.answer = lambda request: httpx.Response(200, json={"login": "janedoe"}, headers={"ETag": '"v1"'})
+        self.client = httpx.Client(transport=ConditionalCacheTransport(httpx.MockTransport(self._upstream)))
+
+    def tearDown(self):
+        cache.clear()
+
+    def _upstream(self, request: httpx.Request) -> httpx.Response:
+        self.seen.append(request)
+        return self.answer(request)
+
+    def test_revalidates_with_the_stored_etag(self):
+        first = self.client.get(self.URL)
+        self.answer = lambda request: httpx.Response(304)
+        second = self.client.get(self.URL)
+        self.assertEqual(self.seen[1].headers["if-none-match"], '"v1"')
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(second.headers["x-firecat-cache"], "revalidated")
+
+    def test_fresh_entries_skip_the_network(self):
+        self.answer = lambda request: httpx.Response(200, json={"n": 1}, headers={"ETag": '"v1"', "Cache-Control": "max-age=60"})
+        self.client.get(self.URL)
+        r = self.client.get(self.URL)
+        self.assertEqual(len(self.seen), 1)
+        self.assertEqual(r.headers["x-firecat-cache"], "fresh")
+
+    def test_no_store_is_not_fresh(self):
+        self.answer = lambda request: httpx.Response(200, json={}, headers={"ETag": '"v1"', "Cache-Control": "no-store, max-age=60"})
+        self.client.get(self.URL)
+        self.client.get(self.URL)
+        self.assertEqual(len(self.seen), 2)
+
+    def test_exhausted_rate_limit_defers_or_serves_stale(self):
+        reset = str(int(time.time()) + 3600)
+        self.answer = lambda request: httpx.Response(
+            200, json={}, headers={"ETag": '"v1"', "X-RateLimit-Remaining": "1", "X-RateLimit-Reset": reset},
+        )
+        self.client.get(self.URL)
+        stale = self.client.get(self.URL)
+        self.assertEqual(stale.headers["x-firecat-cache"], "stale")
+        deferred = self.client.get("https://api.github.com/users/someone-else")
+        self.assertEqual(deferred.status_code, 429)
+        self.assertEqual(deferred.headers["x-firecat-cache"], "deferred")
+        self.assertEqual(len(self.seen), 1)
+
+    def _limit_resets_in(self, seconds: float) -> None:
+        http_cache.cache.set(http_cache._limit_key("api.github.com"), (0, time.time() + seconds), timeout=60)
+
+    def test_short_deferral_sleeps_within_the_budget(self):
+        self._limit_resets_in(2)
+        with mock.patch.object(http_cache.time, "sleep") as sleep:
+            r = self.client.get(self.URL)
+        self.assertEqual(r.status_code, 200)
+        self.assertAlmostEqual(sleep.call_args[0][0], 2, delta=0.5)
+
+    def test_deferral_past_the_deadline_is_a_429(self):
+        self._limit_resets_in(2)
+        with mock.patch.object(http_cache.time, "sleep") as sleep:
+            r = deadline.within(time.monotonic() + 0.5, self.client.get, self.URL)
+        sleep.assert_not_called()
+        self.assertEqual(r.status_code, 429)
+        self.assertEqual(r.headers["x-firecat-cache"], "deferred")
+        self.assertEqual(self.seen, [])
+
+    def test_api_client_keeps_no_cookies(self):
+        self.assertEqual(len(http_cache.api_client.cookies.jar), 0)
+        answer = httpx.Response(200, headers={"set-cookie": "sessionid=VICTIM"}, request=httpx.Request("GET", self.URL))
+        http_cache.api_client.cookies.extract_cookies(answer)
+        self.assertEqual(len(http_cache.api_client.cookies.jar), 0)
+
+    def test_non_get_passes_through(self):
+        self.client.post(self.URL, json={})
+        self.client.post(self.URL, json={})
+        self.assertEqual(len(self.seen), 2)
@@ -0,0 +1,112 @@
+import os
+import tempfile
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from apps.search import jobqueue, priority, views
+from apps.search.records import Result
+
+
+def _job(prio: int = 50, **extra) -> dict:
+    return {"id": f"job{prio}", "group": "person_web", "q": "ada", "deadline": time.time() + 30, "priority": prio, **extra}
+
+
+class LocalBackendTests(SimpleTestCase):
+
+    def test_replies_are_routed_by_job_id(self):
+        b = jobqueue.LocalBackend()
+        b.reply("a", {"id": "a"})
+        b.reply("b", {"id": "b"})
+        self.assertEqual(b.result("b", 1)["id"], "b")
+        self.assertEqual(b.result("a", 1)["id"], "a")
+        self.assertIsNone(b.result("a", 0.05))      # taken once
+
+    def test_uncollected_replies_expire(self):
+        b = jobqueue.LocalBackend()
+        with mock.patch.object(jobqueue, "REPLY_TTL", 0):
+            b.reply("orphan", {"id": "orphan"})
+            time.sleep(0.01)
+            b.reply("fresh", {"id": "fresh"})
+        self.assertEqual(list(b._replies), ["fresh"])
+
+
+class SQLiteBackendTests(SimpleTestCase):
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        self.addCleanup(os.unlink, self.path)
+        self.web, self.worker = jobqueue.SQLiteBackend(self.path), jobqueue.SQLiteBackend(self.path)
+
+    def test_jobs_pop_by_priority(self):
+        for prio in (30, 90, 60):
+            self.web.push(_job(prio))
+        self.assertEqual(self.web.depth(), 3)
+        self.assertEqual([self.worker.pop(0)["priority"] for _ in range(3)], [90, 60, 30])
+        self.assertIsNone(self.worker.pop(0))
+        self.assertEqual(self.web.depth(), 0)
+
+    def test_reply_reaches_any_process_waiting_on_the_job(self):
+        self.worker.reply("job1", {"id": "job1", "items": []})
+        other_web = jobqueue.SQLiteBackend(self.path)
+        self.assertIsNone(other_web.result("job2", 0))
+        self.assertEqual(other_web.result("job1", 1)["id"], "job1")
+        self.assertIsNone(self.web.result("job1", 0))
+
+    def test_uncollected_replies_expire(self):
+        self.worker.reply("orphan", {"id": "orphan"})
+        self.worker._db().execute("UPDATE results SET created = created - ?", (jobqueue.REPLY_TTL + 1,))
+        self.worker.reply("fresh", {"id": "fresh"})
+        self.assertEqual(self.web._db().execute("SELECT job FROM results").fetchall(), [("fresh",)])
+
+
+class RunGroupTests(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        patchers = [
+            mock.patch.object(jobqueue, "_backend", jobqueue.LocalBackend()),
+            mock.patch.object(views, "_search_group", self._search_group),
+        ]
+        for p in patchers:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def _search_group(self, group, q, plan=None, state=None):
+        return group["id"], [Result(f"{q} hit", "https://example.com/", "example.com", "", "bing")]
+
+    def test_runs_on_a_worker_and_returns_the_reply(self):
+        gid, items, _ = jobqueue.run_group(views.GROUP_BY_ID["person_web"], "ada", None, time.monotonic() + 5)
+        self.assertEqual(gid, "person_web")
+        self.assertEqual([i.title for i in items], ["ada hit"])
+        self.assertIsInstance(items[0], Result)
+
+    def test_late_job_is_answered_empty(self):
+        reply = jobqueue.execute(_job(deadline=time.time() - 1))
+        self.assertEqual(reply["items"], [])
+
+    def test_unknown_group(self):
+        self.assertEqual(jobqueue.execute(_job(group="nope"))["items"], [])
+
+
+class QueueDepthShedTests(SimpleTestCase):
+
+    def setUp(self):
+        patcher = mock.patch.object(priority, "_refresh_learned", return_value={})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_depth_is_zero_without_a_queue(self):
+        with mock.patch.object(jobqueue, "QUEUE_URL", ""):
+            self.assertEqual(jobqueue.depth(), 0)
+
+    def test_queued_jobs_count_towards_shedding(self):
+        groups = priority.order([views.GROUP_BY_ID[g] for g in ("person_web", "person_paste")])
+        with mock.patch.object(jobqueue, "depth", return_value=priority.SHED_LOAD):
+            run, shed = priority.shed(groups)
+        self.assertEqual([g["id"] for g in run], ["person_web"])
+        self.assertEqual([g["id"] for g in shed], ["person_paste"])
@@ -0,0 +1,129 @@
+import dataclasses
+import datetime
+import decimal
+import json
+import unittest
+import uuid
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+
+from apps.search import jsonenc
+from apps.search.management.commands.bench_json import _history, _search_body
+from apps.search.records import Result
+from firecat_project.renderers import FastJSONRenderer
+
+
+UTC   = datetime.timezone.utc
+PLUS2 = datetime.timezone(datetime.timedelta(hours=2))
+
+
+@dataclasses.dataclass
+class Point:
+    x: int
+    y: str
+
+
+def _each(payload):
+    """{backend name: bytes} for every encoder available here."""
+    return {name: enc(payload) for name, enc in jsonenc.backends().items()}
+
+
+class SameBytesTests(SimpleTestCase):
+
+    def assertSameBytes(self, payload, expected=None):
+        outs = _each(payload)
+        self.assertEqual(len(set(outs.values())), 1, outs)
+        if expected is not None:
+            self.assertEqual(outs["stdlib"], expected)
+
+    def test_datetimes(self):
+        self.assertSameBytes(datetime.datetime(2026, 1, 1, tzinfo=UTC), b'"2026-01-01T00:00:00Z"')
+        self.assertSameBytes(datetime.datetime(2026, 1, 1, 1, 2, 3, 123456, tzinfo=UTC), b'"2026-01-01T01:02:03.123456Z"')
+        self.assertSameBytes(datetime.datetime(2026, 1, 1, 1, 2, 3, 123456, tzinfo=PLUS2), b'"2026-01-01T01:02:03.123456+02:00"')
+        self.assertSameBytes(datetime.datetime(2026, 1, 1, 1, 2, 3, 5), b'"2026-01-01T01:02:03.000005"')
+        self.assertSameBytes(datetime.date(2026, 1, 2), b'"2026-01-02"')
+        self.assertSameBytes(datetime.time(1, 2, 3, 456789), b'"01:02:03.456789"')
+
+    def test_types_neither_encoder_knows(self):
+        ident = uuid.UUID(int=7)
+        self.assertSameBytes(decimal.Decimal("1.10"), b'"1.10"')
+        self.assertSameBytes(ident, f'"{ident}"'.encode())
+        self.assertSameBytes(gettext_lazy("Search"), b'"Search"')
+        self.assertSameBytes({"tags": {"osint"}}, b'{"tags":["osint"]}')
+        self.assertSameBytes(Point(1, "é"), '{"x":1,"y":"é"}'.encode())
+
+    def test_compact_utf8_in_insertion_order(self):
+        self.assertSameBytes({"z": "jürgen — “x”", "a": [1, 2.5, None, True]}, '{"z":"jürgen — “x”","a":[1,2.5,null,true]}'.encode())
+        self.assertSameBytes({1: "int keys"}, b'{"1":"int keys"}')
+
+    def test_results_encode_as_their_dict_form(self):
+        r = Result("T", "https://a.example/x", "a.example", "S", "bing", osint=True)
+        self.assertSameBytes([r], json.dumps([r.as_dict()], separators=(",", ":")).encode())
+
+    def test_search_payloads(self):
+        body = _search_body(3)
+        self.assertSameBytes(body)
+        self.assertSameBytes({"type": "group", "group": body["groups"][0]})
+
+    def test_unknown_types_raise(self):
+        for name, enc in jsonenc.backends().items():
+            with self.subTest(backend=name), self.assertRaises(TypeError):
+                enc({"x": object()})
+
+
+@unittest.skipIf(jsonenc.orjson is None, "orjson is not installed")
+class KnownGapTests(SimpleTestCase):
+
+    def test_floats_with_an_exponent(self):
+        # Documented in jsonenc: the same number, written two ways
+        outs = _each([1e20, 1e-7])
+        self.assertEqual(outs["stdlib"], b"[1e+20,1e-07]")
+        self.assertEqual(outs["orjson"], b"[1e20,1e-7]")
+        self.assertEqual(json.loads(outs["stdlib"]), json.loads(outs["orjson"]))
+
+    def test_other_floats_agree(self):
+        self.assertEqual(len(set(_each([0.1, 1.5, 123456.789, 1e15, -0.0]).values())), 1)
+
+
+class BackendChoiceTests(SimpleTestCase):
+
+    @override_settings(SEARCH_JSON_BACKEND="stdlib")
+    def test_forced_backend(self):
+        self.assertEqual(jsonenc._pick()[0], "stdlib")
+
+    @override_settings(SEARCH_JSON_BACKEND="simdjson")
+    def test_unavailable_backend(self):
+        with self.assertRaises(ValueError):
+            jsonenc._pick()
+
+    @override_settings(SEARCH_JSON_BACKEND="auto")
+    def test_auto_prefers_orjson(self):
+        with mock.patch.object(jsonenc, "orjson", None):
+            self.assertEqual(jsonenc._pick()[0], "stdlib")
+        if jsonenc.orjson is not None:
+            self.assertEqual(jsonenc._pick()[0], "orjson")
+
+    def test_response(self):
+        r = jsonenc.response({"error": "Désolé"}, status=409)
+        self.assertEqual(r.status_code, 409)
+        self.assertEqual(r["Content-Type"], "application/json")
+        self.assertEqual(r.content, '{"error":"Désolé"}'.encode())
+
+
+class RendererTests(SimpleTestCase):
+
+    def test_matches_drf(self):
+        rows = _history(20) + [
+            {"visited_at": datetime.datetime(2026, 1, 1, 1, 2, 3, 123456, tzinfo=UTC)},
+            {"visited_at": datetime.datetime(2026, 1, 1, 1, 2, 3, 123456, tzinfo=PLUS2)},
+            {"title": "line\u2028separator\u2029", "score": decimal.Decimal("2.50"), "id": uuid.UUID(int=3)},
+        ]
+        self.assertEqual(FastJSONRenderer().render(rows), JSONRenderer().render(rows))
+
+    def test_indented_output_is_drfs(self):
+        ctx = {"indent": 2}
+        self.assertEqual(FastJSONRenderer().render({"a": 1}, renderer_context=ctx), JSONRenderer().render({"a": 1}, renderer_context=ctx))
+        self.assertEqual(FastJSONRenderer().render(None), b"")
@@ -0,0 +1,62 @@
+import io
+import re
+
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, TransactionTestCase
+
+from apps.search import outbound, stub_upstream, views
+from apps.search.management.commands._sampling import percentile
+from apps.search.management.commands.loadtest_search import _parse_mix, _QueryPool
+
+from .utils import no_latency
+
+
+class HelperTests(SimpleTestCase):
+
+    def test_parse_mix(self):
+        self.assertEqual(_parse_mix("person=3, username"), {"person": 3.0, "username": 1.0})
+        with self.assertRaises(CommandError):
+            _parse_mix("nonsense=1")
+
+    def test_percentile_interpolates(self):
+        self.assertEqual(percentile([], 50), 0.0)
+        self.assertEqual(percentile([1.0, 2.0, 3.0, 4.0], 50), 2.5)
+        self.assertEqual(percentile([5.0, 1.0], 100), 5.0)
+
+    def test_query_pool_reuses_completed_queries(self):
+        pool = _QueryPool(hit_ratio=1.0, seed=1)
+        q, warm = pool.pick("email")
+        self.assertFalse(warm)
+        self.assertRegex(q, r"^ada\d+@example\.com$")
+        pool.done("email", q)
+        self.assertEqual(pool.pick("email"), (q, True))
+
+
+class StubUpstreamTests(SimpleTestCase):
+
+    def test_every_engine_page_parses(self):
+        rows = stub_upstream._results('"ada lovelace" site:github.com', 1)
+        self.assertTrue(all("github.com" in link for _, link, _ in rows))
+        for engine, parse in (("bing", views._serp_bing), ("ddg", views._serp_ddg), ("brave", views._serp_brave),
+                              ("startpage", views._serp_startpage), ("mojeek", views._serp_mojeek),
+                              ("yahoo", views._serp_yahoo), ("google", views._serp_google)):
+            with self.subTest(engine=engine):
+                parsed = parse(stub_upstream._serp(engine, rows))
+                self.assertEqual([r[1] for r in parsed], [link for _, link, _ in rows])
+
+    def test_results_are_deterministic(self):
+        self.assertEqual(stub_upstream._results("x", 1), stub_upstream._results("x", 1))
+        self.assertNotEqual(stub_upstream._results("x", 1), stub_upstream._results("x", 2))
+
+
+class LoadTestCommandTests(TransactionTestCase):
+
+    def tearDown(self):
+        outbound.configure(outbound.LIVE)
+
+    def test_runs_searches_against_the_stub(self):
+        out = io.StringIO()
+        call_command("loadtest_search", clients=2, duration=1.0, mix="username=1", latency=no_latency(), stdout=out)
+        completed = int(re.search(r"searches completed : (\d+)", out.getvalue()).group(1))
+        self.assertGreater(completed, 0)
+        self.assertIn("errors/incomplete: 0", out.getvalue())
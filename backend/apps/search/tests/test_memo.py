@@ -0,0 +1,133 @@
+import threading
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from apps.search import deadline, hedging, memo, prefetch, views
+from apps.search.records import Result
+
+
+class _ClearCache:
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+
+class SharedTests(_ClearCache, SimpleTestCase):
+
+    def test_computes_once_then_reads_the_cache(self):
+        calls = []
+        for _ in range(3):
+            self.assertEqual(memo.shared("k", lambda: calls.append(1) or "v", 60), "v")
+        self.assertEqual(len(calls), 1)
+
+    def test_concurrent_callers_share_one_computation(self):
+        calls, release = [], threading.Event()
+
+        def compute():
+            calls.append(1)
+            release.wait(5)
+            return "v"
+
+        out: list[str] = []
+        threads = [threading.Thread(target=lambda: out.append(memo.shared("k", compute, 60))) for _ in range(4)]
+        for t in threads:
+            t.start()
+        time.sleep(0.1)
+        release.set()
+        for t in threads:
+            t.join(5)
+        self.assertEqual(out, ["v"] * 4)
+        self.assertEqual(len(calls), 1)
+
+    def test_result_past_the_deadline_is_not_cached(self):
+        def late():
+            time.sleep(0.05)
+            return "partial"
+
+        self.assertEqual(deadline.within(time.monotonic() + 0.01, memo.shared, "k", late, 60), "partial")
+        self.assertIsNone(cache.get("k"))
+
+    def test_cut_short_result_gets_a_short_ttl(self):
+        def cut():
+            memo.cut_short()
+            return "partial"
+
+        with mock.patch.object(memo.cache, "set", wraps=memo.cache.set) as setter:
+            memo.shared("cut", cut, 900)
+            memo.shared("whole", lambda: "done", 900)
+        self.assertEqual([c.kwargs["timeout"] for c in setter.call_args_list], [memo.PARTIAL_TTL, 900])
+
+    def test_cut_short_outside_a_computation_is_ignored(self):
+        memo.cut_short()
+        self.assertEqual(memo.shared("k", lambda: "v", 60), "v")
+
+    def test_timed_out_hedged_round_is_cut_short(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def silent(query):
+            release.wait(5)
+            return []
+
+        def round_():
+            raw, _ = hedging.hedged_round("q", [("bing", silent)], [], 0.1)
+            return raw
+
+        with mock.patch.object(memo.cache, "set", wraps=memo.cache.set) as setter:
+            memo.shared("round", round_, 900)
+        self.assertEqual(setter.call_args.kwargs["timeout"], memo.PARTIAL_TTL)
+
+
+class PrefetchTests(_ClearCache, SimpleTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.rounds: list[str] = []
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+        patcher = mock.patch.object(views, "_engine_round", self._engine_round)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _engine_round(self, query, q_words, prior=None):
+        self.rounds.append(query)
+        self.release.wait(5)
+        return [Result(query, "https://example.com/", "example.com", "", "bing")]
+
+    def _wait(self, session: str) -> None:
+        for _ in range(100):
+            if not prefetch.active()["jobs"]:
+                return
+            time.sleep(0.02)
+        self.fail(f"prefetch for {session} still running")
+
+    def test_warms_the_exact_phrase_round(self):
+        self.release.set()
+        self.assertTrue(prefetch.start("s1", "ada lovelace"))
+        self._wait("s1")
+        self.assertEqual(self.rounds, ['"ada lovelace"'])
+        self.assertEqual(len(views._cached_round('"ada lovelace"', ["ada", "lovelace"])), 1)
+        self.assertEqual(self.rounds, ['"ada lovelace"'])   # the real search reads what was warmed
+
+    def test_short_or_repeated_queries_start_nothing(self):
+        self.assertFalse(prefetch.start("s1", "ad"))
+        self.assertTrue(prefetch.start("s1", "ada lovelace"))
+        self.assertFalse(prefetch.start("s1", "ada lovelace "))
+        self.release.set()
+        self._wait("s1")
+
+    def test_new_query_cancels_the_previous_job(self):
+        prefetch.start("s1", "ada love")
+        time.sleep(0.05)
+        first = prefetch._jobs["s1"]
+        prefetch.start("s1", "ada lovelace")
+        self.assertTrue(first.cancel.is_set())
+        self.assertEqual(prefetch.active()["queries"], ["ada lovelace"])
+        prefetch.cancel("s1")
+        self.assertTrue(prefetch._jobs["s1"].cancel.is_set())
+        self.release.set()
+        self._wait("s1")
@@ -0,0 +1,112 @@
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from apps.search import metrics, outbound, proxy_views
+from apps.search.tests.utils import StubUpstreamMixin
+
+DEAD_PID = 2 ** 22 + 12345   # above pid_max — never a live process
+
+
+def _upstream(host: str, status: str = "2xx") -> float:
+    return dict((tuple(k), v) for k, v in metrics.UPSTREAM.samples()).get((host, status), 0)
+
+
+class RenderTests(SimpleTestCase):
+
+    def test_counter_and_histogram_exposition(self):
+        c = metrics.Counter("t_total", "help", ("a",))
+        h = metrics.Histogram("t_seconds", "help", (), buckets=(0.1, 1.0))
+        c.inc(2, a='x"y')
+        h.observe(0.05)
+        h.observe(0.5)
+        with mock.patch.dict(metrics._registry, {"t_total": c, "t_seconds": h}, clear=True), \
+             mock.patch.object(metrics, "METRICS_DIR", ""):
+            text = metrics.render()
+        self.assertIn('t_total{a="x\\"y"} 2', text)
+        self.assertIn('t_seconds_bucket{le="0.1"} 1', text)
+        self.assertIn('t_seconds_bucket{le="1.0"} 2', text)
+        self.assertIn('t_seconds_bucket{le="+Inf"} 2', text)
+        self.assertIn("t_seconds_count 2", text)
+
+
+class AsyncTransportTests(StubUpstreamMixin, SimpleTestCase):
+
+    def test_async_requests_are_counted(self):
+        before = _upstream("api.github.com")
+        asyncio.run(outbound.aget("https://api.github.com/users/ada"))
+        asyncio.run(outbound.aget("https://api.github.com/users/ada", verify=proxy_views.LEGACY_TLS))
+        self.assertEqual(_upstream("api.github.com"), before + 2)
+
+    def test_unknown_hosts_share_one_label(self):
+        before = _upstream("other", "4xx")
+        asyncio.run(outbound.aget("https://target.example/page"))
+        self.assertEqual(_upstream("other", "4xx"), before + 1)
+
+
+class MultiProcessTests(SimpleTestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.counter = metrics.Counter("t_total", "help", ("a",))
+        self.gauge   = metrics.Gauge("t_gauge", "help", (), lambda: {(): 1})
+        for target, value in (
+            ("METRICS_DIR", self.dir), ("_adopted", {}), ("_flushed", True),
+            ("_registry", {"t_total": self.counter, "t_gauge": self.gauge}),
+        ):
+            patcher = mock.patch.object(metrics, target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _write(self, pid: int, count: int, gauge: int = 5) -> str:
+        path = os.path.join(self.dir, f"{pid}.json")
+        with open(path, "w") as fh:
+            json.dump({"pid": pid, "families": {
+                "t_total": {"kind": "counter", "help": "help", "labels": ["a"], "buckets": [], "samples": [[["x"], count]]},
+                "t_gauge": {"kind": "gauge", "help": "help", "labels": [], "buckets": [], "samples": [[[], gauge]]},
+            }}, fh)
+        return path
+
+    def _totals(self) -> tuple[float, float]:
+        merged = metrics.collect()
+        return merged["t_total"]["samples"].get(("x",), 0), merged["t_gauge"]["samples"].get((), 0)
+
+    def test_live_processes_are_summed(self):
+        self.counter.inc(1, a="x")
+        self._write(os.getppid(), 10)
+        self.assertEqual(self._totals(), (11, 6))
+
+    def test_dead_process_file_is_taken_over(self):
+        self.counter.inc(1, a="x")
+        dead = self._write(DEAD_PID, 10)
+        self.assertEqual(self._totals(), (11, 1))   # its counter still counts, its gauge does not
+        self.assertFalse(os.path.exists(dead))
+        self.assertEqual(os.listdir(self.dir), [f"{os.getpid()}.json"])
+        self.assertEqual(self._totals(), (11, 1))   # once, not twice
+
+    def test_takeover_passes_on_what_was_taken_over(self):
+        self._write(DEAD_PID, 10)
+        metrics.collect()
+        # Now we exit too, and another process finds our file
+        ours = os.path.join(self.dir, f"{os.getpid()}.json")
+        with open(ours) as fh:
+            snap = {**json.load(fh), "pid": DEAD_PID + 1}
+        os.unlink(ours)
+        with open(os.path.join(self.dir, f"{DEAD_PID + 1}.json"), "w") as fh:
+            json.dump(snap, fh)
+        metrics._adopted.clear()
+        self.assertEqual(self._totals(), (10, 1))
+
+    def test_reused_pid_keeps_the_old_totals(self):
+        own = self._write(os.getpid(), 7)
+        with mock.patch.object(metrics, "_flushed", False):
+            metrics.flush()
+        with open(own) as fh:
+            self.assertEqual(json.load(fh)["adopted"]["t_total"]["samples"], [[["x"], 7]])
+        self.assertEqual(self._totals(), (7, 1))
@@ -0,0 +1,127 @@
+from unittest import mock
+
+from django.core import signing
+from django.core.cache import cache
+from django.test import TestCase
+
+from apps.search import scheduler, views
+from apps.search.records import Result
+
+Q     = "ada lovelace"
+GROUP = views.GROUP_BY_ID["person_web"]
+
+
+def _hits(start: int, count: int) -> list[Result]:
+    return [Result(f"Ada Lovelace {i}", f"https://site{i}.com/ada", f"site{i}.com", "", "bing") for i in range(start, start + count)]
+
+
+class _MoreTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.rounds: list[str] = []
+        for name, fake in (("_engine_round", self._engine_round), ("_fetch_bing", lambda *a, **k: [])):
+            patcher = mock.patch.object(views, name, fake)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _engine_round(self, query, q_words, prior=None):
+        self.rounds.append(query)
+        return _hits(0, 10) + _hits(100 + 10 * len(self.rounds), 10)   # old links come back with new ones
+
+    def _cursor(self, served: list[Result], backlog: list[Result], qi: int = 0) -> str:
+        return views._save_more(GROUP, Q, 0, {
+            "qi": qi, "o": {}, "seen": [views._link_digest(i.link) for i in served], "backlog": backlog,
+        })
+
+    def _more(self, token: str):
+        return self.client.get("/api/search/more/", {"cursor": token})
+
+
+class SearchMoreTests(_MoreTestCase):
+
+    def test_never_serves_a_link_twice(self):
+        token  = self._cursor(_hits(0, 25), _hits(20, 10))
+        served = {i.link for i in _hits(0, 25)}
+        for _ in range(3):
+            items, token = views._search_more(views._load_cursor(token))
+            links = {i.link for i in items}
+            self.assertTrue(items)
+            self.assertFalse(links & served)
+            served |= links
+        self.assertEqual(self.rounds[0], views._build_queries(GROUP, Q)[0])
+
+    def test_seen_links_travel_in_the_cursor(self):
+        token = self._cursor(_hits(0, 25), [])
+        cur   = views._load_cursor(token)
+        self.assertEqual(len(cur["s"]), 25)
+        self.assertNotIn("k", cur)
+        cache.clear()
+        items, _ = views._search_more(cur)   # nothing cached — still no repeats
+        self.assertFalse({i.link for i in items} & {i.link for i in _hits(0, 25)})
+
+    def test_backlog_is_stored_per_cursor_and_only_when_there_is_one(self):
+        self.assertIsNone(self._cursor(_hits(0, 5), [], qi=len(views._build_queries(GROUP, Q))))
+        first  = views._load_cursor(self._cursor(_hits(0, 5), _hits(5, 5)))
+        second = views._load_cursor(self._cursor(_hits(0, 5), _hits(50, 5)))
+        self.assertNotEqual(first["k"], second["k"])
+        self.assertEqual([i.link for i in cache.get(views._backlog_key(first["k"]))], [i.link for i in _hits(5, 5)])
+
+    def test_expired_backlog_is_gone_not_reset(self):
+        token = self._cursor(_hits(0, 25), _hits(25, 5))
+        cache.clear()
+        self.assertIsNone(views._search_more(views._load_cursor(token)))
+        self.assertEqual(self._more(token).status_code, 410)
+        self.assertEqual(self.rounds, [])
+
+    def test_view(self):
+        r = self._more(self._cursor(_hits(0, 25), _hits(25, 5)))
+        self.assertEqual(r.status_code, 200)
+        group = r.json()["group"]
+        self.assertEqual(group["id"], "person_web")
+        self.assertEqual([i["link"] for i in group["items"]][:5], [i.link for i in _hits(25, 5)])
+        self.assertIsNotNone(group["cursor"])
+
+    def test_bad_cursor(self):
+        self.assertEqual(self._more("nope").status_code, 400)
+        forged = signing.dumps({"g": "person_web", "q": Q}, salt="another.salt")
+        self.assertEqual(self._more(forged).status_code, 400)
+
+    def test_full_queue_answers_429(self):
+        busy = scheduler.Admission(slots=1, queue_limit=0, session_limit=0)
+        busy.admit("someone else")
+        with mock.patch.object(scheduler, "admission", busy):
+            r = self._more(self._cursor(_hits(0, 25), _hits(25, 5)))
+        self.assertEqual(r.status_code, 429)
+        self.assertEqual(r["Retry-After"], str(busy.retry_after()))
+        self.assertEqual(self.rounds, [])
+
+    def test_takes_and_returns_a_search_slot(self):
+        admission = scheduler.Admission(slots=1, queue_limit=0, session_limit=0)
+        with mock.patch.object(scheduler, "admission", admission):
+            self.assertEqual(self._more(self._cursor(_hits(0, 25), _hits(25, 5))).status_code, 200)
+            self.assertEqual(admission.stats()["running"], 0)
+
+
+class SearchCursorTests(_MoreTestCase):
+    """Cursors handed out by a search, fresh and cached."""
+
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.object(views, "_search_group", self._search_group)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _search_group(self, group, q, plan=None, state=None):
+        state["qi"], state["raw"] = 1, _hits(0, 40)
+        return group["id"], _hits(0, 25)
+
+    def _search(self):
+        return self.client.get("/api/search/", {"q": Q, "groups": "person_web"}).json()["groups"][0]["cursor"]
+
+    def test_cached_group_keeps_its_cursor(self):
+        fresh, cached = self._search(), self._search()
+        self.assertEqual(fresh, cached)
+        items = self._more(cached).json()["group"]["items"]
+        self.assertEqual([i["link"] for i in items][:15], [i.link for i in _hits(25, 15)])
@@ -0,0 +1,50 @@
+import asyncio
+from unittest import mock
+
+import httpx
+from django.test import SimpleTestCase
+
+from apps.search import outbound
+
+
+class CookieServer:
+    """Sets a session cookie on every answer and records the Cookie header it was sent."""
+
+    def __init__(self) -> None:
+        self.sent: list[str | None] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.sent.append(request.headers.get("cookie"))
+        return httpx.Response(200, headers={"set-cookie": "sessionid=VICTIM; Path=/"}, text="ok")
+
+
+class SharedClientCookieTests(SimpleTestCase):
+
+    def setUp(self):
+        self.server = CookieServer()
+        outbound.configure(outbound.MODE)
+        self.addCleanup(outbound.configure, outbound.MODE)
+        for name in ("transport", "async_transport"):
+            patcher = mock.patch.object(outbound, name, lambda verify=True: httpx.MockTransport(self.server))
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_sync_client_keeps_no_cookies(self):
+        outbound.get("https://a.example/login")
+        outbound.get("https://a.example/next")
+        self.assertEqual(self.server.sent, [None, None])
+        self.assertEqual(len(outbound.client().cookies.jar), 0)
+
+    def test_async_client_keeps_no_cookies(self):
+        async def run():
+            await outbound.aget("https://a.example/login")
+            await outbound.aget("https://a.example/next")
+            return len(outbound.async_client().cookies.jar)
+
+        self.assertEqual(asyncio.run(run()), 0)
+        self.assertEqual(self.server.sent, [None, None])
+
+    def test_per_request_cookies_are_still_sent(self):
+        outbound.get("https://a.example/", cookies={"consent": "yes"})
+        outbound.get("https://a.example/")
+        self.assertEqual(self.server.sent, ["consent=yes", None])
@@ -0,0 +1,65 @@
+from concurrent.futures.process import BrokenProcessPool
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from apps.search import concurrency, parsing, views
+from apps.search.stub_upstream import _results, _serp
+
+
+def _echo(html: str, suffix: str) -> str:
+    return html + suffix
+
+
+class SizeTests(SimpleTestCase):
+
+    def test_size(self):
+        self.assertEqual(parsing._size("4"), 4)
+        self.assertEqual(parsing._size(""), 0)
+        self.assertEqual(parsing._size("-2"), 0)
+        self.assertEqual(parsing._size("lots"), 0)
+        with mock.patch.object(concurrency, "gil_enabled", return_value=False):
+            self.assertEqual(parsing._size("auto"), 0)   # free-threaded: parse on the group threads
+        with mock.patch.object(concurrency, "gil_enabled", return_value=True):
+            self.assertGreaterEqual(parsing._size("AUTO"), 1)
+
+
+class InlineTests(SimpleTestCase):
+
+    def setUp(self):
+        patcher = mock.patch.object(parsing, "PROCESSES", 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_no_pool_parses_inline(self):
+        self.assertIsNone(parsing.pool())
+        self.assertEqual(parsing.run(_echo, "a", "b"), "ab")
+
+    def test_bytes_are_decoded_with_the_given_encoding(self):
+        self.assertEqual(parsing.run(_echo, "é".encode("latin-1"), "!", encoding="latin-1"), "é!")
+        self.assertEqual(parsing.run(_echo, b"\xc3", b"!"), b"\xc3!")   # no encoding: bytes as they came
+
+    def test_broken_pool_falls_back_inline_and_resets(self):
+        broken = mock.Mock()
+        broken.submit.side_effect = BrokenProcessPool()
+        with mock.patch.object(parsing, "pool", return_value=broken), mock.patch.object(parsing, "_pool", broken):
+            self.assertEqual(parsing.run(_echo, "a", "b"), "ab")
+            self.assertIsNone(parsing._pool)
+
+
+class PoolTests(SimpleTestCase):
+    """A real one-process pool — the parsers must give the same rows as inline."""
+
+    def setUp(self):
+        patchers = [mock.patch.object(parsing, "PROCESSES", 1), mock.patch.object(parsing, "_pool", None)]
+        for p in patchers:
+            p.start()
+        self.addCleanup(lambda: [p.stop() for p in patchers])
+        self.addCleanup(lambda: parsing._pool and parsing._pool.shutdown(wait=True))
+
+    def test_serp_rows_match_inline(self):
+        html = _serp("bing", _results('"ada lovelace"', 1)).encode()
+        rows = parsing.run(views._serp_bing, html, encoding="utf-8")
+        self.assertIsNotNone(parsing._pool)
+        self.assertTrue(rows)
+        self.assertEqual(rows, views._serp_bing(html.decode()))
@@ -0,0 +1,83 @@
+import threading
+
+from django.test import SimpleTestCase
+
+from apps.search import planner
+from apps.search.planner import QueryPlan
+from apps.search.records import Result
+
+
+def _r(link: str) -> Result:
+    return Result("t", link, "", "", "bing")
+
+
+class QueryTextTests(SimpleTestCase):
+
+    def test_canonicalise_sorts_and_dedupes_sites(self):
+        self.assertEqual(
+            planner.canonicalise('"ada"   site:b.com OR site:a.com OR site:b.com'),
+            '"ada" site:a.com OR site:b.com',
+        )
+        self.assertEqual(planner.canonicalise('  "ada  lovelace"   x '), '"ada  lovelace" x')
+
+    def test_split_sites(self):
+        self.assertEqual(planner.split_sites('site:a.com OR site:b.com "ada"'), ('"ada"', ["a.com", "b.com"]))
+        self.assertIsNone(planner.split_sites('"ada" site:a.com "x" site:b.com'))   # not one chain
+        self.assertIsNone(planner.split_sites('"ada" OR "bob" site:a.com'))          # boolean OR in the base
+        self.assertIsNone(planner.split_sites('"ada" -site:a.com site:b.com'))
+        self.assertIsNone(planner.split_sites('"ada"'))
+
+    def test_site_matches(self):
+        self.assertTrue(planner.site_matches("https://www.github.com/ada", "github.com"))
+        self.assertTrue(planner.site_matches("https://gist.github.com/ada", "github.com"))
+        self.assertTrue(planner.site_matches("https://linkedin.com/in/ada", "linkedin.com/in"))
+        self.assertFalse(planner.site_matches("https://linkedin.com/company/x", "linkedin.com/in"))
+        self.assertFalse(planner.site_matches("https://notgithub.com/ada", "github.com"))
+
+
+class QueryPlanTests(SimpleTestCase):
+
+    def setUp(self):
+        self.ran: list[str] = []
+        self.lock = threading.Lock()
+
+    def _runner(self, text: str) -> list[Result]:
+        with self.lock:
+            self.ran.append(text)
+        return [_r("https://github.com/ada"), _r("https://twitter.com/ada"), _r("https://example.org/ada")]
+
+    def test_merges_site_queries_sharing_a_base(self):
+        plan = QueryPlan({
+            "dev":    ['"ada" site:github.com OR site:gitlab.com'],
+            "social": ['"ada" site:twitter.com', '"ada"'],
+            "web":    ['"ada"'],
+        }, self._runner)
+        self.assertEqual(plan.planned, ['"ada"', '"ada" site:github.com OR site:gitlab.com OR site:twitter.com'])
+        self.assertEqual(plan.stats()["requested"], 4)
+
+    def test_routes_results_back_by_site(self):
+        plan = QueryPlan({"dev": ['"ada" site:github.com'], "social": ['"ada" site:twitter.com']}, self._runner)
+        self.assertEqual([i.link for i in plan.fetch('"ada" site:github.com')], ["https://github.com/ada"])
+        self.assertEqual([i.link for i in plan.fetch('"ada"  site:twitter.com')], ["https://twitter.com/ada"])
+        self.assertEqual(len(self.ran), 1)
+
+    def test_long_site_lists_are_chunked(self):
+        sites = [f"s{i}.com" for i in range(planner.SITE_MERGE_MAX + 2)]
+        plan  = QueryPlan({"g": [planner.join_sites('"ada"', sites)]}, self._runner)
+        self.assertEqual(len(plan.planned), 2)
+        plan.fetch(planner.join_sites('"ada"', sites))
+        self.assertEqual(sorted(self.ran), sorted(plan.planned))
+
+    def test_concurrent_callers_share_one_run(self):
+        plan = QueryPlan({"a": ['"ada"'], "b": ['"ada"']}, self._runner)
+        threads = [threading.Thread(target=plan.fetch, args=('"ada"',)) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(self.ran, ['"ada"'])
+        self.assertEqual(plan.stats()["executed"], 1)
+
+    def test_failing_runner_yields_nothing(self):
+        plan = QueryPlan({"a": ['"ada"']}, lambda text: 1 / 0)
+        self.assertEqual(plan.fetch('"ada"'), [])
@@ -0,0 +1,113 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from apps.search import priority, views
+from apps.search.models import GroupClick
+
+
+def _groups(*ids: str) -> list[dict]:
+    return [views.GROUP_BY_ID[i] for i in ids]
+
+
+class _NoLearned:
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.object(priority, "_refresh_learned", return_value={})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class PriorityTests(_NoLearned, SimpleTestCase):
+
+    def test_order_is_highest_first(self):
+        ordered = priority.order(_groups("person_paste", "person_news", "person_web"))
+        self.assertEqual([g["id"] for g in ordered], ["person_web", "person_news", "person_paste"])
+
+    @override_settings(SEARCH_GROUP_PRIORITIES={"person_paste": 99})
+    def test_settings_override(self):
+        self.assertEqual(priority.of(views.GROUP_BY_ID["person_paste"]), 99)
+
+    def test_running_sets_the_current_priority(self):
+        self.assertEqual(priority.current(), priority.DEFAULT_PRIORITY)
+        with priority.running(80):
+            self.assertEqual(priority.current(), 80)
+        self.assertEqual(priority.current(), priority.DEFAULT_PRIORITY)
+
+    def test_sheds_low_priority_groups_under_load(self):
+        groups = priority.order(_groups("person_web", "person_news", "person_paste", "person_records"))
+        run, shed = priority.shed(groups)
+        self.assertEqual(shed, [])
+        with mock.patch.object(priority, "_active", priority.SHED_LOAD - 2):
+            run, shed = priority.shed(groups)
+        self.assertEqual([g["id"] for g in run], ["person_web", "person_news"])
+        self.assertEqual([g["id"] for g in shed], ["person_paste", "person_records"])
+
+    def test_high_priority_groups_are_never_shed(self):
+        with mock.patch.object(priority, "_active", priority.SHED_LOAD + 10):
+            run, shed = priority.shed(_groups("person_web", "person_news"))
+        self.assertEqual(len(run), 2)
+        self.assertEqual(shed, [])
+
+
+class LearnedBonusTests(TestCase):
+
+    def setUp(self):
+        priority._learned, priority._learned_at = {}, 0.0
+        self.addCleanup(setattr, priority, "_learned_at", 0.0)
+        self.addCleanup(setattr, priority, "_learned", {})
+
+    def test_clicks_raise_a_group_within_its_category(self):
+        GroupClick.objects.create(group_id="person_paste", clicks=100)
+        GroupClick.objects.create(group_id="person_news", clicks=1)
+        learned = priority._refresh_learned()
+        self.assertEqual(learned["person_paste"], priority.LEARN_WEIGHT)
+        self.assertLess(learned["person_news"], priority.LEARN_WEIGHT)
+        self.assertEqual(priority.of(views.GROUP_BY_ID["person_paste"]), 30 + priority.LEARN_WEIGHT)
+
+    def test_record_click(self):
+        priority.record_click("person_news")
+        priority.record_click("person_news")
+        self.assertEqual(GroupClick.objects.get(group_id="person_news").clicks, 2)
+
+
+class ClickViewTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def _click(self, group: str = "person_news", client=None):
+        return (client or self.client).post("/api/search/click/", {"group": group}, content_type="application/json")
+
+    def _with_session(self, client=None):
+        client = client or self.client
+        session = client.session
+        session.save()
+        client.cookies["sessionid"] = session.session_key
+        return client
+
+    def _clicks(self) -> int:
+        row = GroupClick.objects.filter(group_id="person_news").first()
+        return row.clicks if row else 0
+
+    def test_unknown_group(self):
+        self.assertEqual(self._click("nope").status_code, 400)
+
+    def test_needs_a_session(self):
+        self.assertEqual(self._click().status_code, 403)
+        self.assertEqual(self._clicks(), 0)
+
+    def test_one_click_per_session_and_group(self):
+        self._with_session()
+        self.assertTrue(self._click().json()["counted"])
+        self.assertFalse(self._click().json()["counted"])
+        self.assertTrue(self._click("person_web").json()["counted"])
+        self.assertEqual(self._clicks(), 1)
+
+    def test_clicks_per_address_are_capped(self):
+        with mock.patch.object(views, "CLICK_IP_LIMIT", 2):
+            counted = [self._click(client=self._with_session(self.client_class())).json()["counted"] for _ in range(4)]
+        self.assertEqual(counted, [True, True, False, False])
+        self.assertEqual(self._clicks(), 2)
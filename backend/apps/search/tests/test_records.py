@@ -0,0 +1,91 @@
+import json
+import pickle
+import sys
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from apps.search import jsonenc, records
+from apps.search.records import Result
+
+
+def _fresh(s: str) -> str:
+    """An equal string that is not the interned object."""
+    return "".join(list(s))
+
+
+class Marked(str):
+    """Parsers may hand over str subclasses (e.g. bs4's NavigableString)."""
+
+
+class ResultTests(SimpleTestCase):
+
+    def test_source_and_domain_are_interned(self):
+        a = Result("A", "https://x.example/a", _fresh("x.example"), "", _fresh("duckduckgo"))
+        b = Result("B", "https://x.example/b", _fresh("x.example"), "", _fresh("duckduckgo"))
+        self.assertIs(a.source, b.source)
+        self.assertIs(a.display_link, b.display_link)
+        self.assertIs(a.source, sys.intern("duckduckgo"))
+
+    def test_str_subclasses_and_empty_fields(self):
+        r = Result(None, None, Marked("x.example"), None, Marked("bing"))   # type: ignore[arg-type]
+        self.assertIs(type(r.source), str)
+        self.assertIs(r.source, sys.intern("bing"))
+        self.assertEqual((r.title, r.link, r.snippet), ("", "", ""))
+        self.assertEqual(Result("t", "l", "", "s", "").source, "")
+
+    def test_slots_only(self):
+        r = Result("t", "l", "d", "s", "bing")
+        self.assertFalse(hasattr(r, "__dict__"))
+        with self.assertRaises(AttributeError):
+            r.extra = 1   # type: ignore[attr-defined]
+
+    def test_pickle_round_trip_interns_again(self):
+        rows = [Result(f"T{i}", f"https://x.example/{i}", _fresh("x.example"), "S", _fresh("startpage"), osint=i == 0) for i in range(3)]
+        back = pickle.loads(pickle.dumps(rows))
+        self.assertEqual([r.as_dict() for r in back], [r.as_dict() for r in rows])
+        for r in back:
+            self.assertIs(r.source, sys.intern("startpage"))
+            self.assertIs(r.display_link, sys.intern("x.example"))
+        self.assertTrue(back[0].osint)
+        self.assertFalse(back[1].osint)
+
+    def test_cached_results_come_back_as_records(self):
+        self.addCleanup(cache.clear)
+        cache.set("records-test", [Result("T", "https://x.example/", "x.example", "S", _fresh("mojeek"))])
+        r = cache.get("records-test")[0]
+        self.assertIsInstance(r, Result)
+        self.assertIs(r.source, sys.intern("mojeek"))
+
+
+class WireFormTests(SimpleTestCase):
+
+    def test_as_dict(self):
+        r = Result("T", "https://x.example/", "x.example", "S", "bing")
+        self.assertEqual(r.as_dict(), {"title": "T", "link": "https://x.example/", "displayLink": "x.example", "snippet": "S", "source": "bing"})
+        self.assertIs(Result("T", "l", "d", "S", "bing", osint=True).as_dict()["osint"], True)
+
+    def test_from_dict_round_trip(self):
+        for osint in (False, True):
+            r = Result("T", "https://x.example/", "x.example", "S", "bing", osint=osint)
+            self.assertEqual(Result.from_dict(r.as_dict()).as_dict(), r.as_dict())
+
+    def test_from_dict_tolerates_missing_keys(self):
+        r = Result.from_dict({"link": "https://x.example/", "source": "brave"})
+        self.assertEqual((r.title, r.display_link, r.snippet, r.osint), ("", "", "", False))
+        self.assertIs(r.source, sys.intern("brave"))
+
+    def test_coerce(self):
+        kept = Result("A", "https://a.example/", "a.example", "", "bing")
+        out  = records.coerce([kept, {"title": "B", "link": "https://b.example/", "source": "ddg", "osint": True}])
+        self.assertIs(out[0], kept)
+        self.assertIsInstance(out[1], Result)
+        self.assertTrue(out[1].osint)
+        self.assertEqual(records.coerce([]), [])
+
+    def test_job_reply_round_trip(self):
+        # Worker replies travel as JSON (jobqueue) and come back as records
+        items = [Result("T", "https://x.example/", "x.example", "S", "bing", osint=True)]
+        back  = records.coerce(json.loads(jsonenc.dumps({"items": items}))["items"])
+        self.assertEqual([r.as_dict() for r in back], [r.as_dict() for r in items])
+        self.assertIs(back[0].source, sys.intern("bing"))
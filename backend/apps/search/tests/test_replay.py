@@ -0,0 +1,81 @@
+import asyncio
+import tempfile
+from unittest import mock
+
+import httpx
+from django.test import SimpleTestCase
+
+from apps.search import scheduler, views
+from apps.search.management.commands.bench_search import run_search
+from apps.search.replay import RECORD, REPLAY, RecordReplayTransport, load_latency
+
+from .utils import StubUpstreamMixin
+
+
+class RecordReplayTests(SimpleTestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+        self.calls = 0
+
+    def _upstream(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        return httpx.Response(200, content=f"body for {request.url.params['q']}".encode(), headers={"X-Upstream": "1"})
+
+    def _record(self, url: str) -> httpx.Response:
+        transport = RecordReplayTransport(RECORD, self.dir.name, inner=httpx.MockTransport(self._upstream))
+        with httpx.Client(transport=transport) as c:
+            return c.get(url)
+
+    def test_replay_returns_the_recorded_response(self):
+        recorded = self._record("https://www.bing.com/search?q=a&first=1")
+        with httpx.Client(transport=RecordReplayTransport(REPLAY, self.dir.name)) as c:
+            # Query parameter order does not change the cassette
+            replayed = c.get("https://www.bing.com/search?first=1&q=a")
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(replayed.content, recorded.content)
+        self.assertEqual(replayed.headers["x-upstream"], "1")
+
+    def test_post_bodies_are_part_of_the_key(self):
+        transport = RecordReplayTransport(RECORD, self.dir.name, inner=httpx.MockTransport(lambda r: httpx.Response(200, content=r.content)))
+        with httpx.Client(transport=transport) as c:
+            c.post("http://127.0.0.1:8766/search", content=b"one")
+        with httpx.Client(transport=RecordReplayTransport(REPLAY, self.dir.name)) as c:
+            self.assertEqual(c.post("http://127.0.0.1:8766/search", content=b"one").content, b"one")
+            self.assertEqual(c.post("http://127.0.0.1:8766/search", content=b"two").status_code, 599)
+
+    def test_missing_cassette_is_a_599(self):
+        with httpx.Client(transport=RecordReplayTransport(REPLAY, self.dir.name)) as c:
+            r = c.get("https://www.bing.com/search?q=never")
+        self.assertEqual(r.status_code, 599)
+        self.assertEqual(r.headers["x-firecat-replay"], "miss")
+
+    def test_simulated_latency_respects_the_read_timeout(self):
+        self._record("https://www.bing.com/search?q=slow")
+        transport = RecordReplayTransport(REPLAY, self.dir.name, latency=load_latency('{"default": [500, 0]}'))
+        with httpx.Client(transport=transport) as c, self.assertRaises(httpx.ReadTimeout):
+            c.get("https://www.bing.com/search?q=slow", timeout=0.05)
+
+    def test_async_replay(self):
+        self._record("https://www.bing.com/search?q=async")
+
+        async def fetch() -> httpx.Response:
+            async with httpx.AsyncClient(transport=RecordReplayTransport(REPLAY, self.dir.name)) as c:
+                return await c.get("https://www.bing.com/search?q=async")
+
+        self.assertEqual(asyncio.run(fetch()).content, b"body for async")
+
+
+class BenchSearchTests(StubUpstreamMixin, SimpleTestCase):
+
+    def test_runs_through_the_search_path(self):
+        groups = [g for g in views.HACKING_GROUPS if g["category"] == "domain"]
+        admit  = mock.patch.object(scheduler.admission, "admit", wraps=scheduler.admission.admit)
+        runner = mock.patch.object(views, "_run_group", wraps=views._run_group)
+        with admit as admitted, runner as ran:
+            timings = run_search("example.com", groups, budget=20)
+        admitted.assert_called_once_with("bench")
+        self.assertEqual(ran.call_count, len(groups))
+        self.assertGreater(timings["groups"], 0)
+        self.assertLessEqual(timings["ttfg"], timings["latency"])
@@ -0,0 +1,102 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+
+from apps.search import scheduler, views
+from apps.search.records import Result
+
+
+class AdmissionTests(SimpleTestCase):
+
+    def test_grants_up_to_the_slot_count(self):
+        a = scheduler.Admission(slots=2, queue_limit=4, session_limit=4)
+        first, second, third = a.admit("s1"), a.admit("s2"), a.admit("s3")
+        self.assertTrue(first.granted.is_set() and second.granted.is_set())
+        self.assertFalse(third.granted.is_set())
+        self.assertEqual(a.position(third), 1)
+        a.release(first)
+        self.assertTrue(third.granted.is_set())
+        self.assertEqual(a.stats(), {"running": 2, "queued": 0, "slots": 2})
+
+    def test_round_robin_across_sessions(self):
+        a = scheduler.Admission(slots=1, queue_limit=8, session_limit=8)
+        running = a.admit("busy")
+        heavy   = [a.admit("heavy") for _ in range(3)]
+        light   = a.admit("light")
+        self.assertEqual(a.position(light), 2)   # behind heavy's first search, not all three
+        order = []
+        current = running
+        for _ in range(4):
+            a.release(current)
+            current = next(t for t in heavy + [light] if t.granted.is_set() and not t.released)
+            order.append(current.session)
+        self.assertEqual(order, ["heavy", "light", "heavy", "heavy"])
+
+    def test_queue_and_session_limits(self):
+        a = scheduler.Admission(slots=1, queue_limit=3, session_limit=2)
+        a.admit("busy")
+        self.assertIsNotNone(a.admit("s1"))
+        self.assertIsNotNone(a.admit("s1"))
+        self.assertIsNone(a.admit("s1"))          # per-session limit
+        self.assertIsNotNone(a.admit("s2"))
+        self.assertIsNone(a.admit("s3"))          # whole queue full
+
+    def test_release_of_a_queued_ticket_leaves_the_line(self):
+        a = scheduler.Admission(slots=1, queue_limit=4, session_limit=4)
+        running, waiting = a.admit("s1"), a.admit("s2")
+        a.release(waiting)
+        a.release(waiting)                        # idempotent
+        self.assertEqual(a.stats()["queued"], 0)
+        a.release(running)
+        self.assertEqual(a.stats()["running"], 0)
+
+    def test_retry_after_grows_with_the_queue(self):
+        a = scheduler.Admission(slots=2, queue_limit=8, session_limit=8)
+        a.duration = 10.0
+        empty = a.retry_after()
+        for s in ("a", "b", "c", "d", "e"):
+            a.admit(s)
+        self.assertEqual(empty, 5)
+        self.assertEqual(a.retry_after(), 20)
+
+    def test_closing_releases_even_if_never_iterated(self):
+        released = []
+        scheduler.closing(iter(["x"]), lambda: released.append(1)).close()
+        self.assertEqual(released, [1])
+
+
+class BusySearchTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        patcher = mock.patch.object(
+            views, "_search_group",
+            lambda group, q, plan=None, state=None: (group["id"], [Result("ada", "https://example.com/", "example.com", "", "bing")]),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_full_queue_answers_429_with_retry_after(self):
+        busy = scheduler.Admission(slots=1, queue_limit=0, session_limit=0)
+        busy.admit("someone else")
+        with mock.patch.object(scheduler, "admission", busy):
+            r = self.client.get("/api/search/", {"q": "ada lovelace", "groups": "person_web"})
+        self.assertEqual(r.status_code, 429)
+        self.assertEqual(r["Retry-After"], str(busy.retry_after()))
+        self.assertEqual(r.json()["retry_after"], busy.retry_after())
+
+    def test_cached_search_skips_the_queue(self):
+        self.client.get("/api/search/", {"q": "ada lovelace", "groups": "person_web"})
+        busy = scheduler.Admission(slots=1, queue_limit=0, session_limit=0)
+        busy.admit("someone else")
+        with mock.patch.object(scheduler, "admission", busy):
+            r = self.client.get("/api/search/", {"q": "ada lovelace", "groups": "person_web"})
+        self.assertEqual(r.status_code, 200)
+
+    def test_slot_is_returned(self):
+        a = scheduler.Admission(slots=1, queue_limit=0, session_limit=0)
+        with mock.patch.object(scheduler, "admission", a):
+            self.assertEqual(self.client.get("/api/search/", {"q": "ada lovelace", "groups": "person_web"}).status_code, 200)
+        self.assertEqual(a.stats()["running"], 0)
@@ -0,0 +1,115 @@
+import concurrent.futures
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+
+from apps.search import deadline, tracing, views
+from apps.search.records import Result
+
+
+def _engine() -> None:
+    with tracing.span("engine", engine="bing"):
+        pass
+
+
+class SpanTreeTests(SimpleTestCase):
+
+    def test_spans_nest_and_follow_submitted_work(self):
+        trace = tracing.Trace("search", q="ada")
+        with concurrent.futures.ThreadPoolExecutor(2) as ex, tracing.active(trace.root):
+            with tracing.span("group", group="g1") as attrs:
+                attrs["results"] = 3
+                deadline.submit(ex, _engine).result()
+            with tracing.span("dedupe"):
+                pass
+        trace.finish(store=False)
+        tree = trace.tree()["root"]
+        self.assertEqual([c["name"] for c in tree["children"]], ["group", "dedupe"])
+        group = tree["children"][0]
+        self.assertEqual(group["attrs"], {"group": "g1", "results": 3})
+        self.assertEqual(group["children"][0]["name"], "engine")
+        self.assertIsNotNone(group["children"][0]["ms"])
+
+    def test_open_spans_have_no_duration(self):
+        trace = tracing.Trace("search")
+        trace.open(trace.root, "group", {})
+        self.assertIsNone(trace.tree()["root"]["children"][0]["ms"])
+        self.assertEqual(trace.summary(), {})
+
+    def test_outside_a_trace_spans_cost_nothing(self):
+        self.assertIsNone(tracing.current())
+        with tracing.span("x", a=1) as attrs:
+            attrs["b"] = 2
+        tracing.record("queue", time.monotonic())
+        tracing.graft({"name": "group"})
+
+    def test_errors_are_recorded(self):
+        trace = tracing.Trace("search")
+        with tracing.active(trace.root), self.assertRaises(ValueError), tracing.span("engine"):
+            raise ValueError
+        self.assertEqual(trace.root.children[0].attrs["error"], "ValueError")
+
+    def test_span_cap(self):
+        trace = tracing.Trace("search")
+        with mock.patch.object(tracing, "MAX_SPANS", 3), tracing.active(trace.root):
+            for _ in range(5):
+                with tracing.span("http"):
+                    pass
+        self.assertEqual((trace.spans, trace.dropped), (3, 3))
+
+    def test_graft_keeps_relative_times(self):
+        trace = tracing.Trace("search")
+        with tracing.active(trace.root):
+            tracing.graft({"name": "worker", "at_ms": 0, "ms": 50.0, "children": [{"name": "engine", "at_ms": 10.0, "ms": 20.0}]})
+        worker = trace.root.children[0]
+        self.assertTrue(worker.attrs["remote"])
+        engine = worker.children[0]
+        self.assertAlmostEqual((engine.start - trace.root.start) * 1000, 10.0, places=3)
+        self.assertAlmostEqual((engine.end - engine.start) * 1000, 20.0, places=3)
+
+    def test_server_timing_leads_with_the_longest_span(self):
+        trace = tracing.Trace("search")
+        now   = time.monotonic()
+        with tracing.active(trace.root):
+            tracing.record("engine", now - 0.3, now)
+            tracing.record("engine", now - 0.1, now)
+            tracing.record("cache", now - 0.01, now)
+        trace.finish(store=False)
+        timing = trace.server_timing()
+        self.assertTrue(timing.startswith("total;dur="))
+        self.assertIn('engine;dur=300.0;desc="2x, 400ms total"', timing)
+        self.assertLess(timing.index("engine;"), timing.index("cache;"))
+        self.assertTrue(timing.endswith(f'trace;desc="{trace.id}"'))
+
+    def test_finished_traces_are_kept_in_the_ring(self):
+        trace = tracing.Trace("search", q="ada")
+        trace.finish()
+        self.assertIs(tracing.find(trace.id), trace)
+        self.assertEqual(tracing.recent()[0]["id"], trace.id)
+        self.assertEqual(tracing.recent()[0]["q"], "ada")
+
+
+class SearchTimingTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        patcher = mock.patch.object(views, "_search_group", self._search_group)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _search_group(self, group, q, plan=None, state=None):
+        with tracing.span("engine", engine="bing"):
+            pass
+        return group["id"], [Result("ada", "https://example.com/", "example.com", "", "bing")]
+
+    def test_json_search_has_server_timing(self):
+        r = self.client.get("/api/search/", {"q": "ada lovelace", "groups": "person_web"})
+        timing = r["Server-Timing"]
+        self.assertIn("group;dur=", timing)
+        self.assertIn("engine;dur=", timing)
+        trace_id = timing.rsplit('trace;desc="', 1)[1].rstrip('"')
+        tree = tracing.find(trace_id).tree()
+        self.assertEqual(tree["root"]["attrs"]["q"], "ada lovelace")
@@ -0,0 +1,129 @@
+import asyncio
+import importlib
+import threading
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from apps.search import metrics, username_checker, views
+from apps.search.username_checker import FOUND, MISSING, Site
+
+from .utils import StubUpstreamMixin
+
+
+def _site(name: str, uri: str, e_string: str = "") -> Site:
+    return Site(name, uri, "", 200, e_string, None, "", "test", "GET")
+
+
+# The stub answers api.* hosts 200 "{}" and anything else 404
+FOUND_SITE   = _site("Found", "https://api.found.test/users/{account}")
+MISSING_SITE = _site("Missing", "https://www.missing.test/{account}")
+UNKNOWN_SITE = _site("Unknown", "https://api.unknown.test/users/{account}", e_string='"login":')
+SLOW_SITE    = _site("Slow", "https://api.slow.test/users/{account}")
+
+
+def _sites(*sites: Site) -> mock._patch:
+    return mock.patch.object(username_checker, "load_sites", return_value=(list(sites), {}))
+
+
+class CheckUsernameTests(StubUpstreamMixin, SimpleTestCase):
+    latency = {"api.slow.test": (1500.0, 0.0)}
+
+    def test_yields_found_sites_only(self):
+        with _sites(FOUND_SITE, MISSING_SITE, UNKNOWN_SITE):
+            links = [r.link for r in username_checker.check_username("janedoe")]
+        self.assertEqual(links, ["https://api.found.test/users/janedoe"])
+
+    def test_unknown_verdicts_are_not_cached(self):
+        with _sites(FOUND_SITE, MISSING_SITE, UNKNOWN_SITE):
+            list(username_checker.check_username("janedoe"))
+        key = lambda s: username_checker._cache_key(s, "janedoe")  # noqa: E731
+        self.assertEqual(cache.get(key(FOUND_SITE))[0], FOUND)
+        self.assertEqual(cache.get(key(MISSING_SITE))[0], MISSING)
+        self.assertIsNone(cache.get(key(UNKNOWN_SITE)))
+
+    def test_hits_stream_before_slow_sites_answer(self):
+        with _sites(FOUND_SITE, SLOW_SITE):
+            t0    = time.monotonic()
+            it    = username_checker.check_username("janedoe")
+            first = next(it)
+            first_at = time.monotonic() - t0
+            rest  = list(it)
+        self.assertEqual(first.link, "https://api.found.test/users/janedoe")
+        self.assertLess(first_at, 1.0)
+        self.assertEqual([r.link for r in rest], ["https://api.slow.test/users/janedoe"])
+
+    def test_probes_go_through_the_metrics_transport(self):
+        before = dict(metrics.UPSTREAM.values)
+        with _sites(FOUND_SITE, MISSING_SITE):
+            list(username_checker.check_username("janedoe"))
+        self.assertEqual(metrics.UPSTREAM.values.get(("other", "2xx"), 0) - before.get(("other", "2xx"), 0), 1)
+        self.assertEqual(metrics.UPSTREAM.values.get(("other", "4xx"), 0) - before.get(("other", "4xx"), 0), 1)
+
+
+class EnrichUsernameTests(StubUpstreamMixin, SimpleTestCase):
+
+    def test_username_enrichment_is_available(self):
+        self.assertIn("username", views._ENRICHERS)
+        self.assertIn("phone", views._ENRICHERS)
+
+    def test_every_enrichment_script_imports(self):
+        for category, module, name in views._ENRICHER_SCRIPTS:
+            with self.subTest(category=category):
+                script = getattr(importlib.import_module(f"apps.search.{module}"), name)
+                self.assertIs(views._ENRICHERS[category], script)
+
+    def test_search_group_includes_platform_hits(self):
+        group = next(g for g in views.HACKING_GROUPS if g["id"] == "username_exact")
+        with _sites(FOUND_SITE, MISSING_SITE):
+            _, items = views._search_group(group, "janedoe")
+        osint = {i.link for i in items if i.osint}
+        self.assertIn("https://api.found.test/users/janedoe", osint)
+        self.assertNotIn("https://www.missing.test/janedoe", osint)
+
+
+class ProbeSchedulingTests(SimpleTestCase):
+
+    def test_probes_waiting_on_a_host_hold_no_global_slot(self):
+        client = mock.Mock()
+        client.head = mock.AsyncMock(return_value=mock.Mock(status_code=200))
+        busy   = Site("Busy", "https://busy.test/{account}", "", 200, "", None, "", "test", "HEAD")
+        free   = Site("Free", "https://free.test/{account}", "", 200, "", None, "", "test", "HEAD")
+
+        async def run():
+            busy_host, free_host, global_sem = asyncio.Semaphore(1), asyncio.Semaphore(1), asyncio.Semaphore(1)
+            await busy_host.acquire()   # a slow probe to the same host is still out
+            queued = asyncio.ensure_future(username_checker._probe(client, busy, "jane", busy_host, global_sem))
+            await asyncio.sleep(0)
+            try:
+                return await asyncio.wait_for(username_checker._probe(client, free, "jane", free_host, global_sem), 1.0)
+            finally:
+                queued.cancel()
+
+        site, verdict, _ = asyncio.run(run())
+        self.assertEqual((site, verdict), (free, FOUND))
+
+    def test_cache_is_read_and_written_off_the_event_loop(self):
+        self.addCleanup(cache.clear)
+        threads = []
+        loop_thread = threading.get_ident()
+
+        def record(fn):
+            def call(*args, **kwargs):
+                threads.append(threading.get_ident())
+                return fn(*args, **kwargs)
+            return call
+
+        async def run():
+            with mock.patch.object(username_checker, "_probe", mock.AsyncMock(return_value=(FOUND_SITE, FOUND, 200))):
+                return [r async for r in username_checker.iter_presence("janedoe", sites=[FOUND_SITE])]
+
+        with mock.patch.object(username_checker.outbound, "async_client"), \
+                mock.patch.object(cache, "get_many", record(cache.get_many)), \
+                mock.patch.object(cache, "set_many", record(cache.set_many)):
+            found = asyncio.run(run())
+        self.assertEqual(len(found), 1)
+        self.assertEqual(len(threads), 2)
+        self.assertNotIn(loop_thread, threads)
@@ -0,0 +1,127 @@
+import concurrent.futures
+import json
+import threading
+from contextlib import contextmanager
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from apps.search import outbound, worker_client
+
+
+class FakeWorker:
+    """Stands in for the Electron worker: records what it is asked and answers every page."""
+
+    def __init__(self, batch_status: int = 200, skip: tuple[str, ...] = (), queue: int | None = None) -> None:
+        self.batch_status = batch_status
+        self.skip         = skip
+        self.queue        = queue
+        self.batches: list[list[tuple[str, str]]] = []
+        self.singles: list[tuple[str, str]] = []
+        self._lock        = threading.Lock()
+
+    @staticmethod
+    def html(engine: str, query: str) -> str:
+        return f"<html>{engine}:{query}</html>"
+
+    @contextmanager
+    def stream(self, method, url, json=None, **kwargs):
+        assert url.endswith("/search/batch")
+        batch = [(r["engine"], r["query"]) for r in json["requests"]]
+        with self._lock:
+            self.batches.append(batch)
+        pages = [
+            _dumps({"engine": e, "query": q, "html": self.html(e, q), "queue": self.queue})
+            for e, q in batch if q not in self.skip
+        ]
+        yield mock.Mock(status_code=self.batch_status, iter_lines=lambda: iter(pages))
+
+    def post(self, url, json=None, **kwargs):
+        assert url.endswith("/search")
+        with self._lock:
+            self.singles.append((json["engine"], json["query"]))
+        body = {"html": self.html(json["engine"], json["query"]), "queue": self.queue}
+        return mock.Mock(status_code=200, json=lambda: body)
+
+
+def _dumps(obj):   # FakeWorker.stream's `json` argument shadows the module
+    return json.dumps(obj)
+
+
+class DispatcherTests(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.dispatcher = worker_client.Dispatcher(url="http://worker", window=0.2)
+
+    def serve(self, worker):
+        stream = mock.patch.object(outbound, "stream", worker.stream)
+        post   = mock.patch.object(outbound, "post", worker.post)
+        stream.start()
+        post.start()
+        self.addCleanup(stream.stop)
+        self.addCleanup(post.stop)
+        return worker
+
+    def fetch_all(self, keys, timeout=60.0):
+        with concurrent.futures.ThreadPoolExecutor(len(keys)) as ex:
+            return list(ex.map(lambda k: self.dispatcher.fetch(*k, timeout=timeout), keys))
+
+    def test_requests_within_the_window_go_out_as_one_batch(self):
+        worker = self.serve(FakeWorker())
+        keys   = [("google", "a"), ("bing", "b"), ("ddg", "c")]
+        self.assertEqual(self.fetch_all(keys), [FakeWorker.html(*k) for k in keys])
+        self.assertEqual(len(worker.batches), 1)
+        self.assertCountEqual(worker.batches[0], keys)
+        self.assertEqual(worker.singles, [])
+
+    def test_pages_are_cached(self):
+        worker = self.serve(FakeWorker())
+        self.dispatcher.fetch("google", "a")
+        self.assertEqual(self.dispatcher.fetch("google", "a"), FakeWorker.html("google", "a"))
+        self.assertEqual(len(worker.batches), 1)
+
+    def test_identical_requests_share_one_load(self):
+        worker = self.serve(FakeWorker())
+        pages  = self.fetch_all([("google", "a")] * 4)
+        self.assertEqual(set(pages), {FakeWorker.html("google", "a")})
+        self.assertEqual(worker.batches, [[("google", "a")]])
+
+    def test_batches_are_capped(self):
+        self.dispatcher.max_batch = 2
+        worker = self.serve(FakeWorker())
+        keys   = [("google", str(i)) for i in range(5)]
+        self.assertEqual(self.fetch_all(keys), [FakeWorker.html(*k) for k in keys])
+        self.assertTrue(all(len(b) <= 2 for b in worker.batches))
+        self.assertCountEqual([k for b in worker.batches for k in b], keys)
+
+    def test_pages_the_worker_never_sent_come_back_empty(self):
+        self.serve(FakeWorker(skip=("b",)))
+        self.assertEqual(self.fetch_all([("google", "a"), ("google", "b")]), [FakeWorker.html("google", "a"), ""])
+        self.assertIsNone(cache.get(worker_client.memo.key("electron", "google", "b")))
+
+    def test_old_workers_get_one_request_per_page(self):
+        worker = self.serve(FakeWorker(batch_status=404))
+        keys   = [("google", "a"), ("bing", "b")]
+        self.assertEqual(self.fetch_all(keys), [FakeWorker.html(*k) for k in keys])
+        self.assertFalse(self.dispatcher.batching)
+        self.assertCountEqual(worker.singles, keys)
+        # Once known, the batch endpoint is not tried again
+        self.dispatcher.fetch("ddg", "c")
+        self.assertEqual(len(worker.batches), 1)
+        self.assertIn(("ddg", "c"), worker.singles)
+
+    def test_deep_queue_answers_no_at_once(self):
+        worker = self.serve(FakeWorker())
+        self.dispatcher.per_load = 10.0
+        self.assertIsNone(self.dispatcher.fetch("google", "a", timeout=5.0))
+        self.assertEqual(worker.batches, [])
+        self.assertEqual(self.dispatcher.depth(), 0)
+
+    def test_reported_queue_counts_towards_depth(self):
+        self.serve(FakeWorker(queue=4))
+        self.dispatcher.fetch("google", "a")
+        self.assertEqual(self.dispatcher.depth(), 4)
+        self.assertAlmostEqual(self.dispatcher.wait(1), 5 * self.dispatcher.per_load)
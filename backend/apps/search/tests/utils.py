@@ -0,0 +1,35 @@
+"""
+Shared test fixtures — the stub upstream (stub_upstream.py) answering every
+outbound request, with no simulated latency unless a test asks for some.
+"""
+from __future__ import annotations
+
+import json
+
+from django.core.cache import cache
+
+from apps.search import outbound, stub_upstream
+
+
+def no_latency(hosts: dict[str, tuple[float, float]] | None = None) -> str:
+    """A latency profile for outbound.configure — zero everywhere but `hosts` (ms, jitter ms)."""
+    profile = {h: (0.0, 0.0) for h in stub_upstream.DEFAULT_LATENCY}
+    profile.update(hosts or {})
+    return json.dumps(profile)
+
+
+class StubUpstreamMixin:
+    """Outbound traffic goes to the stub upstream; the cache starts empty."""
+
+    latency: dict[str, tuple[float, float]] = {}
+
+    def setUp(self) -> None:
+        super().setUp()  # type: ignore[misc]
+        self._mode = outbound.MODE
+        outbound.configure(outbound.STUB, latency=no_latency(self.latency))
+        cache.clear()
+
+    def tearDown(self) -> None:
+        outbound.configure(self._mode)
+        cache.clear()
+        super().tearDown()  # type: ignore[misc]
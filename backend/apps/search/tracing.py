@@ -0,0 +1,212 @@
+"""
+tracing.py — Per-search span trees
+Every search records where its time went: the queue wait, cache lookups,
+each group, each operator query, each engine and API call with its HTTP
+exchanges and parse time, and deduplication. Spans follow the search onto
+the shared pools through the context deadline.submit already copies, and
+come back from search_worker processes with the group reply.
+
+The JSON response summarises the tree in a Server-Timing header; with
+trace=1 the SSE stream ends with a "trace" event carrying all of it.
+Finished traces are kept in a bounded ring (SEARCH_TRACE_RING) for
+/api/search/traces/ (staff or SEARCH_DEBUG_ENDPOINTS, see profiling.allowed).
+"""
+from __future__ import annotations
+
+import collections
+import contextvars
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+from django.conf import settings
+
+
+RING_SIZE = int(getattr(settings, "SEARCH_TRACE_RING", 100))
+MAX_SPANS = 4000     # per trace — a runaway search stops recording, it does not grow without bound
+
+_current: contextvars.ContextVar[Span | None] = contextvars.ContextVar("firecat_span", default=None)
+_recent: collections.deque[Trace] = collections.deque(maxlen=RING_SIZE)
+
+
+class Span:
+    __slots__ = ("trace", "name", "attrs", "start", "end", "children")
+
+    def __init__(self, trace: Trace, name: str, attrs: dict[str, Any], start: float | None = None) -> None:
+        self.trace    = trace
+        self.name     = name
+        self.attrs    = attrs
+        self.start    = time.monotonic() if start is None else start
+        self.end: float | None = None
+        self.children: list[Span] = []
+
+    def as_dict(self, origin: float) -> dict[str, Any]:
+        out: dict[str, Any] = {
+            "name":  self.name,
+            "at_ms": round((self.start - origin) * 1000, 1),
+            "ms":    None if self.end is None else round((self.end - self.start) * 1000, 1),   # None: still open
+        }
+        if self.attrs:
+            out["attrs"] = dict(self.attrs)
+        if self.children:
+            out["children"] = [c.as_dict(origin) for c in list(self.children)]
+        return out
+
+
+class Trace:
+    def __init__(self, name: str, **attrs: Any) -> None:
+        self.id      = uuid.uuid4().hex[:12]
+        self.wall    = time.time()
+        self.spans   = 1
+        self.dropped = 0
+        self._lock   = threading.Lock()
+        self.root    = Span(self, name, attrs)
+        self._flat: list[Span] = [self.root]
+
+    def open(self, parent: Span, name: str, attrs: dict[str, Any], start: float | None = None) -> Span | None:
+        with self._lock:
+            if self.spans >= MAX_SPANS:
+                self.dropped += 1
+                return None
+            self.spans += 1
+            span = Span(self, name, attrs, start)
+            parent.children.append(span)
+            self._flat.append(span)
+            return span
+
+    def finish(self, store: bool = True) -> None:
+        if self.root.end is None:
+            self.root.end = time.monotonic()
+            if store:
+                _recent.append(self)
+
+    @property
+    def ms(self) -> float:
+        return round(((self.root.end or time.monotonic()) - self.root.start) * 1000, 1)
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """span name → count, summed and longest duration (ms) of its closed spans."""
+        out: dict[str, dict[str, float]] = {}
+        with self._lock:
+            spans = list(self._flat[1:])
+        for s in spans:
+            if s.end is None:
+                continue
+            ms  = (s.end - s.start) * 1000
+            row = out.setdefault(s.name, {"count": 0, "sum": 0.0, "max": 0.0})
+            row["count"] += 1
+            row["sum"]   += ms
+            row["max"]    = max(row["max"], ms)
+        return out
+
+    def server_timing(self) -> str:
+        """
+        The summary as a Server-Timing value. Groups and engine calls run in
+        parallel, so `dur` is the longest single span — the one that held
+        the search up — and the sum goes in the description.
+        """
+        parts = [f"total;dur={self.ms}"]
+        rows  = sorted(self.summary().items(), key=lambda kv: -kv[1]["max"])
+        for name, row in rows:
+            parts.append(f'{name};dur={row["max"]:.1f};desc="{int(row["count"])}x, {row["sum"]:.0f}ms total"')
+        parts.append(f'trace;desc="{self.id}"')
+        return ", ".join(parts)
+
+    def tree(self) -> dict[str, Any]:
+        return {
+            "id":      self.id,
+            "started": self.wall,
+            "ms":      self.ms,
+            "spans":   self.spans,
+            "dropped": self.dropped,
+            "summary": {k: {n: round(v, 1) for n, v in row.items()} for k, row in self.summary().items()},
+            "root":    self.root.as_dict(self.root.start),
+        }
+
+
+# ---------------------------------------------------------------------------
+# Recording
+# ---------------------------------------------------------------------------
+
+def current() -> Span | None:
+    return _current.get()
+
+
+@contextmanager
+def active(span: Span | None) -> Iterator[None]:
+    """Make `span` the parent of spans opened here and in work submitted from here."""
+    token = _current.set(span)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[dict[str, Any]]:
+    """
+    A child span of the current one; set more attributes on the yielded
+    dict. Outside a trace this costs one context lookup.
+    """
+    parent = _current.get()
+    s      = parent.trace.open(parent, name, attrs) if parent is not None else None
+    if s is None:
+        yield attrs
+        return
+    token = _current.set(s)
+    try:
+        yield s.attrs
+    except BaseException as exc:
+        s.attrs["error"] = type(exc).__name__
+        raise
+    finally:
+        s.end = time.monotonic()
+        _current.reset(token)
+
+
+def record(name: str, start: float, end: float | None = None, **attrs: Any) -> None:
+    """A span that already happened (e.g. a queue wait measured elsewhere)."""
+    parent = _current.get()
+    if parent is None:
+        return
+    s = parent.trace.open(parent, name, attrs, start)
+    if s is not None:
+        s.end = time.monotonic() if end is None else end
+
+
+def graft(tree: dict[str, Any] | None) -> None:
+    """Attach a subtree recorded in another process (Span.as_dict form) under
+    the current span, its times taken as relative to that span's start."""
+    parent = _current.get()
+    if parent is None or not tree:
+        return
+
+    def add(under: Span, node: dict[str, Any]) -> None:
+        start = parent.start + node.get("at_ms", 0) / 1000  # type: ignore[union-attr]
+        s     = parent.trace.open(under, node.get("name", "?"), {**node.get("attrs", {}), "remote": True}, start)  # type: ignore[union-attr]
+        if s is None:
+            return
+        if node.get("ms") is not None:
+            s.end = start + node["ms"] / 1000
+        for child in node.get("children", ()):
+            add(s, child)
+
+    add(parent, tree)
+
+
+# ---------------------------------------------------------------------------
+# Inspection
+# ---------------------------------------------------------------------------
+
+def recent() -> list[dict[str, Any]]:
+    """Newest first — id, query, when and how long, for every stored trace."""
+    return [
+        {"id": t.id, "started": t.wall, "ms": t.ms, "spans": t.spans, **t.root.attrs}
+        for t in reversed(list(_recent))
+    ]
+
+
+def find(trace_id: str) -> Trace | None:
+    return next((t for t in list(_recent) if t.id == trace_id), None)
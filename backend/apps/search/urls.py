@@ -1,11 +1,17 @@
 from django.urls import path
-from .views        import SearchProxyView, SearchGroupsView
+from .views        import (
+    SearchProxyView, SearchGroupsView, SearchClickView, SearchMoreView, SearchPrefetchView, SearchTraceView,
+)
 from .proxy_views  import WebProxyView
 from .inspect_view import InspectView
 
 urlpatterns = [
-    path("",         SearchProxyView.as_view(),  name="search"),
-    path("groups/",  SearchGroupsView.as_view(), name="search-groups"),
-    path("inspect/", InspectView.as_view(),      name="search-inspect"),
-    path("proxy/",   WebProxyView.as_view(),     name="web-proxy"),
+    path("",          SearchProxyView.as_view(),    name="search"),
+    path("groups/",   SearchGroupsView.as_view(),   name="search-groups"),
+    path("click/",    SearchClickView.as_view(),    name="search-click"),
+    path("more/",     SearchMoreView.as_view(),     name="search-more"),
+    path("prefetch/", SearchPrefetchView.as_view(), name="search-prefetch"),
+    path("inspect/",  InspectView.as_view(),        name="search-inspect"),
+    path("traces/",   SearchTraceView.as_view(),    name="search-traces"),
+    path("proxy/",    WebProxyView.as_view(),       name="web-proxy"),
 ]
\ No newline at end of file
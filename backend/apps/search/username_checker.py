@@ -0,0 +1,271 @@
+"""
+username_checker.py — Data-driven username presence checker
+Probes every site in a WhatsMyName-style definition file concurrently,
+with a per-host concurrency cap, a global deadline and cached verdicts.
+Confirmed profiles are streamed out as soon as they are known. Probes go
+through outbound's shared async client, so the latency budget, host rate
+limits and upstream metrics apply to them as to every other request.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import queue
+import re
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, AsyncIterator, Iterator
+from urllib.parse import quote, urlparse
+
+import httpx
+from django.core.cache import cache
+
+from apps.search import deadline as budget, outbound
+from apps.search.records import Result
+
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+SITES_FILE = Path(os.environ.get(
+    "FIRECAT_USERNAME_SITES",
+    str(Path(__file__).resolve().parent / "data" / "username_sites.json"),
+))
+
+PROBE_TIMEOUT     = 6       # per request
+CHECK_DEADLINE    = 12      # whole check, all sites
+DEFAULT_HOST_CAP  = 2       # concurrent probes per host unless the file says otherwise
+GLOBAL_CAP        = 64      # concurrent probes overall
+BODY_LIMIT        = 256 * 1024
+VERDICT_TTL       = 6 * 3600     # found / missing only — unknown (errors, timeouts) is asked again
+PROBE_HEADERS     = {"User-Agent": "Mozilla/5.0", "Accept": "*/*"}
+
+USERNAME_RE = re.compile(r"^[A-Za-z0-9._\-]{1,64}$")
+
+FOUND, MISSING, UNKNOWN = "found", "missing", "unknown"
+
+
+# ---------------------------------------------------------------------------
+# Site definitions
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class Site:
+    name:       str
+    uri_check:  str
+    uri_pretty: str
+    e_code:     int
+    e_string:   str
+    m_code:     int | None
+    m_string:   str
+    category:   str
+    method:     str
+    headers:    tuple[tuple[str, str], ...] = ()
+
+    @property
+    def host(self) -> str:
+        return urlparse(self.uri_check.replace("{account}", "x")).netloc.lower()
+
+    def url(self, account: str) -> str:
+        return self.uri_check.replace("{account}", quote(account, safe=""))
+
+    def profile_url(self, account: str) -> str:
+        return (self.uri_pretty or self.uri_check).replace("{account}", quote(account, safe=""))
+
+
+def _site_from_dict(d: dict[str, Any]) -> Site | None:
+    uri = d.get("uri_check", "")
+    if not uri or "{account}" not in uri or d.get("valid") is False or d.get("post_body"):
+        return None
+    e_string = d.get("e_string", "") or ""
+    method   = (d.get("method") or ("GET" if e_string or d.get("m_string") else "HEAD")).upper()
+    return Site(
+        name       = d.get("name", urlparse(uri).netloc),
+        uri_check  = uri,
+        uri_pretty = d.get("uri_pretty", "") or "",
+        e_code     = int(d.get("e_code", 200)),
+        e_string   = e_string,
+        m_code     = int(d["m_code"]) if d.get("m_code") is not None else None,
+        m_string   = d.get("m_string", "") or "",
+        category   = d.get("cat", ""),
+        method     = method,
+        headers    = tuple((d.get("headers") or {}).items()),
+    )
+
+
+_sites_lock = threading.Lock()
+_sites: tuple[list[Site], dict[str, int]] | None = None
+
+
+def load_sites() -> tuple[list[Site], dict[str, int]]:
+    """Parse the definition file once — returns (sites, per-host limits)."""
+    global _sites
+    with _sites_lock:
+        if _sites is None:
+            try:
+                data = json.loads(SITES_FILE.read_text(encoding="utf-8"))
+            except Exception:
+                data = {}
+            sites = [s for s in (_site_from_dict(d) for d in data.get("sites", [])) if s]
+            hosts = {h.lower(): int(n) for h, n in (data.get("hosts") or {}).items()}
+            _sites = (sites, hosts)
+        return _sites
+
+
+# ---------------------------------------------------------------------------
+# Verdicts
+# ---------------------------------------------------------------------------
+
+def _verdict(site: Site, status: int, body: str) -> str:
+    if status == site.e_code and (not site.e_string or site.e_string in body):
+        return FOUND
+    if site.m_code is not None and status == site.m_code and (not site.m_string or site.m_string in body):
+        return MISSING
+    if site.m_string and site.m_string in body:
+        return MISSING
+    if status in (404, 410):
+        return MISSING
+    return UNKNOWN
+
+
+def _cache_key(site: Site, username: str) -> str:
+    return "uname1_" + hashlib.md5(f"{site.name}|{username.lower()}".encode()).hexdigest()
+
+
+def _result(site: Site, username: str, status: int) -> Result:
+    url = site.profile_url(username)
+    return Result(
+        title=f"{site.name} — @{username} [FOUND]",
+        link=url,
+        display_link=re.sub(r"https?://", "", url).split("/")[0],
+        snippet=f"Profile @{username} exists on {site.name}. Status: {status}.",
+        source=re.sub(r"[^a-z0-9]+", "_", site.name.lower()).strip("_"),
+        osint=True,
+    )
+
+
+async def _probe(
+    client: httpx.AsyncClient,
+    site: Site,
+    username: str,
+    host_sem: asyncio.Semaphore,
+    global_sem: asyncio.Semaphore,
+) -> tuple[Site, str, int]:
+    headers = {**PROBE_HEADERS, **dict(site.headers)}
+    # Wait for the host first — a probe queued behind a slow host must not hold a global slot
+    async with host_sem, global_sem:
+        try:
+            if site.method == "HEAD":
+                r = await client.head(site.url(username), headers=headers, timeout=PROBE_TIMEOUT, follow_redirects=True)
+                return site, _verdict(site, r.status_code, ""), r.status_code
+            async with client.stream(
+                "GET", site.url(username), headers=headers, timeout=PROBE_TIMEOUT, follow_redirects=True,
+            ) as r:
+                body = b""
+                async for chunk in r.aiter_bytes():
+                    body += chunk
+                    if len(body) >= BODY_LIMIT:
+                        break
+                text = body.decode(r.encoding or "utf-8", errors="replace")
+                return site, _verdict(site, r.status_code, text), r.status_code
+        except Exception:
+            return site, UNKNOWN, 0
+
+
+# ---------------------------------------------------------------------------
+# Checker
+# ---------------------------------------------------------------------------
+
+async def iter_presence(
+    username: str,
+    deadline: float | None = None,
+    sites: list[Site] | None = None,
+) -> AsyncIterator[Result]:
+    """
+    Yield one Result per site where `username` was confirmed, in the
+    order the verdicts arrive. Cached verdicts are yielded first.
+    """
+    if not USERNAME_RE.match(username):
+        return
+    all_sites, host_caps = load_sites()
+    sites    = all_sites if sites is None else sites
+    deadline = deadline or (time.monotonic() + CHECK_DEADLINE)
+
+    keys    = {_cache_key(s, username): s for s in sites}
+    # The cache client is blocking (Redis, memcached) — keep it off the event loop
+    cached  = await asyncio.to_thread(cache.get_many, list(keys))
+    pending = []
+    for key, site in keys.items():
+        hit = cached.get(key)
+        if hit is None:
+            pending.append(site)
+        elif hit[0] == FOUND:
+            yield _result(site, username, hit[1])
+
+    if not pending:
+        return
+
+    host_sems: dict[str, asyncio.Semaphore] = {}
+    for site in pending:
+        if site.host not in host_sems:
+            host_sems[site.host] = asyncio.Semaphore(host_caps.get(site.host, DEFAULT_HOST_CAP))
+    global_sem = asyncio.Semaphore(GLOBAL_CAP)
+    verdicts: dict[str, tuple[str, int]] = {}
+
+    client = outbound.async_client()
+    tasks  = [
+        asyncio.ensure_future(_probe(client, s, username, host_sems[s.host], global_sem))
+        for s in pending
+    ]
+    try:
+        for fut in asyncio.as_completed(tasks, timeout=max(0.0, deadline - time.monotonic())):
+            try:
+                site, verdict, status = await fut
+            except asyncio.TimeoutError:
+                break
+            verdicts[_cache_key(site, username)] = (verdict, status)
+            if verdict == FOUND:
+                yield _result(site, username, status)
+    finally:
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        known = {k: v for k, v in verdicts.items() if v[0] != UNKNOWN}
+        if known:
+            await asyncio.to_thread(cache.set_many, known, timeout=VERDICT_TTL)
+
+
+def check_username(username: str, timeout: float = CHECK_DEADLINE) -> Iterator[Result]:
+    """
+    Synchronous streaming wrapper around iter_presence for the thread-based
+    search path. The probes run on outbound's background event loop; results
+    are handed over through a queue as they are confirmed. Stopping early
+    (closing the generator) cancels the probes still out.
+    """
+    out:  queue.Queue[Result | None] = queue.Queue()
+    deadline = time.monotonic() + (budget.clamp(timeout) or 0.0)
+
+    async def _pump() -> None:
+        try:
+            async for item in iter_presence(username, deadline=deadline):
+                out.put(item)
+        finally:
+            out.put(None)
+
+    job = outbound.submit_async(_pump())
+    try:
+        while True:
+            try:
+                item = out.get(timeout=max(0.1, deadline - time.monotonic() + 1))
+            except queue.Empty:
+                break
+            if item is None:
+                break
+            yield item
+    finally:
+        job.cancel()
@@ -3,46 +3,68 @@ from __future__ import annotations
 import hashlib
 import os
 import json
-import random
 import re
+import secrets
 import time
+import asyncio
 import concurrent.futures
-
-# OSINT enrichment scripts — one per target type
-try:
-    from apps.search.osint_phone    import enrich_phone
-    from apps.search.osint_url      import enrich_url
-    from apps.search.osint_email    import enrich_email
-    from apps.search.osint_username import enrich_username
-    from apps.search.osint_person   import enrich_person
-    _OSINT_SCRIPTS_AVAILABLE = True
-except ImportError:
-    _OSINT_SCRIPTS_AVAILABLE = False
+import importlib
+import itertools
 from collections import defaultdict
-from typing import Any
+from types import MappingProxyType
+from typing import Any, AsyncIterator, Callable, Iterable, Iterator, Mapping
 from urllib.parse import unquote, parse_qs, urlparse, quote_plus
 
-import httpx
+from asgiref.sync import sync_to_async
 from bs4 import BeautifulSoup
+from django.core import signing
 from django.core.cache import cache
-from django.http import StreamingHttpResponse, JsonResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, StreamingHttpResponse, JsonResponse
 from django.views import View
 from django.views.decorators.clickjacking import xframe_options_exempt
+from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 
+from apps.search import (
+    classify, compression, concurrency, ct_index, deadline, hedging, jobqueue, jsonenc, memo, metrics, outbound, parsing, prefetch,
+    priority, profiling, scheduler, tracing, worker_client,
+)
+from apps.search.async_views import AsyncView
+from apps.search.http_cache import api_client
+from apps.search.planner import QueryPlan
+from apps.search.records import Result
+
+
+# OSINT enrichment scripts — one per target type, each imported on its own so
+# one that is missing or broken only turns off its own category. There is
+# no person script: person groups are engine results only.
+_ENRICHER_SCRIPTS: tuple[tuple[str, str, str], ...] = (
+    ("phone",    "osint_phone",    "enrich_phone"),
+    ("domain",   "osint_url",      "enrich_url"),
+    ("email",    "osint_email",    "enrich_email"),
+    ("username", "osint_username", "enrich_username"),
+)
+_ENRICHERS: dict[str, Callable[[str], Iterable[Result]]] = {}
+for _category, _module, _name in _ENRICHER_SCRIPTS:
+    try:
+        _ENRICHERS[_category] = getattr(importlib.import_module(f"apps.search.{_module}"), _name)
+    except (ImportError, AttributeError):
+        pass
+
 
 # ---------------------------------------------------------------------------
 # Constants
 # ---------------------------------------------------------------------------
 
-USER_AGENTS: list[str] = [
+USER_AGENTS: tuple[str, ...] = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:125.0) Gecko/20100101 Firefox/125.0",
     "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36 Edg/124.0.0.0",
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_4_1) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.4.1 Safari/605.1.15",
-]
+)
 
 BLOCKED_DOMAINS: frozenset[str] = frozenset({
     "zhihu.com","baidu.com","weibo.com","qq.com","taobao.com","jd.com","163.com",
@@ -59,11 +81,19 @@ NON_LATIN_RE = re.compile(
 
 MAX_PER_DOMAIN = 3
 MAX_PER_GROUP  = 25
+BING_PAGES     = 4       # result pages per Bing query; "load more" continues after them
+MORE_BACKLOG   = 300     # unserved raw results kept for the next slice
+CURSOR_MAX_AGE = 3600
 CACHE_TTL      = 900
+EMPTY_TTL      = 120     # groups that finished with nothing — retried sooner
 GROUP_TIMEOUT  = 35
+CLICK_WINDOW   = 3600    # a session's clicks on one group count once per window
+CLICK_IP_LIMIT = 60      # clicks counted per client address per window
+QUEUE_POLL     = 1.0     # seconds between "queued" position checks on the stream
+ASYNC_POLL     = 0.1     # how often an ASGI stream looks for its search slot
 
 # Electron search worker — port passed via env var from main.js
-WORKER_PORT = int(os.environ.get("FIRECAT_WORKER_PORT", "8766"))
+WORKER_PORT = worker_client.WORKER_PORT
 
 # ---------------------------------------------------------------------------
 # OSINT Groups — deep operators, multiple layers per group
@@ -514,7 +544,8 @@ HACKING_GROUPS: list[dict[str, Any]] = [
     },
 ]
 
-GROUP_BY_ID: dict[str, dict[str, Any]] = {g["id"]: g for g in HACKING_GROUPS}
+# Read-only — shared by every search thread
+GROUP_BY_ID: Mapping[str, dict[str, Any]] = MappingProxyType({g["id"]: g for g in HACKING_GROUPS})
 
 
 # ---------------------------------------------------------------------------
@@ -522,7 +553,7 @@ GROUP_BY_ID: dict[str, dict[str, Any]] = {g["id"]: g for g in HACKING_GROUPS}
 # ---------------------------------------------------------------------------
 
 def _ua() -> str:
-    return random.choice(USER_AGENTS)
+    return concurrency.rng().choice(USER_AGENTS)
 
 
 def _headers(referer: str = "") -> dict[str, str]:
@@ -544,6 +575,10 @@ def _normalise_cache_key(q: str) -> str:
     return "deep4_" + hashlib.md5(" ".join(words).encode()).hexdigest()
 
 
+def _group_cache_key(gid: str, q: str) -> str:
+    return f"{_normalise_cache_key(q)}_{gid}"
+
+
 def _clean_display(link: str) -> str:
     try:
         return urlparse(link).netloc.replace("www.", "")
@@ -563,31 +598,32 @@ def _is_blocked(link: str) -> bool:
     return any(domain == b or domain.endswith("." + b) for b in BLOCKED_DOMAINS)
 
 
-def _is_english(item: dict[str, Any]) -> bool:
-    if _is_blocked(item.get("link", "")):
+def _is_english(item: Result) -> bool:
+    if _is_blocked(item.link):
         return False
-    text      = f"{item.get('title', '')} {item.get('snippet', '')}"
+    text      = f"{item.title} {item.snippet}"
     non_latin = len(NON_LATIN_RE.findall(text))
     total     = len([c for c in text if c.strip()])
     return not (total > 0 and non_latin / total > 0.25)
 
 
 def _deduplicate(
-    items: list[dict[str, Any]],
+    items: Iterable[Result],
     q_words: list[str] | set[str],
     strict: bool = False,
-) -> list[dict[str, Any]]:
-    seen_urls:    set[str]             = set()
-    domain_count: dict[str, int]       = defaultdict(int)
-    final:        list[dict[str, Any]] = []
+    exclude: set[str] | None = None,
+) -> list[Result]:
+    seen_urls:    set[str]       = set(exclude or ())
+    domain_count: dict[str, int] = defaultdict(int)
+    final:        list[Result]   = []
 
     for item in items:
-        url = item.get("link", "")
+        url = item.link
         if not url or url in seen_urls:
             continue
-        if not item.get("title", "").strip():
+        if not item.title.strip():
             continue
-        if not item.get("osint") and not _is_english(item):
+        if not item.osint and not _is_english(item):
             continue
 
         domain = _get_domain(url)
@@ -595,7 +631,7 @@ def _deduplicate(
             continue
 
         # OSINT enrichment results bypass the relevance filter — they are curated
-        if item.get("osint"):
+        if item.osint:
             seen_urls.add(url)
             domain_count[domain] += 1
             final.append(item)
@@ -607,7 +643,7 @@ def _deduplicate(
         if q_words:
             q_list   = list(q_words)  # already ordered — from q.split()
             q_phrase = " ".join(q_list)       # exact phrase e.g. "andres nicolas"
-            text     = f"{item.get('title','')} {item.get('snippet','')} {url}".lower()
+            text     = f"{item.title} {item.snippet} {url}".lower()
 
             # Accept if exact phrase present
             if q_phrase in text:
@@ -647,12 +683,13 @@ def _deduplicate(
 # Open APIs — no key required, reliable JSON responses
 # ---------------------------------------------------------------------------
 
-def _api_github_search(q: str) -> list[dict[str, Any]]:
+@metrics.sourced("api", "github")
+def _api_github_search(q: str) -> list[Result]:
     """GitHub public search — users, repos, code."""
-    items: list[dict[str, Any]] = []
+    items: list[Result] = []
     try:
         # User search
-        r = httpx.get(
+        r = api_client.get(
             "https://api.github.com/search/users",
             params={"q": q, "per_page": "10"},
             headers={"Accept": "application/vnd.github+json", "User-Agent": _ua()},
@@ -660,15 +697,15 @@ def _api_github_search(q: str) -> list[dict[str, Any]]:
         )
         if r.status_code == 200:
             for user in r.json().get("items", []):
-                items.append({
-                    "title":       f"{user.get('login')} — GitHub User",
-                    "link":        user.get("html_url", ""),
-                    "displayLink": "github.com",
-                    "snippet":     f"GitHub user · {user.get('type', 'User')} · {user.get('html_url','')}",
-                    "source":      "github_api",
-                })
+                items.append(Result(
+                    title=f"{user.get('login')} — GitHub User",
+                    link=user.get("html_url", ""),
+                    display_link="github.com",
+                    snippet=f"GitHub user · {user.get('type', 'User')} · {user.get('html_url','')}",
+                    source="github_api",
+                ))
         # Repo search
-        r2 = httpx.get(
+        r2 = api_client.get(
             "https://api.github.com/search/repositories",
             params={"q": q, "per_page": "10", "sort": "stars"},
             headers={"Accept": "application/vnd.github+json", "User-Agent": _ua()},
@@ -676,23 +713,24 @@ def _api_github_search(q: str) -> list[dict[str, Any]]:
         )
         if r2.status_code == 200:
             for repo in r2.json().get("items", []):
-                items.append({
-                    "title":       f"{repo.get('full_name')} — GitHub Repository",
-                    "link":        repo.get("html_url", ""),
-                    "displayLink": "github.com",
-                    "snippet":     repo.get("description") or f"⭐ {repo.get('stargazers_count',0)} · {repo.get('language','')}",
-                    "source":      "github_api",
-                })
+                items.append(Result(
+                    title=f"{repo.get('full_name')} — GitHub Repository",
+                    link=repo.get("html_url", ""),
+                    display_link="github.com",
+                    snippet=repo.get("description") or f"⭐ {repo.get('stargazers_count',0)} · {repo.get('language','')}",
+                    source="github_api",
+                ))
     except Exception:
         pass
     return items
 
 
-def _api_reddit_search(q: str) -> list[dict[str, Any]]:
+@metrics.sourced("api", "reddit")
+def _api_reddit_search(q: str) -> list[Result]:
     """Reddit JSON API — posts and users."""
-    items: list[dict[str, Any]] = []
+    items: list[Result] = []
     try:
-        r = httpx.get(
+        r = api_client.get(
             "https://www.reddit.com/search.json",
             params={"q": q, "limit": "15", "sort": "relevance", "type": "link"},
             headers={"User-Agent": f"FirecatOSINT/1.0 {_ua()}"},
@@ -701,15 +739,15 @@ def _api_reddit_search(q: str) -> list[dict[str, Any]]:
         if r.status_code == 200:
             for post in r.json().get("data", {}).get("children", []):
                 d = post.get("data", {})
-                items.append({
-                    "title":       d.get("title", ""),
-                    "link":        f"https://reddit.com{d.get('permalink','')}",
-                    "displayLink": f"reddit.com/r/{d.get('subreddit','')}",
-                    "snippet":     d.get("selftext", "")[:200] or f"r/{d.get('subreddit','')} · {d.get('score',0)} upvotes",
-                    "source":      "reddit_api",
-                })
+                items.append(Result(
+                    title=d.get("title", ""),
+                    link=f"https://reddit.com{d.get('permalink','')}",
+                    display_link=f"reddit.com/r/{d.get('subreddit','')}",
+                    snippet=d.get("selftext", "")[:200] or f"r/{d.get('subreddit','')} · {d.get('score',0)} upvotes",
+                    source="reddit_api",
+                ))
         # User search
-        r2 = httpx.get(
+        r2 = api_client.get(
             f"https://www.reddit.com/user/{q}/about.json",
             headers={"User-Agent": f"FirecatOSINT/1.0 {_ua()}"},
             timeout=8,
@@ -717,57 +755,42 @@ def _api_reddit_search(q: str) -> list[dict[str, Any]]:
         if r2.status_code == 200:
             d = r2.json().get("data", {})
             if d.get("name"):
-                items.insert(0, {
-                    "title":       f"u/{d['name']} — Reddit User",
-                    "link":        f"https://reddit.com/user/{d['name']}",
-                    "displayLink": "reddit.com",
-                    "snippet":     f"Reddit user · {d.get('link_karma',0)} link karma · {d.get('comment_karma',0)} comment karma",
-                    "source":      "reddit_api",
-                })
+                items.insert(0, Result(
+                    title=f"u/{d['name']} — Reddit User",
+                    link=f"https://reddit.com/user/{d['name']}",
+                    display_link="reddit.com",
+                    snippet=f"Reddit user · {d.get('link_karma',0)} link karma · {d.get('comment_karma',0)} comment karma",
+                    source="reddit_api",
+                ))
     except Exception:
         pass
     return items
 
 
-def _api_crtsh(q: str) -> list[dict[str, Any]]:
-    """crt.sh — SSL certificate transparency logs. Finds domains, subdomains, emails."""
-    items: list[dict[str, Any]] = []
+@metrics.sourced("api", "crtsh")
+def _api_crtsh(q: str) -> list[Result]:
+    """crt.sh — SSL certificate transparency logs, read from the shared subdomain index."""
+    items: list[Result] = []
     try:
-        r = httpx.get(
-            "https://crt.sh/",
-            params={"q": q, "output": "json"},
-            headers={"User-Agent": _ua()},
-            timeout=12,
-        )
-        if r.status_code == 200:
-            seen: set[str] = set()
-            for cert in r.json()[:30]:
-                name = cert.get("name_value", "").strip()
-                issuer = cert.get("issuer_name", "")
-                logged = cert.get("entry_timestamp", "")[:10]
-                for line in name.splitlines():
-                    line = line.strip().lstrip("*.")
-                    if not line or line in seen:
-                        continue
-                    seen.add(line)
-                    link = f"https://{line}" if not line.startswith("http") else line
-                    items.append({
-                        "title":       f"{line} — SSL Certificate",
-                        "link":        link,
-                        "displayLink": line,
-                        "snippet":     f"SSL cert logged {logged} · Issuer: {issuer[:60] if issuer else 'unknown'}",
-                        "source":      "crt.sh",
-                    })
+        for cert in ct_index.lookup(q, limit=30):
+            items.append(Result(
+                title=f"{cert.name} — SSL Certificate",
+                link=f"https://{cert.name}",
+                display_link=cert.name,
+                snippet=f"SSL cert logged {cert.logged_at} · Issuer: {cert.issuer[:60] if cert.issuer else 'unknown'}",
+                source="crt.sh",
+            ))
     except Exception:
         pass
     return items
 
 
-def _api_wayback(q: str) -> list[dict[str, Any]]:
+@metrics.sourced("api", "wayback")
+def _api_wayback(q: str) -> list[Result]:
     """Wayback Machine CDX API — historical snapshots of a domain/URL."""
-    items: list[dict[str, Any]] = []
+    items: list[Result] = []
     try:
-        r = httpx.get(
+        r = api_client.get(
             "https://web.archive.org/cdx/search/cdx",
             params={
                 "url":       f"*.{q}/*" if "." in q else f"*{q}*",
@@ -787,24 +810,25 @@ def _api_wayback(q: str) -> list[dict[str, Any]]:
                     original, ts, status, mime = row[0], row[1], row[2], row[3]
                     year = ts[:4] if ts else "?"
                     archived_url = f"https://web.archive.org/web/{ts}/{original}"
-                    items.append({
-                        "title":       f"[{year}] {original}",
-                        "link":        archived_url,
-                        "displayLink": "web.archive.org",
-                        "snippet":     f"Archived snapshot from {year} · {mime} · Original: {original[:80]}",
-                        "source":      "wayback",
-                    })
+                    items.append(Result(
+                        title=f"[{year}] {original}",
+                        link=archived_url,
+                        display_link="web.archive.org",
+                        snippet=f"Archived snapshot from {year} · {mime} · Original: {original[:80]}",
+                        source="wayback",
+                    ))
     except Exception:
         pass
     return items
 
 
-def _api_hackertarget_dns(q: str) -> list[dict[str, Any]]:
+@metrics.sourced("api", "hackertarget")
+def _api_hackertarget_dns(q: str) -> list[Result]:
     """HackerTarget — DNS lookup, reverse IP, host search."""
-    items: list[dict[str, Any]] = []
+    items: list[Result] = []
     try:
         # Host search
-        r = httpx.get(
+        r = outbound.get(
             "https://api.hackertarget.com/hostsearch/",
             params={"q": q},
             headers={"User-Agent": _ua()},
@@ -815,23 +839,24 @@ def _api_hackertarget_dns(q: str) -> list[dict[str, Any]]:
                 parts = line.split(",")
                 if len(parts) >= 2:
                     hostname, ip = parts[0].strip(), parts[1].strip()
-                    items.append({
-                        "title":       f"{hostname} → {ip}",
-                        "link":        f"https://{hostname}",
-                        "displayLink": hostname,
-                        "snippet":     f"DNS record · Host: {hostname} · IP: {ip}",
-                        "source":      "hackertarget",
-                    })
+                    items.append(Result(
+                        title=f"{hostname} → {ip}",
+                        link=f"https://{hostname}",
+                        display_link=hostname,
+                        snippet=f"DNS record · Host: {hostname} · IP: {ip}",
+                        source="hackertarget",
+                    ))
     except Exception:
         pass
     return items
 
 
-def _api_urlscan(q: str) -> list[dict[str, Any]]:
+@metrics.sourced("api", "urlscan")
+def _api_urlscan(q: str) -> list[Result]:
     """urlscan.io public search — website scans, technologies, contacts."""
-    items: list[dict[str, Any]] = []
+    items: list[Result] = []
     try:
-        r = httpx.get(
+        r = api_client.get(
             "https://urlscan.io/api/v1/search/",
             params={"q": q, "size": "15"},
             headers={"User-Agent": _ua(), "Accept": "application/json"},
@@ -844,13 +869,13 @@ def _api_urlscan(q: str) -> list[dict[str, Any]]:
                 url  = page.get("url", task.get("url", ""))
                 if not url:
                     continue
-                items.append({
-                    "title":       page.get("title") or url,
-                    "link":        f"https://urlscan.io/result/{result.get('task',{}).get('uuid','')}",
-                    "displayLink": page.get("domain", _clean_display(url)),
-                    "snippet":     f"Scanned: {task.get('time','')[:10]} · {url[:100]}",
-                    "source":      "urlscan.io",
-                })
+                items.append(Result(
+                    title=page.get("title") or url,
+                    link=f"https://urlscan.io/result/{result.get('task',{}).get('uuid','')}",
+                    display_link=page.get("domain", _clean_display(url)),
+                    snippet=f"Scanned: {task.get('time','')[:10]} · {url[:100]}",
+                    source="urlscan.io",
+                ))
     except Exception:
         pass
     return items
@@ -858,12 +883,19 @@ def _api_urlscan(q: str) -> list[dict[str, Any]]:
 
 
 # ---------------------------------------------------------------------------
-# Electron Worker — real browser searches via the invisible BrowserWindow
+# SERP parsers — module-level so they can run on the parse pool (parsing.py);
+# each returns plain (title, link, displayLink, snippet) rows
 # ---------------------------------------------------------------------------
 
-def _parse_google_html(html: str) -> list[dict[str, Any]]:
-    """Parse Google SERP HTML extracted from the Electron worker."""
-    items: list[dict[str, Any]] = []
+Row = tuple[str, str, str, str]
+
+
+def _items(rows: list[Row], source: str) -> list[Result]:
+    return [Result(title, link, display, snippet, source) for title, link, display, snippet in rows]
+
+
+def _serp_google(html: str) -> list[Row]:
+    rows: list[Row] = []
     soup = BeautifulSoup(html, "html.parser")
 
     # Google result containers
@@ -881,20 +913,45 @@ def _parse_google_html(html: str) -> list[dict[str, Any]]:
         link = link_el.get("href", "")
         if not link or not link.startswith("http") or "google.com" in link:
             continue
-        items.append({
-            "title":       title_el.get_text(strip=True),
-            "link":        link,
-            "displayLink": _clean_display(link),
-            "snippet":     snippet_el.get_text(strip=True) if snippet_el else "",
-            "source":      "google",
-        })
+        rows.append((
+            title_el.get_text(strip=True),
+            link,
+            _clean_display(link),
+            snippet_el.get_text(strip=True) if snippet_el else "",
+        ))
 
-    return items
+    return rows
 
 
-def _parse_bing_html(html: str) -> list[dict[str, Any]]:
-    """Parse Bing SERP HTML from Electron worker (richer than HTTP scraping)."""
-    items: list[dict[str, Any]] = []
+def _serp_bing(html: str) -> list[Row]:
+    rows: list[Row] = []
+    soup = BeautifulSoup(html, "html.parser")
+    for result in soup.select("li.b_algo"):
+        title_el   = result.select_one("h2 a")
+        snippet_el = result.select_one(".b_caption p") or result.select_one("p")
+        cite_el    = result.select_one("cite")
+        if not title_el:
+            continue
+        link = title_el.get("data-href", "") or title_el.get("href", "")
+        if not link or "bing.com" in link:
+            if cite_el:
+                raw  = cite_el.get_text(strip=True).split(" ›")[0].strip()
+                link = ("https://" + raw) if not raw.startswith("http") else raw
+            else:
+                continue
+        if not link or not link.startswith("http") or "bing.com" in link:
+            continue
+        rows.append((
+            title_el.get_text(strip=True),
+            link,
+            _clean_display(link),
+            snippet_el.get_text(strip=True) if snippet_el else "",
+        ))
+    return rows
+
+
+def _serp_bing_electron(html: str) -> list[Row]:
+    rows: list[Row] = []
     soup = BeautifulSoup(html, "html.parser")
     for result in soup.select("li.b_algo"):
         title_el   = result.select_one("h2 a")
@@ -904,19 +961,17 @@ def _parse_bing_html(html: str) -> list[dict[str, Any]]:
         link = title_el.get("href", "")
         if not link or not link.startswith("http") or "bing.com" in link:
             continue
-        items.append({
-            "title":       title_el.get_text(strip=True),
-            "link":        link,
-            "displayLink": _clean_display(link),
-            "snippet":     snippet_el.get_text(strip=True) if snippet_el else "",
-            "source":      "bing_electron",
-        })
-    return items
+        rows.append((
+            title_el.get_text(strip=True),
+            link,
+            _clean_display(link),
+            snippet_el.get_text(strip=True) if snippet_el else "",
+        ))
+    return rows
 
 
-def _parse_ddg_html(html: str) -> list[dict[str, Any]]:
-    """Parse DuckDuckGo HTML from Electron worker."""
-    items: list[dict[str, Any]] = []
+def _serp_ddg(html: str) -> list[Row]:
+    rows: list[Row] = []
     soup = BeautifulSoup(html, "html.parser")
     for result in soup.select(".result"):
         title_el   = result.select_one(".result__title a") or result.select_one("a.result__a")
@@ -933,50 +988,167 @@ def _parse_ddg_html(html: str) -> list[dict[str, Any]]:
         if not link or not link.startswith("http"):
             continue
         display = url_el.get_text(strip=True) if url_el else _clean_display(link)
-        items.append({
-            "title":       title_el.get_text(strip=True),
-            "link":        link,
-            "displayLink": display.replace("www.", ""),
-            "snippet":     snippet_el.get_text(strip=True) if snippet_el else "",
-            "source":      "ddg_electron",
-        })
+        rows.append((
+            title_el.get_text(strip=True),
+            link,
+            display.replace("www.", ""),
+            snippet_el.get_text(strip=True) if snippet_el else "",
+        ))
+    return rows
+
+
+def _serp_brave(html: str) -> list[Row]:
+    rows: list[Row] = []
+    soup = BeautifulSoup(html, "html.parser")
+    for result in soup.select("div.snippet"):
+        title_el   = result.select_one(".snippet-title") or result.select_one("span.title")
+        snippet_el = result.select_one(".snippet-description") or result.select_one("p")
+        link_el    = result.select_one("a[href]")
+        if not link_el:
+            continue
+        link = link_el.get("href", "")
+        if not link or not link.startswith("http") or "brave.com" in link:
+            continue
+        title = title_el.get_text(strip=True) if title_el else ""
+        if not title:
+            continue
+        rows.append((title, link, _clean_display(link), snippet_el.get_text(strip=True) if snippet_el else ""))
+    return rows
+
+
+def _serp_startpage(html: str) -> list[Row]:
+    rows: list[Row] = []
+    soup = BeautifulSoup(html, "html.parser")
+    for result in soup.select(".w-gl__result, .result"):
+        title_el   = result.select_one("h3 a") or result.select_one("a.result-title")
+        snippet_el = result.select_one("p.w-gl__description") or result.select_one(".description")
+        if not title_el:
+            continue
+        link = title_el.get("href", "")
+        if not link or not link.startswith("http") or "startpage.com" in link:
+            continue
+        rows.append((
+            title_el.get_text(strip=True),
+            link,
+            _clean_display(link),
+            snippet_el.get_text(strip=True) if snippet_el else "",
+        ))
+    return rows
+
+
+def _serp_mojeek(html: str) -> list[Row]:
+    rows: list[Row] = []
+    soup = BeautifulSoup(html, "html.parser")
+    for result in soup.select("ul.results-standard li"):
+        title_el   = result.select_one("a.title")
+        snippet_el = result.select_one("p.s")
+        url_el     = result.select_one("a.ob")
+        if not title_el:
+            continue
+        link = title_el.get("href", "")
+        if not link or not link.startswith("http"):
+            continue
+        rows.append((
+            title_el.get_text(strip=True),
+            link,
+            url_el.get_text(strip=True).replace("www.", "") if url_el else _clean_display(link),
+            snippet_el.get_text(strip=True) if snippet_el else "",
+        ))
+    return rows
+
+
+def _serp_yahoo(html: str) -> list[Row]:
+    rows: list[Row] = []
+    soup = BeautifulSoup(html, "html.parser")
+    for result in soup.select("div.algo, div.Sr"):
+        title_el   = result.select_one("h3 a") or result.select_one("h3.title a")
+        snippet_el = result.select_one("p") or result.select_one(".compText")
+        if not title_el:
+            continue
+        link = title_el.get("href", "")
+        if "/RU=" in link:
+            try:
+                m = re.search(r"/RU=([^/]+)/", link)
+                if m:
+                    link = unquote(m.group(1))
+            except Exception:
+                pass
+        if not link or not link.startswith("http") or "yahoo.com" in link:
+            continue
+        rows.append((
+            title_el.get_text(strip=True),
+            link,
+            _clean_display(link),
+            snippet_el.get_text(strip=True) if snippet_el else "",
+        ))
+    return rows
+
+
+def _parse_response(r: Any, parser: Any, source: str) -> list[Result]:
+    """An engine response's raw bytes through its parser — on the parse pool if there is one."""
+    with tracing.span("parse", source=source, status=r.status_code, bytes=len(r.content)) as span:
+        items = _items(parsing.run(parser, r.content, encoding=r.encoding), source)
+        span["rows"] = len(items)
     return items
 
 
-def _fetch_electron_worker(engine: str, query: str) -> list[dict[str, Any]]:
+# ---------------------------------------------------------------------------
+# Electron Worker — real browser searches via the invisible BrowserWindow
+# ---------------------------------------------------------------------------
+
+def _parse_google_html(html: str) -> list[Result]:
+    """Parse Google SERP HTML extracted from the Electron worker."""
+    return _items(parsing.run(_serp_google, html), "google")
+
+
+def _parse_bing_html(html: str) -> list[Result]:
+    """Parse Bing SERP HTML from Electron worker (richer than HTTP scraping)."""
+    return _items(parsing.run(_serp_bing_electron, html), "bing_electron")
+
+
+def _parse_ddg_html(html: str) -> list[Result]:
+    """Parse DuckDuckGo HTML from Electron worker."""
+    return _items(parsing.run(_serp_ddg, html), "ddg_electron")
+
+
+def _fetch_electron_worker(engine: str, query: str) -> list[Result]:
     """
-    Send a search request to the Electron worker server running on localhost.
+    Search through the Electron worker server running on localhost.
     The worker uses a real invisible BrowserWindow — bypasses all bot detection.
+    Requests go through worker_client: cached, shared between groups and
+    batched; an empty list straight away when its queue is too long to wait.
     """
-    try:
-        r = httpx.post(
-            f"http://127.0.0.1:{WORKER_PORT}/search",
-            json={"engine": engine, "query": query},
-            timeout=25,
-        )
-        if r.status_code != 200:
-            return []
-        data = r.json()
-        html = data.get("html", "")
-        if not html:
-            return []
-
-        if engine == "google":
-            return _parse_google_html(html)
-        elif engine == "bing":
-            return _parse_bing_html(html)
-        elif engine in ("ddg", "duckduckgo"):
-            return _parse_ddg_html(html)
-        else:
-            return _parse_google_html(html)
+    with metrics.source("electron", engine) as call:
+        try:
+            html = worker_client.fetch(engine, query)
+            if html is None:
+                call["outcome"] = "busy"
+                return []
+            if not html:
+                return []
+
+            if engine == "google":
+                items = _parse_google_html(html)
+            elif engine == "bing":
+                items = _parse_bing_html(html)
+            elif engine in ("ddg", "duckduckgo"):
+                items = _parse_ddg_html(html)
+            else:
+                items = _parse_google_html(html)
+            call["results"] = len(items)
+            return items
 
-    except Exception:
-        return []
+        except Exception:
+            call["outcome"] = "error"
+            return []
 
 
 def _is_worker_available() -> bool:
     """Check if the Electron worker server is running via TCP socket check."""
     import socket
+    simulated = outbound.simulated_host_available(f"127.0.0.1_{WORKER_PORT}")
+    if simulated is not None:
+        return simulated
     try:
         sock = socket.create_connection(("127.0.0.1", WORKER_PORT), timeout=1)
         sock.close()
@@ -988,16 +1160,16 @@ def _is_worker_available() -> bool:
 # Classic scraping engines
 # ---------------------------------------------------------------------------
 
-def _fetch_bing(q: str, pages: int = 4) -> list[dict[str, Any]]:
-    items: list[dict[str, Any]] = []
+def _fetch_bing(q: str, pages: int = BING_PAGES, start: int = 1) -> list[Result]:
+    items: list[Result] = []
     cookies = {
         "MUID": "1", "_EDGE_S": "mkt=en-US&ui=en-US&setmkt=en-US&setlang=en-US",
         "_EDGE_V": "1", "SRCHD": "AF=NOFORM", "SRCHUID": "V=2",
         "SRCHUSR": "DOB=20200101", "ENSEARCH": "BENVER=1",
     }
-    for first in range(1, pages * 10 + 1, 10):
+    for first in range(start, start + pages * 10, 10):
         try:
-            r = httpx.get(
+            r = outbound.get(
                 "https://www.bing.com/search",
                 params={"q": q, "setlang": "en-US", "cc": "US", "mkt": "en-US",
                         "ensearch": "1", "first": str(first), "count": "10"},
@@ -1006,219 +1178,89 @@ def _fetch_bing(q: str, pages: int = 4) -> list[dict[str, Any]]:
             )
             if r.status_code != 200:
                 break
-            soup    = BeautifulSoup(r.text, "html.parser")
-            results = soup.select("li.b_algo")
-            if not results:
-                break
-            added = 0
-            for result in results:
-                title_el   = result.select_one("h2 a")
-                snippet_el = result.select_one(".b_caption p") or result.select_one("p")
-                cite_el    = result.select_one("cite")
-                if not title_el:
-                    continue
-                link = title_el.get("data-href", "") or title_el.get("href", "")
-                if not link or "bing.com" in link:
-                    if cite_el:
-                        raw  = cite_el.get_text(strip=True).split(" ›")[0].strip()
-                        link = ("https://" + raw) if not raw.startswith("http") else raw
-                    else:
-                        continue
-                if not link or not link.startswith("http") or "bing.com" in link:
-                    continue
-                items.append({
-                    "title":       title_el.get_text(strip=True),
-                    "link":        link,
-                    "displayLink": _clean_display(link),
-                    "snippet":     snippet_el.get_text(strip=True) if snippet_el else "",
-                    "source":      "bing",
-                })
-                added += 1
-            if added == 0:
+            page = _parse_response(r, _serp_bing, "bing")
+            if not page:
                 break
-            time.sleep(random.uniform(0.15, 0.4))
+            items.extend(page)
+            time.sleep(concurrency.rng().uniform(0.15, 0.4))
         except Exception:
             break
     return items
 
 
-def _fetch_duckduckgo(q: str) -> list[dict[str, Any]]:
-    items: list[dict[str, Any]] = []
+def _fetch_duckduckgo(q: str) -> list[Result]:
     try:
-        r = httpx.get(
+        r = outbound.get(
             "https://html.duckduckgo.com/html/",
             params={"q": q, "kl": "en-us", "kp": "-1", "k1": "-1"},
             headers=_headers("https://duckduckgo.com/"),
             timeout=14, follow_redirects=True,
         )
         if r.status_code != 200:
-            return items
-        soup = BeautifulSoup(r.text, "html.parser")
-        for result in soup.select(".result"):
-            title_el   = result.select_one(".result__title a") or result.select_one("a.result__a")
-            snippet_el = result.select_one(".result__snippet")
-            url_el     = result.select_one(".result__url")
-            if not title_el:
-                continue
-            link = title_el.get("href", "")
-            if "uddg=" in link:
-                try:
-                    link = unquote(parse_qs(urlparse(link).query).get("uddg", [""])[0])
-                except Exception:
-                    pass
-            if not link or not link.startswith("http"):
-                continue
-            display = url_el.get_text(strip=True) if url_el else _clean_display(link)
-            items.append({
-                "title":       title_el.get_text(strip=True),
-                "link":        link,
-                "displayLink": display.replace("www.", ""),
-                "snippet":     snippet_el.get_text(strip=True) if snippet_el else "",
-                "source":      "duckduckgo",
-            })
+            return []
+        return _parse_response(r, _serp_ddg, "duckduckgo")
     except Exception:
-        pass
-    return items
+        return []
 
 
-def _fetch_brave(q: str) -> list[dict[str, Any]]:
-    items: list[dict[str, Any]] = []
+def _fetch_brave(q: str) -> list[Result]:
     try:
-        r = httpx.get(
+        r = outbound.get(
             "https://search.brave.com/search",
             params={"q": q, "source": "web", "lang": "en", "country": "us"},
             headers=_headers("https://search.brave.com/"),
             timeout=14, follow_redirects=True,
         )
         if r.status_code != 200:
-            return items
-        soup = BeautifulSoup(r.text, "html.parser")
-        for result in soup.select("div.snippet"):
-            title_el   = result.select_one(".snippet-title") or result.select_one("span.title")
-            snippet_el = result.select_one(".snippet-description") or result.select_one("p")
-            link_el    = result.select_one("a[href]")
-            if not link_el:
-                continue
-            link = link_el.get("href", "")
-            if not link or not link.startswith("http") or "brave.com" in link:
-                continue
-            title = title_el.get_text(strip=True) if title_el else ""
-            if not title:
-                continue
-            items.append({
-                "title":       title,
-                "link":        link,
-                "displayLink": _clean_display(link),
-                "snippet":     snippet_el.get_text(strip=True) if snippet_el else "",
-                "source":      "brave",
-            })
+            return []
+        return _parse_response(r, _serp_brave, "brave")
     except Exception:
-        pass
-    return items
+        return []
 
 
-def _fetch_startpage(q: str) -> list[dict[str, Any]]:
-    items: list[dict[str, Any]] = []
+def _fetch_startpage(q: str) -> list[Result]:
     try:
-        r = httpx.get(
+        r = outbound.get(
             "https://www.startpage.com/sp/search",
             params={"q": q, "language": "english", "cat": "web"},
             headers=_headers("https://www.startpage.com/"),
             timeout=14, follow_redirects=True,
         )
         if r.status_code != 200:
-            return items
-        soup = BeautifulSoup(r.text, "html.parser")
-        for result in soup.select(".w-gl__result, .result"):
-            title_el   = result.select_one("h3 a") or result.select_one("a.result-title")
-            snippet_el = result.select_one("p.w-gl__description") or result.select_one(".description")
-            if not title_el:
-                continue
-            link = title_el.get("href", "")
-            if not link or not link.startswith("http") or "startpage.com" in link:
-                continue
-            items.append({
-                "title":       title_el.get_text(strip=True),
-                "link":        link,
-                "displayLink": _clean_display(link),
-                "snippet":     snippet_el.get_text(strip=True) if snippet_el else "",
-                "source":      "startpage",
-            })
+            return []
+        return _parse_response(r, _serp_startpage, "startpage")
     except Exception:
-        pass
-    return items
+        return []
 
 
-def _fetch_mojeek(q: str) -> list[dict[str, Any]]:
-    items: list[dict[str, Any]] = []
+def _fetch_mojeek(q: str) -> list[Result]:
     try:
-        r = httpx.get(
+        r = outbound.get(
             "https://www.mojeek.com/search",
             params={"q": q, "lang": "en", "country": "US"},
             headers=_headers("https://www.mojeek.com/"),
             timeout=12, follow_redirects=True,
         )
         if r.status_code != 200:
-            return items
-        soup = BeautifulSoup(r.text, "html.parser")
-        for result in soup.select("ul.results-standard li"):
-            title_el   = result.select_one("a.title")
-            snippet_el = result.select_one("p.s")
-            url_el     = result.select_one("a.ob")
-            if not title_el:
-                continue
-            link = title_el.get("href", "")
-            if not link or not link.startswith("http"):
-                continue
-            items.append({
-                "title":       title_el.get_text(strip=True),
-                "link":        link,
-                "displayLink": url_el.get_text(strip=True).replace("www.", "") if url_el else _clean_display(link),
-                "snippet":     snippet_el.get_text(strip=True) if snippet_el else "",
-                "source":      "mojeek",
-            })
+            return []
+        return _parse_response(r, _serp_mojeek, "mojeek")
     except Exception:
-        pass
-    return items
+        return []
 
 
-def _fetch_yahoo(q: str) -> list[dict[str, Any]]:
-    items: list[dict[str, Any]] = []
+def _fetch_yahoo(q: str) -> list[Result]:
     try:
-        r = httpx.get(
+        r = outbound.get(
             "https://search.yahoo.com/search",
             params={"p": q, "ei": "UTF-8", "n": "20", "fl": "1", "vl": "lang_en"},
             headers=_headers("https://search.yahoo.com/"),
             timeout=12, follow_redirects=True,
         )
         if r.status_code != 200:
-            return items
-        soup = BeautifulSoup(r.text, "html.parser")
-        for result in soup.select("div.algo, div.Sr"):
-            title_el   = result.select_one("h3 a") or result.select_one("h3.title a")
-            snippet_el = result.select_one("p") or result.select_one(".compText")
-            if not title_el:
-                continue
-            link = title_el.get("href", "")
-            if "/RU=" in link:
-                try:
-                    m = re.search(r"/RU=([^/]+)/", link)
-                    if m:
-                        link = unquote(m.group(1))
-                except Exception:
-                    pass
-            if not link or not link.startswith("http") or "yahoo.com" in link:
-                continue
-            items.append({
-                "title":       title_el.get_text(strip=True),
-                "link":        link,
-                "displayLink": _clean_display(link),
-                "snippet":     snippet_el.get_text(strip=True) if snippet_el else "",
-                "source":      "yahoo",
-            })
+            return []
+        return _parse_response(r, _serp_yahoo, "yahoo")
     except Exception:
-        pass
-    return items
+        return []
 
 
 # ---------------------------------------------------------------------------
@@ -1262,12 +1304,139 @@ def _build_queries(group: dict[str, Any], q: str) -> list[str]:
 # Group dispatcher — decides which engines to use per group/category
 # ---------------------------------------------------------------------------
 
-def _search_group(group: dict[str, Any], q: str) -> tuple[str, list[dict[str, Any]]]:
+PRIMARY_ENGINES  = [("bing", _fetch_bing), ("duckduckgo", _fetch_duckduckgo), ("startpage", _fetch_startpage)]
+FALLBACK_ENGINES = [("brave", _fetch_brave), ("mojeek", _fetch_mojeek), ("yahoo", _fetch_yahoo)]
+
+
+def _engine_round(
+    query: str,
+    q_words: list[str],
+    prior: list[Result] | None = None,
+) -> list[Result]:
+    """
+    Run one query through the primary engines — hedged with the fallback
+    engines when one is slow or thin — then through the fallback engines
+    not used yet when fewer than 5 usable results exist (counting `prior`).
+    Only what finished within GROUP_TIMEOUT or the budget is kept.
+    """
+    # Primary: Bing + DDG + Startpage
+    raw, used = hedging.hedged_round(query, PRIMARY_ENGINES, FALLBACK_ENGINES, deadline.clamp(GROUP_TIMEOUT))
+
+    # Fallback: Brave + Mojeek + Yahoo if < 5 results
+    rest = [e for e in FALLBACK_ENGINES if e[0] not in used]
+    if rest and len(_deduplicate(itertools.chain(prior or (), raw), q_words)) < 5 and not deadline.expired():
+        more, _ = hedging.hedged_round(query, rest, [], deadline.clamp(GROUP_TIMEOUT))
+        raw.extend(more)
+
+    return raw
+
+
+def _group_deadline(ends_at: float) -> float:
+    """Groups stop a little before the response does, so their partial
+    results still make it out — 10% of what is left, at most a second."""
+    return ends_at - min(1.0, max(0.0, ends_at - time.monotonic()) * 0.1)
+
+
+def _busy(mode: str) -> JsonResponse:
+    """429 for a full search queue, with a Retry-After from recent search times."""
+    retry    = scheduler.admission.retry_after()
+    metrics.SEARCHES.inc(mode=mode, outcome="busy")
+    response = JsonResponse({"error": "Search is busy — try again shortly.", "retry_after": retry}, status=429)
+    response["Retry-After"] = str(retry)
+    return response
+
+
+def _run_group(
+    group: dict[str, Any],
+    q: str,
+    plan: QueryPlan | None,
+    ends_at: float,
+) -> tuple[str, list[Result], str | None]:
+    """
+    A group on a pool thread — its priority and deadline follow every call it
+    makes. Returns (gid, items, cursor for the next slice or None).
+    """
+    state: dict[str, Any] = {}
+    t0 = time.monotonic()
+    with priority.running(priority.of(group)), tracing.span("group", group=group["id"]) as span:
+        gid, items = deadline.within(ends_at, _search_group, group, q, plan, state)
+        span["results"] = len(items)
+    labels = {"group": gid, "category": group["category"]}
+    metrics.GROUP_LATENCY.observe(time.monotonic() - t0, **labels)
+    metrics.GROUP_RUNS.inc(outcome="late" if time.monotonic() >= ends_at else "ok" if items else "empty", **labels)
+    if items:
+        metrics.GROUP_RESULTS.inc(len(items), **labels)
+    more = {
+        "qi":      state.get("qi", 0),
+        "o":       {str(i): BING_PAGES * 10 + 1 for i in range(state.get("qi", 0))},
+        "seen":    sorted({_link_digest(i.link) for i in items}),
+        "backlog": [],
+    }
+    links           = {i.link for i in items}
+    more["backlog"] = list(itertools.islice((i for i in state.get("raw", ()) if i.link not in links), MORE_BACKLOG))
+    return gid, items, _save_more(group, q, 0, more)
+
+
+def _group_runner() -> Any:
+    """_run_group here, or on a search_worker process when a job queue is configured."""
+    return jobqueue.run_group if jobqueue.enabled() else _run_group
+
+
+def _cached_round(query: str, q_words: list[str]) -> list[Result]:
+    """_engine_round shared across searches — prefetch, the real search and
+    every plan that contains the same query reuse one result."""
+    return memo.shared(memo.key("engine1", query), lambda: _engine_round(query, q_words), CACHE_TTL) or []
+
+
+def _enrich(category: str, q: str) -> list[Result]:
+    """The OSINT enrichment script for a category — once per (category, q),
+    not once per group. Scripts may yield results as they arrive; taking
+    them stops once the budget is spent, keeping what came in."""
+    script = _ENRICHERS.get(category)
+    if script is None:
+        return []
+
+    def run() -> list[Result]:
+        with metrics.source("enrich", category) as call:
+            items: list[Result] = []
+            stream = iter(script(q) or ())
+            try:
+                for item in stream:
+                    items.append(item)
+                    if deadline.expired():
+                        break
+            finally:
+                getattr(stream, "close", lambda: None)()
+            call["results"] = len(items)
+            return items
+
+    return memo.shared(memo.key("enrich1", category, q), run, CACHE_TTL) or []
+
+
+def _plan_search(groups: list[dict[str, Any]], q: str) -> QueryPlan:
+    """One shared plan for every selected group — see apps/search/planner.py."""
+    q_words = [w.lower() for w in q.split() if len(w) >= 2]
+    return QueryPlan(
+        {g["id"]: _build_queries(g, q) for g in groups},
+        lambda query: _cached_round(query, q_words),
+    )
+
+
+def _search_group(
+    group: dict[str, Any],
+    q: str,
+    plan: QueryPlan | None = None,
+    state: dict[str, Any] | None = None,
+) -> tuple[str, list[Result]]:
+    """
+    Run one group. When `state` is given it receives where the operator
+    queries stopped ("qi") and every raw result ("raw") for "load more".
+    """
     queries   = _build_queries(group, q)
     q_words   = [w.lower() for w in q.split() if len(w) >= 2]  # ordered list — preserves word order
     is_strict = group["category"] in ("person", "username", "email", "phone")
     gid       = group["id"]
-    all_raw:  list[dict[str, Any]] = []
+    all_raw:  list[Result] = []
 
     # ── Inject open API results per group ───────────────────────────────────
     if gid in ("person_github", "username_dev"):
@@ -1297,19 +1466,9 @@ def _search_group(group: dict[str, Any], q: str) -> tuple[str, list[dict[str, An
     # ── Electron worker — real browser, Google included ─────────────────────
     # Only fires if the Electron worker server is running (desktop app mode)
     # ── OSINT enrichment scripts — structured data per target type ─────────
-    if _OSINT_SCRIPTS_AVAILABLE:
+    if not deadline.expired():
         try:
-            cat = group["category"]
-            if cat == "phone":
-                all_raw.extend(enrich_phone(q))
-            elif cat == "domain":
-                all_raw.extend(enrich_url(q))
-            elif cat == "email":
-                all_raw.extend(enrich_email(q))
-            elif cat == "username":
-                all_raw.extend(enrich_username(q))
-            elif cat == "person":
-                all_raw.extend(enrich_person(q))
+            all_raw.extend(_enrich(group["category"], q))
         except Exception:
             pass
 
@@ -1322,7 +1481,7 @@ def _search_group(group: dict[str, Any], q: str) -> tuple[str, list[dict[str, An
         'phone_exact', 'phone_reverse',
         'domain_whois', 'domain_exposed', 'domain_emails',
     }
-    if _is_worker_available() and gid in WORKER_PRIORITY:
+    if gid in WORKER_PRIORITY and not deadline.expired() and _is_worker_available():
         worker_q = queries[0] if queries else q
         try:
             results_g = _fetch_electron_worker("google", worker_q)
@@ -1334,158 +1493,658 @@ def _search_group(group: dict[str, Any], q: str) -> tuple[str, list[dict[str, An
             pass
         deduped_early = _deduplicate(all_raw, q_words, is_strict)
         if len(deduped_early) >= MAX_PER_GROUP:
+            if state is not None:
+                state["qi"], state["raw"] = 0, all_raw
             return gid, deduped_early
 
     # ── Scraping engines ─────────────────────────────────────────────────────
-    for query in queries:
-        if len(all_raw) >= MAX_PER_GROUP * 3:
-            break
+    qi = 0
+    for qi, query in enumerate(queries):
+        if len(all_raw) >= MAX_PER_GROUP * 3 or deadline.expired():
+            break  # enough, or out of budget — return the best partial set
+        with tracing.span("query", query=query) as span:
+            got = plan.fetch(query) if plan is not None else _engine_round(query, q_words, all_raw)
+            span["results"] = len(got)
+        all_raw.extend(got)
+    else:
+        qi = len(queries)
+
+    if state is not None:
+        state["qi"], state["raw"] = qi, all_raw
+    with tracing.span("dedup", raw=len(all_raw)) as span:
+        items = _deduplicate(all_raw, q_words, is_strict)
+        span["kept"] = len(items)
+    return gid, items
 
-        # Primary: Bing + DDG + Startpage
-        with concurrent.futures.ThreadPoolExecutor(max_workers=3) as ex:
-            f_bing = ex.submit(_fetch_bing,       query)
-            f_ddg  = ex.submit(_fetch_duckduckgo, query)
-            f_sp   = ex.submit(_fetch_startpage,  query)
-            for f in concurrent.futures.as_completed([f_bing, f_ddg, f_sp], timeout=GROUP_TIMEOUT):
-                try:
-                    all_raw.extend(f.result() or [])
-                except Exception:
-                    pass
-
-        # Fallback: Brave + Mojeek + Yahoo if < 5 results
-        deduped = _deduplicate(all_raw, q_words, is_strict)
-        if len(deduped) < 5:
-            with concurrent.futures.ThreadPoolExecutor(max_workers=3) as ex:
-                f_brave  = ex.submit(_fetch_brave,  query)
-                f_mojeek = ex.submit(_fetch_mojeek, query)
-                f_yahoo  = ex.submit(_fetch_yahoo,  query)
-                for f in concurrent.futures.as_completed([f_brave, f_mojeek, f_yahoo], timeout=GROUP_TIMEOUT):
-                    try:
-                        all_raw.extend(f.result() or [])
-                    except Exception:
-                        pass
 
-    return gid, _deduplicate(all_raw, q_words, is_strict)
+# ---------------------------------------------------------------------------
+# Load more — per-group continuation
+# ---------------------------------------------------------------------------
+# A cursor is a signed {g, q, n, qi, o, s, k}: group, query, slices served so
+# far, the next operator query to run, the next Bing offset per query already
+# run, and a short digest of every link served — so dedupe never depends on
+# the cache. Unserved raw results are the only state kept server-side: under
+# a random key (k) per cursor, and only when there are any, so concurrent
+# readers of one query never share or overwrite each other's backlog.
+
+def _more_key(gid: str, q: str) -> str:
+    """Slice-0 cursor of a cached group."""
+    return f"{_group_cache_key(gid, q)}_more"
+
+
+def _backlog_key(key: str) -> str:
+    return f"search_more_{key}"
+
+
+def _link_digest(link: str) -> str:
+    return hashlib.blake2b(link.encode(), digest_size=4).hexdigest()
+
+
+def _save_more(group: dict[str, Any], q: str, n: int, more: dict[str, Any]) -> str | None:
+    """Store slice-n backlog if any; returns the cursor for slice n+1, or None when exhausted."""
+    if not more["backlog"] and not more["o"] and more["qi"] >= len(_build_queries(group, q)):
+        return None
+    cur = {"g": group["id"], "q": q, "n": n, "qi": more["qi"], "o": more["o"], "s": more["seen"]}
+    if more["backlog"]:
+        cur["k"] = secrets.token_urlsafe(12)
+        cache.set(_backlog_key(cur["k"]), more["backlog"], timeout=CURSOR_MAX_AGE)
+    return signing.dumps(cur, salt="firecat.search.more", compress=True)
+
+
+def _load_cursor(token: str) -> dict[str, Any] | None:
+    try:
+        cur = signing.loads(token, salt="firecat.search.more", max_age=CURSOR_MAX_AGE)
+    except signing.BadSignature:
+        return None
+    return cur if isinstance(cur, dict) and cur.get("g") in GROUP_BY_ID else None
+
+
+def _search_more(cur: dict[str, Any]) -> tuple[list[Result], str | None] | None:
+    """Next slice for a cursor — backlog first, then unrun operator queries,
+    then deeper Bing pages of the queries already run. None when the
+    cursor's backlog is no longer cached."""
+    group, q, n = GROUP_BY_ID[cur["g"]], cur["q"], cur["n"]
+    pool: list[Result] = []
+    if cur.get("k"):
+        pool = cache.get(_backlog_key(cur["k"]))
+        if pool is None:
+            return None
+    queries   = _build_queries(group, q)
+    q_words   = [w.lower() for w in q.split() if len(w) >= 2]
+    is_strict = group["category"] in ("person", "username", "email", "phone")
+    seen      = set(cur.get("s") or ())
+    qi        = cur["qi"]
+    offsets   = dict(cur["o"])
+
+    def unseen(items: list[Result]) -> list[Result]:
+        return [i for i in items if _link_digest(i.link) not in seen]
+
+    pool  = unseen(pool)
+    fresh = _deduplicate(pool, q_words, is_strict)
+    while len(fresh) < MAX_PER_GROUP and not deadline.expired():
+        if qi < len(queries):
+            pool.extend(unseen(_engine_round(queries[qi], q_words, pool)))
+            offsets[str(qi)] = BING_PAGES * 10 + 1
+            qi += 1
+        elif offsets:
+            k = min(offsets, key=int)
+            items = _fetch_bing(queries[int(k)], pages=2, start=offsets[k])
+            if items:
+                pool.extend(unseen(items))
+                offsets[k] += 20
+            else:
+                del offsets[k]  # Bing has nothing past this page
+        else:
+            break
+        fresh = _deduplicate(pool, q_words, is_strict)
+
+    links = {i.link for i in fresh}
+    nxt   = _save_more(group, q, n + 1, {
+        "qi":      qi,
+        "o":       offsets,
+        "seen":    sorted(seen | {_link_digest(l) for l in links}),
+        "backlog": list(itertools.islice((i for i in pool if i.link not in links), MORE_BACKLOG)),
+    })
+    return fresh, nxt
 
 
 # ---------------------------------------------------------------------------
 # Views
 # ---------------------------------------------------------------------------
 
+def _session_key(request: Any) -> str:
+    if not request.session.session_key:
+        request.session.create()
+    return request.session.session_key
+
+
+def _sse(payload: dict[str, Any]) -> str:
+    return f"data: {jsonenc.dumps(payload)}\n\n"
+
+
+class _SearchStream:
+    """
+    One SSE search. The steps that build events are shared; events() drives
+    them from a server thread (WSGI), aevents() from the event loop (ASGI).
+    Either way the groups themselves run on the shared scheduler pools.
+    """
+
+    def __init__(
+        self,
+        view: SearchProxyView,
+        q: str,
+        groups: list[dict[str, Any]],
+        ends_at: float,
+        guesses: list[dict[str, Any]] | None,
+        cached: dict[str, list[Result]],
+        cursors: dict[str, str],
+        missing: list[dict[str, Any]],
+        ticket: scheduler.Ticket | None,
+        trace: tracing.Trace,
+        want_trace: bool = False,
+    ) -> None:
+        self.view     = view
+        self.q        = q
+        self.groups   = groups
+        self.ends_at  = ends_at
+        self.guesses  = guesses
+        self.cached   = cached
+        self.cursors  = cursors
+        self.missing  = missing
+        self.ticket   = ticket
+        self.total    = 0
+        self.partial  = False
+        self.shed: list[dict[str, Any]] = []
+        self.plan: QueryPlan | None     = None
+        self.group_by = ends_at
+        self.done_ids: set[str]         = set()
+        self.position: int | None       = None
+        self.trace    = trace
+        self.admitted = time.monotonic()
+        self.want_trace = want_trace
+
+    def opening(self) -> Iterator[str]:
+        """The classification and every cached group — all of it when nothing is missing."""
+        if self.guesses is not None:
+            cats = sorted({g["category"] for g in self.groups})
+            yield _sse({"type": "classified", "guesses": self.guesses, "categories": cats})
+        for g in self.groups:
+            items = self.cached.get(g["id"])
+            if items:
+                self.total += 1
+                yield _sse({"type": "group", "group": {
+                    "id": g["id"], "label": g["label"], "items": items, "cursor": self.cursors.get(g["id"]),
+                }})
+        if not self.missing:
+            if self.total:
+                yield _sse({"type": "done", "cached": True, "total": self.total})
+            else:
+                yield _sse({"type": "error", "message": "No results found. Try a different query."})
+
+    def queue_event(self) -> str | None:
+        """While waiting for a search slot: an event when our place in line changed,
+        a final error once the budget is spent (then `ticket` is dropped)."""
+        if time.monotonic() >= self.ends_at:
+            self.ticket = None
+            return _sse({
+                "type": "error", "message": "Search is busy — try again shortly.",
+                "retry_after": scheduler.admission.retry_after(),
+            })
+        now_at = scheduler.admission.position(self.ticket)  # type: ignore[arg-type]
+        if now_at == self.position:
+            return None
+        self.position = now_at
+        return _sse({"type": "queued", "position": now_at})
+
+    def start(self) -> dict[concurrent.futures.Future[Any], dict[str, Any]]:
+        run, self.shed = priority.shed(priority.order(self.missing))
+        self.plan      = _plan_search(run, self.q)
+        self.group_by  = _group_deadline(self.ends_at)
+        self.partial   = bool(self.shed)
+        with tracing.active(self.trace.root):
+            tracing.record("queue", self.admitted, queued=self.position is not None)
+            # Highest priority first — the shared pool runs tasks in submission order
+            return {
+                deadline.submit(scheduler.groups_pool, _group_runner(), g, self.q, self.plan, self.group_by): g
+                for g in run
+            }
+
+    def finished(self, future: concurrent.futures.Future[Any]) -> str | None:
+        try:
+            gid, items, cursor = future.result()
+        except Exception:
+            return None
+        if gid in self.done_ids:
+            return None
+        self.done_ids.add(gid)
+        if time.monotonic() < self.group_by:
+            self.view._store_group(self.q, gid, items, cursor)
+        else:
+            self.partial = True  # cut short by the budget — don't cache
+        if not items:
+            return None
+        self.total += 1
+        meta = GROUP_BY_ID.get(gid, {})
+        return _sse({"type": "group", "group": {
+            "id": gid, "label": meta.get("label", gid), "items": items, "cursor": cursor,
+        }})
+
+    def closing(self, unfinished: bool) -> str:
+        if not self.total:
+            return _sse({"type": "error", "message": "No results found. Try a different query."})
+        return _sse({
+            "type": "done", "cached": False, "total": self.total,
+            "queries": self.plan.stats() if self.plan else {},
+            "partial": self.partial or unfinished, "shed": [g["id"] for g in self.shed],
+        })
+
+    def trace_events(self) -> Iterator[str]:
+        """Store the finished trace; send it along too when the client asked (trace=1)."""
+        self.trace.finish()
+        if self.want_trace:
+            yield _sse({"type": "trace", "trace": self.trace.tree()})
+
+    def _wait_left(self, cap: float) -> float:
+        return min(cap, max(0.0, self.ends_at - time.monotonic()))
+
+    def events(self) -> Iterator[str]:
+        yield from self._events()
+        yield from self.trace_events()
+
+    async def aevents(self) -> AsyncIterator[str]:
+        async for event in self._aevents():
+            yield event
+        for event in self.trace_events():
+            yield event
+
+    def _events(self) -> Iterator[str]:
+        yield from self.opening()
+        if not self.missing:
+            return
+        while self.ticket is not None and not self.ticket.granted.is_set():
+            event = self.queue_event()
+            if event:
+                yield event
+            if self.ticket is None:
+                return
+            self.ticket.granted.wait(timeout=self._wait_left(QUEUE_POLL))
+        if self.position is not None:
+            yield _sse({"type": "queued", "position": 0})
+
+        futures = self.start()
+        pending = set(futures)
+        try:
+            while pending and time.monotonic() < self.ends_at:
+                finished, pending = concurrent.futures.wait(
+                    pending, timeout=self._wait_left(5), return_when=concurrent.futures.FIRST_COMPLETED,
+                )
+                for future in finished:
+                    event = self.finished(future)
+                    if event:
+                        yield event
+        finally:
+            scheduler.cancel_pending(futures)
+        yield self.closing(bool(pending))
+
+    async def _aevents(self) -> AsyncIterator[str]:
+        for event in self.opening():
+            yield event
+        if not self.missing:
+            return
+        next_check = 0.0
+        while self.ticket is not None and not self.ticket.granted.is_set():
+            if time.monotonic() >= next_check:
+                event = self.queue_event()
+                if event:
+                    yield event
+                if self.ticket is None:
+                    return
+                next_check = time.monotonic() + QUEUE_POLL
+            # A grant is a thread-side Event — poll it cheaply rather than park a thread on it
+            await asyncio.sleep(self._wait_left(ASYNC_POLL))
+        if self.position is not None:
+            yield _sse({"type": "queued", "position": 0})
+
+        futures = self.start()
+        waiting = {asyncio.wrap_future(f): f for f in futures}
+        pending = set(waiting)
+        try:
+            while pending and time.monotonic() < self.ends_at:
+                finished, pending = await asyncio.wait(
+                    pending, timeout=self._wait_left(5), return_when=asyncio.FIRST_COMPLETED,
+                )
+                for af in finished:
+                    event = self.finished(waiting[af])
+                    if event:
+                        yield event
+        finally:
+            for af in pending:
+                af.cancel()
+            scheduler.cancel_pending(futures)
+        yield self.closing(bool(pending))
+
+
 @method_decorator(xframe_options_exempt, name="dispatch")
-class SearchProxyView(View):
+class SearchProxyView(AsyncView):
     """
-    GET /api/search/?q=<query>[&categories=people,files,contact,web]
+    GET /api/search/?q=<query>[&categories=person,email,...|all|auto][&groups=<id>,<id>][&budget_ms=<ms>]
     Supports SSE streaming via Accept: text/event-stream
+    categories=auto classifies the query (apps/search/classify.py) and runs
+    only the matching categories.
+    budget_ms bounds the whole search; groups still running when it is spent
+    return whatever they have gathered so far.
+    Results are cached per (group, query), so narrowing or widening the
+    selection only runs the groups not seen yet. Groups run in priority order
+    (apps/search/priority.py); low-priority ones are shed under load.
+    Async: served over ASGI, an open stream waits as a coroutine rather than
+    holding a server thread.
     """
 
-    def get(self, request):  # type: ignore[override]
+    async def get(self, request):  # type: ignore[override]
         q = request.GET.get("q", "").strip()
         if not q:
             return JsonResponse({"error": "No query provided"}, status=400)
 
-        raw_cats     = request.GET.get("categories", "").strip()
-        allowed_cats: set[str] | None = None
-        if raw_cats and raw_cats != "all":
-            allowed_cats = {c.strip().lower() for c in raw_cats.split(",") if c.strip()}
-
-        groups = [
-            g for g in HACKING_GROUPS
-            if allowed_cats is None or g["category"] in allowed_cats
-        ]
-        if not groups:
-            return JsonResponse({"error": "No valid categories specified"}, status=400)
-
-        accept = request.META.get("HTTP_ACCEPT", "")
-        if "text/event-stream" in accept:
-            return self._stream(q, groups)
-        return self._json(q, groups)
-
-    def _json(self, q: str, groups: list[dict[str, Any]]) -> JsonResponse:
-        cache_key = _normalise_cache_key(q + "|" + ",".join(g["id"] for g in groups))
-        cached    = cache.get(cache_key)
-        if cached:
-            return JsonResponse({"groups": cached, "cached": True})
-        groups_out = self._run_all(q, groups)
-        if not groups_out:
-            return JsonResponse({"error": "No results found. Try a different query."}, status=503)
-        cache.set(cache_key, groups_out, timeout=CACHE_TTL)
-        return JsonResponse({"groups": groups_out, "cached": False})
-
-    def _stream(self, q: str, groups: list[dict[str, Any]]) -> StreamingHttpResponse:
-        cache_key  = _normalise_cache_key(q + "|" + ",".join(g["id"] for g in groups))
-        cached_all = cache.get(cache_key)
+        guesses: list[dict[str, Any]] | None = None
+        raw_groups = request.GET.get("groups", "").strip()
+        if raw_groups:
+            # Explicit group ids win over categories
+            ids    = [i.strip() for i in raw_groups.split(",") if i.strip()]
+            groups = [GROUP_BY_ID[i] for i in dict.fromkeys(ids) if i in GROUP_BY_ID]
+            if not groups:
+                return JsonResponse({"error": "No valid groups specified"}, status=400)
+        else:
+            raw_cats     = request.GET.get("categories", "").strip()
+            allowed_cats: set[str] | None = None
+            if raw_cats == "auto":
+                # Only the categories the query can plausibly be
+                guesses      = [vars(g) for g in classify.classify(q)]
+                allowed_cats = set(classify.categories_for(q))
+            elif raw_cats and raw_cats != "all":
+                allowed_cats = {c.strip().lower() for c in raw_cats.split(",") if c.strip()}
+
+            groups = [
+                g for g in HACKING_GROUPS
+                if allowed_cats is None or g["category"] in allowed_cats
+            ]
+            if not groups:
+                return JsonResponse({"error": "No valid categories specified"}, status=400)
 
-        def _sse(payload: dict[str, Any]) -> str:
-            return f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+        try:
+            budget = deadline.parse_budget(request.GET.get("budget_ms", "").strip())
+        except ValueError:
+            return JsonResponse({"error": "budget_ms must be a number"}, status=400)
+        ends_at = time.monotonic() + budget
 
-        def generate():
-            if cached_all:
-                for gd in cached_all:
-                    yield _sse({"type": "group", "group": gd})
-                yield _sse({"type": "done", "cached": True, "total": len(cached_all)})
-                return
+        session = await sync_to_async(_session_key)(request)
 
-            collected: list[dict[str, Any]] = []
-
-            with concurrent.futures.ThreadPoolExecutor(max_workers=min(len(groups), 16)) as ex:
-                fm = {ex.submit(_search_group, g, q): g for g in groups}
-                # Use iter + manual timeout to avoid TimeoutError crash in Python 3.14
-                deadline = time.time() + 120
-                pending  = set(fm.keys())
-                done_ids: set[str] = set()
-                while pending and time.time() < deadline:
-                    finished, pending = concurrent.futures.wait(
-                        pending,
-                        timeout=min(5, max(0, deadline - time.time())),
-                        return_when=concurrent.futures.FIRST_COMPLETED,
-                    )
-                    for future in finished:
-                        try:
-                            gid, items = future.result()
-                        except Exception:
-                            continue
-                        if not items or gid in done_ids:
-                            continue
-                        done_ids.add(gid)
-                        meta = GROUP_BY_ID.get(gid, {})
-                        gd   = {"id": gid, "label": meta.get("label", gid), "items": items}
-                        collected.append(gd)
-                        yield _sse({"type": "group", "group": gd})
-
-            if collected:
-                cache.set(cache_key, collected, timeout=CACHE_TTL)
-                yield _sse({"type": "done", "cached": False, "total": len(collected)})
+        accept = request.META.get("HTTP_ACCEPT", "")
+        sse    = "text/event-stream" in accept
+        trace  = tracing.Trace("search", q=q, mode="sse" if sse else "json", groups=len(groups))
+        with tracing.active(trace.root):
+            if sse:
+                response = self._stream(
+                    q, groups, ends_at, guesses, session, asgi=isinstance(request, ASGIRequest),
+                    trace=trace, want_trace=request.GET.get("trace") == "1",
+                )
+                if isinstance(response, StreamingHttpResponse):
+                    # The timings are not known yet — they arrive as the closing "trace" event
+                    response["Server-Timing"] = f'trace;desc="{trace.id}"'
+                    return compression.compress_events(request, response)
             else:
-                yield _sse({"type": "error", "message": "No results found. Try a different query."})
+                # One blocking answer — it waits on a worker thread, not the event loop
+                response = await sync_to_async(self._json, thread_sensitive=False)(q, groups, ends_at, guesses, session)
+        trace.finish()
+        response["Server-Timing"] = trace.server_timing()
+        return response
 
-        response = StreamingHttpResponse(generate(), content_type="text/event-stream")
+    def _cached_groups(
+        self,
+        q: str,
+        groups: list[dict[str, Any]],
+    ) -> tuple[dict[str, list[Result]], dict[str, str]]:
+        """
+        Per-group results already computed for q — (gid → items, possibly
+        empty; gid → "load more" cursor where the continuation is still cached).
+        """
+        keys   = {_group_cache_key(g["id"], q): g["id"] for g in groups}
+        mores  = {_more_key(g["id"], q): g["id"] for g in groups}
+        with tracing.span("cache", layer="group", groups=len(keys)) as span:
+            cached = cache.get_many(list(keys) + list(mores))
+            items  = {keys[k]: v for k, v in cached.items() if k in keys}
+            span["hits"] = len(items)
+        if items:
+            metrics.CACHE.inc(len(items), layer="group", outcome="hit")
+        if len(items) < len(keys):
+            metrics.CACHE.inc(len(keys) - len(items), layer="group", outcome="miss")
+        return items, {mores[k]: v for k, v in cached.items() if k in mores and mores[k] in items}
+
+    def _store_group(self, q: str, gid: str, items: list[Result], cursor: str | None = None) -> None:
+        cache.set(_group_cache_key(gid, q), items, timeout=CACHE_TTL if items else EMPTY_TTL)
+        if cursor:
+            cache.set(_more_key(gid, q), cursor, timeout=CURSOR_MAX_AGE)
+
+    def _json(
+        self,
+        q: str,
+        groups: list[dict[str, Any]],
+        ends_at: float,
+        guesses: list[dict[str, Any]] | None = None,
+        session: str = "",
+    ) -> JsonResponse:
+        results, cursors = self._cached_groups(q, groups)
+        missing = [g for g in groups if g["id"] not in results]
+        partial = False
+        if not missing:
+            metrics.SEARCHES.inc(mode="json", outcome="cached")
+        else:
+            ticket = scheduler.admission.admit(session)
+            if ticket is None:
+                return _busy("json")
+            try:
+                # Queued behind other searches — the wait comes out of this search's budget
+                with tracing.span("queue"):
+                    granted = ticket.granted.wait(timeout=max(0.0, ends_at - time.monotonic()))
+                if not granted:
+                    return _busy("json")
+                metrics.SEARCHES.inc(mode="json", outcome="run")
+                fresh, fresh_cursors, partial = self._run_all(q, missing, _plan_search(missing, q), ends_at)
+            finally:
+                scheduler.admission.release(ticket)
+            cursors.update(fresh_cursors)
+            if not partial:
+                cache.set_many(
+                    {_group_cache_key(gid, q): items for gid, items in fresh.items() if items},
+                    timeout=CACHE_TTL,
+                )
+                cache.set_many(
+                    {_group_cache_key(gid, q): items for gid, items in fresh.items() if not items},
+                    timeout=EMPTY_TTL,
+                )
+                cache.set_many(
+                    {_more_key(gid, q): cursor for gid, cursor in fresh_cursors.items() if gid in fresh},
+                    timeout=CURSOR_MAX_AGE,
+                )
+            results.update(fresh)
+        groups_out = [
+            {"id": g["id"], "label": g["label"], "items": results[g["id"]], "cursor": cursors.get(g["id"])}
+            for g in groups if results.get(g["id"])
+        ]
+        if not groups_out:
+            return JsonResponse({"error": "No results found. Try a different query."}, status=503)
+        body: dict[str, Any] = {"groups": groups_out, "cached": not missing, "partial": partial}
+        if guesses is not None:
+            body["classified"] = guesses
+        return jsonenc.response(body)
+
+    def _stream(
+        self,
+        q: str,
+        groups: list[dict[str, Any]],
+        ends_at: float,
+        guesses: list[dict[str, Any]] | None = None,
+        session: str = "",
+        asgi: bool = False,
+        trace: tracing.Trace | None = None,
+        want_trace: bool = False,
+    ) -> StreamingHttpResponse | JsonResponse:
+        cached, cursors = self._cached_groups(q, groups)
+        missing = [g for g in groups if g["id"] not in cached]
+        ticket  = scheduler.admission.admit(session) if missing else None
+        if missing and ticket is None:
+            return _busy("sse")
+        metrics.SEARCHES.inc(mode="sse", outcome="run" if missing else "cached")
+
+        search = _SearchStream(
+            self, q, groups, ends_at, guesses, cached, cursors, missing, ticket,
+            trace or tracing.Trace("search", q=q, mode="sse"), want_trace,
+        )
+        # Under WSGI an async iterator would be buffered whole — keep the thread-driven one there
+        events = search.aevents() if asgi else search.events()
+        if ticket is not None:
+            events = scheduler.closing(events, lambda: scheduler.admission.release(ticket))
+        response = StreamingHttpResponse(events, content_type="text/event-stream")
         response["Cache-Control"]     = "no-cache"
         response["X-Accel-Buffering"] = "no"
         return response
 
-    def _run_all(self, q: str, groups: list[dict[str, Any]]) -> list[dict[str, Any]]:
-        results: dict[str, list[dict[str, Any]]] = {}
-        with concurrent.futures.ThreadPoolExecutor(max_workers=min(len(groups), 16)) as ex:
-            futures  = {ex.submit(_search_group, g, q): g for g in groups}
-            deadline = time.time() + 120
-            pending  = set(futures.keys())
-            while pending and time.time() < deadline:
+    def _run_all(
+        self,
+        q: str,
+        groups: list[dict[str, Any]],
+        plan: QueryPlan | None = None,
+        ends_at: float | None = None,
+    ) -> tuple[dict[str, list[Result]], dict[str, str], bool]:
+        """
+        Run groups concurrently, highest priority first, within the budget —
+        (gid → items for every group that returned, gid → "load more" cursor,
+        whether any of it was cut short by the budget or shed under load).
+        """
+        ends_at   = ends_at or time.monotonic() + deadline.DEFAULT_BUDGET_MS / 1000
+        group_by  = _group_deadline(ends_at)
+        run, shed = priority.shed(priority.order(groups))
+        partial   = bool(shed)
+        results: dict[str, list[Result]] = {}
+        cursors: dict[str, str]                  = {}
+        futures = {deadline.submit(scheduler.groups_pool, _group_runner(), g, q, plan, group_by): g for g in run}
+        try:
+            pending = set(futures.keys())
+            while pending and time.monotonic() < ends_at:
                 finished, pending = concurrent.futures.wait(
                     pending,
-                    timeout=min(5, max(0, deadline - time.time())),
+                    timeout=min(5, max(0, ends_at - time.monotonic())),
                     return_when=concurrent.futures.FIRST_COMPLETED,
                 )
                 for future in finished:
                     try:
-                        gid, items = future.result()
+                        gid, items, cursor = future.result()
                         results[gid] = items
+                        if cursor:
+                            cursors[gid] = cursor
+                        partial = partial or time.monotonic() >= group_by
                     except Exception:
                         pass
-        return [
-            {"id": g["id"], "label": g["label"], "items": results.get(g["id"], [])}
-            for g in groups if results.get(g["id"])
-        ]
+        finally:
+            scheduler.cancel_pending(futures)
+        return results, cursors, partial or bool(pending)
+
+
+@method_decorator(xframe_options_exempt, name="dispatch")
+class SearchMoreView(View):
+    """
+    GET /api/search/more/?cursor=<cursor>[&budget_ms=<ms>]
+    Next slice of one group, continuing from the cursor in its group payload.
+    Takes a search slot like any search (429 with Retry-After when the queue
+    is full); 410 when the cursor's unserved results have left the cache.
+    """
+
+    def get(self, request):  # type: ignore[override]
+        cur = _load_cursor(request.GET.get("cursor", ""))
+        if cur is None:
+            return JsonResponse({"error": "Invalid or expired cursor"}, status=400)
+        try:
+            budget = deadline.parse_budget(request.GET.get("budget_ms", "").strip())
+        except ValueError:
+            return JsonResponse({"error": "budget_ms must be a number"}, status=400)
+
+        group   = GROUP_BY_ID[cur["g"]]
+        ends_at = time.monotonic() + budget
+        ticket  = scheduler.admission.admit(_session_key(request))
+        if ticket is None:
+            return _busy("more")
+        try:
+            with tracing.span("queue"):
+                granted = ticket.granted.wait(timeout=max(0.0, ends_at - time.monotonic()))
+            if not granted:
+                return _busy("more")
+            metrics.SEARCHES.inc(mode="more", outcome="run")
+            with priority.running(priority.of(group)):
+                found = deadline.within(ends_at, _search_more, cur)
+        finally:
+            scheduler.admission.release(ticket)
+        if found is None:
+            return JsonResponse({"error": "This cursor's results have expired — search again"}, status=410)
+        items, cursor = found
+        return jsonenc.response({"group": {"id": group["id"], "label": group["label"], "items": items, "cursor": cursor}})
+
+
+@method_decorator(xframe_options_exempt, name="dispatch")
+class SearchPrefetchView(View):
+    """
+    GET /api/search/prefetch/?q=<partial query>
+    Called (debounced) while the user types: classifies the partial query and
+    warms its cheapest searches in the background. A new query — or an empty
+    one — cancels the session's previous prefetch.
+    """
+
+    def get(self, request):  # type: ignore[override]
+        session = _session_key(request)
+        q       = request.GET.get("q", "").strip()
+        if not q:
+            prefetch.cancel(session)
+            return JsonResponse({"started": False})
+        return JsonResponse({
+            "classified": [vars(g) for g in classify.classify(q)],
+            "categories": classify.categories_for(q),
+            "started":    prefetch.start(session, q),
+        })
+
+
+def _click_counts(session: str, gid: str, addr: str) -> bool:
+    """Whether a click feeds the learned priority: once per session and group
+    per CLICK_WINDOW, and at most CLICK_IP_LIMIT per client address."""
+    if not cache.add(f"click1_{session}_{gid}", 1, timeout=CLICK_WINDOW):
+        return False
+    key = f"clickip1_{addr}"
+    cache.add(key, 0, timeout=CLICK_WINDOW)
+    try:
+        return cache.incr(key) <= CLICK_IP_LIMIT
+    except ValueError:
+        return False   # evicted between add and incr
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class SearchClickView(View):
+    """
+    POST /api/search/click/ {"group": "<id>"} — a result was opened; feeds group priority.
+    Only from a session that has searched, and rate limited (_click_counts),
+    so scripted clicks cannot push a group up.
+    """
+
+    def post(self, request):  # type: ignore[override]
+        try:
+            gid = json.loads(request.body or b"{}").get("group", "")
+        except (ValueError, AttributeError):
+            gid = ""
+        if gid not in GROUP_BY_ID:
+            return JsonResponse({"error": "Unknown group"}, status=400)
+        session = request.session.session_key
+        if not session:
+            return JsonResponse({"error": "No search session"}, status=403)
+        counted = _click_counts(session, gid, request.META.get("REMOTE_ADDR", ""))
+        if counted:
+            priority.record_click(gid)
+        return JsonResponse({"ok": True, "counted": counted})
 
 
 @method_decorator(xframe_options_exempt, name="dispatch")
@@ -1496,4 +2155,31 @@ class SearchGroupsView(View):
         categories: dict[str, list[dict[str, str]]] = defaultdict(list)
         for g in HACKING_GROUPS:
             categories[g["category"]].append({"id": g["id"], "label": g["label"]})
-        return JsonResponse({"categories": dict(categories)})
\ No newline at end of file
+        return jsonenc.response({"categories": dict(categories)})
+
+
+class SearchTraceView(View):
+    """
+    GET /api/search/traces/[?id=<trace id>] — recent search traces, newest
+    first, or one full span tree. Staff or SEARCH_DEBUG_ENDPOINTS only:
+    traces hold the queries.
+    """
+
+    def get(self, request):  # type: ignore[override]
+        if not profiling.allowed(request):
+            return jsonenc.response({"error": "Not found"}, status=404)
+        trace_id = request.GET.get("id", "").strip()
+        if not trace_id:
+            return jsonenc.response({"traces": tracing.recent()})
+        trace = tracing.find(trace_id)
+        if trace is None:
+            return jsonenc.response({"error": "Unknown or expired trace"}, status=404)
+        return jsonenc.response(trace.tree())
+
+
+class MetricsView(View):
+    """GET /api/metrics — Prometheus text format, summed over every process sharing SEARCH_METRICS_DIR."""
+
+    def get(self, request):  # type: ignore[override]
+        metrics.flush()   # so our own file is current for the other processes' scrapes too
+        return HttpResponse(metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
\ No newline at end of file
@@ -0,0 +1,217 @@
+"""
+worker_client.py — Batched, cached requests to the Electron search worker
+The desktop app's worker loads SERPs one at a time in a single hidden
+window, seconds apart, so every load it is asked for delays the next. The
+dispatcher here sits between the search groups and the worker:
+
+    cache       SERP HTML by (engine, query) for SEARCH_WORKER_TTL seconds
+    one flight  identical concurrent requests share one load
+    batches     requests arriving within WINDOW go out as one POST
+                /search/batch; the worker streams each page back (NDJSON)
+                as soon as it has loaded, so nobody waits for the whole batch
+    depth       loads outstanding, corrected by the queue length the worker
+                reports with every page, times the measured time per load —
+                a caller whose budget would run out in the queue is told
+                no at once instead of blocking for WORKER_TIMEOUT
+
+Workers from before the batch endpoint answer it 404; the dispatcher then
+sends one POST /search per load, as before.
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import json
+import os
+import threading
+import time
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.search import deadline, memo, metrics, outbound
+
+
+# Port passed via env var from main.js
+WORKER_PORT    = int(os.environ.get("FIRECAT_WORKER_PORT", "8766"))
+WORKER_URL     = f"http://127.0.0.1:{WORKER_PORT}"
+WORKER_TIMEOUT = 25       # seconds a caller waits for one page, at most
+WORKER_TTL     = int(getattr(settings, "SEARCH_WORKER_TTL", 600))
+WINDOW         = 0.05     # seconds requests gather before a batch goes out
+MAX_BATCH      = 16
+LOAD_SECONDS   = 3.0      # per page until measured — one load plus the worker's cooldown
+
+
+class Dispatcher:
+    def __init__(self, url: str = WORKER_URL, window: float = WINDOW, max_batch: int = MAX_BATCH) -> None:
+        self.url       = url
+        self.window    = window
+        self.max_batch = max_batch
+        self.per_load  = LOAD_SECONDS
+        self.batching  = True              # False once the worker answers /search/batch with 404
+        self._lock     = threading.Lock()
+        self._inflight: dict[tuple[str, str], concurrent.futures.Future[str]] = {}
+        self._pending:  list[tuple[str, str]] = []
+        self._timer:    threading.Timer | None = None
+        self._remote   = (0, 0.0)         # (queue length the worker last reported, when)
+
+    # -- callers ------------------------------------------------------------
+
+    def fetch(self, engine: str, query: str, timeout: float = WORKER_TIMEOUT) -> str | None:
+        """
+        SERP HTML for (engine, query): from the cache, from a load already
+        under way, or from a new one. None when the worker's queue is too
+        deep for the time left, or the page did not arrive in time; "" when
+        the worker could not load it.
+        """
+        ckey = memo.key("electron", engine, query)
+        html = cache.get(ckey)
+        if html is not None:
+            metrics.CACHE.inc(layer="worker", outcome="hit")
+            return html
+
+        timeout = deadline.clamp(timeout) or 0.0
+        k       = (engine, query)
+        with self._lock:
+            flight = self._inflight.get(k)
+            if flight is None:
+                if self._wait_locked(1) > timeout:
+                    metrics.CACHE.inc(layer="worker", outcome="busy")
+                    return None
+                flight = self._inflight[k] = concurrent.futures.Future()
+                self._pending.append(k)
+                self._schedule_locked()
+                metrics.CACHE.inc(layer="worker", outcome="miss")
+            else:
+                metrics.CACHE.inc(layer="worker", outcome="wait")
+        try:
+            return flight.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            return None
+
+    def depth(self) -> int:
+        with self._lock:
+            return self._depth_locked()
+
+    def wait(self, loads: int = 1) -> float:
+        """Estimated seconds until `loads` new pages would be back."""
+        with self._lock:
+            return self._wait_locked(loads)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "depth":    self._depth_locked(),
+                "pending":  len(self._pending),
+                "per_load": round(self.per_load, 2),
+                "batching": self.batching,
+            }
+
+    def _depth_locked(self) -> int:
+        # The worker's own count covers other web processes; it drains as pages load
+        reported, at = self._remote
+        remote = reported - int((time.monotonic() - at) / self.per_load) if at else 0
+        return max(len(self._inflight), remote)
+
+    def _wait_locked(self, loads: int) -> float:
+        return (self._depth_locked() + loads) * self.per_load
+
+    # -- batching -----------------------------------------------------------
+
+    def _schedule_locked(self) -> None:
+        if self._timer is not None:
+            return
+        delay = 0.0 if len(self._pending) >= self.max_batch else self.window
+        self._timer = threading.Timer(delay, self._flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _flush(self) -> None:
+        with self._lock:
+            batch, self._pending = self._pending[:self.max_batch], self._pending[self.max_batch:]
+            self._timer = None
+            if self._pending:
+                self._schedule_locked()
+        if not batch:
+            return
+        try:
+            if not self.batching or not self._send_batch(batch):
+                self._send_each(batch)
+        finally:
+            # Anything the worker never answered — a dropped stream, a crash
+            for k in batch:
+                self._resolve(k, "")
+
+    def _send_batch(self, batch: list[tuple[str, str]]) -> bool:
+        """One round trip for the whole batch; False if the worker predates it."""
+        body = {"requests": [{"engine": e, "query": q} for e, q in batch]}
+        try:
+            with outbound.stream("POST", f"{self.url}/search/batch", json=body, timeout=WORKER_TIMEOUT) as r:
+                if r.status_code == 404:
+                    self.batching = False
+                    return False
+                if r.status_code != 200:
+                    return True
+                last: float | None = None   # the first page also waited out whatever was queued before it
+                for line in r.iter_lines():
+                    if not line.strip():
+                        continue
+                    try:
+                        page = json.loads(line)
+                    except ValueError:
+                        continue
+                    now = time.monotonic()
+                    self._measured(None if last is None else now - last, page.get("queue"))
+                    last = now
+                    self._resolve((page.get("engine", ""), page.get("query", "")), page.get("html") or "")
+        except Exception:
+            pass
+        return True
+
+    def _send_each(self, batch: list[tuple[str, str]]) -> None:
+        def one(k: tuple[str, str]) -> None:
+            html = ""
+            try:
+                r = outbound.post(f"{self.url}/search", json={"engine": k[0], "query": k[1]}, timeout=WORKER_TIMEOUT)
+                if r.status_code == 200:
+                    data = r.json()
+                    html = data.get("html") or ""
+                    self._measured(None, data.get("queue"))
+            except Exception:
+                pass
+            self._resolve(k, html)
+
+        # The worker queues them itself; one thread each keeps them all in its queue
+        threads = [threading.Thread(target=one, args=(k,), daemon=True) for k in batch]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    def _measured(self, seconds: float | None, queue: Any) -> None:
+        with self._lock:
+            if seconds is not None and seconds > 0:
+                self.per_load = 0.8 * self.per_load + 0.2 * seconds
+            if isinstance(queue, int):
+                self._remote = (queue, time.monotonic())
+
+    def _resolve(self, k: tuple[str, str], html: str) -> None:
+        with self._lock:
+            flight = self._inflight.pop(k, None)
+        if flight is None:
+            return
+        if html:
+            cache.set(memo.key("electron", *k), html, timeout=WORKER_TTL)
+        flight.set_result(html)
+
+
+dispatcher = Dispatcher()
+
+metrics.gauge(
+    "firecat_worker_queue", "Electron worker loads outstanding, as the dispatcher sees them.", (),
+    lambda: {(): dispatcher.depth()},
+)
+
+
+def fetch(engine: str, query: str, timeout: float = WORKER_TIMEOUT) -> str | None:
+    return dispatcher.fetch(engine, query, timeout)
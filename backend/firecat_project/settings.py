@@ -1,5 +1,6 @@
 from pathlib import Path
 from decouple import config  # type: ignore[import-untyped]
+import json
 import os
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -38,6 +39,7 @@ MIDDLEWARE = [
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
+    'apps.search.profiling.profile_middleware',
 ]
 
 ROOT_URLCONF = 'firecat_project.urls'
@@ -61,6 +63,7 @@ TEMPLATES = [{
 }]
 
 WSGI_APPLICATION = 'firecat_project.wsgi.application'
+ASGI_APPLICATION = 'firecat_project.asgi.application'
 
 DATABASES = {
     'default': {
@@ -92,7 +95,7 @@ SESSION_COOKIE_AGE      = 60 * 60 * 24 * 30
 X_FRAME_OPTIONS = 'ALLOWALL'
 
 REST_FRAMEWORK = {
-    'DEFAULT_RENDERER_CLASSES':       ['rest_framework.renderers.JSONRenderer'],
+    'DEFAULT_RENDERER_CLASSES':       ['firecat_project.renderers.FastJSONRenderer'],
     'DEFAULT_PARSER_CLASSES':         ['rest_framework.parsers.JSONParser'],
     'DEFAULT_AUTHENTICATION_CLASSES': ['firecat_project.authentication.CsrfExemptSessionAuthentication'],
     'DEFAULT_PERMISSION_CLASSES':     ['rest_framework.permissions.AllowAny'],
@@ -121,14 +124,61 @@ if _CACHE_URL:
         }
     }
 else:
+    # One search over every category writes ~200-250 entries (group results,
+    # engine rounds, cursors, username verdicts, HTTP validators) of ~5 KB on
+    # average: 10000 keeps ~40 recent searches in roughly 50-100 MB per process
     CACHES = {
         'default': {
             'BACKEND':  'django.core.cache.backends.locmem.LocMemCache',
             'LOCATION': 'firecat-search-cache',
-            'OPTIONS':  {'MAX_ENTRIES': 500},
+            'OPTIONS':  {'MAX_ENTRIES': config('CACHE_MAX_ENTRIES', default=10000, cast=int)},
         }
     }
 
+# Search scheduling — per-group priority overrides ({"person_web": 95, ...}) and
+# load shedding: past SEARCH_SHED_LOAD groups in flight, groups under
+# SEARCH_SHED_BELOW priority are skipped
+SEARCH_GROUP_PRIORITIES = config('SEARCH_GROUP_PRIORITIES', default='{}', cast=json.loads)
+SEARCH_SHED_LOAD        = config('SEARCH_SHED_LOAD', default=96, cast=int)
+SEARCH_SHED_BELOW       = config('SEARCH_SHED_BELOW', default=45, cast=int)
+
+# Admission control — searches run at once, and how many may wait behind them
+# before new ones get 429 + Retry-After
+SEARCH_SLOTS            = config('SEARCH_SLOTS', default=8, cast=int)
+SEARCH_QUEUE_LIMIT      = config('SEARCH_QUEUE_LIMIT', default=32, cast=int)
+
+# Worker mode — group tasks go to `manage.py search_worker` processes through
+# this queue: redis://…, sqlite:///path or local:// (see apps/search/jobqueue.py)
+SEARCH_QUEUE_URL        = config('SEARCH_QUEUE_URL', default='')
+
+# HTML parsing on a process pool — "auto" (one per core), a number, or 0 to parse inline
+SEARCH_PARSE_PROCESSES  = config('SEARCH_PARSE_PROCESSES', default='0')
+
+# Directory shared by all web and worker processes so /api/metrics sums over
+# them (see apps/search/metrics.py); empty serves this process's numbers only
+SEARCH_METRICS_DIR      = config('SEARCH_METRICS_DIR', default='')
+
+# Finished search traces kept in memory for /api/search/traces/
+SEARCH_TRACE_RING       = config('SEARCH_TRACE_RING', default=100, cast=int)
+
+# Seconds SERPs loaded by the Electron search worker are reused (see apps/search/worker_client.py)
+SEARCH_WORKER_TTL       = config('SEARCH_WORKER_TTL', default=600, cast=int)
+
+# JSON encoder for search responses, SSE events and the API — "auto" (orjson
+# when installed), "orjson" or "stdlib" (see apps/search/jsonenc.py)
+SEARCH_JSON_BACKEND     = config('SEARCH_JSON_BACKEND', default='auto')
+
+# Encodings offered for SSE search streams, in preference order — each event is
+# flushed through one shared compressor (br needs the brotli package); empty: off
+SEARCH_SSE_COMPRESSION  = config('SEARCH_SSE_COMPRESSION', default='br,gzip,deflate')
+
+# Where requests sent with X-Firecat-Profile save their folded stacks (default: <tmp>/firecat-profiles)
+SEARCH_PROFILE_DIR      = config('SEARCH_PROFILE_DIR', default='')
+
+# Search traces, request profiling and tracemalloc snapshots for everyone, not
+# just staff users — they expose queries and slow the process; DEBUG alone does not open them
+SEARCH_DEBUG_ENDPOINTS  = config('SEARCH_DEBUG_ENDPOINTS', default=False, cast=bool)
+
 # Required for StreamingHttpResponse to work correctly with Django's dev server
 # When behind a proxy/nginx, ensure proxy_buffering is off for /api/search/
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10 MB
\ No newline at end of file
@@ -3,8 +3,9 @@ from django.urls import path, include, re_path
 from django.views.generic import TemplateView
 from django.conf import settings
 from django.views.static import serve
-from apps.search.views import SearchProxyView
+from apps.search.views import MetricsView, SearchProxyView
 from apps.search.proxy_views import WebProxyView
+from apps.search.debug_views import MemoryView, ProfilesView
 
 urlpatterns = [
     path('admin/',           admin.site.urls),
@@ -12,7 +13,11 @@ urlpatterns = [
     path('api/bookmarks/',   include('apps.bookmarks.urls')),
     path('api/history/',     include('apps.history.urls')),
     path('api/search/',      SearchProxyView.as_view(), name='search-proxy'),
+    path('api/search/',      include('apps.search.urls')),
     path('api/proxy/',       WebProxyView.as_view(),    name='web-proxy'),
+    path('api/metrics',      MetricsView.as_view(),     name='metrics'),
+    path('api/debug/memory/',   MemoryView.as_view(),   name='debug-memory'),
+    path('api/debug/profiles/', ProfilesView.as_view(), name='debug-profiles'),
 
     re_path(r'^assets/(?P<path>.*)$', serve, {
         'document_root': str(settings.FRONTEND_DIST / 'assets'),
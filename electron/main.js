@@ -166,19 +166,28 @@ async function processSearchQueue() {
 
 /**
  * Enqueue a search — serialised to avoid parallel loads in the same window.
+ * Identical requests while one is queued or loading share its result.
  */
+const searchPending = new Map()
+
 function queueSearch(engine, query) {
-  return new Promise((resolve) => {
-    // Deduplicate: skip if identical request already queued
-    const isDupe = searchQueue.some(item => item.engine === engine && item.query === query)
-    if (isDupe) {
-      safeLog(`[SearchWorker] Dedup skip: ${engine} → ${query.slice(0, 40)}`)
-      resolve('')
-      return
-    }
+  const key = `${engine}\u0000${query}`
+  const pending = searchPending.get(key)
+  if (pending) {
+    safeLog(`[SearchWorker] Dedup share: ${engine} → ${query.slice(0, 40)}`)
+    return pending
+  }
+  const promise = new Promise((resolve) => {
     searchQueue.push({ engine, query, resolve })
     processSearchQueue()
-  })
+  }).finally(() => searchPending.delete(key))
+  searchPending.set(key, promise)
+  return promise
+}
+
+/** Loads waiting or under way — reported to Django so it can stop queueing. */
+function searchDepth() {
+  return searchQueue.length + (searchBusy ? 1 : 0)
 }
 
 // ---------------------------------------------------------------------------
@@ -196,7 +205,34 @@ function startWorkerServer() {
     // Health check — Django uses this to detect if worker is available
     if (req.url === '/health') {
       res.writeHead(200, { 'Content-Type': 'application/json' })
-      res.end(JSON.stringify({ ok: true }))
+      res.end(JSON.stringify({ ok: true, queue: searchDepth() }))
+      return
+    }
+
+    // Batch — {requests: [{engine, query}, …]}; one NDJSON line per page as
+    // it loads, in load order, each with the queue depth at that moment
+    if (req.method === 'POST' && req.url === '/search/batch') {
+      let body = ''
+      req.on('data', chunk => { body += chunk })
+      req.on('end', async () => {
+        let requests
+        try {
+          requests = (JSON.parse(body).requests || []).filter(r => r && r.query)
+        } catch (err) {
+          res.writeHead(400)
+          res.end(JSON.stringify({ error: err.message }))
+          return
+        }
+        safeLog(`[SearchWorker] batch of ${requests.length}`)
+        res.writeHead(200, { 'Content-Type': 'application/x-ndjson' })
+        await Promise.all(requests.map(async ({ engine, query }) => {
+          const html = await queueSearch(engine || 'google', query)
+          if (!res.writableEnded) {
+            res.write(JSON.stringify({ html, engine, query, queue: searchDepth() }) + '\n')
+          }
+        }))
+        res.end()
+      })
       return
     }
 
@@ -221,7 +257,7 @@ function startWorkerServer() {
         const html = await queueSearch(engine || 'google', query)
 
         res.writeHead(200, { 'Content-Type': 'application/json' })
-        res.end(JSON.stringify({ html, engine, query }))
+        res.end(JSON.stringify({ html, engine, query, queue: searchDepth() }))
       } catch (err) {
         safeLog('[SearchWorker] Error:', err.message)
         res.writeHead(500)
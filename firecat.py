@@ -1,11 +1,13 @@
 #!/usr/bin/env python3
 
+import argparse
 import subprocess
 import sys
 import os
 import time
 import threading
 import shutil
+import tempfile
 from pathlib import Path
 
 ROOT     = Path(__file__).resolve().parent
@@ -90,15 +92,32 @@ def build_frontend():
         run(['npm', 'run', 'build'], cwd=FRONTEND)
 
 
-def start_django():
+def check_asgi_server():
+    # uvicorn is pinned in requirements.txt — a venv older than that pin needs a reinstall, not a guess
+    result = subprocess.run([str(PIP), 'show', 'uvicorn'], capture_output=True, text=True)
+    if result.returncode != 0:
+        log('setup', RED, f'uvicorn not found. Run: {PIP} install -r {BACKEND / "requirements.txt"}')
+        sys.exit(1)
+
+
+def start_django(asgi=False, workers=1):
     env = {
         **os.environ,
         'DJANGO_SETTINGS_MODULE': 'firecat_project.settings',
         'PYTHONUNBUFFERED': '1',
         'PYTHONPATH': str(BACKEND),
     }
+    if asgi:
+        # Open SSE streams and proxied pages wait as coroutines instead of pinning threads.
+        # Each worker is its own process — set CACHE_URL so they share the result cache.
+        # Workers also pool their /api/metrics numbers through a fresh directory per launch.
+        env.setdefault('SEARCH_METRICS_DIR', tempfile.mkdtemp(prefix='firecat-metrics-'))
+        cmd = [str(PYTHON), '-m', 'uvicorn', 'firecat_project.asgi:application',
+               '--host', '127.0.0.1', '--port', str(DJANGO_PORT), '--workers', str(workers)]
+    else:
+        cmd = [str(PYTHON), 'manage.py', 'runserver', f'127.0.0.1:{DJANGO_PORT}', '--noreload']
     proc = subprocess.Popen(
-        [str(PYTHON), 'manage.py', 'runserver', f'127.0.0.1:{DJANGO_PORT}', '--noreload'],
+        cmd,
         cwd=BACKEND, env=env,
         stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
         text=True, bufsize=1,
@@ -162,10 +181,17 @@ def kill_all():
 
 
 def main():
+    parser = argparse.ArgumentParser(description='Firecat dev launcher')
+    parser.add_argument('--asgi', action='store_true', help='serve Django with uvicorn (ASGI) instead of runserver')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='ASGI worker processes')
+    args = parser.parse_args()
+
     print(f"\n{BOLD}{GREEN}🔥 Firecat Dev Launcher{RESET}\n")
 
     try:
         setup_venv()
+        if args.asgi:
+            check_asgi_server()
         migrate()
         check_node()
         npm_install(FRONTEND, 'frontend')
@@ -175,7 +201,7 @@ def main():
         print()
         log('setup', GREEN, 'Starting services...\n')
 
-        start_django()
+        start_django(asgi=args.asgi, workers=max(1, args.workers))
 
         if not wait_for_django():
             kill_all()
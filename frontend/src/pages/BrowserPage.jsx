@@ -375,6 +375,35 @@ function ResultCard({ item, onNavigate, onInspect, theme, accent, border, muted
 // ---------------------------------------------------------------------------
 function GroupSection({ group, onNavigate, onInspect, theme, accent, border, muted, isNew }) {
   const [collapsed, setCollapsed] = useState(false)
+  const [extra,     setExtra]     = useState([])
+  const [cursor,    setCursor]    = useState(group.cursor || null)
+  const [loading,   setLoading]   = useState(false)
+  const items = extra.length ? [...group.items, ...extra] : group.items
+
+  // Next slice of this group only — the backend continues where the cursor left off
+  const loadMore = () => {
+    if (!cursor || loading) return
+    setLoading(true)
+    fetch(`/api/search/more/?cursor=${encodeURIComponent(cursor)}`)
+      .then(r => r.json())
+      .then(d => {
+        if (d.group) {
+          setExtra(prev => [...prev, ...d.group.items])
+          setCursor(d.group.cursor || null)
+        }
+      })
+      .catch(() => {})
+      .finally(() => setLoading(false))
+  }
+
+  // Report which group the opened result came from — the backend learns group priority from it
+  const openResult = (link) => {
+    const body = JSON.stringify({ group: group.id })
+    if (!navigator.sendBeacon?.('/api/search/click/', new Blob([body], { type: 'application/json' }))) {
+      fetch('/api/search/click/', { method: 'POST', headers: { 'Content-Type': 'application/json' }, body }).catch(() => {})
+    }
+    onNavigate(link)
+  }
 
   return (
     <div style={{ animation: isNew ? 'fadeUp 0.35s both' : 'none' }}>
@@ -395,7 +424,7 @@ function GroupSection({ group, onNavigate, onInspect, theme, accent, border, mut
           {group.label}
         </span>
         <span style={{ fontSize: 10, color: muted, opacity: 0.5, flexShrink: 0 }}>
-          {group.items.length}
+          {items.length}
         </span>
         <span style={{ fontSize: 9, color: muted, opacity: 0.35, flexShrink: 0 }}>
           {collapsed ? '▶' : '▼'}
@@ -405,11 +434,11 @@ function GroupSection({ group, onNavigate, onInspect, theme, accent, border, mut
 
       {!collapsed && (
         <div style={{ display: 'flex', flexDirection: 'column', gap: 6 }}>
-          {group.items.map((item, i) => (
+          {items.map((item, i) => (
             <ResultCard
               key={`${group.id}-${i}`}
               item={item}
-              onNavigate={onNavigate}
+              onNavigate={openResult}
               onInspect={onInspect}
               theme={theme}
               accent={accent}
@@ -417,6 +446,20 @@ function GroupSection({ group, onNavigate, onInspect, theme, accent, border, mut
               muted={muted}
             />
           ))}
+          {cursor && (
+            <button
+              onClick={loadMore}
+              disabled={loading}
+              style={{
+                alignSelf: 'center', padding: '4px 14px', borderRadius: 5,
+                border: `1px solid ${accent}40`, background: `${accent}12`,
+                color: accent, fontSize: 11, cursor: loading ? 'default' : 'pointer',
+                fontFamily: 'inherit', fontWeight: 500, opacity: loading ? 0.6 : 1,
+              }}
+            >
+              {loading ? 'Loading…' : 'Load more'}
+            </button>
+          )}
         </div>
       )}
     </div>
@@ -434,6 +477,7 @@ function DeepResults({ url, onNavigate }) {
   const [done,       setDone]       = useState(false)
   const [error,      setError]      = useState(null)
   const [cached,     setCached]     = useState(false)
+  const [queued,     setQueued]     = useState(0)
   const [activeGroup, setActiveGroup] = useState(null)
   const [inspectUrl,  setInspectUrl]  = useState(null)
   const esRef = useRef(null)
@@ -448,11 +492,12 @@ function DeepResults({ url, onNavigate }) {
     setDone(false)
     setError(null)
     setCached(false)
+    setQueued(0)
     setActiveGroup(null)
 
     const urlParams = new URLSearchParams(url.includes('?') ? url.split('?')[1] : '')
     const qValue    = urlParams.get('q') || ''
-    const baseCats  = urlParams.get('categories') || 'all'
+    const baseCats  = urlParams.get('categories') || 'auto'
     const catParam  = (baseCats && baseCats !== 'all') ? `&categories=${baseCats}` : ''
     const esUrl     = `/api/search/?q=${encodeURIComponent(qValue)}${catParam}`
 
@@ -462,6 +507,7 @@ function DeepResults({ url, onNavigate }) {
     es.onmessage = (e) => {
       try {
         const msg = JSON.parse(e.data)
+        if (msg.type === 'queued') setQueued(msg.position)
         if (msg.type === 'group') {
           const g = msg.group
           setGroups(prev => {
@@ -471,7 +517,7 @@ function DeepResults({ url, onNavigate }) {
             return next
           })
           setNewIds(prev => new Set([...prev, g.id]))
-          setLoading(false)
+          setLoading(false); setQueued(0)
         }
         if (msg.type === 'done') {
           setDone(true); setLoading(false); setCached(msg.cached ?? false)
@@ -531,7 +577,7 @@ function DeepResults({ url, onNavigate }) {
           borderRadius: '50%', animation: 'spin 0.8s linear infinite',
         }} />
         <div style={{ fontSize: 13, color: accent, animation: 'pulse 1.4s ease-in-out infinite', letterSpacing: '0.04em' }}>
-          Scanning...
+          {queued > 0 ? `Queued — position ${queued}` : 'Scanning...'}
         </div>
       </div>
     )
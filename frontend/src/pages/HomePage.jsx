@@ -93,6 +93,15 @@ export default function HomePage({ onSearch }) {
   const border     = theme.border
   const accent     = theme.accent
 
+  // Speculative warmup while typing — the backend cancels the previous one on every change
+  useEffect(() => {
+    if (!deepMode) return
+    const timer = setTimeout(() => {
+      fetch(`/api/search/prefetch/?q=${encodeURIComponent(query.trim())}`).catch(() => {})
+    }, 400)
+    return () => clearTimeout(timer)
+  }, [query, deepMode])
+
   const handleSearch = (q = query, t = activeType) => {
     const trimmed = (q || '').trim()
     if (!trimmed) return